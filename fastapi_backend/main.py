@@ -0,0 +1,16 @@
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from fastapi_backend.routers import decisions, valuation
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    decisions.shutdown_decision_executor()
+
+
+app = FastAPI(title="CHARLY API", lifespan=lifespan)
+app.include_router(decisions.router)
+app.include_router(valuation.router)
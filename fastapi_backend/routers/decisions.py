@@ -0,0 +1,216 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from fastapi_backend.services.batch_decisions import decide_lines
+from fastapi_backend.services.micro_batcher import DecisionMicroBatcher
+
+router = APIRouter(prefix="/api/v1/decisions", tags=["decisions"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Lines per worker task, and tasks allowed in flight per request. Together
+# they bound how much of a request is held in memory at once.
+BATCH_CHUNK_LINES = int(os.getenv("DECISION_BATCH_CHUNK_LINES", "256"))
+BATCH_MAX_IN_FLIGHT = int(os.getenv("DECISION_BATCH_MAX_IN_FLIGHT", "8"))
+# Longest accepted input line; longer lines are skipped with an error row
+BATCH_MAX_LINE_BYTES = int(os.getenv("DECISION_BATCH_MAX_LINE_BYTES", str(1 << 20)))
+
+# Single-property requests are micro-batched: rows per batch at most, and
+# how long the oldest row waits for more rows before its batch is sent
+MICROBATCH_MAX_SIZE = int(os.getenv("DECISION_MICROBATCH_MAX_SIZE", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("DECISION_MICROBATCH_MAX_WAIT_MS", "2"))
+
+_executor: Optional[Executor] = None
+_batcher: Optional[DecisionMicroBatcher] = None
+
+
+def _worker_count() -> int:
+    return int(os.getenv("DECISION_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def get_decision_executor() -> Executor:
+    """Shared process pool for CPU-bound decision work (DECISION_WORKERS sizes it)."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=_worker_count())
+    return _executor
+
+
+def shutdown_decision_executor() -> None:
+    """Shut down the shared process pool (app shutdown); the next request starts a new one."""
+    global _executor, _batcher
+    executor, _executor, _batcher = _executor, None, None
+    if executor is not None:
+        executor.shutdown()
+
+
+def get_micro_batcher() -> DecisionMicroBatcher:
+    """Shared micro-batcher feeding the decision executor; one batch per worker in flight."""
+    global _batcher
+    if _batcher is None:
+        _batcher = DecisionMicroBatcher(
+            get_decision_executor(),
+            max_batch_size=MICROBATCH_MAX_SIZE,
+            max_wait_ms=MICROBATCH_MAX_WAIT_MS,
+            max_in_flight=_worker_count(),
+        )
+    return _batcher
+
+
+def _problem(status: int, title: str, code: str, detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        media_type="application/problem+json",
+        content={"type": "about:blank", "title": title, "status": status, "code": code, "detail": detail},
+    )
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body generator also reads the request body.
+
+    Starlette's StreamingResponse listens for disconnects by draining
+    `receive`, which would swallow request body messages; here the generator
+    owns `receive` and sees disconnects through request.stream().
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_line_chunks(
+    body: AsyncIterator[bytes],
+    chunk_lines: int,
+    max_line_bytes: int = BATCH_MAX_LINE_BYTES,
+) -> AsyncIterator[Tuple[int, List[Optional[bytes]]]]:
+    """
+    Split a byte stream into (first_line_no, lines) chunks of at most chunk_lines lines.
+
+    A line longer than max_line_bytes is dropped as it arrives and yielded
+    as None, so a runaway line costs at most max_line_bytes plus one body
+    message of memory.
+    """
+    buffer = bytearray()
+    oversized = False
+    lines: List[Optional[bytes]] = []
+    next_line_no = 1
+    async for data in body:
+        start = 0
+        while (end := data.find(b"\n", start)) >= 0:
+            if oversized or len(buffer) + end - start > max_line_bytes:
+                lines.append(None)
+            else:
+                buffer += data[start:end]
+                lines.append(bytes(buffer))
+            buffer.clear()
+            oversized = False
+            start = end + 1
+            if len(lines) >= chunk_lines:
+                yield next_line_no, lines
+                next_line_no += len(lines)
+                lines = []
+        if not oversized:
+            buffer += data[start:]
+            if len(buffer) > max_line_bytes:
+                oversized = True
+                buffer.clear()
+    if oversized:
+        lines.append(None)
+    elif buffer:
+        lines.append(bytes(buffer))
+    if lines:
+        yield next_line_no, lines
+
+
+async def stream_decisions(
+    body: AsyncIterator[bytes],
+    executor: Executor,
+    chunk_lines: int = BATCH_CHUNK_LINES,
+    max_in_flight: int = BATCH_MAX_IN_FLIGHT,
+    max_line_bytes: int = BATCH_MAX_LINE_BYTES,
+) -> AsyncIterator[bytes]:
+    """
+    Decide NDJSON rows from `body` in the executor, yielding output chunks as they complete.
+
+    At most `max_in_flight` chunks are queued; once the window is full the
+    body is not read again until a chunk finishes and its output has been
+    taken by the consumer, so a slow client throttles intake.
+    """
+    loop = asyncio.get_running_loop()
+    pending: Set[asyncio.Future] = set()
+    try:
+        async for first_line_no, lines in iter_line_chunks(body, chunk_lines, max_line_bytes):
+            if len(pending) >= max_in_flight:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            done = {future for future in pending if future.done()}
+            pending -= done
+            for future in done:
+                yield future.result()
+            pending.add(loop.run_in_executor(executor, decide_lines, first_line_no, lines))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+@router.post("/batch")
+async def batch_decisions(request: Request, executor: Executor = Depends(get_decision_executor)):
+    """
+    Confidence + appeal decision for NDJSON property rows.
+
+    Each input line is {"property_id", "confidence": {...}, "decision": {...}}.
+    The response streams one NDJSON line per non-blank input line, in
+    completion order, carrying its 1-based input `line` number and either
+    `confidence` + `decision` results or an `error`. Lines longer than
+    DECISION_BATCH_MAX_LINE_BYTES get an error row without being parsed.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in (NDJSON_MEDIA_TYPE, "application/jsonl"):
+        return _problem(415, "Unsupported Media Type", "unsupported_media_type", f"Send rows as {NDJSON_MEDIA_TYPE}")
+    return NDJSONStreamingResponse(stream_decisions(request.stream(), executor))
+
+
+@router.post("")
+async def decide(request: Request, batcher: DecisionMicroBatcher = Depends(get_micro_batcher)):
+    """
+    Confidence + appeal decision for one property.
+
+    Body is {"property_id"?, "confidence": {...}, "decision": {...}}, as one
+    line of the batch endpoint. Concurrent requests are decided together
+    (see DecisionMicroBatcher); each still gets only its own result.
+    """
+    try:
+        row = await request.json()
+    except ValueError as e:
+        return _problem(400, "Bad Request", "invalid_json", str(e))
+    if not isinstance(row, dict):
+        return _problem(400, "Bad Request", "invalid_json", "Body must be a JSON object")
+    try:
+        confidence, decision = await batcher.submit(row)
+    except ValueError as e:
+        return _problem(422, "Unprocessable Entity", "invalid_decision_input", str(e))
+    return {
+        "property_id": row.get("property_id"),
+        "confidence": confidence.model_dump(mode="json"),
+        "decision": decision.model_dump(mode="json"),
+    }
+
+
+@router.get("/stats")
+def decision_stats(batcher: DecisionMicroBatcher = Depends(get_micro_batcher)):
+    """Micro-batcher counters: batch sizes, queue wait times and current load."""
+    return batcher.stats()
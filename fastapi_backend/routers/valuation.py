@@ -0,0 +1,42 @@
+import os
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from fastapi_backend.models.valuation_combined import CombinedValuation
+from fastapi_backend.schemas.combined_validator import get_combined_validator
+from fastapi_backend.services.request_context import RequestContext
+
+router = APIRouter(prefix="/api/valuation", tags=["valuation"])
+
+# Check every combined response against the JSON schema before returning it
+VALIDATE_RESPONSES = os.getenv("VALIDATE_COMBINED_RESPONSES", "1") == "1"
+
+
+def _problem(status: int, title: str, code: str, detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        media_type="application/problem+json",
+        content={"type": "about:blank", "title": title, "status": status, "code": code, "detail": detail},
+    )
+
+
+@router.get("/{property_id}/combined")
+def get_combined_valuation(property_id: str):
+    """Income, sales and cost valuations for one property in a single response."""
+    try:
+        from fastapi_backend.services.valuation_combiner import combine_all
+    except ImportError as e:
+        return _problem(501, "Not Implemented", "approach_services_unavailable", str(e))
+
+    try:
+        combined = combine_all(property_id, context=RequestContext())
+    except Exception as e:
+        return _problem(502, "Bad Gateway", "approach_service_failed", str(e))
+
+    body = CombinedValuation(property_id=property_id, **combined).model_dump()
+    if VALIDATE_RESPONSES:
+        errors = get_combined_validator().errors(body)
+        if errors:
+            return _problem(500, "Internal Server Error", "response_schema_violation", "; ".join(errors))
+    return body
@@ -0,0 +1,135 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from jsonschema import Draft202012Validator
+
+SCHEMA_PATH = Path(__file__).with_name("valuation_combined.schema.json")
+
+Check = Callable[[Any], bool]
+
+# Keywords that carry no validation meaning
+_ANNOTATIONS = {"$schema", "$id", "title", "description", "$comment", "examples"}
+
+_TYPE_CHECKS: Dict[str, Check] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+                         or (isinstance(v, float) and v.is_integer()),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _compile(schema: Any) -> Optional[Check]:
+    """
+    Compile a schema into a single predicate, or None if it uses keywords
+    outside the supported subset (type, required, properties,
+    additionalProperties, items).
+    """
+    if schema is True:
+        return lambda v: True
+    if not isinstance(schema, dict) or set(schema) - _ANNOTATIONS - {
+        "type", "required", "properties", "additionalProperties", "items"
+    }:
+        return None
+
+    checks: List[Check] = []
+    types = schema.get("type")
+    if types is not None:
+        names = [types] if isinstance(types, str) else list(types)
+        type_checks = [_TYPE_CHECKS[name] for name in names]
+        checks.append(type_checks[0] if len(type_checks) == 1 else lambda v: any(c(v) for c in type_checks))
+
+    required = tuple(schema.get("required", ()))
+    properties = {}
+    for name, subschema in schema.get("properties", {}).items():
+        check = _compile(subschema)
+        if check is None:
+            return None
+        properties[name] = check
+    additional = schema.get("additionalProperties", True)
+    if additional not in (True, False):
+        return None
+    if required or properties or additional is False:
+        known = set(properties)
+
+        def check_object(v) -> bool:
+            if not isinstance(v, dict):
+                return True
+            for name in required:
+                if name not in v:
+                    return False
+            for name, check in properties.items():
+                if name in v and not check(v[name]):
+                    return False
+            return additional or known.issuperset(v)
+        checks.append(check_object)
+
+    if "items" in schema:
+        item_check = _compile(schema["items"])
+        if item_check is None:
+            return None
+        checks.append(lambda v: not isinstance(v, list) or all(item_check(item) for item in v))
+
+    if len(checks) == 1:
+        return checks[0]
+    return lambda v: all(check(v) for check in checks)
+
+
+class CompiledValidator:
+    """
+    Schema validator built once and reused for every response.
+
+    Valid instances are confirmed by a predicate compiled from the schema;
+    jsonschema is only consulted to explain failures (or for schemas using
+    keywords the compiler does not cover).
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        Draft202012Validator.check_schema(schema)
+        self.schema = schema
+        self._validator = Draft202012Validator(schema)
+        self._check = _compile(schema) or self._validator.is_valid
+
+    def is_valid(self, instance: Any) -> bool:
+        return self._check(instance)
+
+    def errors(self, instance: Any) -> List[str]:
+        """Error messages for an instance (empty if valid)."""
+        if self._check(instance):
+            return []
+        return [
+            f"{'/'.join(str(p) for p in error.absolute_path) or '<root>'}: {error.message}"
+            for error in sorted(self._validator.iter_errors(instance), key=lambda e: list(e.absolute_path))
+        ]
+
+    def validate(self, instance: Any) -> None:
+        """Raise jsonschema.ValidationError if the instance is invalid."""
+        if not self._check(instance):
+            self._validator.validate(instance)
+
+    def validate_many(self, instances: Iterable[Any]) -> Dict[int, List[str]]:
+        """Errors keyed by position for each invalid instance in a batch."""
+        check = self._check
+        return {i: self.errors(instance) for i, instance in enumerate(instances) if not check(instance)}
+
+
+@lru_cache(maxsize=None)
+def get_combined_validator() -> CompiledValidator:
+    """Process-wide validator for CombinedValuation responses."""
+    with open(SCHEMA_PATH, "r") as f:
+        return CompiledValidator(json.load(f))
+
+
+def validate_combined(instance: Any) -> None:
+    """Raise jsonschema.ValidationError if a combined response breaks the schema."""
+    get_combined_validator().validate(instance)
+
+
+def validate_combined_many(instances: Iterable[Any]) -> Dict[int, List[str]]:
+    """Validate a batch of combined responses; returns errors by index for invalid ones."""
+    return get_combined_validator().validate_many(instances)
@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+import json
+
+from pydantic import ValidationError
+
+from charly_core_engine.confidence import ConfidenceInput, ConfidenceResult, calculate_confidence_band
+from charly_core_engine.decision import DecisionInput, DecisionResult, make_appeal_decision
+
+
+# Per-row failures: invalid input, or decimal arithmetic that overflows or
+# becomes undefined on extreme (but valid) values
+ROW_ERRORS = (ValidationError, ValueError, TypeError, ArithmeticError)
+
+
+def row_error_message(error: Exception) -> str:
+    """Error text for a failed row; decimal signals carry no useful message."""
+    if isinstance(error, ArithmeticError):
+        return f"Calculation failed: {type(error).__name__}"
+    return str(error)
+
+
+def _error_line(line_no: int, property_id: Optional[str], message: str) -> bytes:
+    return json.dumps({"line": line_no, "property_id": property_id, "error": message}).encode() + b"\n"
+
+
+def _decide(row: Dict[str, Any]) -> Tuple[ConfidenceResult, DecisionResult]:
+    confidence_input = ConfidenceInput(**(row.get("confidence") or {}))
+    confidence = calculate_confidence_band(confidence_input)
+    decision_fields = dict(row.get("decision") or {})
+    decision_fields.setdefault("estimated_market_value", confidence_input.estimated_market_value)
+    decision = make_appeal_decision(DecisionInput(**decision_fields, confidence_result=confidence))
+    return confidence, decision
+
+
+def decide_row(line_no: int, row: Dict[str, Any]) -> bytes:
+    """
+    Run confidence + decision for one parsed NDJSON row.
+
+    Row shape:
+    {
+      "property_id": str,
+      "confidence": {...ConfidenceInput fields},
+      "decision":   {...DecisionInput fields except confidence_result}
+    }
+    `decision.estimated_market_value` defaults to the confidence input's.
+    Returns one NDJSON output line (result or per-line error).
+    """
+    property_id = row.get("property_id")
+    if not isinstance(property_id, str):
+        return _error_line(line_no, None, "property_id must be a string")
+    try:
+        confidence, decision = _decide(row)
+    except ROW_ERRORS as e:
+        return _error_line(line_no, property_id, row_error_message(e))
+
+    return (
+        b'{"line":%d,"property_id":%s,"confidence":%s,"decision":%s}\n'
+        % (line_no, json.dumps(property_id).encode(),
+           confidence.model_dump_json().encode(), decision.model_dump_json().encode())
+    )
+
+
+def decide_rows(rows: List[Dict[str, Any]]) -> List[Union[Tuple[ConfidenceResult, DecisionResult], str]]:
+    """
+    Decide already-parsed rows in one call; runs inside the worker pool.
+
+    Rows have the decide_row shape (property_id optional). Each slot holds
+    the (confidence, decision) pair or, for an invalid row, its error
+    message (messages pickle reliably, validation errors do not).
+    """
+    out: List[Union[Tuple[ConfidenceResult, DecisionResult], str]] = []
+    for row in rows:
+        try:
+            out.append(_decide(row))
+        except ROW_ERRORS as e:
+            out.append(row_error_message(e))
+    return out
+
+
+def decide_lines(first_line_no: int, lines: List[Optional[bytes]]) -> bytes:
+    """
+    Decide a chunk of raw NDJSON lines; runs inside the worker pool.
+
+    Blank lines are skipped, and None marks a line dropped for exceeding
+    the line length limit. Parsing happens here too so the event loop
+    only moves bytes.
+    """
+    out = []
+    for offset, raw in enumerate(lines):
+        line_no = first_line_no + offset
+        if raw is None:
+            out.append(_error_line(line_no, None, "Line exceeds the maximum line length"))
+            continue
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError as e:
+            out.append(_error_line(line_no, None, f"Invalid JSON: {e}"))
+            continue
+        if not isinstance(row, dict):
+            out.append(_error_line(line_no, None, "Each line must be a JSON object"))
+            continue
+        out.append(decide_row(line_no, row))
+    return b"".join(out)
@@ -0,0 +1,186 @@
+"""
+Adaptive micro-batching of single-property confidence + decision requests.
+
+Concurrent callers `await batcher.submit(row)`; rows are gathered and
+decided together by one `decide_rows` call in the executor, and each caller's
+future resolves with its own (ConfidenceResult, DecisionResult).
+
+Rows collect for up to `max_wait_ms` after the oldest queued row arrived,
+or until `max_batch_size` rows are queued, whichever comes first; then
+they go out as one batch. No more than `max_in_flight` batches ever run at
+once: while every slot is busy, rows keep queueing, and each slot that
+frees up takes the next `max_batch_size` rows whose window has closed.
+`max_wait_ms=0` dispatches every row as soon as a slot is free.
+
+Batches run the exact Decimal engines row by row rather than the float64
+`screen_decisions` pass. Every caller gets the full ConfidenceResult and
+DecisionResult, and screening only guarantees the decision label of an
+unflagged row, not its metrics. Batching here saves executor round trips
+and pickling, not arithmetic.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from charly_core_engine.confidence import ConfidenceResult
+from charly_core_engine.decision import DecisionResult
+from fastapi_backend.services.batch_decisions import decide_rows
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatcherMetrics:
+    batches: int = 0
+    items: int = 0
+    errors: int = 0
+    batch_sizes: Counter = field(default_factory=Counter)  # size -> batches
+    queue_wait_seconds: float = 0.0  # Summed submit -> dispatch delay
+    max_queue_wait_seconds: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    @property
+    def mean_queue_wait_ms(self) -> float:
+        return 1000 * self.queue_wait_seconds / self.items if self.items else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "errors": self.errors,
+            "mean_batch_size": round(self.mean_batch_size, 2),
+            "max_batch_size": max(self.batch_sizes, default=0),
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "mean_queue_wait_ms": round(self.mean_queue_wait_ms, 3),
+            "max_queue_wait_ms": round(1000 * self.max_queue_wait_seconds, 3),
+        }
+
+
+class DecisionMicroBatcher:
+    """
+    Gather single-row decision requests into batches.
+
+    Args:
+        executor: Where batches run (None uses the loop's default executor)
+        max_batch_size: Rows per batch at most
+        max_wait_ms: How long the oldest queued row waits for more rows
+            before its batch is dispatched
+        max_in_flight: Batches allowed to run at once
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        max_in_flight: int = 1,
+    ):
+        if max_batch_size < 1 or max_in_flight < 1:
+            raise ValueError("max_batch_size and max_in_flight must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+        self.metrics = BatcherMetrics()
+        self._queue: List[Tuple[Dict[str, Any], asyncio.Future, float]] = []
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def in_flight(self) -> int:
+        """Batches currently running."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Rows waiting for a free slot."""
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch size and queue latency counters, plus the current load."""
+        return {**self.metrics.as_dict(), "in_flight": self._in_flight, "queued": len(self._queue)}
+
+    async def submit(self, row: Dict[str, Any]) -> Tuple[ConfidenceResult, DecisionResult]:
+        """
+        Decide one row ({"confidence": {...}, "decision": {...}}) as part of a batch.
+
+        Raises:
+            ValueError: If the row fails validation
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((row, future, time.perf_counter()))
+        self._dispatch()
+        return await future
+
+    def _dispatch(self, window_closed: bool = False) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue and self._in_flight < self.max_in_flight:
+            waited = time.perf_counter() - self._queue[0][2]
+            if not (window_closed or waited >= self.max_wait or len(self._queue) >= self.max_batch_size):
+                break
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            self._send(batch)
+            window_closed = False  # Rows left behind arrived later; their own window applies
+
+        if self._queue and self._in_flight < self.max_in_flight:
+            # Without a free slot, the next finished batch dispatches instead
+            remaining = self.max_wait - (time.perf_counter() - self._queue[0][2])
+            self._timer = asyncio.get_running_loop().call_later(max(remaining, 0), self._dispatch, True)
+
+    def _send(self, batch: List[Tuple[Dict[str, Any], asyncio.Future, float]]) -> None:
+        now = time.perf_counter()
+        waits = [now - queued_at for _, _, queued_at in batch]
+        metrics = self.metrics
+        metrics.batches += 1
+        metrics.items += len(batch)
+        metrics.batch_sizes[len(batch)] += 1
+        metrics.queue_wait_seconds += sum(waits)
+        metrics.max_queue_wait_seconds = max(metrics.max_queue_wait_seconds, max(waits))
+
+        self._in_flight += 1
+        asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Dict[str, Any], asyncio.Future, float]]) -> None:
+        rows = [row for row, _, _ in batch]
+        try:
+            results = await self._decide(rows)
+            if isinstance(results, Exception) and len(rows) > 1:
+                # Whatever broke the batch, retry row by row so only rows that fail alone see it
+                results = [await self._decide([row]) for row in rows]
+                results = [result if isinstance(result, Exception) else result[0] for result in results]
+            elif isinstance(results, Exception):
+                results = [results]
+        finally:
+            self._in_flight -= 1
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():  # Caller gave up (cancelled)
+                continue
+            if isinstance(result, tuple):
+                future.set_result(result)
+            else:
+                self.metrics.errors += 1
+                future.set_exception(result if isinstance(result, Exception) else ValueError(result))
+        logger.debug("decision micro-batch", extra={"batch_size": len(batch), **self.metrics.as_dict()})
+
+        self._dispatch()  # A slot just freed up
+
+    async def _decide(self, rows: List[Dict[str, Any]]) -> Union[List[Any], Exception]:
+        """decide_rows in the executor; a failure of the call itself is returned, not raised."""
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, decide_rows, rows)
+        except Exception as e:
+            return e
@@ -0,0 +1,264 @@
+"""
+Declarative NOI -> cap rate -> confidence -> decision -> tax savings pipeline.
+
+Each stage reads named sections of the property's input and the results
+of its upstream stages. A stage's fingerprint hashes its sections together
+with its upstream fingerprints, and results are cached by fingerprint, so
+editing one input (say `decision.tax_rate`) re-runs only the stages
+downstream of it. The cache is shared across runs; what-if edits against
+the same pipeline object reuse everything the edit did not touch.
+
+Input shape (sections other than `noi`, `cap_rate` and `decision` are optional):
+{
+  "noi":         {...NOIInput fields},
+  "cap_rate":    {"target_cap_rate": ...} or {"property_value": ...},
+  "confidence":  {...ConfidenceInput fields},
+  "decision":    {...DecisionInput fields except confidence_result},
+  "tax_savings": {...TaxSavingsInput fields}
+}
+
+Defaults that link the stages:
+- confidence.estimated_market_value is the cap rate's implied value and
+  valuation_method is income_approach
+- decision.estimated_market_value is the confidence central estimate
+- tax savings compare the assessed value with the central estimate when the
+  decision is OVER (no change otherwise), using the decision's tax rate
+  (converted to per $1000), fees and horizon
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from charly_core_engine.confidence import ConfidenceInput, ValuationMethod, calculate_confidence_band
+from charly_core_engine.decision import AppealDecision, DecisionInput, make_appeal_decision
+from charly_finance.cap_rate import CapRateInput, calculate_cap_rate
+from charly_finance.noi import NOIInput, calculate_noi
+from charly_finance.tax_savings import TaxSavingsInput, calculate_tax_savings
+
+StageFunction = Callable[[Mapping[str, Any], Mapping[str, Any]], Any]
+
+_PER_THOUSAND = Decimal('1000')
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    sections: Tuple[str, ...]  # Input sections the stage reads
+    upstream: Tuple[str, ...]  # Stages whose results the stage reads
+    run: StageFunction         # run(sections, upstream_results) -> result
+
+
+@dataclass
+class StageStats:
+    runs: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class PipelineRun:
+    results: Dict[str, Any]
+    fingerprints: Dict[str, str]
+    timings: Dict[str, float]  # Seconds per stage, including cache lookups
+    cached: List[str] = field(default_factory=list)  # Stages served from the cache
+
+    @property
+    def executed(self) -> List[str]:
+        return [name for name in self.results if name not in self.cached]
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)  # Decimal, dates, ...
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable digest of JSON-like parts (Decimals and models included)."""
+    payload = json.dumps(parts, sort_keys=True, default=_canonical, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _noi(sections, upstream):
+    return calculate_noi(NOIInput(**sections["noi"]))
+
+
+def _cap_rate(sections, upstream):
+    return calculate_cap_rate(CapRateInput(
+        net_operating_income=upstream["noi"].net_operating_income, **sections["cap_rate"]
+    ))
+
+
+def _confidence(sections, upstream):
+    fields = dict(sections["confidence"])
+    if "estimated_market_value" not in fields:
+        implied_value = upstream["cap_rate"].implied_value
+        if implied_value is None:
+            raise ValueError("confidence.estimated_market_value is required when cap_rate gives no implied value")
+        fields["estimated_market_value"] = implied_value
+    fields.setdefault("valuation_method", ValuationMethod.INCOME_APPROACH)
+    return calculate_confidence_band(ConfidenceInput(**fields))
+
+
+def _decision(sections, upstream):
+    confidence = upstream["confidence"]
+    fields = dict(sections["decision"])
+    fields.setdefault("estimated_market_value", confidence.central_estimate)
+    return make_appeal_decision(DecisionInput(**fields, confidence_result=confidence))
+
+
+def _decision_field(sections, name: str) -> Any:
+    return sections["decision"].get(name, DecisionInput.model_fields[name].default)
+
+
+def _tax_savings(sections, upstream):
+    current = Decimal(str(_decision_field(sections, "assessed_value")))
+    proposed = current
+    if upstream["decision"].decision == AppealDecision.OVER:
+        proposed = min(current, upstream["confidence"].central_estimate)
+
+    fields = {
+        "current_assessed_value": current,
+        "proposed_assessed_value": proposed,
+        "tax_rate": Decimal(str(_decision_field(sections, "tax_rate"))) * _PER_THOUSAND,
+        "filing_fee": _decision_field(sections, "estimated_filing_fee"),
+        "attorney_fee": _decision_field(sections, "estimated_attorney_fee"),
+        "other_costs": _decision_field(sections, "estimated_other_costs"),
+        "years_of_savings": _decision_field(sections, "appeal_horizon_years"),
+    }
+    fields.update(sections["tax_savings"])
+    return calculate_tax_savings(TaxSavingsInput(**fields))
+
+
+PROPERTY_STAGES: Tuple[Stage, ...] = (
+    Stage("noi", ("noi",), (), _noi),
+    Stage("cap_rate", ("cap_rate",), ("noi",), _cap_rate),
+    Stage("confidence", ("confidence",), ("cap_rate",), _confidence),
+    Stage("decision", ("decision",), ("confidence",), _decision),
+    Stage("tax_savings", ("decision", "tax_savings"), ("confidence", "decision"), _tax_savings),
+)
+
+
+class PropertyPipeline:
+    """
+    Run stages in order, caching each result by its input fingerprint.
+
+    Args:
+        stages: Stages in dependency order (upstream stages first)
+        cache_size: Cached results kept per pipeline (least recently used evicted)
+    """
+
+    def __init__(self, stages: Sequence[Stage] = PROPERTY_STAGES, cache_size: int = 4096):
+        seen = set()
+        for stage in stages:
+            missing = [name for name in stage.upstream if name not in seen]
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on {missing} which do not run before it")
+            seen.add(stage.name)
+        self.stages = tuple(stages)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._stats = {stage.name: StageStats() for stage in self.stages}
+        self._lock = threading.Lock()
+
+    def _cached(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return True, self._cache[key]
+        return False, None
+
+    def _store(self, key: Tuple[str, str], result: Any) -> None:
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def run(self, inputs: Mapping[str, Mapping[str, Any]]) -> PipelineRun:
+        """
+        Run every stage for one property, reusing cached stage results.
+
+        Args:
+            inputs: Input sections keyed by name (see module docstring)
+
+        Returns:
+            PipelineRun with per-stage results, fingerprints and timings
+
+        Raises:
+            ValidationError, ValueError: From the failing stage
+        """
+        run = PipelineRun(results={}, fingerprints={}, timings={})
+        for stage in self.stages:
+            started = time.perf_counter()
+            sections = {name: inputs.get(name) or {} for name in stage.sections}
+            digest = fingerprint(stage.name, sections, [run.fingerprints[name] for name in stage.upstream])
+            key = (stage.name, digest)
+            hit, result = self._cached(key)
+            if not hit:
+                result = stage.run(sections, {name: run.results[name] for name in stage.upstream})
+                self._store(key, result)
+            elapsed = time.perf_counter() - started
+
+            run.results[stage.name] = result
+            run.fingerprints[stage.name] = digest
+            run.timings[stage.name] = elapsed
+            if hit:
+                run.cached.append(stage.name)
+            with self._lock:
+                stats = self._stats[stage.name]
+                stats.runs += 1
+                stats.hits += hit
+                stats.seconds += elapsed
+        return run
+
+    def run_many(
+        self,
+        rows: Iterable[Mapping[str, Mapping[str, Any]]],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Run a batch of properties through the pipeline.
+
+        Rows that share upstream inputs (e.g. one rent roll under several tax
+        rates) share the cached stage results.
+
+        Args:
+            rows: One input mapping per property
+            return_exceptions: Put a failing row's exception in its slot
+                instead of raising
+
+        Returns:
+            PipelineRun (or exception) per row, in order
+        """
+        out = []
+        for row in rows:
+            try:
+                out.append(self.run(row))
+            except (ValueError, TypeError) as e:  # pydantic ValidationError is a ValueError
+                if not return_exceptions:
+                    raise
+                out.append(e)
+        return out
+
+    def stats(self) -> Dict[str, StageStats]:
+        """Cumulative per-stage runs, cache hits and seconds."""
+        with self._lock:
+            return {name: StageStats(s.runs, s.hits, s.seconds) for name, s in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
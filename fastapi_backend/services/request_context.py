@@ -0,0 +1,65 @@
+from concurrent.futures import Future
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Shared lookup kinds the approach services fetch per property
+PROPERTY_RECORD = "property_record"
+COMPS = "comps"
+COST_TABLES = "cost_tables"
+
+
+@dataclass
+class FetchStats:
+    loads: int = 0  # Loader actually ran
+    hits: int = 0   # Served from the request cache (a fetch avoided)
+
+
+class RequestContext:
+    """
+    Per-request memo for lookups shared by the approach services.
+
+    combine_all creates one per combined request and passes it to each
+    service as `context`. Services wrap expensive lookups in `fetch`, so a
+    property record or comps set is loaded once no matter how many
+    approaches need it. Concurrent callers asking for the same key wait for
+    the first load instead of repeating it; a failed load is remembered
+    and re-raised for the rest of the request.
+
+        record = context.fetch(PROPERTY_RECORD, prop_id, lambda: load_property(prop_id))
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._entries: Dict[Tuple[str, Hashable], Future] = {}
+        self._stats: Dict[str, FetchStats] = {}
+
+    def fetch(self, kind: str, key: Hashable, loader: Callable[[], T]) -> T:
+        """Return the memoized value for (kind, key), running `loader` on first use."""
+        with self._lock:
+            stats = self._stats.setdefault(kind, FetchStats())
+            future = self._entries.get((kind, key))
+            owner = future is None
+            if owner:
+                future = self._entries[(kind, key)] = Future()
+                stats.loads += 1
+            else:
+                stats.hits += 1
+        if owner:
+            try:
+                future.set_result(loader())
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Loads and cache hits per lookup kind."""
+        with self._lock:
+            return {kind: {"loads": s.loads, "hits": s.hits} for kind, s in self._stats.items()}
+
+    @property
+    def avoided_fetches(self) -> int:
+        with self._lock:
+            return sum(s.hits for s in self._stats.values())
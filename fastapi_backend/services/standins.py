@@ -0,0 +1,150 @@
+"""
+Deterministic local stand-ins for the income, sales and cost services.
+
+For offline development and load testing of /api/valuation/{id}/combined.
+Values are derived from a hash of the property ID, so every run returns the
+same numbers. Each service loads its data through the request context
+(property record, comps, cost tables), and every real load sleeps for the
+configured latency, so the per-request memoization is visible in timings.
+
+    from fastapi_backend.services import standins
+    standins.install(standins.StandinConfig(fetch_latency_ms=20, failure_rate=0.01))
+
+install() registers the stand-ins as the income_service, sales_service
+and cost_service modules that valuation_combiner imports.
+"""
+
+import hashlib
+import random
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from fastapi_backend.services.request_context import COMPS, COST_TABLES, PROPERTY_RECORD, RequestContext
+
+SERVICE_MODULES = {
+    "income_service": "get_income_valuation",
+    "sales_service": "get_sales_valuation",
+    "cost_service": "get_cost_valuation",
+}
+
+
+class StandinServiceError(RuntimeError):
+    """Injected upstream failure."""
+
+
+@dataclass
+class StandinConfig:
+    fetch_latency_ms: float = 0.0   # Sleep per real (non-memoized) load
+    jitter_ms: float = 0.0          # Extra uniform random latency per load
+    failure_rate: float = 0.0       # Probability that a load raises StandinServiceError
+    failing_ids: FrozenSet[str] = field(default_factory=frozenset)  # Always fail these properties
+    seed: int = 0                   # Seeds jitter and failure injection
+
+
+class _Standins:
+    def __init__(self, config: StandinConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _load(self, prop_id: str, build):
+        config = self.config
+        with self._lock:
+            self.loads += 1
+            jitter = self._rng.uniform(0, config.jitter_ms) if config.jitter_ms else 0.0
+            fail = config.failure_rate > 0 and self._rng.random() < config.failure_rate
+        delay = (config.fetch_latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+        if fail or prop_id in config.failing_ids:
+            raise StandinServiceError(f"Injected failure loading {prop_id}")
+        return build()
+
+    def property_record(self, prop_id: str, context: RequestContext) -> Dict[str, Any]:
+        return context.fetch(PROPERTY_RECORD, prop_id, lambda: self._load(prop_id, lambda: _property_record(prop_id)))
+
+    def comps(self, prop_id: str, context: RequestContext) -> List[float]:
+        return context.fetch(COMPS, prop_id, lambda: self._load(prop_id, lambda: _comps(prop_id)))
+
+    def cost_tables(self, property_type: str, context: RequestContext) -> Dict[str, float]:
+        return context.fetch(COST_TABLES, property_type, lambda: self._load(property_type, lambda: _cost_table(property_type)))
+
+    def income(self, prop_id: str, context: Optional[RequestContext] = None) -> Dict[str, Any]:
+        context = context or RequestContext()
+        record = self.property_record(prop_id, context)
+        noi = record["building_sqft"] * record["rent_psf"] * 0.62
+        cap_rate = 0.055 + (record["seed"] % 40) / 2000
+        return {"approach": "income", "noi": round(noi, 2), "cap_rate": round(cap_rate, 4),
+                "value": round(noi / cap_rate, 2)}
+
+    def sales(self, prop_id: str, context: Optional[RequestContext] = None) -> Dict[str, Any]:
+        context = context or RequestContext()
+        record = self.property_record(prop_id, context)
+        prices = self.comps(prop_id, context)
+        psf = sorted(prices)[len(prices) // 2] / record["building_sqft"]
+        return {"approach": "sales", "comparable_count": len(prices), "price_psf": round(psf, 2),
+                "value": round(psf * record["building_sqft"], 2)}
+
+    def cost(self, prop_id: str, context: Optional[RequestContext] = None) -> Dict[str, Any]:
+        context = context or RequestContext()
+        record = self.property_record(prop_id, context)
+        table = self.cost_tables(record["property_type"], context)
+        depreciation = min(record["age_years"] * 0.015, 0.6)
+        improvements = record["building_sqft"] * table["replacement_psf"] * (1 - depreciation)
+        return {"approach": "cost", "depreciation": round(depreciation, 3),
+                "value": round(improvements + record["land_value"], 2)}
+
+
+def _seed(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+
+
+def _property_record(prop_id: str) -> Dict[str, Any]:
+    seed = _seed(prop_id)
+    sqft = 5000 + seed % 95000
+    return {
+        "property_id": prop_id,
+        "property_type": ("office", "retail", "industrial", "multifamily")[seed % 4],
+        "building_sqft": sqft,
+        "rent_psf": 14 + (seed >> 8) % 30,
+        "age_years": (seed >> 16) % 50,
+        "land_value": float(sqft * (8 + (seed >> 24) % 25)),
+        "seed": seed,
+    }
+
+
+def _comps(prop_id: str) -> List[float]:
+    record = _property_record(prop_id)
+    base = record["building_sqft"] * record["rent_psf"] * 0.62 / 0.07
+    rng = random.Random(record["seed"])
+    return [round(base * rng.uniform(0.85, 1.15), -2) for _ in range(5)]
+
+
+def _cost_table(property_type: str) -> Dict[str, float]:
+    return {"replacement_psf": 90.0 + _seed(property_type) % 120}
+
+
+def install(config: Optional[StandinConfig] = None) -> _Standins:
+    """Register stand-in service modules (replacing any already registered)."""
+    standins = _Standins(config or StandinConfig())
+    functions = {"income_service": standins.income, "sales_service": standins.sales, "cost_service": standins.cost}
+    for module_name, attr in SERVICE_MODULES.items():
+        module = types.ModuleType(f"fastapi_backend.services.{module_name}")
+        module.__doc__ = "Stand-in registered by fastapi_backend.services.standins"
+        setattr(module, attr, functions[module_name])
+        sys.modules[module.__name__] = module
+    # The combiner binds service functions at import; rebind on next import
+    sys.modules.pop("fastapi_backend.services.valuation_combiner", None)
+    return standins
+
+
+def uninstall() -> None:
+    """Remove registered stand-ins (and the combiner bound to them)."""
+    for module_name in SERVICE_MODULES:
+        sys.modules.pop(f"fastapi_backend.services.{module_name}", None)
+    sys.modules.pop("fastapi_backend.services.valuation_combiner", None)
@@ -1,9 +1,13 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import logging
 
 # These imports are best-effort; if a service is missing, raise and let the 501 surface.
 from fastapi_backend.services.income_service import get_income_valuation  # type: ignore
 from fastapi_backend.services.sales_service import get_sales_valuation    # type: ignore
 from fastapi_backend.services.cost_service import get_cost_valuation      # type: ignore
+from fastapi_backend.services.request_context import RequestContext
+
+logger = logging.getLogger(__name__)
 
 def _to_number(v: Any) -> float:
     try:
@@ -11,7 +15,7 @@ def _to_number(v: Any) -> float:
     except Exception:
         return 0.0
 
-def combine_all(prop_id: str) -> Dict[str, Any]:
+def combine_all(prop_id: str, context: Optional[RequestContext] = None) -> Dict[str, Any]:
     """
     Returns a deterministic, schema-friendly dict with:
     {
@@ -24,10 +28,23 @@ def combine_all(prop_id: str) -> Dict[str, Any]:
     }
     Each per-approach service is responsible for domain-accurate calcs.
     We only normalize shape and bubble up the final values.
+
+    Services are called as service(prop_id, context=...) with one
+    RequestContext for the whole combined request, so lookups they share
+    (property record, comps, cost tables) are fetched once. Pass a context
+    to inspect its fetch stats afterwards; otherwise a fresh one is used.
     """
-    income = get_income_valuation(prop_id) or {}
-    sales  = get_sales_valuation(prop_id) or {}
-    cost   = get_cost_valuation(prop_id) or {}
+    if context is None:
+        context = RequestContext()
+
+    income = get_income_valuation(prop_id, context=context) or {}
+    sales  = get_sales_valuation(prop_id, context=context) or {}
+    cost   = get_cost_valuation(prop_id, context=context) or {}
+
+    logger.debug(
+        "combine_all fetches",
+        extra={"property_id": prop_id, "avoided_fetches": context.avoided_fetches, "fetch_stats": context.stats()},
+    )
 
     income_value = _to_number(income.get("value"))
     sales_value  = _to_number(sales.get("value"))
@@ -0,0 +1,79 @@
+"""
+Construction and serialization cost of the engine's pydantic models.
+
+Run from the package root:
+
+    python -m benchmarks.bench_models [--number N] [--repeat R]
+
+Inputs are validated from plain dicts of strings and floats (as they arrive
+from the API); results are serialized with model_dump_json and
+model_dump(mode="json"). Reports the best per-call time over R rounds of N
+calls.
+"""
+
+import argparse
+import timeit
+
+from charly_core_engine.confidence import ConfidenceInput, ConfidenceResult, calculate_confidence_band
+from charly_core_engine.decision import DecisionInput, DecisionResult, make_appeal_decision
+from charly_core_engine.jurisdiction import JurisdictionPriors
+
+PRIORS = {
+    "jurisdiction_id": "collin_county_tx",
+    "jurisdiction_name": "Collin County, TX",
+    "state": "tx",
+    "appeal_success_rate": "0.45",
+    "average_reduction_pct": 0.18,
+    "typical_filing_fee": 450,
+    "typical_attorney_cost": "2800",
+    "cod_target": "0.15",
+}
+
+CONFIDENCE = {
+    "estimated_market_value": 1000000.0,
+    "valuation_method": "sales_comparison",
+    "comparable_sales": ["980000", "1010000", "1025000"],
+    "other_estimates": [["1040000", "income_approach"]],
+    "data_quality_score": "0.85",
+    "market_conditions": "Improving",
+    "days_since_valuation": 120,
+}
+
+
+def best_per_call_us(func, number: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    confidence = calculate_confidence_band(ConfidenceInput(**CONFIDENCE))
+    decision_fields = {
+        "assessed_value": "1250000",
+        "estimated_market_value": 1000000.0,
+        "confidence_result": confidence,
+        "jurisdiction_priors": PRIORS,
+        "tax_rate": 0.025,
+        "estimated_attorney_fee": "2800",
+    }
+    decision = make_appeal_decision(DecisionInput(**decision_fields))
+
+    cases = [
+        ("JurisdictionPriors(**dict)", lambda: JurisdictionPriors(**PRIORS)),
+        ("ConfidenceInput(**dict)", lambda: ConfidenceInput(**CONFIDENCE)),
+        ("DecisionInput(**dict)", lambda: DecisionInput(**decision_fields)),
+        ("ConfidenceResult.model_dump_json", confidence.model_dump_json),
+        ("DecisionResult.model_dump_json", decision.model_dump_json),
+        ("DecisionResult.model_dump(json)", lambda: decision.model_dump(mode="json")),
+        ("DecisionResult.model_validate", lambda: DecisionResult.model_validate(decision.model_dump())),
+        ("ConfidenceResult.model_validate", lambda: ConfidenceResult.model_validate(confidence.model_dump())),
+    ]
+    for name, func in cases:
+        print(f"{name:34s} {best_per_call_us(func, args.number, args.repeat):8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
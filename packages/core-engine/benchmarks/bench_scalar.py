@@ -0,0 +1,67 @@
+"""
+Scalar throughput of calculate_confidence_band and make_appeal_decision.
+
+Run from the package root:
+
+    python -m benchmarks.bench_scalar [--number N] [--repeat R]
+
+Reports the best per-call time over R rounds of N calls for each engine, and
+the cost of a ROUND_HALF_UP quantize through the shared rounding context
+versus passing `rounding=` per call.
+"""
+
+import argparse
+import timeit
+from decimal import Decimal, ROUND_HALF_UP
+
+from charly_core_engine.confidence import (
+    ConfidenceInput, ValuationMethod, calculate_confidence_band
+)
+from charly_core_engine.decision import DecisionInput, make_appeal_decision
+from charly_core_engine.jurisdiction import JurisdictionPriors
+from charly_core_engine.rounding import round_currency
+
+
+def build_inputs():
+    confidence_input = ConfidenceInput(
+        estimated_market_value=Decimal('1000000'),
+        valuation_method=ValuationMethod.SALES_COMPARISON,
+        comparable_sales=[Decimal('980000'), Decimal('1010000'), Decimal('1025000')],
+        other_estimates=[(Decimal('1040000'), ValuationMethod.INCOME_APPROACH)],
+        market_conditions="improving",
+        days_since_valuation=120,
+    )
+    decision_input = DecisionInput(
+        assessed_value=Decimal('1250000'),
+        estimated_market_value=Decimal('1000000'),
+        confidence_result=calculate_confidence_band(confidence_input),
+        jurisdiction_priors=JurisdictionPriors.get_default_priors("TX"),
+        tax_rate=Decimal('0.025'),
+    )
+    return confidence_input, decision_input
+
+
+def best_per_call_us(func, number: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    confidence_input, decision_input = build_inputs()
+    value = Decimal('1234567.8951')
+    cases = [
+        ("calculate_confidence_band", lambda: calculate_confidence_band(confidence_input)),
+        ("make_appeal_decision", lambda: make_appeal_decision(decision_input)),
+        ("quantize (shared context)", lambda: round_currency(value)),
+        ("quantize (rounding= per call)", lambda: value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+    ]
+    for name, func in cases:
+        print(f"{name:32s} {best_per_call_us(func, args.number, args.repeat):8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,67 @@
 """CHARLY Core Engine - Property tax appeal decision engine."""
 
-from .decision import make_appeal_decision, DecisionInput, DecisionResult
-from .confidence import calculate_confidence_band, ConfidenceInput, ConfidenceResult
-from .jurisdiction import JurisdictionPriors
-
-__all__ = [
-    "make_appeal_decision", "DecisionInput", "DecisionResult",
-    "calculate_confidence_band", "ConfidenceInput", "ConfidenceResult",
-    "JurisdictionPriors"
-]
\ No newline at end of file
+from importlib import import_module
+
+# Public name -> defining submodule. Submodules (and pydantic/numpy with them)
+# are imported on first attribute access, so cold starts only pay for what
+# they use.
+_EXPORTS = {
+    "make_appeal_decision": ".decision",
+    "DecisionInput": ".decision",
+    "DecisionResult": ".decision",
+    "calculate_confidence_band": ".confidence",
+    "ConfidenceInput": ".confidence",
+    "ConfidenceResult": ".confidence",
+    "ConfidenceAccumulator": ".confidence_accumulator",
+    "ComparableSalesIndex": ".comps_index",
+    "MarketIndexStore": ".market_index",
+    "MarketConditionsClassifier": ".market_conditions",
+    "MarketConditionsReport": ".market_conditions",
+    "QualityScorer": ".quality_scoring",
+    "QualityScores": ".quality_scoring",
+    "QualityWeights": ".quality_scoring",
+    "RatioStudy": ".ratio_study",
+    "RatioStudyResult": ".ratio_study",
+    "QuantileSketch": ".quantile_sketch",
+    "PortfolioQuantiles": ".quantile_sketch",
+    "JurisdictionPriors": ".jurisdiction",
+    "DecisionStore": ".result_store",
+    "DecisionStoreWriter": ".result_store",
+    "write_decision_store": ".result_store",
+    "DecisionIndex": ".decision_index",
+    "RedecisionTracker": ".redecision",
+    "RedecisionReport": ".redecision",
+    "DecisionChange": ".redecision",
+    "DecisionCube": ".aggregate_cube",
+    "SharedJurisdictionTables": ".shared_tables",
+    "ScreeningBatch": ".screening",
+    "ScreeningResult": ".screening",
+    "screen_decisions": ".screening",
+    "ReconciliationResult": ".reconciliation",
+    "reconcile": ".reconciliation",
+    "reconcile_many": ".reconciliation",
+    "decide_reconciled": ".reconciliation",
+    "RobustDispersion": ".robust_dispersion",
+    "robust_dispersion": ".robust_dispersion",
+    "robust_confidence_band": ".robust_dispersion",
+    "robust_confidence_bands": ".robust_dispersion",
+    "ColumnValidationReport": ".column_validation",
+    "validate_confidence_columns": ".column_validation",
+    "validate_decision_columns": ".column_validation",
+    "validate_model_columns": ".column_validation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,315 @@
+"""Incrementally maintained aggregate cube over decided properties.
+
+Dashboards sum savings, counts and costs grouped by jurisdiction,
+decision, confidence level and reliability grade. A DecisionCube keeps
+those sums in one dense array with one cell per combination of the four
+dimensions, so a dashboard query is a slice and a sum, not a scan.
+
+Money is summed as integer cents, so adding and subtracting never drifts.
+The cube also remembers each property's cell and contribution. When a
+property is re-decided, its old contribution is subtracted and the new
+one added, so the cube never has to be rebuilt:
+
+    cube = DecisionCube.from_store(store)
+    report = tracker.update_priors(new_priors)
+    cube.refresh(tracker, tracker.dependents(new_priors.jurisdiction_id))
+    cube.total("expected_annual_savings", jurisdiction_id="collin_county_tx", decision="OVER")
+    cube.save("portfolio.cube")
+"""
+
+from decimal import Decimal
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from .confidence import ConfidenceResult
+from .decision import DecisionResult
+from .redecision import RedecisionTracker
+from .result_store import CONFIDENCE_LEVEL_CODES, DECISION_CODES, GRADE_CODES, DecisionStore
+from .rounding import round_currency
+
+
+FORMAT_VERSION = 1
+
+CUBE_DIMENSIONS: Tuple[str, ...] = ("jurisdiction_id", "decision", "confidence_level", "reliability_grade")
+
+# Summed per cell; "count" is a property count, the rest are cents
+CUBE_MEASURES: Tuple[str, ...] = (
+    "count",
+    "expected_annual_savings",
+    "total_appeal_costs",
+    "net_savings_year_1",
+    "cumulative_net_savings",
+)
+_MONEY = CUBE_MEASURES[1:]
+
+# Cells per jurisdiction
+_CELLS = len(DECISION_CODES) * len(CONFIDENCE_LEVEL_CODES) * len(GRADE_CODES)
+
+_NO_CELL = -1
+
+# Fixed labels of the dimensions after jurisdiction, in axis order
+_LABELS: Dict[str, Tuple[str, ...]] = {
+    "decision": DECISION_CODES,
+    "confidence_level": CONFIDENCE_LEVEL_CODES,
+    "reliability_grade": GRADE_CODES,
+}
+
+Labels = Union[str, Iterable[str]]
+Value = Union[int, Decimal]
+
+
+def _cents(value: Decimal) -> int:
+    return int(round_currency(value).scaleb(2))
+
+
+def _value(measure: str, total) -> Value:
+    return int(total) if measure == "count" else Decimal(int(total)).scaleb(-2)
+
+
+class DecisionCube:
+    """
+    Sums of decision measures by jurisdiction x decision x confidence level x grade.
+
+    Args:
+        capacity: Properties to allocate for up front
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._jurisdictions: Dict[str, int] = {}
+        self._cube = np.zeros((_CELLS, len(CUBE_MEASURES)), dtype=np.int64)
+        # The same cells summed over all jurisdictions, for portfolio-wide queries
+        self._rollup = np.zeros((_CELLS, len(CUBE_MEASURES)), dtype=np.int64)
+        # Per property: its cell and contribution, for subtracting on re-decide
+        self._rows: Dict[str, int] = {}
+        self._property_ids = []
+        self._cells = np.full(max(capacity, 1), _NO_CELL, dtype=np.int64)
+        self._contributions = np.zeros((max(capacity, 1), len(CUBE_MEASURES)), dtype=np.int64)
+
+    def __len__(self) -> int:
+        """Properties currently in the cube."""
+        return int(self._rollup[:, 0].sum())
+
+    def __contains__(self, property_id: str) -> bool:
+        row = self._rows.get(property_id)
+        return row is not None and self._cells[row] != _NO_CELL
+
+    @property
+    def jurisdictions(self) -> Tuple[str, ...]:
+        return tuple(self._jurisdictions)
+
+    def _jurisdiction(self, jurisdiction_id: str) -> int:
+        code = self._jurisdictions.get(jurisdiction_id)
+        if code is None:
+            code = self._jurisdictions[jurisdiction_id] = len(self._jurisdictions)
+            if len(self._cube) < len(self._jurisdictions) * _CELLS:
+                grown = np.zeros((2 * len(self._cube), len(CUBE_MEASURES)), dtype=np.int64)
+                grown[:len(self._cube)] = self._cube
+                self._cube = grown
+        return code
+
+    def _row(self, property_id: str) -> int:
+        row = self._rows.get(property_id)
+        if row is None:
+            row = self._rows[property_id] = len(self._property_ids)
+            self._property_ids.append(property_id)
+            if row == len(self._cells):
+                self._cells = np.concatenate([self._cells, np.full(row, _NO_CELL, dtype=np.int64)])
+                self._contributions = np.concatenate([self._contributions, np.zeros_like(self._contributions)])
+        return row
+
+    def upsert(
+        self,
+        property_id: str,
+        jurisdiction_id: str,
+        decision: DecisionResult,
+        confidence: ConfidenceResult,
+    ) -> None:
+        """Add a property, or replace the contribution of one already in the cube."""
+        jurisdiction = self._jurisdiction(jurisdiction_id)
+        cell = ((jurisdiction * len(DECISION_CODES) + DECISION_CODES.index(decision.decision.value))
+                * len(CONFIDENCE_LEVEL_CODES) + CONFIDENCE_LEVEL_CODES.index(decision.confidence_level)) \
+            * len(GRADE_CODES) + GRADE_CODES.index(confidence.reliability_grade)
+        contribution = [1] + [_cents(getattr(decision, measure)) for measure in _MONEY]
+
+        row = self._row(property_id)
+        old = self._cells[row]
+        if old != _NO_CELL:
+            self._cube[old] -= self._contributions[row]
+            self._rollup[old % _CELLS] -= self._contributions[row]
+        self._cube[cell] += contribution
+        self._rollup[cell % _CELLS] += contribution
+        self._cells[row] = cell
+        self._contributions[row] = contribution
+
+    def remove(self, property_id: str) -> None:
+        """Subtract a property's contribution (no-op if it is not in the cube)."""
+        row = self._rows.get(property_id)
+        if row is None or self._cells[row] == _NO_CELL:
+            return
+        self._cube[self._cells[row]] -= self._contributions[row]
+        self._rollup[self._cells[row] % _CELLS] -= self._contributions[row]
+        self._cells[row] = _NO_CELL
+        self._contributions[row] = 0
+
+    def refresh(self, tracker: RedecisionTracker, property_ids: Iterable[str]) -> None:
+        """
+        Bring properties in line with a RedecisionTracker's current results.
+
+        Call after update_priors with the jurisdiction's dependents. Properties
+        the tracker no longer tracks are removed.
+        """
+        for property_id in property_ids:
+            result = tracker.result(property_id)
+            if result is None:
+                self.remove(property_id)
+            else:
+                input_data = tracker.decision_input(property_id)
+                self.upsert(property_id, input_data.jurisdiction_priors.jurisdiction_id, result,
+                            input_data.confidence_result)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, DecisionResult, ConfidenceResult]]) -> "DecisionCube":
+        """Build a cube from (property_id, jurisdiction_id, decision, confidence) rows."""
+        cube = cls()
+        for row in rows:
+            cube.upsert(*row)
+        return cube
+
+    @classmethod
+    def from_store(cls, store: DecisionStore) -> "DecisionCube":
+        """Bulk-build a cube straight from a mapped store's record columns."""
+        records = store.records
+        size = len(records)
+        cube = cls(capacity=size)
+        string_codes, jurisdictions = np.unique(records["jurisdiction"], return_inverse=True)
+        for code in string_codes:
+            cube._jurisdiction(store.string(int(code)))
+
+        cells = ((jurisdictions.reshape(-1) * len(DECISION_CODES) + records["decision"])
+                 * len(CONFIDENCE_LEVEL_CODES) + records["confidence_level"]) \
+            * len(GRADE_CODES) + records["reliability_grade"]
+        contributions = np.ones((size, len(CUBE_MEASURES)), dtype=np.int64)
+        for column, measure in enumerate(_MONEY, start=1):
+            contributions[:, column] = np.rint(records[measure] * 100)
+
+        rows = np.array([cube._row(store.property_id(row)) for row in range(size)], dtype=np.int64)
+        # A property stored twice keeps its last record, as with repeated upserts
+        last = np.full(len(cube._property_ids), -1, dtype=np.int64)
+        last[rows] = np.arange(size)
+        cube._cells[:len(last)] = cells[last]
+        cube._contributions[:len(last)] = contributions[last]
+        np.add.at(cube._cube, cells[last], contributions[last])
+        cube._rollup[:] = cube._cube.reshape(-1, _CELLS, len(CUBE_MEASURES)).sum(axis=0)
+        return cube
+
+    # Queries
+
+    def _select(self, filters: Dict[str, Optional[Labels]], by_jurisdiction: bool = False) -> np.ndarray:
+        unknown = sorted(set(filters) - set(CUBE_DIMENSIONS))
+        if unknown:
+            raise ValueError(f"Not cube dimensions: {', '.join(unknown)}")
+        if filters.get("jurisdiction_id") is None and not by_jurisdiction:
+            cells = self._rollup
+        else:
+            cells = self._cube[:len(self._jurisdictions) * _CELLS]
+        cube = cells.reshape(-1, len(DECISION_CODES), len(CONFIDENCE_LEVEL_CODES), len(GRADE_CODES), len(CUBE_MEASURES))
+        for axis, name in enumerate(CUBE_DIMENSIONS):
+            labels = filters.get(name)
+            if labels is None:
+                continue
+            if isinstance(labels, str):
+                labels = (labels,)
+            if name == "jurisdiction_id":
+                indexes = [self._jurisdictions[label] for label in labels if label in self._jurisdictions]
+            else:
+                indexes = [_LABELS[name].index(label) for label in labels]
+            if len(indexes) == 1:
+                index = [slice(None)] * axis + [slice(indexes[0], indexes[0] + 1)]
+                cube = cube[tuple(index)]
+            else:
+                cube = cube.take(indexes, axis=axis)
+        return cube
+
+    def totals(self, **filters: Optional[Labels]) -> Dict[str, Value]:
+        """
+        Every measure summed over the cells matching the filters.
+
+        Args:
+            **filters: jurisdiction_id, decision, confidence_level and/or
+                reliability_grade, each a label or iterable of labels
+
+        Returns:
+            measure -> count (int) or amount (Decimal, cents)
+        """
+        sums = self._select(filters).sum(axis=(0, 1, 2, 3))
+        return {measure: _value(measure, total) for measure, total in zip(CUBE_MEASURES, sums.tolist())}
+
+    def total(self, measure: str, **filters: Optional[Labels]) -> Value:
+        """One measure summed over the cells matching the filters."""
+        if measure not in CUBE_MEASURES:
+            raise ValueError(f"Not a cube measure: {measure}")
+        return _value(measure, self._select(filters)[..., CUBE_MEASURES.index(measure)].sum())
+
+    def breakdown(self, dimension: str, measure: str = "count", **filters: Optional[Labels]) -> Dict[str, Value]:
+        """
+        One measure by the labels of one dimension.
+
+        Returns:
+            label -> total, for every label of the dimension matching the filters
+        """
+        if dimension not in CUBE_DIMENSIONS:
+            raise ValueError(f"Not a cube dimension: {dimension}")
+        if measure not in CUBE_MEASURES:
+            raise ValueError(f"Not a cube measure: {measure}")
+        axis = CUBE_DIMENSIONS.index(dimension)
+        labels = self.jurisdictions if dimension == "jurisdiction_id" else _LABELS[dimension]
+        selected = filters.get(dimension)
+        if selected is not None:
+            selected = {selected} if isinstance(selected, str) else set(selected)
+        # Sum over the other dimensions, keeping every label of this one
+        sums = self._select(dict(filters, **{dimension: None}), by_jurisdiction=axis == 0)
+        sums = sums[..., CUBE_MEASURES.index(measure)].sum(axis=tuple(other for other in range(len(CUBE_DIMENSIONS)) if other != axis))
+        return {
+            label: _value(measure, total)
+            for label, total in zip(labels, sums.tolist())
+            if selected is None or label in selected
+        }
+
+    # Persistence
+
+    def save(self, path_or_file: Union[str, BinaryIO]) -> None:
+        """Write the cube, with the per-property state needed to keep updating it."""
+        if isinstance(path_or_file, str):
+            with open(path_or_file, "wb") as handle:
+                self.save(handle)
+            return
+        size = len(self._property_ids)
+        np.savez(
+            path_or_file,
+            format_version=np.array(FORMAT_VERSION),
+            jurisdictions=np.array(list(self._jurisdictions), dtype=str),
+            cube=self._cube[:len(self._jurisdictions) * _CELLS],
+            property_ids=np.array(self._property_ids, dtype=str),
+            cells=self._cells[:size],
+            contributions=self._contributions[:size],
+        )
+
+    @classmethod
+    def load(cls, path_or_file: Union[str, BinaryIO]) -> "DecisionCube":
+        """Read a cube written by save()."""
+        with np.load(path_or_file, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported decision cube version: {version}")
+            property_ids = data["property_ids"].tolist()
+            cube = cls(capacity=len(property_ids))
+            for jurisdiction_id in data["jurisdictions"].tolist():
+                cube._jurisdiction(jurisdiction_id)
+            cube._cube[:len(data["cube"])] = data["cube"]
+            cube._rollup[:] = cube._cube.reshape(-1, _CELLS, len(CUBE_MEASURES)).sum(axis=0)
+            cube._property_ids = property_ids
+            cube._rows = {property_id: row for row, property_id in enumerate(property_ids)}
+            cube._cells[:len(property_ids)] = data["cells"]
+            cube._contributions[:len(property_ids)] = data["contributions"]
+        return cube
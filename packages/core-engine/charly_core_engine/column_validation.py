@@ -0,0 +1,483 @@
+"""Column-wise validation of batch engine inputs.
+
+Building one pydantic model per row costs microseconds per row, and the
+first bad row raises. `validate_confidence_columns` and
+`validate_decision_columns` check the same constraints over whole numpy
+columns in one pass and report every failure: a mask of valid rows and a
+compact error table of (row, rule) pairs, where each rule carries
+pydantic's error type, location and message. `validate_model_columns` runs the
+numeric field checks for any other pydantic model.
+
+Bounds (gt/ge/lt/le), defaults and required fields are read from the model
+fields; the models' field validators (tax rate cap, market conditions,
+other estimates) are mirrored here. As in pydantic, each field of a row
+reports at most its first failure.
+
+Numbers are compared in float64. For int and float input this agrees with
+the models' Decimal(str(value)) coercion; numeric strings beyond float64
+precision are rounded before comparison. None marks a value the row did
+not supply: the field default applies, or a `missing` error if the field
+is required.
+"""
+
+import re
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+from annotated_types import Ge, Gt, Le, Lt
+from pydantic import BaseModel
+
+from .confidence import MARKET_ADJUSTMENTS, ConfidenceInput, ValuationMethod
+from .decision import DecisionInput
+
+
+ColumnLike = Union[float, int, str, Sequence]
+Loc = Tuple[Union[str, int], ...]
+
+# Most other estimates ConfidenceInput accepts
+MAX_OTHER_ESTIMATES = 10
+
+_METHOD_VALUES = [m.value for m in ValuationMethod]
+_METHODS_EXPECTED = ", ".join(f"'{m}'" for m in _METHOD_VALUES[:-1]) + f" or '{_METHOD_VALUES[-1]}'"
+
+Check = Tuple[Callable[[np.ndarray], np.ndarray], str]
+
+# Mirror of DecisionInput's field validator: (bad-value predicate, message)
+_DECISION_CHECKS: Mapping[str, Tuple[Check, ...]] = {
+    "tax_rate": ((lambda v: v > 0.10, "Tax rate seems unreasonably high (>10%)"),),
+}
+
+# annotated_types constraint -> (attribute, passing comparison, error type, wording)
+_BOUNDS = {
+    Gt: ("gt", np.greater, "greater_than", "greater than"),
+    Ge: ("ge", np.greater_equal, "greater_than_equal", "greater than or equal to"),
+    Lt: ("lt", np.less, "less_than", "less than"),
+    Le: ("le", np.less_equal, "less_than_equal", "less than or equal to"),
+}
+
+_INT_STRING = re.compile(r"\s*([+-]?[\d_]+)(?:\.0*)?\s*")
+
+_PARSE_ERRORS = {
+    "decimal": ("decimal_parsing", "Input should be a valid decimal"),
+    "int": ("int_parsing", "Input should be a valid integer, unable to parse string as an integer"),
+}
+
+
+@dataclass(frozen=True)
+class ErrorRule:
+    """One kind of validation failure, shared by every row that has it."""
+
+    loc: Loc
+    type: str
+    msg: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, "loc": self.loc, "msg": self.msg}
+
+
+class ColumnValidationReport:
+    """
+    Outcome of validating a batch column-wise.
+
+    Attributes:
+        valid: Boolean mask, True for rows that pass every check
+        error_rows: Row of each error, ascending
+        error_rules: Index into `rules` of each error, aligned with error_rows
+        rules: Distinct failures seen in the batch
+    """
+
+    def __init__(self, size: int, rules: Sequence[ErrorRule], error_rows: np.ndarray, error_rules: np.ndarray):
+        self.rules: Tuple[ErrorRule, ...] = tuple(rules)
+        self.error_rows = error_rows
+        self.error_rules = error_rules
+        self.valid = np.ones(size, dtype=bool)
+        self.valid[error_rows] = False
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    @property
+    def valid_rows(self) -> np.ndarray:
+        """Indexes of the valid rows."""
+        return np.flatnonzero(self.valid)
+
+    @property
+    def invalid_rows(self) -> np.ndarray:
+        """Indexes of rows with at least one error."""
+        return np.flatnonzero(~self.valid)
+
+    def errors(self, row: int) -> List[Dict[str, Any]]:
+        """Pydantic-style error dicts (type, loc, msg) for one row."""
+        start, end = np.searchsorted(self.error_rows, [row, row + 1])
+        return [self.rules[rule].as_dict() for rule in self.error_rules[start:end]]
+
+    def iter_errors(self) -> Iterator[Tuple[int, ErrorRule]]:
+        """(row, rule) for every error, in row order."""
+        for row, rule in zip(self.error_rows.tolist(), self.error_rules.tolist()):
+            yield row, self.rules[rule]
+
+    def summary(self) -> Dict[ErrorRule, int]:
+        """Number of rows failing each rule."""
+        counts = np.bincount(self.error_rules, minlength=len(self.rules))
+        return {rule: int(count) for rule, count in zip(self.rules, counts)}
+
+
+@dataclass(frozen=True)
+class _Place:
+    """Where a column's entries belong: the batch row of each entry and the error location."""
+
+    rows: np.ndarray
+    loc: Loc
+    positions: Optional[np.ndarray] = None  # List index of each entry, for ragged columns
+    suffix: Loc = ()  # Location within a list element
+
+    def split(self, entries: np.ndarray) -> Iterator[Tuple[np.ndarray, Loc]]:
+        """Rows and location of `entries`, grouped by list index for ragged columns."""
+        if self.positions is None:
+            yield self.rows[entries], self.loc
+            return
+        positions = self.positions[entries]
+        for position in np.unique(positions):
+            yield self.rows[entries[positions == position]], self.loc + (int(position),) + self.suffix
+
+
+class _Errors:
+    """Collects (rows, rule) pairs and builds the report."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.rules: Dict[ErrorRule, int] = {}
+        self.rows: List[np.ndarray] = []
+        self.codes: List[np.ndarray] = []
+
+    def add(self, rows: np.ndarray, loc: Loc, type: str, msg: str) -> None:
+        if len(rows) == 0:
+            return
+        code = self.rules.setdefault(ErrorRule(loc, type, msg), len(self.rules))
+        self.rows.append(rows)
+        self.codes.append(np.full(len(rows), code, dtype=np.int32))
+
+    def add_mask(self, mask: np.ndarray, place: "_Place", type: str, msg: str) -> None:
+        for rows, loc in place.split(np.flatnonzero(mask)):
+            self.add(rows, loc, type, msg)
+
+    def report(self) -> ColumnValidationReport:
+        if not self.rows:
+            empty = np.empty(0, dtype=np.int64)
+            return ColumnValidationReport(self.size, [], empty, empty.astype(np.int32))
+        rows = np.concatenate(self.rows).astype(np.int64)
+        codes = np.concatenate(self.codes)
+        # Within a row, order errors like pydantic: by field (fields are
+        # checked in model order), then by list index
+        fields = list(dict.fromkeys(rule.loc[0] for rule in self.rules))
+        keys = [(fields.index(rule.loc[0]), rule.loc[1:]) for rule in self.rules]
+        rank = np.empty(len(keys), dtype=np.int64)
+        rank[sorted(range(len(keys)), key=keys.__getitem__)] = np.arange(len(keys))
+        order = np.lexsort((rank[codes], rows))
+        return ColumnValidationReport(self.size, list(self.rules), rows[order], codes[order])
+
+
+def _is_column(value: Any) -> bool:
+    return isinstance(value, (list, tuple)) or (isinstance(value, np.ndarray) and value.ndim > 0)
+
+
+def _batch_size(columns: Mapping[str, Any], ragged: Sequence[Optional[Sequence[int]]]) -> int:
+    sizes = {len(value) for value in columns.values() if _is_column(value)}
+    sizes |= {len(offsets) - 1 for offsets in ragged if offsets is not None}
+    if len(sizes) > 1:
+        raise ValueError("All columns must have the same length")
+    return sizes.pop() if sizes else 1
+
+
+def _broadcast(values: Any, size: int) -> np.ndarray:
+    """Column as an array; scalars repeat for every row."""
+    if isinstance(values, np.ndarray) and values.ndim > 0:
+        return values
+    if not isinstance(values, (list, tuple)):
+        array = np.empty(size, dtype=object)
+        array[:] = [values] * size
+        return np.asarray(array.tolist()) if _plain(values) else array
+    if all(_plain(value) for value in values):
+        return np.asarray(values)
+    # None, enum members and nested values stay Python objects
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _plain(value: Any) -> bool:
+    return isinstance(value, (int, float, str)) and not isinstance(value, Enum)
+
+
+def _parse_number(value: Any, kind: str) -> float:
+    if kind == "int" and isinstance(value, str):
+        # Like pydantic: integer strings, optionally with a zero fraction
+        match = _INT_STRING.fullmatch(value)
+        if match is None:
+            raise ValueError(value)
+        return float(int(match.group(1)))
+    return float(value)
+
+
+def _parse_numbers(values: np.ndarray, kind: str = "decimal") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """float64 values plus masks of missing (None) and unparsable entries."""
+    none = np.zeros(len(values), dtype=bool)
+    if values.dtype.kind in "biuf":
+        return values.astype(np.float64), none, none
+    try:
+        if values.dtype.kind == "U" and kind == "int":
+            return values.astype(np.int64).astype(np.float64), none, none
+        if values.dtype.kind == "U":
+            return values.astype(np.float64), none, none
+    except (OverflowError, ValueError):
+        pass
+    numbers = np.full(len(values), np.nan)
+    missing = none.copy()
+    unparsable = none.copy()
+    for i, value in enumerate(values.tolist()):
+        if value is None:
+            missing[i] = True
+            continue
+        try:
+            numbers[i] = _parse_number(value, kind)
+        except (TypeError, ValueError):
+            unparsable[i] = True
+    return numbers, missing, unparsable
+
+
+def _check_numbers(
+    errors: _Errors,
+    values: np.ndarray,
+    place: _Place,
+    kind: str,
+    required: bool,
+    metadata: Sequence[Any] = (),
+    checks: Sequence[Check] = (),
+) -> np.ndarray:
+    """Check one numeric column, recording failures; returns the mask of entries that passed."""
+    numbers, missing, unparsable = _parse_numbers(values, kind)
+    ok = ~(missing | unparsable)
+
+    def fail(mask: np.ndarray, error_type: str, msg: str) -> None:
+        errors.add_mask(mask, place, error_type, msg)
+        ok[mask] = False
+
+    if required:
+        fail(missing, "missing", "Field required")
+    fail(unparsable, *_PARSE_ERRORS[kind])
+    fail(ok & ~np.isfinite(numbers), "finite_number", "Input should be a finite number")
+    if kind == "int":
+        fail(ok & (numbers != np.trunc(numbers)), "int_from_float",
+             "Input should be a valid integer, got a number with a fractional part")
+
+    with np.errstate(invalid="ignore"):
+        for constraint in metadata:
+            bound = _BOUNDS.get(type(constraint))
+            if bound is not None:
+                attr, passes, error_type, words = bound
+                limit = getattr(constraint, attr)
+                fail(ok & ~passes(numbers, float(limit)), error_type, f"Input should be {words} {limit}")
+        for is_bad, message in checks:
+            fail(ok & is_bad(numbers), "value_error", f"Value error, {message}")
+    return ok if required else ok | missing
+
+
+def _check_model_column(
+    errors: _Errors,
+    model: type,
+    name: str,
+    values: Optional[ColumnLike],
+    checks: Optional[Mapping[str, Tuple[Check, ...]]] = None,
+) -> None:
+    field = model.model_fields[name]
+    if values is None:
+        if field.is_required():
+            raise ValueError(f"Missing required column: {name}")
+        return
+    kind = "int" if field.annotation is int else "decimal"
+    _check_numbers(
+        errors, _broadcast(values, errors.size), _Place(np.arange(errors.size), (name,)), kind,
+        field.is_required(), field.metadata, (checks or {}).get(name, ()),
+    )
+
+
+def _labels(values: Any, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """String labels (enum members unwrapped) and the mask of None entries."""
+    array = _broadcast(values, size)
+    if array.dtype != object:
+        return array.astype(str), np.zeros(len(array), dtype=bool)
+    items = array.tolist()
+    missing = np.array([item is None for item in items], dtype=bool)
+    return np.array([str(getattr(item, "value", item)) for item in items], dtype=str), missing
+
+
+def _isin(labels: np.ndarray, choices: Sequence[str]) -> np.ndarray:
+    # A few equality passes beat np.isin's sort for short choice lists
+    known = np.zeros(len(labels), dtype=bool)
+    for choice in choices:
+        known |= labels == choice
+    return known
+
+
+def _check_methods(errors: _Errors, labels: np.ndarray, missing: np.ndarray, place: _Place) -> np.ndarray:
+    """Check ValuationMethod labels; returns the mask of entries that passed."""
+    known = _isin(labels, _METHOD_VALUES) & ~missing
+    errors.add_mask(missing, place, "missing", "Field required")
+    errors.add_mask(~known & ~missing, place, "enum", f"Input should be {_METHODS_EXPECTED}")
+    return known
+
+
+def _ragged_rows(offsets: np.ndarray) -> np.ndarray:
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def _check_offsets(offsets: Sequence[int], size: int, values_length: int, name: str) -> np.ndarray:
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if (len(offsets) != size + 1 or offsets[0] != 0 or offsets[-1] != values_length
+            or np.any(np.diff(offsets) < 0)):
+        raise ValueError(f"{name} must run from 0 to the number of values in n + 1 steps")
+    return offsets
+
+
+def _ragged_place(offsets: np.ndarray, loc: Loc, suffix: Loc = ()) -> _Place:
+    rows = _ragged_rows(offsets)
+    return _Place(rows, loc, np.arange(len(rows)) - offsets[rows], suffix)
+
+
+def validate_confidence_columns(
+    columns: Mapping[str, ColumnLike],
+    comparable_offsets: Optional[Sequence[int]] = None,
+    comparable_prices: Optional[Sequence[float]] = None,
+    other_estimate_offsets: Optional[Sequence[int]] = None,
+    other_estimate_values: Optional[Sequence[float]] = None,
+    other_estimate_methods: Optional[Sequence[str]] = None,
+) -> ColumnValidationReport:
+    """
+    Validate ConfidenceInput fields column-wise.
+
+    `columns` maps field names to one value per row (or a scalar for every
+    row); absent optional fields take their defaults. List fields are
+    ragged: row i's comparable sales are
+    `comparable_prices[comparable_offsets[i]:comparable_offsets[i + 1]]`,
+    and its other estimates pair `other_estimate_values` with
+    `other_estimate_methods` over `other_estimate_offsets` likewise.
+
+    Args:
+        columns: Scalar ConfidenceInput fields by name
+        comparable_offsets: Row offsets into comparable_prices (length n + 1)
+        comparable_prices: Concatenated comparable sale prices
+        other_estimate_offsets: Row offsets into the other estimate arrays
+        other_estimate_values: Concatenated other estimate values
+        other_estimate_methods: ValuationMethod of each other estimate
+
+    Returns:
+        ColumnValidationReport with the valid-row mask and error table
+
+    Raises:
+        ValueError: If columns are misaligned or a required column is absent
+    """
+    size = _batch_size(columns, [comparable_offsets, other_estimate_offsets])
+    errors = _Errors(size)
+
+    _check_model_column(errors, ConfidenceInput, "estimated_market_value", columns.get("estimated_market_value"))
+
+    if "valuation_method" not in columns:
+        raise ValueError("Missing required column: valuation_method")
+    _check_methods(errors, *_labels(columns["valuation_method"], size), _Place(np.arange(size), ("valuation_method",)))
+
+    if comparable_offsets is not None:
+        offsets = _check_offsets(comparable_offsets, size, len(comparable_prices), "comparable_offsets")
+        place = _ragged_place(offsets, ("comparable_sales",))
+        _check_numbers(errors, _broadcast(comparable_prices, len(place.rows)), place, "decimal", True)
+
+    if other_estimate_offsets is not None:
+        offsets = _check_offsets(other_estimate_offsets, size, len(other_estimate_values), "other_estimate_offsets")
+        if len(other_estimate_methods) != len(other_estimate_values):
+            raise ValueError("other_estimate_methods must align with other_estimate_values")
+        values = _broadcast(other_estimate_values, len(other_estimate_values))
+        value_place = _ragged_place(offsets, ("other_estimates",), (0,))
+        parsed = _check_numbers(errors, values, value_place, "decimal", True)
+        parsed &= _check_methods(
+            errors, *_labels(other_estimate_methods, len(values)), replace(value_place, suffix=(1,))
+        )
+        # The field validator only runs on lists whose elements all parsed
+        element_rows = value_place.rows
+        all_parsed = np.bincount(element_rows, weights=~parsed, minlength=size) == 0
+        too_many = all_parsed & (np.diff(offsets) > MAX_OTHER_ESTIMATES)
+        with np.errstate(invalid="ignore"):
+            non_positive = ~(_parse_numbers(values)[0] > 0)
+        any_non_positive = np.bincount(element_rows, weights=non_positive, minlength=size) > 0
+        place = _Place(np.arange(size), ("other_estimates",))
+        errors.add_mask(too_many, place, "value_error",
+                        f"Value error, Too many other estimates (max {MAX_OTHER_ESTIMATES})")
+        errors.add_mask(all_parsed & ~too_many & any_non_positive, place, "value_error",
+                        "Value error, All estimates must be positive")
+
+    _check_model_column(errors, ConfidenceInput, "data_quality_score", columns.get("data_quality_score"))
+
+    if "market_conditions" in columns:
+        labels, missing = _labels(columns["market_conditions"], size)
+        known = _isin(labels, MARKET_ADJUSTMENTS) | missing
+        # Only labels not already lowercase-valid pay for lower()
+        unknown = np.flatnonzero(~known)
+        known[unknown] = _isin(np.char.lower(labels[unknown]), MARKET_ADJUSTMENTS)
+        errors.add_mask(~known, _Place(np.arange(size), ("market_conditions",)), "value_error",
+                        f"Value error, Market conditions must be one of: {set(MARKET_ADJUSTMENTS)}")
+
+    for name in ("property_uniqueness", "days_since_valuation"):
+        _check_model_column(errors, ConfidenceInput, name, columns.get(name))
+    return errors.report()
+
+
+def validate_decision_columns(columns: Mapping[str, ColumnLike]) -> ColumnValidationReport:
+    """
+    Validate the scalar DecisionInput fields column-wise.
+
+    The nested confidence_result and jurisdiction_priors are not columns;
+    check the confidence columns with validate_confidence_columns.
+
+    Args:
+        columns: DecisionInput fields by name, one value per row or a scalar
+
+    Returns:
+        ColumnValidationReport with the valid-row mask and error table
+
+    Raises:
+        ValueError: If columns are misaligned or a required column is absent
+    """
+    return validate_model_columns(DecisionInput, columns, _DECISION_CHECKS)
+
+
+def validate_model_columns(
+    model: Type[BaseModel],
+    columns: Mapping[str, ColumnLike],
+    checks: Optional[Mapping[str, Tuple[Check, ...]]] = None,
+) -> ColumnValidationReport:
+    """
+    Validate the numeric fields of any pydantic model column-wise.
+
+    Each int or Decimal field is checked against its bounds and required
+    flag, then against `checks`, the mirror of the model's own field
+    validators. Flags and nested models have no column form and are skipped.
+
+    Args:
+        model: Pydantic model whose fields the columns hold
+        columns: Fields by name, one value per row or a scalar for every row;
+            absent optional fields take their defaults
+        checks: (bad-value predicate, message) pairs by field name
+
+    Returns:
+        ColumnValidationReport with the valid-row mask and error table
+
+    Raises:
+        ValueError: If columns are misaligned or a required column is absent
+    """
+    errors = _Errors(_batch_size(columns, []))
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if annotation is bool or (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+            continue
+        _check_model_column(errors, model, name, columns.get(name), checks)
+    return errors.report()
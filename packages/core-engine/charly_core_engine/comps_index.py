@@ -0,0 +1,250 @@
+"""Comparable-sales candidate index for feeding ConfidenceInput.
+
+Sales are bucketed by property type and a uniform spatial grid (an
+equirectangular projection in kilometres, centered on the sales' middle
+latitude), and kept sorted by sale date
+inside each cell. A k-nearest query walks rings of cells outward from the
+subject, applies the date window with a binary search per cell and the
+size tolerance per candidate, and stops as soon as no unvisited cell can
+hold a closer sale.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from .rounding import round_currency
+
+
+_KM_PER_DEGREE_LAT = 110.574
+_KM_PER_DEGREE_LON = 111.320
+
+# Cell coordinates are packed into one int64 key: type | cx | cy
+_CELL_BITS = 21
+_CELL_OFFSET = 1 << (_CELL_BITS - 1)
+_MIN_CELL_KM = 0.05
+
+DateLike = Union[str, date, np.datetime64]
+
+
+def _project(latitude: np.ndarray, longitude: np.ndarray, reference_latitude: float):
+    # One cosine for every point: per-point cosines shear the grid, so
+    # distances between points at different latitudes come out wrong
+    x = longitude * _KM_PER_DEGREE_LON * np.cos(np.radians(reference_latitude))
+    y = latitude * _KM_PER_DEGREE_LAT
+    return x, y
+
+
+def _pack(type_code, cx, cy):
+    return (
+        (np.asarray(type_code, dtype=np.int64) << (2 * _CELL_BITS))
+        | ((cx + _CELL_OFFSET).astype(np.int64) << _CELL_BITS)
+        | (cy + _CELL_OFFSET).astype(np.int64)
+    )
+
+
+class ComparableSalesIndex:
+    """
+    Grid + date index over a sales table for k-nearest comparable lookups.
+
+        index = ComparableSalesIndex(lat, lon, sqft, types, dates, prices)
+        comps = index.comparable_sales(
+            32.78, -96.80, "office", k=6,
+            building_area=12000, as_of="2024-01-01", max_age_days=540,
+        )
+        ConfidenceInput(..., comparable_sales=comps)
+
+    Args:
+        latitude, longitude: Sale locations in degrees
+        building_area: Building size (any consistent unit)
+        property_type: Property type label per sale
+        sale_date: Sale dates (anything numpy converts to datetime64[D])
+        price: Sale prices
+        cell_km: Grid cell edge length; roughly the typical comp search radius
+    """
+
+    def __init__(
+        self,
+        latitude: Sequence[float],
+        longitude: Sequence[float],
+        building_area: Sequence[float],
+        property_type: Sequence[str],
+        sale_date: Sequence[DateLike],
+        price: Sequence[float],
+        cell_km: float = 1.0,
+    ):
+        if cell_km < _MIN_CELL_KM:
+            raise ValueError(f"cell_km must be at least {_MIN_CELL_KM}")
+
+        latitude = np.asarray(latitude, dtype=np.float64)
+        longitude = np.asarray(longitude, dtype=np.float64)
+        columns = [
+            np.asarray(building_area, dtype=np.float64),
+            np.asarray(property_type),
+            np.asarray(sale_date, dtype="datetime64[D]"),
+            np.asarray(price, dtype=np.float64),
+        ]
+        if any(len(column) != len(latitude) for column in [longitude] + columns):
+            raise ValueError("All sales columns must have the same length")
+
+        self.cell_km = cell_km
+        # Projection center: the middle of the sales' latitude range
+        self.reference_latitude = float((latitude.min() + latitude.max()) / 2) if len(latitude) else 0.0
+        x, y = _project(latitude, longitude, self.reference_latitude)
+        cx = np.floor(x / cell_km).astype(np.int64)
+        cy = np.floor(y / cell_km).astype(np.int64)
+
+        self._types, type_codes = np.unique(columns[1], return_inverse=True)
+        dates = columns[2].astype(np.int64)
+        keys = _pack(type_codes, cx, cy)
+
+        # Sort by cell, then by sale date within each cell
+        order = np.lexsort((dates, keys))
+        self._rows = order
+        self._x = x[order]
+        self._y = y[order]
+        self._area = columns[0][order]
+        self._dates = dates[order]
+        self._prices = columns[3]  # Original row order, for price and date lookups
+        self._sale_dates = columns[2]
+
+        sorted_keys = keys[order]
+        self._cell_keys, self._cell_starts = np.unique(sorted_keys, return_index=True)
+        self._cell_ends = np.append(self._cell_starts[1:], len(sorted_keys)).astype(np.int64)
+
+        # Per-type grid extent bounds the ring walk
+        self._extent = {}
+        for code in range(len(self._types)):
+            mask = type_codes == code
+            self._extent[code] = (cx[mask].min(), cx[mask].max(), cy[mask].min(), cy[mask].max())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _type_code(self, property_type: str) -> Optional[int]:
+        code = int(np.searchsorted(self._types, property_type))
+        if code < len(self._types) and self._types[code] == property_type:
+            return code
+        return None
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        property_type: str,
+        k: int = 6,
+        building_area: Optional[float] = None,
+        size_tolerance: float = 0.25,
+        as_of: Optional[DateLike] = None,
+        max_age_days: Optional[int] = None,
+        max_distance_km: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Row numbers (in the original table) of the k nearest qualifying sales.
+
+        Args:
+            latitude, longitude: Subject location
+            property_type: Only sales of this type qualify
+            k: Number of comparables wanted
+            building_area: Subject size; when given, sales must be within
+                `size_tolerance` (fractional) of it
+            as_of: Valuation date; sales after it are excluded
+            max_age_days: With `as_of`, exclude sales older than this
+            max_distance_km: Exclude sales farther than this
+
+        Returns:
+            Row numbers ordered nearest first (fewer than k if not enough qualify)
+        """
+        if k < 1:
+            raise ValueError("k must be positive")
+        code = self._type_code(property_type)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+
+        first_day, last_day = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+        if as_of is not None:
+            last_day = int(np.datetime64(as_of, "D").astype(np.int64))
+            if max_age_days is not None:
+                first_day = last_day - max_age_days
+
+        qx, qy = _project(np.float64(latitude), np.float64(longitude), self.reference_latitude)
+        qcx = int(np.floor(qx / self.cell_km))
+        qcy = int(np.floor(qy / self.cell_km))
+        min_cx, max_cx, min_cy, max_cy = self._extent[code]
+        max_ring = max(qcx - min_cx, max_cx - qcx, qcy - min_cy, max_cy - qcy)
+        if max_distance_km is not None:
+            max_ring = min(max_ring, int(np.ceil(max_distance_km / self.cell_km)))
+
+        found_positions: List[np.ndarray] = []
+        found_distances: List[np.ndarray] = []
+        found = 0
+        for ring in range(max_ring + 1):
+            positions = self._ring_candidates(code, qcx, qcy, ring, first_day, last_day)
+            if len(positions):
+                if building_area is not None:
+                    area = self._area[positions]
+                    positions = positions[np.abs(area - building_area) <= size_tolerance * building_area]
+                distances = np.hypot(self._x[positions] - qx, self._y[positions] - qy)
+                if max_distance_km is not None:
+                    keep = distances <= max_distance_km
+                    positions, distances = positions[keep], distances[keep]
+                found_positions.append(positions)
+                found_distances.append(distances)
+                found += len(positions)
+
+            # Every unvisited cell is at least ring * cell_km away
+            if found >= k:
+                distances = np.concatenate(found_distances)
+                if np.partition(distances, k - 1)[k - 1] <= ring * self.cell_km:
+                    break
+
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        positions = np.concatenate(found_positions)
+        distances = np.concatenate(found_distances)
+        best = np.argsort(distances, kind="stable")[:k]
+        return self._rows[positions[best]]
+
+    def _ring_candidates(self, code: int, qcx: int, qcy: int, ring: int, first_day: int, last_day: int) -> np.ndarray:
+        if ring == 0:
+            cx = np.array([qcx])
+            cy = np.array([qcy])
+        else:
+            span = np.arange(-ring, ring + 1)
+            inner = span[1:-1]
+            cx = np.concatenate([span, span, np.full(len(inner), -ring), np.full(len(inner), ring)]) + qcx
+            cy = np.concatenate([np.full(len(span), -ring), np.full(len(span), ring), inner, inner]) + qcy
+
+        keys = _pack(code, cx, cy)
+        slots = np.searchsorted(self._cell_keys, keys)
+        inside = slots < len(self._cell_keys)
+        # A missing key lands on the next key, possibly another cell of this ring: match exactly
+        slots = slots[inside][self._cell_keys[slots[inside]] == keys[inside]]
+
+        chunks = []
+        for slot in slots:
+            start, end = self._cell_starts[slot], self._cell_ends[slot]
+            dates = self._dates[start:end]
+            lo = start + np.searchsorted(dates, first_day, side="left")
+            hi = start + np.searchsorted(dates, last_day, side="right")
+            if hi > lo:
+                chunks.append(np.arange(lo, hi))
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+    def prices(self, rows: Sequence[int]) -> List[Decimal]:
+        """Sale prices for table rows as cent-rounded Decimals."""
+        return [round_currency(Decimal(repr(float(self._prices[row])))) for row in rows]
+
+    def sale_dates(self, rows: Sequence[int]) -> np.ndarray:
+        """Sale dates for table rows, e.g. for MarketIndexStore time adjustment."""
+        return self._sale_dates[np.asarray(rows, dtype=np.int64)]
+
+    def comparable_sales(self, *args, **kwargs) -> List[Decimal]:
+        """
+        Prices of the k nearest qualifying sales, ready for ConfidenceInput.
+
+        Accepts the same arguments as `nearest`.
+        """
+        return self.prices(self.nearest(*args, **kwargs))
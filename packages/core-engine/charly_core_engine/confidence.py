@@ -1,10 +1,14 @@
 """Confidence band calculations for property valuations."""
 
-from decimal import Decimal, ROUND_HALF_UP
-from typing import List, Optional, Tuple
-from pydantic import BaseModel, Field, validator
+from decimal import Decimal
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
+from .decimal_fields import CoercedDecimal, JsonDecimal
+from .rounding import THOUSANDTHS, half_up, round_currency
+
 
 class ValuationMethod(str, Enum):
     """Methods used for property valuation."""
@@ -15,10 +19,61 @@ class ValuationMethod(str, Enum):
     TAX_ASSESSOR = "tax_assessor"
 
 
+# Base confidence band by valuation method
+METHOD_BANDS: Mapping[ValuationMethod, Decimal] = MappingProxyType({
+    ValuationMethod.SALES_COMPARISON: Decimal('0.10'),    # ±10% for good comps
+    ValuationMethod.INCOME_APPROACH: Decimal('0.15'),     # ±15% for income approach
+    ValuationMethod.COST_APPROACH: Decimal('0.20'),       # ±20% for cost approach
+    ValuationMethod.AUTOMATED_VALUATION: Decimal('0.25'), # ±25% for AVMs
+    ValuationMethod.TAX_ASSESSOR: Decimal('0.30')         # ±30% for assessor estimates
+})
+
+# Band widening by market conditions
+MARKET_ADJUSTMENTS: Mapping[str, Decimal] = MappingProxyType({
+    "stable": Decimal('0.0'),
+    "improving": Decimal('0.05'),  # More uncertainty in rising markets
+    "declining": Decimal('0.08'),  # More uncertainty in falling markets
+    "volatile": Decimal('0.12')    # High uncertainty in volatile markets
+})
+
+# Final band limits (5% to 50%)
+MIN_BAND = Decimal('0.05')
+MAX_BAND = Decimal('0.50')
+
+# Minimum confidence score for each reliability grade, best first (else "D")
+GRADE_THRESHOLDS: Tuple[Tuple[Decimal, str], ...] = (
+    (Decimal('0.8'), "A"),
+    (Decimal('0.6'), "B"),
+    (Decimal('0.4'), "C"),
+)
+
+# Method consistency once CV exceeds each limit, widest first
+_CONSISTENCY_STEPS: Tuple[Tuple[Decimal, Decimal], ...] = (
+    (Decimal('0.3'), Decimal('0.3')),  # >30% variation
+    (Decimal('0.2'), Decimal('0.6')),  # >20% variation
+    (Decimal('0.1'), Decimal('0.8')),  # >10% variation
+)
+
+_ZERO = Decimal('0.0')
+_ONE = Decimal('1.0')
+_QUALITY_WEIGHT = Decimal('0.15')
+_UNIQUENESS_WEIGHT = Decimal('0.10')
+_DAYS_PER_YEAR = Decimal('365')
+_AGE_RATE_PER_YEAR = Decimal('0.01')
+_MAX_AGE_ADJUSTMENT = Decimal('0.15')
+_DISPERSION_WEIGHT = Decimal('0.5')
+_BAND_RANGE = MAX_BAND - MIN_BAND
+_LOW_DATA_QUALITY = Decimal('0.6')
+_HIGH_UNIQUENESS = Decimal('0.7')
+_HIGH_DISPERSION = Decimal('0.25')
+
+_round_percentage = half_up(THOUSANDTHS)  # 3 decimal places
+
+
 class ConfidenceInput(BaseModel):
     """Input data for confidence band calculation."""
     
-    estimated_market_value: Decimal = Field(..., gt=0, description="Primary estimated market value")
+    estimated_market_value: CoercedDecimal = Field(..., gt=0, description="Primary estimated market value")
     valuation_method: ValuationMethod = Field(..., description="Primary valuation method used")
     
     # Supporting valuations (optional)
@@ -26,22 +81,26 @@ class ConfidenceInput(BaseModel):
     other_estimates: List[Tuple[Decimal, ValuationMethod]] = Field(default_factory=list, description="Other valuation estimates")
     
     # Quality indicators
-    data_quality_score: Decimal = Field(0.8, ge=0, le=1, description="Quality of underlying data (0-1)")
+    data_quality_score: CoercedDecimal = Field(Decimal('0.8'), ge=0, le=1, description="Quality of underlying data (0-1)")
     market_conditions: str = Field("stable", description="Market conditions: stable, improving, declining")
-    property_uniqueness: Decimal = Field(0.5, ge=0, le=1, description="Property uniqueness factor (0=common, 1=unique)")
+    property_uniqueness: CoercedDecimal = Field(Decimal('0.5'), ge=0, le=1, description="Property uniqueness factor (0=common, 1=unique)")
     
     # Temporal factors
     valuation_date: Optional[str] = Field(None, description="Valuation date (YYYY-MM-DD)")
     days_since_valuation: int = Field(0, ge=0, le=1095, description="Days since valuation performed")
     
-    @validator("market_conditions")
+    model_config = ConfigDict(defer_build=True)
+
+    @field_validator("market_conditions")
+    @classmethod
     def validate_market_conditions(cls, v):
         valid_conditions = {"stable", "improving", "declining", "volatile"}
         if v.lower() not in valid_conditions:
             raise ValueError(f"Market conditions must be one of: {valid_conditions}")
         return v.lower()
         
-    @validator("other_estimates")
+    @field_validator("other_estimates")
+    @classmethod
     def validate_other_estimates(cls, v):
         if len(v) > 10:  # Reasonable limit
             raise ValueError("Too many other estimates (max 10)")
@@ -49,38 +108,29 @@ class ConfidenceInput(BaseModel):
             if estimate <= 0:
                 raise ValueError("All estimates must be positive")
         return v
-        
-    @validator("*", pre=True)
-    def convert_to_decimal(cls, v):
-        if isinstance(v, (int, float, str)) and any(field in cls.__annotations__ for field in ['estimated_market_value', 'data_quality_score', 'property_uniqueness']):
-            return Decimal(str(v))
-        return v
 
 
 class ConfidenceResult(BaseModel):
     """Result of confidence band calculation."""
     
-    central_estimate: Decimal = Field(..., description="Central value estimate")
-    confidence_band_pct: Decimal = Field(..., description="Confidence band as percentage (+/-)")
+    central_estimate: JsonDecimal = Field(..., description="Central value estimate")
+    confidence_band_pct: JsonDecimal = Field(..., description="Confidence band as percentage (+/-)")
     
-    lower_bound: Decimal = Field(..., description="Lower confidence bound")
-    upper_bound: Decimal = Field(..., description="Upper confidence bound")
+    lower_bound: JsonDecimal = Field(..., description="Lower confidence bound")
+    upper_bound: JsonDecimal = Field(..., description="Upper confidence bound")
     
     # Quality metrics
-    confidence_score: Decimal = Field(..., ge=0, le=1, description="Overall confidence score (0-1)")
+    confidence_score: JsonDecimal = Field(..., ge=0, le=1, description="Overall confidence score (0-1)")
     reliability_grade: str = Field(..., description="A/B/C/D grade for reliability")
     
     # Supporting analysis
-    estimate_dispersion: Optional[Decimal] = Field(None, description="Coefficient of variation of estimates")
-    method_consistency: Decimal = Field(0, ge=0, le=1, description="Consistency across valuation methods")
+    estimate_dispersion: Optional[JsonDecimal] = Field(None, description="Coefficient of variation of estimates")
+    method_consistency: JsonDecimal = Field(Decimal('0'), ge=0, le=1, description="Consistency across valuation methods")
     
     # Risk factors
     risk_factors: List[str] = Field(default_factory=list, description="Identified risk factors")
     
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
+    model_config = ConfigDict(defer_build=True)
 
 
 def calculate_confidence_band(input_data: ConfidenceInput) -> ConfidenceResult:
@@ -97,82 +147,86 @@ def calculate_confidence_band(input_data: ConfidenceInput) -> ConfidenceResult:
         ConfidenceResult with bounds and quality metrics
     """
     
-    def round_currency(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    # Calculate coefficient of variation if multiple estimates available
+    all_estimates = [input_data.estimated_market_value]
+    all_estimates.extend(input_data.comparable_sales)
+    all_estimates.extend([est for est, _ in input_data.other_estimates])
     
-    def round_percentage(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.001'), rounding=ROUND_HALF_UP)  # 3 decimal places
+    cv = None
+    if len(all_estimates) > 1:
+        mean_estimate = sum(all_estimates) / len(all_estimates)
+        variance = sum((est - mean_estimate) ** 2 for est in all_estimates) / len(all_estimates)
+        std_dev = variance.sqrt()
+
+        if mean_estimate > 0:
+            cv = std_dev / mean_estimate
     
-    # Start with base confidence band based on valuation method
-    method_bands = {
-        ValuationMethod.SALES_COMPARISON: Decimal('0.10'),    # ±10% for good comps
-        ValuationMethod.INCOME_APPROACH: Decimal('0.15'),     # ±15% for income approach
-        ValuationMethod.COST_APPROACH: Decimal('0.20'),       # ±20% for cost approach
-        ValuationMethod.AUTOMATED_VALUATION: Decimal('0.25'), # ±25% for AVMs
-        ValuationMethod.TAX_ASSESSOR: Decimal('0.30')         # ±30% for assessor estimates
-    }
+    return confidence_band_from_dispersion(input_data, cv, len(input_data.comparable_sales))
+
+
+def confidence_band_from_dispersion(
+    input_data: ConfidenceInput,
+    cv: Optional[Decimal],
+    comparable_count: int
+) -> ConfidenceResult:
+    """
+    Build the confidence band from a precomputed coefficient of variation.
+
+    Callers that maintain dispersion statistics themselves (e.g. incremental
+    accumulators) use this to share the band logic of calculate_confidence_band.
+    `input_data.comparable_sales` is not read; `comparable_count` replaces it.
+
+    Args:
+        input_data: Confidence calculation inputs
+        cv: Coefficient of variation across all estimates, or None if unavailable
+        comparable_count: Number of comparable sales behind `cv`
+
+    Returns:
+        ConfidenceResult with bounds and quality metrics
+    """
     
-    base_band = method_bands[input_data.valuation_method]
+    # Start with base confidence band based on valuation method
+    base_band = METHOD_BANDS[input_data.valuation_method]
     
     # Adjust for data quality
-    quality_adjustment = (Decimal('1.0') - input_data.data_quality_score) * Decimal('0.15')
+    quality_adjustment = (_ONE - input_data.data_quality_score) * _QUALITY_WEIGHT
     adjusted_band = base_band + quality_adjustment
     
     # Adjust for market conditions
-    market_adjustments = {
-        "stable": Decimal('0.0'),
-        "improving": Decimal('0.05'),  # More uncertainty in rising markets
-        "declining": Decimal('0.08'),  # More uncertainty in falling markets
-        "volatile": Decimal('0.12')    # High uncertainty in volatile markets
-    }
-    
-    market_adjustment = market_adjustments[input_data.market_conditions]
+    market_adjustment = MARKET_ADJUSTMENTS[input_data.market_conditions]
     adjusted_band += market_adjustment
     
     # Adjust for property uniqueness
-    uniqueness_adjustment = input_data.property_uniqueness * Decimal('0.10')
+    uniqueness_adjustment = input_data.property_uniqueness * _UNIQUENESS_WEIGHT
     adjusted_band += uniqueness_adjustment
     
     # Adjust for age of valuation
     if input_data.days_since_valuation > 0:
         # Add 1% per year of age, up to 15%
-        age_years = Decimal(input_data.days_since_valuation) / Decimal('365')
-        age_adjustment = min(age_years * Decimal('0.01'), Decimal('0.15'))
+        age_years = Decimal(input_data.days_since_valuation) / _DAYS_PER_YEAR
+        age_adjustment = min(age_years * _AGE_RATE_PER_YEAR, _MAX_AGE_ADJUSTMENT)
         adjusted_band += age_adjustment
     
-    # Calculate estimate dispersion if multiple estimates available
-    all_estimates = [input_data.estimated_market_value]
-    all_estimates.extend(input_data.comparable_sales)
-    all_estimates.extend([est for est, _ in input_data.other_estimates])
-    
+    # Adjust for estimate dispersion if multiple estimates available
     estimate_dispersion = None
-    method_consistency = Decimal('1.0')  # Default to full consistency
+    method_consistency = _ONE  # Default to full consistency
     
-    if len(all_estimates) > 1:
-        # Calculate coefficient of variation
-        mean_estimate = sum(all_estimates) / len(all_estimates)
-        variance = sum((est - mean_estimate) ** 2 for est in all_estimates) / len(all_estimates)
-        std_dev = variance.sqrt()
+    if cv is not None:
+        estimate_dispersion = _round_percentage(cv)
         
-        if mean_estimate > 0:
-            cv = std_dev / mean_estimate
-            estimate_dispersion = round_percentage(cv)
-            
-            # Adjust confidence band based on dispersion
-            # Higher dispersion = wider band
-            dispersion_adjustment = cv * Decimal('0.5')  # Scale factor
-            adjusted_band += dispersion_adjustment
-            
-            # Method consistency: lower if estimates vary widely
-            if cv > Decimal('0.3'):  # >30% variation
-                method_consistency = Decimal('0.3')
-            elif cv > Decimal('0.2'):  # >20% variation
-                method_consistency = Decimal('0.6')
-            elif cv > Decimal('0.1'):  # >10% variation
-                method_consistency = Decimal('0.8')
+        # Adjust confidence band based on dispersion
+        # Higher dispersion = wider band
+        dispersion_adjustment = cv * _DISPERSION_WEIGHT  # Scale factor
+        adjusted_band += dispersion_adjustment
+
+        # Method consistency: lower if estimates vary widely
+        for cv_limit, consistency in _CONSISTENCY_STEPS:
+            if cv > cv_limit:
+                method_consistency = consistency
+                break
     
     # Cap the confidence band at reasonable limits
-    final_band = max(Decimal('0.05'), min(adjusted_band, Decimal('0.50')))  # 5% to 50%
+    final_band = max(MIN_BAND, min(adjusted_band, MAX_BAND))
     
     # Calculate bounds
     central_estimate = input_data.estimated_market_value
@@ -181,26 +235,23 @@ def calculate_confidence_band(input_data: ConfidenceInput) -> ConfidenceResult:
     upper_bound = central_estimate + band_amount
     
     # Calculate overall confidence score
-    confidence_score = Decimal('1.0') - (final_band - Decimal('0.05')) / Decimal('0.45')  # Scale 5%-50% band to 1.0-0.0 score
-    confidence_score = max(Decimal('0.0'), min(confidence_score, Decimal('1.0')))
+    confidence_score = _ONE - (final_band - MIN_BAND) / _BAND_RANGE  # Scale 5%-50% band to 1.0-0.0 score
+    confidence_score = max(_ZERO, min(confidence_score, _ONE))
     
     # Assign reliability grade
-    if confidence_score >= Decimal('0.8'):
-        reliability_grade = "A"
-    elif confidence_score >= Decimal('0.6'):
-        reliability_grade = "B" 
-    elif confidence_score >= Decimal('0.4'):
-        reliability_grade = "C"
-    else:
-        reliability_grade = "D"
+    reliability_grade = "D"
+    for score_floor, grade in GRADE_THRESHOLDS:
+        if confidence_score >= score_floor:
+            reliability_grade = grade
+            break
     
     # Identify risk factors
     risk_factors = []
     
-    if input_data.data_quality_score < Decimal('0.6'):
+    if input_data.data_quality_score < _LOW_DATA_QUALITY:
         risk_factors.append("Low data quality")
         
-    if input_data.property_uniqueness > Decimal('0.7'):
+    if input_data.property_uniqueness > _HIGH_UNIQUENESS:
         risk_factors.append("Highly unique property")
         
     if input_data.market_conditions in ["declining", "volatile"]:
@@ -209,20 +260,20 @@ def calculate_confidence_band(input_data: ConfidenceInput) -> ConfidenceResult:
     if input_data.days_since_valuation > 365:
         risk_factors.append("Valuation more than 1 year old")
         
-    if len(input_data.comparable_sales) < 3 and input_data.valuation_method == ValuationMethod.SALES_COMPARISON:
+    if comparable_count < 3 and input_data.valuation_method == ValuationMethod.SALES_COMPARISON:
         risk_factors.append("Limited comparable sales data")
         
-    if estimate_dispersion and estimate_dispersion > Decimal('0.25'):
+    if estimate_dispersion and estimate_dispersion > _HIGH_DISPERSION:
         risk_factors.append("High dispersion between estimates")
     
     return ConfidenceResult(
         central_estimate=round_currency(central_estimate),
-        confidence_band_pct=round_percentage(final_band),
+        confidence_band_pct=_round_percentage(final_band),
         lower_bound=round_currency(lower_bound),
         upper_bound=round_currency(upper_bound),
-        confidence_score=round_percentage(confidence_score),
+        confidence_score=_round_percentage(confidence_score),
         reliability_grade=reliability_grade,
         estimate_dispersion=estimate_dispersion,
-        method_consistency=round_percentage(method_consistency),
+        method_consistency=_round_percentage(method_consistency),
         risk_factors=risk_factors
     )
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""Incremental confidence band updates as comparable sales arrive."""
+
+from decimal import Decimal, localcontext
+from typing import Iterable, Optional
+
+from .confidence import ConfidenceInput, ConfidenceResult, confidence_band_from_dispersion
+
+
+# Working precision for the running statistics. Well above the default
+# context so the streamed mean and M2 agree with the two-pass computation
+# in calculate_confidence_band once rounded back to the caller's context.
+_WORKING_PRECISION = 60
+
+
+class ConfidenceAccumulator:
+    """
+    Running mean and variance (Welford) over a property's value estimates.
+
+    Seeded from a ConfidenceInput - the primary estimate, other estimates and
+    any comparable sales already known - and then fed new comparable sales one
+    at a time. Each sale updates the statistics in O(1), and `result()`
+    produces the same ConfidenceResult as calling calculate_confidence_band
+    on an input holding every sale seen so far.
+    """
+
+    def __init__(self, input_data: ConfidenceInput):
+        self._input = input_data.model_copy(update={"comparable_sales": []})
+        self._count = 0
+        self._comparable_count = 0
+        self._mean = Decimal('0')
+        self._m2 = Decimal('0')
+
+        self._push(input_data.estimated_market_value)
+        for sale in input_data.comparable_sales:
+            self.add_sale(sale)
+        for estimate, _ in input_data.other_estimates:
+            self._push(estimate)
+
+    def _push(self, value: Decimal) -> None:
+        with localcontext() as ctx:
+            ctx.prec = _WORKING_PRECISION
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+
+    def add_sale(self, price: Decimal) -> None:
+        """Fold one new comparable sale into the running statistics."""
+        self._push(Decimal(str(price)))
+        self._comparable_count += 1
+
+    def add_sales(self, prices: Iterable[Decimal]) -> None:
+        """Fold several new comparable sales in order."""
+        for price in prices:
+            self.add_sale(price)
+
+    @property
+    def count(self) -> int:
+        """Number of estimates, including the primary estimate."""
+        return self._count
+
+    @property
+    def comparable_count(self) -> int:
+        return self._comparable_count
+
+    @property
+    def mean(self) -> Decimal:
+        return +self._mean
+
+    @property
+    def variance(self) -> Decimal:
+        """Population variance of all estimates."""
+        with localcontext() as ctx:
+            ctx.prec = _WORKING_PRECISION
+            variance = max(self._m2, Decimal('0')) / self._count
+        return +variance
+
+    def coefficient_of_variation(self) -> Optional[Decimal]:
+        """Population CV of all estimates, or None with fewer than two."""
+        if self._count < 2 or self._mean <= 0:
+            return None
+        with localcontext() as ctx:
+            ctx.prec = _WORKING_PRECISION
+            cv = (max(self._m2, Decimal('0')) / self._count).sqrt() / self._mean
+        return +cv
+
+    def result(self) -> ConfidenceResult:
+        """Confidence band for everything accumulated so far."""
+        return confidence_band_from_dispersion(
+            self._input, self.coefficient_of_variation(), self._comparable_count
+        )
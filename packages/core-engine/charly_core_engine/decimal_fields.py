@@ -0,0 +1,25 @@
+"""Annotated Decimal field types shared by the models."""
+
+from decimal import Decimal, InvalidOperation
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator, PlainSerializer
+from pydantic_core import PydanticCustomError
+
+
+def to_decimal(value: Any) -> Any:
+    """Convert int, float and str input through str(), so 0.1 becomes Decimal('0.1')."""
+    if isinstance(value, (int, float, str)):
+        try:
+            return Decimal(str(value))
+        except InvalidOperation:
+            # Booleans and non-numeric strings; report them like pydantic's own Decimal parsing
+            raise PydanticCustomError("decimal_parsing", "Input should be a valid decimal") from None
+    return value
+
+
+# Input amounts and rates, accepted as numbers or numeric strings
+CoercedDecimal = Annotated[Decimal, BeforeValidator(to_decimal)]
+
+# Result values, serialized as JSON numbers
+JsonDecimal = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
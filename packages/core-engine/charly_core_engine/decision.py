@@ -1,12 +1,41 @@
 """Core decision engine for property tax appeal classification."""
 
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
 from .confidence import ConfidenceResult
+from .decimal_fields import CoercedDecimal, JsonDecimal
 from .jurisdiction import JurisdictionPriors
+from .rounding import CENTS, half_up, round_currency
+
+
+# Assessment ratio below which a property is classified UNDER
+UNDER_RATIO_THRESHOLD = Decimal('0.90')
+
+# Bounds on the estimated appeal success probability
+MIN_SUCCESS_PROBABILITY = Decimal('0.05')
+MAX_SUCCESS_PROBABILITY = Decimal('0.95')
+
+_ONE = Decimal('1.0')
+_ZERO_PCT = Decimal('0.00')
+_EXCESS_WEIGHT = Decimal('0.5')
+_MAX_EXCESS_BOOST = Decimal('0.3')  # Cap at 30% boost
+_MAX_OVER_PROBABILITY = Decimal('0.9')
+_UNDER_PROBABILITY_FACTOR = Decimal('0.3')
+_MAX_UNDER_PROBABILITY = Decimal('0.2')
+_NEUTRAL_CONFIDENCE = Decimal('0.5')
+_CONFIDENCE_WEIGHT = Decimal('0.2')
+_STRONG_CONFIDENCE_SCORE = Decimal('0.7')
+_REASSESSMENT_HISTORY_THRESHOLD = Decimal('0.1')
+_CLEAR_OVER_RATIO = Decimal('1.15')
+_CLEAR_UNDER_RATIO = Decimal('0.85')
+_MODERATE_OVER_RATIO = Decimal('1.10')
+_STRONG_PROBABILITY = Decimal('0.6')
+_WEAK_PROBABILITY = Decimal('0.4')
+
+_round_percentage = half_up(CENTS)
 
 
 class AppealDecision(str, Enum):
@@ -20,35 +49,32 @@ class DecisionInput(BaseModel):
     """Input data for appeal decision."""
     
     # Property valuation
-    assessed_value: Decimal = Field(..., gt=0, description="Current assessed value")
-    estimated_market_value: Decimal = Field(..., gt=0, description="Estimated market value")
+    assessed_value: CoercedDecimal = Field(..., gt=0, description="Current assessed value")
+    estimated_market_value: CoercedDecimal = Field(..., gt=0, description="Estimated market value")
     confidence_result: ConfidenceResult = Field(..., description="Confidence band analysis")
     
     # Jurisdiction context
     jurisdiction_priors: JurisdictionPriors = Field(..., description="Jurisdiction-specific statistics")
-    tax_rate: Decimal = Field(..., gt=0, description="Effective tax rate (decimal)")
+    tax_rate: CoercedDecimal = Field(..., gt=0, description="Effective tax rate (decimal)")
     
     # Appeal costs and context
-    estimated_filing_fee: Decimal = Field(0, ge=0, description="Estimated filing fee")
-    estimated_attorney_fee: Decimal = Field(0, ge=0, description="Estimated attorney fee")
-    estimated_other_costs: Decimal = Field(0, ge=0, description="Other estimated costs")
+    estimated_filing_fee: CoercedDecimal = Field(Decimal('0'), ge=0, description="Estimated filing fee")
+    estimated_attorney_fee: CoercedDecimal = Field(Decimal('0'), ge=0, description="Estimated attorney fee")
+    estimated_other_costs: CoercedDecimal = Field(Decimal('0'), ge=0, description="Other estimated costs")
     
     # Decision parameters
-    min_roi_threshold: Decimal = Field(Decimal('2.0'), gt=0, description="Minimum ROI threshold for recommendation")
-    min_savings_threshold: Decimal = Field(Decimal('1000'), ge=0, description="Minimum annual savings threshold")
+    min_roi_threshold: CoercedDecimal = Field(Decimal('2.0'), gt=0, description="Minimum ROI threshold for recommendation")
+    min_savings_threshold: CoercedDecimal = Field(Decimal('1000'), ge=0, description="Minimum annual savings threshold")
     appeal_horizon_years: int = Field(3, ge=1, le=10, description="Years to consider for savings calculation")
     
-    @validator("tax_rate")
+    model_config = ConfigDict(defer_build=True)
+
+    @field_validator("tax_rate")
+    @classmethod
     def validate_tax_rate(cls, v):
         if v > Decimal('0.10'):  # 10% seems very high
             raise ValueError("Tax rate seems unreasonably high (>10%)")
         return v
-        
-    @validator("*", pre=True)
-    def convert_to_decimal(cls, v):
-        if isinstance(v, (int, float, str)) and any(field in cls.__annotations__ for field in ['assessed_value', 'estimated_market_value', 'tax_rate', 'estimated_filing_fee', 'estimated_attorney_fee', 'estimated_other_costs', 'min_roi_threshold', 'min_savings_threshold']):
-            return Decimal(str(v))
-        return v
 
 
 class DecisionResult(BaseModel):
@@ -58,10 +84,10 @@ class DecisionResult(BaseModel):
     confidence_level: str = Field(..., description="HIGH/MEDIUM/LOW confidence")
     
     # Key metrics
-    assessment_ratio: Decimal = Field(..., description="Assessed / Market ratio")
-    expected_annual_savings: Decimal = Field(..., description="Expected annual tax savings if successful")
-    expected_roi: Optional[Decimal] = Field(None, description="Expected ROI percentage if successful")
-    breakeven_reduction_pct: Decimal = Field(..., description="Reduction % needed to break even")
+    assessment_ratio: JsonDecimal = Field(..., description="Assessed / Market ratio")
+    expected_annual_savings: JsonDecimal = Field(..., description="Expected annual tax savings if successful")
+    expected_roi: Optional[JsonDecimal] = Field(None, description="Expected ROI percentage if successful")
+    breakeven_reduction_pct: JsonDecimal = Field(..., description="Reduction % needed to break even")
     
     # Rationale and reasoning
     primary_rationale: List[str] = Field(..., description="Primary reasons for decision")
@@ -70,18 +96,15 @@ class DecisionResult(BaseModel):
     
     # Detailed analysis
     within_confidence_band: bool = Field(..., description="Assessment within confidence band")
-    success_probability: Decimal = Field(..., description="Estimated probability of successful appeal")
+    success_probability: JsonDecimal = Field(..., description="Estimated probability of successful appeal")
     reassessment_risk_warning: bool = Field(False, description="Warning about reassessment risk")
     
     # Financial projections
-    total_appeal_costs: Decimal = Field(..., description="Total estimated appeal costs")
-    net_savings_year_1: Decimal = Field(..., description="Net savings in first year")
-    cumulative_net_savings: Decimal = Field(..., description="Cumulative net savings over horizon")
-    
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
+    total_appeal_costs: JsonDecimal = Field(..., description="Total estimated appeal costs")
+    net_savings_year_1: JsonDecimal = Field(..., description="Net savings in first year")
+    cumulative_net_savings: JsonDecimal = Field(..., description="Cumulative net savings over horizon")
+
+    model_config = ConfigDict(defer_build=True)
 
 
 def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
@@ -100,12 +123,6 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
         DecisionResult with recommendation and detailed analysis
     """
     
-    def round_currency(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    
-    def round_percentage(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    
     # Calculate assessment ratio
     assessment_ratio = input_data.assessed_value / input_data.estimated_market_value
     
@@ -118,7 +135,7 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
     # Calculate potential savings if appeal successful
     # Use jurisdiction's typical reduction for estimation
     typical_reduction = input_data.jurisdiction_priors.average_reduction_pct
-    reduced_assessment = input_data.assessed_value * (Decimal('1.0') - typical_reduction)
+    reduced_assessment = input_data.assessed_value * (_ONE - typical_reduction)
     
     # Don't reduce below market value estimate
     reduced_assessment = max(reduced_assessment, input_data.estimated_market_value)
@@ -147,16 +164,16 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
     if total_costs > 0:
         total_benefits = annual_tax_savings * input_data.appeal_horizon_years
         roi = ((total_benefits - total_costs) / total_costs) * 100
-        expected_roi = round_percentage(roi)
+        expected_roi = _round_percentage(roi)
     
     # Calculate breakeven reduction percentage
     if total_costs > 0 and input_data.tax_rate > 0:
         breakeven_annual_savings = total_costs / input_data.appeal_horizon_years
         breakeven_reduction_amount = breakeven_annual_savings / input_data.tax_rate
         breakeven_reduction_pct = breakeven_reduction_amount / input_data.assessed_value
-        breakeven_reduction_pct = round_percentage(breakeven_reduction_pct)
+        breakeven_reduction_pct = _round_percentage(breakeven_reduction_pct)
     else:
-        breakeven_reduction_pct = Decimal('0.00')
+        breakeven_reduction_pct = _ZERO_PCT
     
     # Initialize decision factors
     primary_rationale = []
@@ -169,46 +186,46 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
     
     # Adjust success probability based on how far outside confidence band
     if not within_confidence_band:
-        if assessment_ratio > Decimal('1.0'):
+        if assessment_ratio > _ONE:
             # Over-assessed: increase success probability
-            excess_ratio = assessment_ratio - Decimal('1.0')
+            excess_ratio = assessment_ratio - _ONE
             confidence_band_size = input_data.confidence_result.confidence_band_pct
             
             # The further outside the band, the higher the success probability
             if excess_ratio > confidence_band_size:
-                adjustment = min(excess_ratio * Decimal('0.5'), Decimal('0.3'))  # Cap at 30% boost
-                success_probability = min(success_probability + adjustment, Decimal('0.9'))
+                adjustment = min(excess_ratio * _EXCESS_WEIGHT, _MAX_EXCESS_BOOST)  # Cap at 30% boost
+                success_probability = min(success_probability + adjustment, _MAX_OVER_PROBABILITY)
         else:
             # Under-assessed: decrease success probability (would likely increase assessment)
-            success_probability = min(success_probability * Decimal('0.3'), Decimal('0.2'))
+            success_probability = min(success_probability * _UNDER_PROBABILITY_FACTOR, _MAX_UNDER_PROBABILITY)
     
     # Adjust for confidence in valuation
-    confidence_adjustment = (input_data.confidence_result.confidence_score - Decimal('0.5')) * Decimal('0.2')
-    success_probability = max(Decimal('0.05'), min(success_probability + confidence_adjustment, Decimal('0.95')))
+    confidence_adjustment = (input_data.confidence_result.confidence_score - _NEUTRAL_CONFIDENCE) * _CONFIDENCE_WEIGHT
+    success_probability = max(MIN_SUCCESS_PROBABILITY, min(success_probability + confidence_adjustment, MAX_SUCCESS_PROBABILITY))
     
     # PRIMARY DECISION LOGIC
     
-    if assessment_ratio < Decimal('0.90'):
+    if assessment_ratio < UNDER_RATIO_THRESHOLD:
         # Significantly under-assessed - warn about reassessment risk
         decision = AppealDecision.UNDER
         reassessment_risk_warning = True
         
-        primary_rationale.append(f"Assessment is {round_percentage((Decimal('1.0') - assessment_ratio) * 100)}% below estimated market value")
+        primary_rationale.append(f"Assessment is {_round_percentage((_ONE - assessment_ratio) * 100)}% below estimated market value")
         primary_rationale.append("Appealing could result in a higher assessment")
         
         risk_factors.append("High risk of assessment increase upon review")
         risk_factors.append("May trigger county-wide reassessment attention")
         
-        if input_data.jurisdiction_priors.reassessment_risk_factor > Decimal('0.1'):
+        if input_data.jurisdiction_priors.reassessment_risk_factor > _REASSESSMENT_HISTORY_THRESHOLD:
             risk_factors.append("Jurisdiction has history of reassessment increases")
             
-    elif (assessment_ratio <= (Decimal('1.0') + input_data.jurisdiction_priors.cod_target) and
+    elif (assessment_ratio <= (_ONE + input_data.jurisdiction_priors.cod_target) and
           within_confidence_band):
         # Within reasonable bounds - fair assessment
         decision = AppealDecision.FAIR
         
         primary_rationale.append("Assessment is within reasonable bounds of market value")
-        primary_rationale.append(f"Assessment ratio of {round_percentage(assessment_ratio * 100)}% is reasonable")
+        primary_rationale.append(f"Assessment ratio of {_round_percentage(assessment_ratio * 100)}% is reasonable")
         
         if within_confidence_band:
             primary_rationale.append("Assessment falls within valuation confidence band")
@@ -224,11 +241,11 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
         # Potentially over-assessed - check economics
         decision = AppealDecision.OVER
         
-        excess_pct = round_percentage((assessment_ratio - Decimal('1.0')) * 100)
+        excess_pct = _round_percentage((assessment_ratio - _ONE) * 100)
         primary_rationale.append(f"Assessment appears {excess_pct}% above estimated market value")
         
         if not within_confidence_band:
-            band_pct = round_percentage(input_data.confidence_result.confidence_band_pct * 100)
+            band_pct = _round_percentage(input_data.confidence_result.confidence_band_pct * 100)
             primary_rationale.append(f"Assessment is outside {band_pct}% confidence band")
             
         # Economic analysis
@@ -250,17 +267,17 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
     confidence_factors = 0
     
     # High confidence factors
-    if input_data.confidence_result.confidence_score > Decimal('0.7'):
+    if input_data.confidence_result.confidence_score > _STRONG_CONFIDENCE_SCORE:
         confidence_factors += 2
-    elif input_data.confidence_result.confidence_score > Decimal('0.5'):
+    elif input_data.confidence_result.confidence_score > _NEUTRAL_CONFIDENCE:
         confidence_factors += 1
         
-    if assessment_ratio > Decimal('1.15') or assessment_ratio < Decimal('0.85'):
+    if assessment_ratio > _CLEAR_OVER_RATIO or assessment_ratio < _CLEAR_UNDER_RATIO:
         confidence_factors += 2  # Clear over/under assessment
-    elif assessment_ratio > Decimal('1.10') or assessment_ratio < Decimal('0.90'):
+    elif assessment_ratio > _MODERATE_OVER_RATIO or assessment_ratio < UNDER_RATIO_THRESHOLD:
         confidence_factors += 1  # Moderate over/under
         
-    if success_probability > Decimal('0.6'):
+    if success_probability > _STRONG_PROBABILITY:
         confidence_factors += 1
     
     if len(input_data.confidence_result.risk_factors) <= 2:
@@ -278,12 +295,12 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
     if input_data.confidence_result.reliability_grade in ["C", "D"]:
         risk_factors.append(f"Valuation reliability grade: {input_data.confidence_result.reliability_grade}")
         
-    if success_probability < Decimal('0.4'):
+    if success_probability < _WEAK_PROBABILITY:
         risk_factors.append("Below-average probability of success in this jurisdiction")
         
     # Add supporting factors for strong cases
     if decision == AppealDecision.OVER:
-        if success_probability > Decimal('0.6'):
+        if success_probability > _STRONG_PROBABILITY:
             supporting_factors.append("Above-average probability of success")
             
         if input_data.confidence_result.reliability_grade in ["A", "B"]:
@@ -292,7 +309,7 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
     return DecisionResult(
         decision=decision,
         confidence_level=confidence_level,
-        assessment_ratio=round_percentage(assessment_ratio),
+        assessment_ratio=_round_percentage(assessment_ratio),
         expected_annual_savings=round_currency(annual_tax_savings),
         expected_roi=expected_roi,
         breakeven_reduction_pct=breakeven_reduction_pct,
@@ -300,7 +317,7 @@ def make_appeal_decision(input_data: DecisionInput) -> DecisionResult:
         risk_factors=risk_factors,
         supporting_factors=supporting_factors,
         within_confidence_band=within_confidence_band,
-        success_probability=round_percentage(success_probability),
+        success_probability=_round_percentage(success_probability),
         reassessment_risk_warning=reassessment_risk_warning,
         total_appeal_costs=round_currency(total_costs),
         net_savings_year_1=round_currency(net_first_year),
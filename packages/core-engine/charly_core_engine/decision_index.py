@@ -0,0 +1,391 @@
+"""Secondary indexes over batch decision results.
+
+Portfolio queries such as "all OVER decisions in Collin County with ROI
+above 200% and grade A/B" are answered without scanning every
+DecisionResult:
+
+- Bitmap indexes (packed 64-bit words, one bitmap per value) on the
+  fixed-label columns `decision`, `confidence_level` and
+  `reliability_grade`.
+- A postings index (sorted row IDs per value) on jurisdiction, whose
+  values are unbounded: it takes O(rows) memory where one bitmap per
+  jurisdiction would take O(jurisdictions x rows).
+- Sorted indexes on `expected_roi`, `expected_annual_savings` and
+  `assessment_ratio`, with a small pending set for rows re-decided since
+  the last rebuild so updates stay O(1) until the set is merged.
+
+A query is driven by its most selective predicate; the remaining
+predicates are checked against that candidate set only.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from .confidence import ConfidenceResult
+from .decision import DecisionResult
+from .result_store import (
+    CONFIDENCE_LEVEL_CODES, DECISION_CODES, GRADE_CODES, DecisionStore
+)
+
+
+RANGE_COLUMNS: Tuple[str, ...] = ("expected_roi", "expected_annual_savings", "assessment_ratio")
+
+# Pending re-decided rows are merged into the sorted arrays beyond this size
+_MIN_PENDING = 1024
+
+Labels = Union[str, Iterable[str]]
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def _as_tuple(labels: Labels) -> Tuple[str, ...]:
+    return (labels,) if isinstance(labels, str) else tuple(labels)
+
+
+def _word_count(capacity: int) -> int:
+    return (capacity + 63) // 64
+
+
+class _BitmapColumn:
+    """One packed bitmap per distinct code, plus the current code of every row."""
+
+    def __init__(self, capacity: int):
+        self.codes = np.full(capacity, -1, dtype=np.int32)
+        self.bitmaps: Dict[int, np.ndarray] = {}
+        self.counts: Dict[int, int] = {}
+
+    def grow(self, capacity: int) -> None:
+        extra = capacity - len(self.codes)
+        self.codes = np.concatenate([self.codes, np.full(extra, -1, dtype=np.int32)])
+        words = _word_count(capacity)
+        for code, bitmap in self.bitmaps.items():
+            self.bitmaps[code] = np.concatenate([bitmap, np.zeros(words - len(bitmap), dtype="<u8")])
+
+    def load(self, codes: np.ndarray) -> None:
+        """Bulk-load codes for rows 0..len(codes)-1."""
+        self.codes[:len(codes)] = codes
+        padded = np.zeros(_word_count(len(self.codes)) * 64, dtype=bool)
+        for code in np.unique(codes):
+            padded[:len(codes)] = codes == code
+            self.bitmaps[int(code)] = np.packbits(padded, bitorder="little").view("<u8")
+            self.counts[int(code)] = int(np.count_nonzero(padded))
+
+    def set(self, row: int, code: int) -> None:
+        old = int(self.codes[row])
+        if old == code:
+            return
+        word, bit = row >> 6, np.uint64(1 << (row & 63))
+        if old >= 0:
+            self.bitmaps[old][word] &= ~bit
+            self.counts[old] -= 1
+        bitmap = self.bitmaps.get(code)
+        if bitmap is None:
+            bitmap = self.bitmaps[code] = np.zeros(_word_count(len(self.codes)), dtype="<u8")
+        bitmap[word] |= bit
+        self.counts[code] = self.counts.get(code, 0) + 1
+        self.codes[row] = code
+
+    def estimate(self, codes: Tuple[int, ...]) -> int:
+        return sum(self.counts.get(code, 0) for code in codes)
+
+    def rows(self, codes: Tuple[int, ...], size: int) -> np.ndarray:
+        words = np.zeros(_word_count(len(self.codes)), dtype="<u8")
+        for code in codes:
+            if code in self.bitmaps:
+                words |= self.bitmaps[code]
+        bits = np.unpackbits(words.view(np.uint8), bitorder="little", count=size)
+        return np.flatnonzero(bits)
+
+    def matches(self, rows: np.ndarray, codes: Tuple[int, ...]) -> np.ndarray:
+        return np.isin(self.codes[rows], codes)
+
+
+class _PostingColumn:
+    """Sorted row IDs per distinct code at the last rebuild, plus rows re-coded since."""
+
+    def __init__(self, capacity: int):
+        self.codes = np.full(capacity, -1, dtype=np.int32)
+        self.postings: Dict[int, np.ndarray] = {}
+        self.counts: Dict[int, int] = {}
+        self.pending: Set[int] = set()
+
+    def grow(self, capacity: int) -> None:
+        extra = capacity - len(self.codes)
+        self.codes = np.concatenate([self.codes, np.full(extra, -1, dtype=np.int32)])
+
+    def load(self, codes: np.ndarray) -> None:
+        """Bulk-load codes for rows 0..len(codes)-1."""
+        self.codes[:len(codes)] = codes
+        self.rebuild(len(codes))
+
+    def rebuild(self, size: int) -> None:
+        codes = self.codes[:size]
+        order = np.argsort(codes, kind="stable")  # Stable: rows stay ascending within a code
+        values, starts, counts = np.unique(codes[order], return_index=True, return_counts=True)
+        self.postings = {
+            int(code): order[start:start + count]
+            for code, start, count in zip(values, starts, counts) if code >= 0
+        }
+        self.counts = {code: len(rows) for code, rows in self.postings.items()}
+        self.pending.clear()
+
+    def set(self, row: int, code: int) -> None:
+        old = int(self.codes[row])
+        if old == code:
+            return
+        if old >= 0:
+            self.counts[old] -= 1
+        self.counts[code] = self.counts.get(code, 0) + 1
+        self.codes[row] = code
+        self.pending.add(row)
+
+    def estimate(self, codes: Tuple[int, ...]) -> int:
+        return sum(self.counts.get(code, 0) for code in codes)
+
+    def rows(self, codes: Tuple[int, ...], size: int) -> np.ndarray:
+        postings = [self.postings[code] for code in codes if code in self.postings]
+        rows = np.concatenate(postings) if postings else np.empty(0, dtype=np.int64)
+        if not self.pending:
+            return np.sort(rows) if len(postings) > 1 else rows
+        # Drop rows re-coded away since the rebuild, add rows re-coded in
+        pending = np.fromiter(self.pending, dtype=np.int64, count=len(self.pending))
+        return np.union1d(rows[self.matches(rows, codes)], pending[self.matches(pending, codes)])
+
+    def matches(self, rows: np.ndarray, codes: Tuple[int, ...]) -> np.ndarray:
+        return np.isin(self.codes[rows], codes)
+
+
+class _SortedColumn:
+    """Values sorted at the last rebuild plus the set of rows changed since."""
+
+    def __init__(self, capacity: int):
+        self.values = np.full(capacity, np.nan)
+        self.stale = np.zeros(capacity, dtype=bool)
+        self.pending: Set[int] = set()
+        self._sorted_values = np.empty(0)
+        self._sorted_rows = np.empty(0, dtype=np.int64)
+
+    def grow(self, capacity: int) -> None:
+        extra = capacity - len(self.values)
+        self.values = np.concatenate([self.values, np.full(extra, np.nan)])
+        self.stale = np.concatenate([self.stale, np.zeros(extra, dtype=bool)])
+
+    def rebuild(self, size: int) -> None:
+        order = np.argsort(self.values[:size], kind="stable")
+        valid = size - int(np.count_nonzero(np.isnan(self.values[:size])))  # NaN sorts last
+        self._sorted_rows = order[:valid]
+        self._sorted_values = self.values[self._sorted_rows]
+        self.stale[:] = False
+        self.pending.clear()
+
+    def set(self, row: int, value: float) -> None:
+        self.values[row] = value
+        self.stale[row] = True
+        self.pending.add(row)
+
+    def _slice(self, bounds: Range) -> Tuple[int, int]:
+        low, high = bounds
+        start = 0 if low is None else int(np.searchsorted(self._sorted_values, low, side="left"))
+        end = len(self._sorted_values) if high is None else int(np.searchsorted(self._sorted_values, high, side="right"))
+        return start, max(start, end)
+
+    def estimate(self, bounds: Range) -> int:
+        start, end = self._slice(bounds)
+        return end - start + len(self.pending)
+
+    def rows(self, bounds: Range) -> np.ndarray:
+        start, end = self._slice(bounds)
+        rows = self._sorted_rows[start:end]
+        if self.pending:
+            rows = rows[~self.stale[rows]]
+            pending = np.fromiter(self.pending, dtype=np.int64, count=len(self.pending))
+            rows = np.concatenate([rows, pending[self.matches(pending, bounds)]])
+        return np.sort(rows)
+
+    def matches(self, rows: np.ndarray, bounds: Range) -> np.ndarray:
+        low, high = bounds
+        values = self.values[rows]
+        result = ~np.isnan(values)
+        if low is not None:
+            result &= values >= low
+        if high is not None:
+            result &= values <= high
+        return result
+
+
+class DecisionIndex:
+    """
+    In-process secondary indexes over decided properties.
+
+    Rows are keyed by property ID; `upsert` re-indexes a re-decided property
+    in place. Range bounds are inclusive `(low, high)` tuples where either
+    side may be None, and rows whose value is None never match a range.
+
+        index = DecisionIndex.from_store(store)
+        rows = index.query(
+            decision="OVER",
+            jurisdiction_id="collin_county_tx",
+            reliability_grade=("A", "B"),
+            expected_roi=(200, None),
+        )
+        ids = index.property_ids(rows)
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._capacity = max(capacity, 64)
+        self._rows: Dict[str, int] = {}
+        self._property_ids: List[str] = []
+        self._jurisdictions: Dict[str, int] = {}
+        self._bitmaps = {
+            name: _BitmapColumn(self._capacity) for name in ("decision", "confidence_level", "reliability_grade")
+        }
+        self._jurisdiction = _PostingColumn(self._capacity)
+        self._sorted = {name: _SortedColumn(self._capacity) for name in RANGE_COLUMNS}
+
+    @classmethod
+    def from_results(
+        cls, rows: Iterable[Tuple[str, str, DecisionResult, ConfidenceResult]]
+    ) -> "DecisionIndex":
+        """Index (property_id, jurisdiction_id, decision, confidence) rows."""
+        index = cls()
+        for row in rows:
+            index.upsert(*row)
+        index.rebuild()
+        return index
+
+    @classmethod
+    def from_store(cls, store: DecisionStore) -> "DecisionIndex":
+        """Bulk-build indexes straight from a mapped store's record columns."""
+        records = store.records
+        size = len(records)
+        index = cls(capacity=size)
+        index._size = size
+        index._property_ids = [store.property_id(row) for row in range(size)]
+        index._rows = {property_id: row for row, property_id in enumerate(index._property_ids)}
+
+        string_codes, jurisdiction_codes = np.unique(records["jurisdiction"], return_inverse=True)
+        index._jurisdictions = {store.string(int(code)): i for i, code in enumerate(string_codes)}
+
+        index._bitmaps["decision"].load(records["decision"].astype(np.int32))
+        index._bitmaps["confidence_level"].load(records["confidence_level"].astype(np.int32))
+        index._bitmaps["reliability_grade"].load(records["reliability_grade"].astype(np.int32))
+        index._jurisdiction.load(jurisdiction_codes.astype(np.int32))
+        for name, column in index._sorted.items():
+            column.values[:size] = records[name]
+            column.rebuild(size)
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, property_id: str) -> bool:
+        return property_id in self._rows
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for column in self._bitmaps.values():
+            column.grow(self._capacity)
+        self._jurisdiction.grow(self._capacity)
+        for column in self._sorted.values():
+            column.grow(self._capacity)
+
+    def upsert(
+        self,
+        property_id: str,
+        jurisdiction_id: str,
+        decision: DecisionResult,
+        confidence: ConfidenceResult,
+    ) -> int:
+        """Index a new or re-decided property and return its row number."""
+        row = self._rows.get(property_id)
+        if row is None:
+            if self._size == self._capacity:
+                self._grow()
+            row = self._rows[property_id] = self._size
+            self._property_ids.append(property_id)
+            self._size += 1
+
+        jurisdiction = self._jurisdictions.setdefault(jurisdiction_id, len(self._jurisdictions))
+        self._bitmaps["decision"].set(row, DECISION_CODES.index(decision.decision.value))
+        self._bitmaps["confidence_level"].set(row, CONFIDENCE_LEVEL_CODES.index(decision.confidence_level))
+        self._bitmaps["reliability_grade"].set(row, GRADE_CODES.index(confidence.reliability_grade))
+        self._jurisdiction.set(row, jurisdiction)
+        if len(self._jurisdiction.pending) > max(_MIN_PENDING, self._size // 64):
+            self._jurisdiction.rebuild(self._size)
+
+        for name, column in self._sorted.items():
+            value = getattr(decision, name)
+            column.set(row, np.nan if value is None else float(value))
+            if len(column.pending) > max(_MIN_PENDING, self._size // 64):
+                column.rebuild(self._size)
+        return row
+
+    def rebuild(self) -> None:
+        """Merge all pending updates into the sorted and postings indexes."""
+        self._jurisdiction.rebuild(self._size)
+        for column in self._sorted.values():
+            column.rebuild(self._size)
+
+    def query(
+        self,
+        decision: Optional[Labels] = None,
+        confidence_level: Optional[Labels] = None,
+        reliability_grade: Optional[Labels] = None,
+        jurisdiction_id: Optional[Labels] = None,
+        expected_roi: Optional[Range] = None,
+        expected_annual_savings: Optional[Range] = None,
+        assessment_ratio: Optional[Range] = None,
+    ) -> np.ndarray:
+        """
+        Row numbers matching every given predicate, in ascending order.
+
+        Label arguments accept a single value or any iterable of values.
+        """
+        predicates = []
+        for name, labels, codes in (
+            ("decision", decision, DECISION_CODES),
+            ("confidence_level", confidence_level, CONFIDENCE_LEVEL_CODES),
+            ("reliability_grade", reliability_grade, GRADE_CODES),
+        ):
+            if labels is not None:
+                wanted = tuple(codes.index(label) for label in _as_tuple(labels))
+                predicates.append((self._bitmaps[name], wanted))
+        if jurisdiction_id is not None:
+            wanted = tuple(
+                self._jurisdictions[j] for j in _as_tuple(jurisdiction_id) if j in self._jurisdictions
+            )
+            predicates.append((self._jurisdiction, wanted))
+        for name, bounds in (
+            ("expected_roi", expected_roi),
+            ("expected_annual_savings", expected_annual_savings),
+            ("assessment_ratio", assessment_ratio),
+        ):
+            if bounds is not None:
+                bounds = tuple(None if bound is None else float(bound) for bound in bounds)
+                predicates.append((self._sorted[name], bounds))
+
+        if not predicates:
+            return np.arange(self._size)
+
+        # Drive from the most selective predicate, then filter its candidates
+        predicates.sort(key=lambda p: p[0].estimate(p[1]))
+        (driver, argument), rest = predicates[0], predicates[1:]
+        if isinstance(driver, _SortedColumn):
+            rows = driver.rows(argument)
+        else:
+            rows = driver.rows(argument, self._size)
+        for column, argument in rest:
+            if not len(rows):
+                break
+            rows = rows[column.matches(rows, argument)]
+        return rows
+
+    def property_id(self, row: int) -> str:
+        return self._property_ids[row]
+
+    def property_ids(self, rows: Iterable[int]) -> List[str]:
+        return [self._property_ids[row] for row in rows]
+
+    def row_of(self, property_id: str) -> Optional[int]:
+        return self._rows.get(property_id)
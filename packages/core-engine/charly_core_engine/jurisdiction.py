@@ -2,7 +2,9 @@
 
 from decimal import Decimal
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from .decimal_fields import CoercedDecimal
 
 
 class JurisdictionPriors(BaseModel):
@@ -13,25 +15,28 @@ class JurisdictionPriors(BaseModel):
     state: str = Field(..., min_length=2, max_length=2, description="Two-letter state code")
     
     # Success rate statistics
-    appeal_success_rate: Decimal = Field(0.35, ge=0, le=1, description="Historical appeal success rate")
-    average_reduction_pct: Decimal = Field(0.15, ge=0, le=1, description="Average assessment reduction when successful")
-    median_reduction_pct: Decimal = Field(0.12, ge=0, le=1, description="Median assessment reduction when successful")
+    appeal_success_rate: CoercedDecimal = Field(Decimal('0.35'), ge=0, le=1, description="Historical appeal success rate")
+    average_reduction_pct: CoercedDecimal = Field(Decimal('0.15'), ge=0, le=1, description="Average assessment reduction when successful")
+    median_reduction_pct: CoercedDecimal = Field(Decimal('0.12'), ge=0, le=1, description="Median assessment reduction when successful")
     
     # Cost and timing
-    typical_filing_fee: Decimal = Field(0, ge=0, description="Typical filing fee")
-    typical_attorney_cost: Decimal = Field(2500, ge=0, description="Typical attorney cost")
+    typical_filing_fee: CoercedDecimal = Field(Decimal('0'), ge=0, description="Typical filing fee")
+    typical_attorney_cost: CoercedDecimal = Field(Decimal('2500'), ge=0, description="Typical attorney cost")
     average_timeline_days: int = Field(180, ge=30, le=730, description="Average appeal timeline in days")
     
     # Assessment patterns
-    cod_target: Decimal = Field(0.10, gt=0, le=0.50, description="Coefficient of Dispersion target")
-    reassessment_risk_factor: Decimal = Field(0.05, ge=0, le=1, description="Risk of reassessment increase")
+    cod_target: CoercedDecimal = Field(Decimal('0.10'), gt=0, le=0.50, description="Coefficient of Dispersion target")
+    reassessment_risk_factor: CoercedDecimal = Field(Decimal('0.05'), ge=0, le=1, description="Risk of reassessment increase")
     
     # Jurisdiction characteristics
     uses_market_value: bool = Field(True, description="True if jurisdiction uses market value")
-    assessment_ratio: Decimal = Field(1.0, gt=0, le=1, description="Assessment ratio (assessed/market)")
+    assessment_ratio: CoercedDecimal = Field(Decimal('1.0'), gt=0, le=1, description="Assessment ratio (assessed/market)")
     last_revaluation_year: Optional[int] = Field(None, description="Last county-wide revaluation year")
     
-    @validator("state")
+    model_config = ConfigDict(defer_build=True)
+
+    @field_validator("state")
+    @classmethod
     def validate_state_code(cls, v):
         if not v.isupper():
             v = v.upper()
@@ -39,12 +44,6 @@ class JurisdictionPriors(BaseModel):
         if len(v) != 2 or not v.isalpha():
             raise ValueError("State must be two-letter code (e.g., 'TX', 'CA')")
         return v
-        
-    @validator("*", pre=True)
-    def convert_to_decimal(cls, v):
-        if isinstance(v, (int, float, str)) and any(field in cls.__annotations__ for field in ['appeal_success_rate', 'average_reduction_pct', 'median_reduction_pct', 'typical_filing_fee', 'typical_attorney_cost', 'cod_target', 'reassessment_risk_factor', 'assessment_ratio']):
-            return Decimal(str(v))
-        return v
     
     @classmethod
     def get_default_priors(cls, state: str = "TX") -> "JurisdictionPriors":
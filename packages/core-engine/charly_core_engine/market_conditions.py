@@ -0,0 +1,292 @@
+"""Market conditions classified from streamed sales, per submarket.
+
+ConfidenceInput.market_conditions is otherwise entered by hand. Here a
+MarketConditionsClassifier is fed sales as they are recorded. For each
+submarket it keeps a rolling window of monthly buckets holding the sale
+count, the sum of sale days, and the sum and sum of squares of log sale
+prices. An update touches only the
+buckets of the new sales, and a month leaving the window is overwritten
+in place when its ring-buffer slot is reused.
+
+`classify()` works on the bucket summaries alone:
+
+- trend: weighted least-squares slope of each month's mean log price
+  against its mean sale date, annualized (0.05 is a 5% rise per year);
+- volatility: month-to-month noise of the monthly means around that
+  trend, net of the sampling noise expected from the number of sales
+  behind each month, as a monthly log-price standard deviation.
+
+A submarket is "volatile" above `volatility_threshold`, otherwise
+"improving" or "declining" when the trend exceeds `trend_threshold`
+either way, and "stable" in between. Each signal must also be
+significant at `significance_z` standard errors: a z-test on the slope,
+and a chi-square test of the residual against sampling noise (via the
+Wilson-Hilferty approximation). A few hundred sales of mixed properties
+otherwise produce trends and volatility out of noise. Submarkets with too
+few sales or months get no condition.
+
+    classifier = MarketConditionsClassifier()
+    classifier.add_sales(submarkets, sale_dates, prices)   # daily
+    report = classifier.classify()
+    inputs = report.apply(inputs, property_submarkets)
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .confidence import ConfidenceInput
+
+
+DateLike = Union[str, date, np.datetime64]
+
+DEFAULT_WINDOW_MONTHS = 12
+DEFAULT_TREND_THRESHOLD = 0.04  # Annual change beyond which a market is improving/declining
+DEFAULT_VOLATILITY_THRESHOLD = 0.03  # Monthly log-price noise beyond which a market is volatile
+DEFAULT_MIN_SALES = 12
+DEFAULT_MIN_MONTHS = 4
+DEFAULT_SIGNIFICANCE_Z = 2.0
+
+_DAYS_PER_YEAR = 365.25
+
+
+class MarketConditionsReport:
+    """
+    Per-submarket classification at one point in time.
+
+    Attributes:
+        submarkets: Submarket keys, aligned with the arrays below
+        conditions: Condition per submarket (object array; None if undetermined)
+        annual_trend: Annualized trend (NaN if undetermined)
+        volatility: Net monthly volatility (NaN if undetermined)
+        sales: Sales in the window
+        as_of: Last month of the window
+    """
+
+    def __init__(self, submarkets: Sequence[str], conditions: np.ndarray, annual_trend: np.ndarray,
+                 volatility: np.ndarray, sales: np.ndarray, as_of: np.datetime64):
+        self.submarkets: Tuple[str, ...] = tuple(submarkets)
+        self.conditions = conditions
+        self.annual_trend = annual_trend
+        self.volatility = volatility
+        self.sales = sales
+        self.as_of = as_of
+        self._rows: Dict[str, int] = {key: row for row, key in enumerate(self.submarkets)}
+
+    def __len__(self) -> int:
+        return len(self.submarkets)
+
+    def condition(self, submarket: str) -> Optional[str]:
+        """Condition of one submarket, or None if unknown or undetermined."""
+        row = self._rows.get(submarket)
+        return None if row is None else self.conditions[row]
+
+    def conditions_for(self, submarkets: Sequence[str], default: Optional[str] = "stable") -> List[Optional[str]]:
+        """
+        Conditions for many properties at once, given each one's submarket.
+
+        Args:
+            submarkets: Submarket of each property
+            default: Condition for properties whose submarket has none
+
+        Returns:
+            One condition per property
+        """
+        lookup = {key: default if value is None else value for key, value in zip(self.submarkets, self.conditions)}
+        return [lookup.get(key, default) for key in submarkets]
+
+    def apply(self, inputs: Sequence[ConfidenceInput], submarkets: Sequence[str]) -> List[ConfidenceInput]:
+        """
+        Copies of `inputs` with market_conditions set from their submarkets.
+
+        Properties whose submarket is undetermined keep their current value.
+        """
+        if len(inputs) != len(submarkets):
+            raise ValueError("inputs and submarkets must have the same length")
+        conditions = self.conditions_for(submarkets, default=None)
+        return [
+            input_data if condition is None or condition == input_data.market_conditions
+            else input_data.model_copy(update={"market_conditions": condition})
+            for input_data, condition in zip(inputs, conditions)
+        ]
+
+
+class MarketConditionsClassifier:
+    """
+    Rolling-window market condition state for many submarkets.
+
+    Args:
+        window_months: Months of sales the classification looks back over
+        trend_threshold: Annualized trend beyond which a market is
+            improving or declining
+        volatility_threshold: Net monthly volatility beyond which a market
+            is volatile
+        min_sales: Fewest sales in the window to classify a submarket
+        min_months: Fewest months with sales in the window to classify a submarket
+        significance_z: Standard errors a trend or volatility must clear
+            before it overrides "stable"
+    """
+
+    def __init__(
+        self,
+        window_months: int = DEFAULT_WINDOW_MONTHS,
+        trend_threshold: float = DEFAULT_TREND_THRESHOLD,
+        volatility_threshold: float = DEFAULT_VOLATILITY_THRESHOLD,
+        min_sales: int = DEFAULT_MIN_SALES,
+        min_months: int = DEFAULT_MIN_MONTHS,
+        significance_z: float = DEFAULT_SIGNIFICANCE_Z,
+    ):
+        if min_months < 3 or window_months < min_months:
+            raise ValueError("Need 3 <= min_months <= window_months")
+        self.window_months = window_months
+        self.trend_threshold = trend_threshold
+        self.volatility_threshold = volatility_threshold
+        self.min_sales = min_sales
+        self.min_months = min_months
+        self.significance_z = significance_z
+
+        self._submarkets: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._as_of: Optional[int] = None
+        # Ring buffers, one row per submarket; slot = month % window_months
+        self._bucket_month = np.empty((0, window_months), dtype=np.int64)
+        self._count = np.empty((0, window_months))
+        self._sum = np.empty((0, window_months))
+        self._sum_sq = np.empty((0, window_months))
+        self._sum_day = np.empty((0, window_months))
+
+    def __len__(self) -> int:
+        return len(self._submarkets)
+
+    @property
+    def as_of(self) -> Optional[np.datetime64]:
+        """Last month of the window (the latest month seen or advanced to)."""
+        return None if self._as_of is None else np.datetime64(self._as_of, "M")
+
+    def _submarket_codes(self, submarkets: Sequence[str]) -> np.ndarray:
+        codes = np.fromiter(
+            (self._codes.setdefault(key, len(self._codes)) for key in submarkets), dtype=np.int64, count=len(submarkets)
+        )
+        new = len(self._codes) - len(self._submarkets)
+        if new:
+            self._submarkets.extend(list(self._codes)[len(self._submarkets):])
+            self._bucket_month = np.vstack([self._bucket_month, np.full((new, self.window_months), np.iinfo(np.int64).min)])
+            self._count, self._sum, self._sum_sq, self._sum_day = (
+                np.vstack([array, np.zeros((new, self.window_months))])
+                for array in (self._count, self._sum, self._sum_sq, self._sum_day)
+            )
+        return codes
+
+    def advance(self, as_of: DateLike) -> None:
+        """Move the window to end at `as_of`'s month (it never moves back)."""
+        self._advance_to(int(np.datetime64(as_of, "M").astype(np.int64)))
+
+    def _advance_to(self, month: int) -> None:
+        self._as_of = month if self._as_of is None else max(self._as_of, month)
+
+    def add_sales(self, submarkets: Sequence[str], sale_dates: Sequence[DateLike], prices: Sequence[float]) -> int:
+        """
+        Fold newly recorded sales into the rolling state.
+
+        Sales may arrive late. The window advances to the latest sale
+        month; sales from before the window are ignored.
+
+        Args:
+            submarkets: Submarket key of each sale
+            sale_dates: Sale dates
+            prices: Sale prices
+
+        Returns:
+            Number of sales that landed inside the window
+
+        Raises:
+            ValueError: If columns are misaligned, a sale date is missing or
+                prices are not positive
+        """
+        days = np.asarray(sale_dates, dtype="datetime64[D]")
+        months = days.astype("datetime64[M]").astype(np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if not len(submarkets) == len(months) == len(prices):
+            raise ValueError("submarkets, sale_dates and prices must have the same length")
+        if not (np.isfinite(prices) & (prices > 0)).all():
+            raise ValueError("Sale prices must be positive and finite")
+        if np.isnat(days).any():
+            raise ValueError("Sale dates must not be missing")
+        codes = self._submarket_codes(submarkets)
+        if not len(months):
+            return 0
+
+        self._advance_to(int(months.max()))
+        inside = months > self._as_of - self.window_months
+        codes, months, logs = codes[inside], months[inside], np.log(prices[inside])
+        days = days[inside].astype(np.int64).astype(np.float64)
+        slots = months % self.window_months
+        cells = codes * self.window_months + slots
+
+        # A newer month takes over its slot; older holders have left the window
+        bucket_month = self._bucket_month.reshape(-1)
+        cell_month = np.full(bucket_month.shape, np.iinfo(np.int64).min)
+        np.maximum.at(cell_month, cells, months)
+        stale = np.flatnonzero(cell_month > bucket_month)
+        bucket_month[stale] = cell_month[stale]
+        for array in (self._count, self._sum, self._sum_sq, self._sum_day):
+            array.reshape(-1)[stale] = 0.0
+
+        size = bucket_month.size
+        self._count += np.bincount(cells, minlength=size).reshape(self._count.shape)
+        self._sum += np.bincount(cells, weights=logs, minlength=size).reshape(self._sum.shape)
+        self._sum_sq += np.bincount(cells, weights=logs * logs, minlength=size).reshape(self._sum_sq.shape)
+        self._sum_day += np.bincount(cells, weights=days, minlength=size).reshape(self._sum_day.shape)
+        return len(cells)
+
+    def classify(self) -> MarketConditionsReport:
+        """Trend, volatility and condition of every submarket seen so far."""
+        size = len(self._submarkets)
+        if self._as_of is None:
+            nothing = np.full(size, np.nan)
+            return MarketConditionsReport(self._submarkets, np.full(size, None, dtype=object), nothing,
+                                          nothing.copy(), np.zeros(size, dtype=np.int64), None)
+
+        live = (self._bucket_month > self._as_of - self.window_months) & (self._count > 0)
+        n = np.where(live, self._count, 0.0)
+        # Mean sale date of each month, in years relative to the window's last month
+        origin = self.as_of.astype("datetime64[D]").astype(np.int64)
+        x = np.where(live, (self._sum_day / np.where(live, n, 1.0) - origin) / _DAYS_PER_YEAR, 0.0)
+        s = np.where(live, self._sum, 0.0)
+        q = np.where(live, self._sum_sq, 0.0)
+        sales = n.sum(axis=1)
+        months = live.sum(axis=1)
+        enough = (sales >= self.min_sales) & (months >= self.min_months)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Weighted (by sales) least squares of monthly mean log price on mean sale date
+            mean_x = (n * x).sum(axis=1) / sales
+            mean_y = s.sum(axis=1) / sales
+            dx = np.where(live, x - mean_x[:, None], 0.0)
+            sxx = (n * dx * dx).sum(axis=1)
+            sxy = (s * dx).sum(axis=1)
+            slope = sxy / sxx
+            month_ss = (s * s / np.where(live, n, 1.0)).sum(axis=1)
+            residual = month_ss - sales * mean_y ** 2 - slope * sxy
+            # Within-month variance is the noise each monthly mean carries from sampling
+            sigma2 = np.maximum(q.sum(axis=1) - month_ss, 0.0) / (sales - months)
+            noise = (months - 2) * np.where(sales > months, sigma2, 0.0)
+            volatility = np.sqrt(np.maximum(residual - noise, 0.0) / sales)
+            annual_trend = np.expm1(slope)
+
+            z = self.significance_z
+            trending = np.abs(slope) > z * np.sqrt(np.maximum(residual, 0.0) / (months - 2) / sxx)
+            # Upper chi-square quantile with months - 2 degrees of freedom (Wilson-Hilferty)
+            spread = 2.0 / (9.0 * (months - 2))
+            unsteady = residual > noise * (1.0 - spread + z * np.sqrt(spread)) ** 3
+
+        conditions = np.full(size, None, dtype=object)
+        conditions[enough] = "stable"
+        conditions[enough & trending & (annual_trend > self.trend_threshold)] = "improving"
+        conditions[enough & trending & (annual_trend < -self.trend_threshold)] = "declining"
+        conditions[enough & unsteady & (volatility > self.volatility_threshold)] = "volatile"
+        annual_trend[~enough] = np.nan
+        volatility[~enough] = np.nan
+        return MarketConditionsReport(self._submarkets, conditions, annual_trend, volatility,
+                                      sales.astype(np.int64), self.as_of)
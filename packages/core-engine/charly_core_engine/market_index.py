@@ -0,0 +1,255 @@
+"""Market price indexes and time adjustment of comparable sales.
+
+ConfidenceInput takes comparable sale prices as recorded. In a moving
+market, a comp that sold 18 months before the valuation date is off by the
+market's drift since then, and that drift shows up as dispersion. This
+module restates each price to the valuation date:
+
+    adjusted = price * index(valuation_date) / index(sale_date)
+
+An index is a monthly series per jurisdiction, optionally split further by
+submarket. Each monthly level applies on the first day of its month; days
+in between are interpolated linearly, and dates outside the series take the
+nearest end level. On construction, each series is expanded into dense
+per-month level and slope arrays, and a calendar table maps every day the
+series span to its month and month fraction. A lookup is then a few
+gathers plus a multiply-add, and resolved market keys are cached, so
+adjusting millions of comps costs a few array operations.
+
+    store = MarketIndexStore.from_series({
+        "collin_county_tx": {"2023-01": 100.0, "2024-01": 106.5},
+        ("collin_county_tx", "office"): {"2023-01": 100.0, "2024-01": 97.0},
+    })
+    comps = store.adjust_comparable_sales(prices, sale_dates, "2024-01-01",
+                                          "collin_county_tx", "office")
+    ConfidenceInput(..., comparable_sales=comps)
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .rounding import round_currency
+
+
+DateLike = Union[str, date, np.datetime64]
+MarketKey = Union[str, Tuple[str, Optional[str]]]
+
+NO_MARKET = -1  # Market code for keys without an index; prices pass through unchanged
+
+
+def _month_numbers(months) -> np.ndarray:
+    return np.asarray(months, dtype="datetime64[M]").astype(np.int64)
+
+
+def _day_numbers(dates) -> np.ndarray:
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+
+
+class MarketIndexStore:
+    """
+    Monthly market indexes keyed by (jurisdiction_id, submarket).
+
+    An empty or None submarket holds the jurisdiction-wide series, which
+    also covers submarkets without a series of their own.
+
+    Args:
+        jurisdiction_id: Jurisdiction of each observation
+        submarket: Submarket of each observation (None or "" for jurisdiction-wide)
+        month: Month of each observation (anything numpy converts to datetime64[M])
+        level: Index level, any positive scale; only ratios are used
+
+    Raises:
+        ValueError: If columns are empty or misaligned, levels are not
+            positive and finite, or a market has the same month twice
+    """
+
+    def __init__(
+        self,
+        jurisdiction_id: Sequence[str],
+        submarket: Optional[Sequence[Optional[str]]],
+        month: Sequence[DateLike],
+        level: Sequence[float],
+    ):
+        jurisdiction_id = [str(value) for value in jurisdiction_id]
+        if submarket is None:
+            submarket = [""] * len(jurisdiction_id)
+        submarket = ["" if value is None else str(value) for value in submarket]
+        month = _month_numbers(month)
+        level = np.asarray(level, dtype=np.float64)
+        if not len(jurisdiction_id) == len(submarket) == len(month) == len(level):
+            raise ValueError("All index columns must have the same length")
+        if not len(level):
+            raise ValueError("A market index store needs at least one observation")
+        if not (np.isfinite(level) & (level > 0)).all():
+            raise ValueError("Index levels must be positive and finite")
+
+        keys = sorted(set(zip(jurisdiction_id, submarket)))
+        self._markets: Tuple[Tuple[str, str], ...] = tuple(keys)
+        self._exact: Dict[Tuple[str, str], int] = {key: code for code, key in enumerate(keys)}
+        codes = np.array([self._exact[key] for key in zip(jurisdiction_id, submarket)], dtype=np.int64)
+
+        # Sort by market, then month; fill gaps linearly into one dense run per market
+        order = np.lexsort((month, codes))
+        codes, month, level = codes[order], month[order], level[order]
+        if np.any((np.diff(codes) == 0) & (np.diff(month) == 0)):
+            raise ValueError("Duplicate month in a market index")
+        starts = np.searchsorted(codes, np.arange(len(keys)))
+        ends = np.append(starts[1:], len(codes))
+        self._first_month = month[starts]
+        self._months = month[ends - 1] - self._first_month + 1
+        self._offsets = np.concatenate([[0], np.cumsum(self._months)])
+        self._levels = np.empty(self._offsets[-1])
+        for code, (start, end) in enumerate(zip(starts, ends)):
+            dense = np.arange(self._first_month[code], month[end - 1] + 1)
+            self._levels[self._offsets[code]:self._offsets[code + 1]] = np.interp(
+                dense, month[start:end], level[start:end]
+            )
+        # Change to the next month's level; zero after each market's last month
+        self._slopes = np.zeros_like(self._levels)
+        self._slopes[:-1] = np.diff(self._levels)
+        self._slopes[self._offsets[1:] - 1] = 0.0
+
+        # Calendar over every indexed month: day -> (month, fraction of month elapsed).
+        # Days outside it clip to its ends, which lie outside every series.
+        months = np.arange(month.min(), month.max() + 2).astype("datetime64[M]").astype("datetime64[D]")
+        self._first_day = int(months[0].astype(np.int64))
+        lengths = np.diff(months).astype(np.int64)
+        self._day_month = np.repeat(np.arange(month.min(), month.max() + 1), lengths)
+        self._day_fraction = (np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)) \
+            / np.repeat(lengths, lengths)
+
+        self._resolved: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def from_series(cls, series: Mapping[MarketKey, Mapping[DateLike, float]]) -> "MarketIndexStore":
+        """
+        Build a store from {market: {month: level}}.
+
+        Args:
+            series: Keyed by jurisdiction_id (jurisdiction-wide) or
+                (jurisdiction_id, submarket)
+
+        Returns:
+            MarketIndexStore over every series
+        """
+        jurisdictions, submarkets, months, levels = [], [], [], []
+        for key, monthly in series.items():
+            jurisdiction_id, submarket = (key, None) if isinstance(key, str) else key
+            for month, level in monthly.items():
+                jurisdictions.append(jurisdiction_id)
+                submarkets.append(submarket)
+                months.append(month)
+                levels.append(level)
+        return cls(jurisdictions, submarkets, np.array(months, dtype="datetime64[M]"), levels)
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    @property
+    def markets(self) -> Tuple[Tuple[str, str], ...]:
+        """(jurisdiction_id, submarket) of each market, in code order."""
+        return self._markets
+
+    def market_code(self, jurisdiction_id: str, submarket: Optional[str] = None) -> int:
+        """
+        Code of the series that applies to a market.
+
+        Falls back to the jurisdiction-wide series when the submarket has
+        none. Results are cached.
+
+        Returns:
+            Market code, or NO_MARKET if no series applies
+        """
+        key = (jurisdiction_id, submarket or "")
+        code = self._resolved.get(key)
+        if code is None:
+            code = self._exact.get(key, self._exact.get((jurisdiction_id, ""), NO_MARKET))
+            self._resolved[key] = code
+        return code
+
+    def market_codes(
+        self, jurisdiction_ids: Sequence[str], submarkets: Optional[Sequence[Optional[str]]] = None
+    ) -> np.ndarray:
+        """
+        Vectorized market_code over parallel key columns.
+
+        Returns:
+            int64 market codes, NO_MARKET where no series applies
+        """
+        jurisdiction_ids = list(jurisdiction_ids)
+        if submarkets is None:
+            submarkets = [None] * len(jurisdiction_ids)
+        elif len(submarkets) != len(jurisdiction_ids):
+            raise ValueError("jurisdiction_ids and submarkets must have the same length")
+        return np.fromiter(
+            map(self.market_code, jurisdiction_ids, submarkets), dtype=np.int64, count=len(jurisdiction_ids)
+        )
+
+    def levels(self, codes, dates) -> np.ndarray:
+        """
+        Index level of each market code on each date (codes and dates broadcast).
+
+        NO_MARKET codes get a level of 1.0.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        day = np.clip(_day_numbers(dates) - self._first_day, 0, len(self._day_month) - 1)
+        known = codes != NO_MARKET
+        market = np.where(known, codes, 0)
+        months = self._months[market]
+        position = self._day_month[day] - self._first_month[market]
+        inside = (position >= 0) & (position < months)
+        slot = self._offsets[market] + np.clip(position, 0, months - 1)
+        level = self._levels[slot] + self._slopes[slot] * np.where(inside, self._day_fraction[day], 0.0)
+        return np.where(known, level, 1.0)
+
+    def adjustment_factors(self, codes, sale_dates, valuation_dates) -> np.ndarray:
+        """Factors restating prices from sale_dates to valuation_dates (all arguments broadcast)."""
+        return self.levels(codes, valuation_dates) / self.levels(codes, sale_dates)
+
+    def adjust_prices(self, prices, sale_dates, valuation_dates, codes) -> np.ndarray:
+        """
+        Restate sale prices to their valuation dates in one array pass.
+
+        Args:
+            prices: Sale prices
+            sale_dates: Sale date of each price
+            valuation_dates: Valuation date per price, or one for all; for
+                ragged comps, np.repeat the per-property dates by comp count
+            codes: Market code per price (see market_codes), or one for all
+
+        Returns:
+            float64 adjusted prices; NO_MARKET prices are unchanged
+        """
+        return np.asarray(prices, dtype=np.float64) * self.adjustment_factors(codes, sale_dates, valuation_dates)
+
+    def adjust_comparable_sales(
+        self,
+        prices: Sequence[Union[Decimal, float]],
+        sale_dates: Sequence[DateLike],
+        valuation_date: DateLike,
+        jurisdiction_id: str,
+        submarket: Optional[str] = None,
+    ) -> List[Decimal]:
+        """
+        Comparable sales of one property restated for ConfidenceInput.
+
+        Args:
+            prices: Comparable sale prices
+            sale_dates: Sale date of each comparable
+            valuation_date: Date the property is valued as of
+            jurisdiction_id: Jurisdiction of the property
+            submarket: Submarket within the jurisdiction, if indexed
+
+        Returns:
+            Cent-rounded Decimal prices as of valuation_date
+        """
+        if len(prices) != len(sale_dates):
+            raise ValueError("prices and sale_dates must have the same length")
+        if not len(prices):
+            return []
+        code = self.market_code(jurisdiction_id, submarket)
+        adjusted = self.adjust_prices([float(price) for price in prices], sale_dates, valuation_date, code)
+        return [round_currency(Decimal(repr(price))) for price in adjusted.tolist()]
@@ -0,0 +1,286 @@
+"""Data quality and uniqueness scores derived from assessor roll records.
+
+ConfidenceInput.data_quality_score and property_uniqueness widen the band
+directly, and are otherwise set by hand. A QualityScorer derives both,
+column-wise, for a whole roll:
+
+- data_quality_score is a weighted mean of
+  - completeness: the share of `required_fields` present,
+  - freshness: per `date_fields` column, 1 for a date on `as_of`, falling
+    linearly to 0 at `stale_days` old (0 when the date is missing),
+  - comp density: comparable sales available, as a share of
+    `target_comparables`, capped at 1.
+  Components without input (no date fields, no comparable counts) drop
+  out, and the remaining weights are rescaled.
+- property_uniqueness is the mean rarity of a record's attributes. A
+  value's rarity is 1 - frequency / frequency of the most common value,
+  so the most common value scores 0 and a value absent from the roll
+  scores 1. Numeric attributes are binned into `bins` equal-width bins
+  (in log space when all values are positive) between their 1st and 99th
+  percentiles, plus a bin for each tail.
+
+Frequency tables and bin edges are built once, from the roll passed to
+the constructor, and reused by every `score` call. Missing values are
+None, NaN, NaT or empty strings.
+
+    scorer = QualityScorer(roll, required_fields=["building_sqft", "year_built"],
+                           date_fields=["last_inspection"], categorical_fields=["property_type"],
+                           numeric_fields=["building_sqft"])
+    scores = scorer.score(comparable_counts=counts)
+    batch = ScreeningBatch(..., **scores.as_columns())
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+DEFAULT_STALE_DAYS = 1095
+DEFAULT_TARGET_COMPARABLES = 6
+DEFAULT_BINS = 20
+
+# Uniqueness for records with none of the scored attributes (ConfidenceInput's default)
+_DEFAULT_UNIQUENESS = 0.5
+
+# Scores are rounded like the engine's other ratios
+_SCORE_DECIMALS = 3
+
+DateLike = Union[str, date, np.datetime64]
+
+
+@dataclass(frozen=True)
+class QualityWeights:
+    """Relative weights of the data quality components."""
+
+    completeness: float = 0.5
+    freshness: float = 0.3
+    comp_density: float = 0.2
+
+
+@dataclass
+class QualityScores:
+    """
+    Per-record scores, aligned with the scored columns.
+
+    Attributes:
+        data_quality_score: Combined quality score (0-1)
+        property_uniqueness: Mean attribute rarity (0=common, 1=unique)
+        completeness: Share of required fields present
+        freshness: Mean freshness of the date fields (None without date fields)
+        comp_density: Comparable coverage (None without comparable counts)
+    """
+
+    data_quality_score: np.ndarray
+    property_uniqueness: np.ndarray
+    completeness: np.ndarray
+    freshness: Optional[np.ndarray] = None
+    comp_density: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.data_quality_score)
+
+    def as_columns(self) -> Dict[str, np.ndarray]:
+        """The ConfidenceInput fields, keyed for ScreeningBatch or validate_confidence_columns."""
+        return {"data_quality_score": self.data_quality_score, "property_uniqueness": self.property_uniqueness}
+
+
+def _missing(values: np.ndarray) -> np.ndarray:
+    """True for None, NaN, NaT and empty-string entries."""
+    kind = values.dtype.kind
+    if kind == "f":
+        return np.isnan(values)
+    if kind == "M":
+        return np.isnat(values)
+    if kind in "US":
+        return values == values.dtype.type()
+    if kind == "O":
+        with np.errstate(invalid="ignore"):
+            return np.equal(values, None) | (values != values) | np.equal(values, "")
+    return np.zeros(len(values), dtype=bool)
+
+
+class _CategoricalTable:
+    def __init__(self, values: np.ndarray):
+        self.labels, counts = np.unique(values[~_missing(values)].astype(str), return_counts=True)
+        # Trailing slot for values the roll never had
+        self.rarity = np.append(1.0 - counts / max(counts.max(initial=0), 1), 1.0)
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        labels = values.astype(str)
+        slot = np.searchsorted(self.labels, labels)
+        found = slot < len(self.labels)
+        found[found] = self.labels[slot[found]] == labels[found]
+        return self.rarity[np.where(found, slot, len(self.labels))]
+
+
+class _NumericTable:
+    def __init__(self, values: np.ndarray, bins: int):
+        values = values[~np.isnan(values)]
+        self.log = bool(len(values)) and values.min() > 0
+        scaled = np.log(values) if self.log else values
+        if len(scaled):
+            low, high = np.percentile(scaled, [1, 99])
+        else:
+            low = high = 0.0
+        self.low, self.high, self.bins = low, high, bins
+        self.width = (high - low) / bins or 1.0
+        counts = np.bincount(self._bins(scaled), minlength=bins + 2)
+        self.rarity = 1.0 - counts / max(counts.max(), 1)
+
+    def _bins(self, scaled: np.ndarray) -> np.ndarray:
+        # 0 is the low tail, bins + 1 the high tail; the top edge closes the last bin
+        inner = np.clip(np.floor((scaled - self.low) / self.width), 0, self.bins - 1).astype(np.int64) + 1
+        inner[scaled < self.low] = 0
+        inner[scaled > self.high] = self.bins + 1
+        return inner
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scaled = np.log(values) if self.log else values
+        # Non-positive values under a log scale fall in the low tail; the caller discards missing ones
+        return self.rarity[self._bins(np.where(np.isnan(scaled), -np.inf, scaled))]
+
+
+class QualityScorer:
+    """
+    Scoring rules and frequency tables for one assessor roll.
+
+    Args:
+        roll: Record columns by field name, all the same length
+        required_fields: Fields whose presence makes up completeness
+        date_fields: Date fields whose age makes up freshness
+        categorical_fields: Attributes scored for rarity by value
+        numeric_fields: Attributes scored for rarity by histogram bin
+        stale_days: Age at which a date field's freshness reaches 0
+        target_comparables: Comparable count that earns full comp density
+        weights: Relative weights of the quality components
+        bins: Histogram bins for numeric attributes
+
+    Raises:
+        ValueError: If no fields are named, a named field is missing from
+            the roll, columns are misaligned, or a setting is out of range
+    """
+
+    def __init__(
+        self,
+        roll: Mapping[str, Sequence],
+        required_fields: Sequence[str] = (),
+        date_fields: Sequence[str] = (),
+        categorical_fields: Sequence[str] = (),
+        numeric_fields: Sequence[str] = (),
+        stale_days: int = DEFAULT_STALE_DAYS,
+        target_comparables: int = DEFAULT_TARGET_COMPARABLES,
+        weights: QualityWeights = QualityWeights(),
+        bins: int = DEFAULT_BINS,
+    ):
+        if stale_days <= 0 or target_comparables <= 0 or bins <= 0:
+            raise ValueError("stale_days, target_comparables and bins must be positive")
+        if min(weights.completeness, weights.freshness, weights.comp_density) < 0 or weights.completeness <= 0:
+            raise ValueError("Quality weights must be non-negative, with a positive completeness weight")
+        self.required_fields: Tuple[str, ...] = tuple(required_fields)
+        self.date_fields: Tuple[str, ...] = tuple(date_fields)
+        self.categorical_fields: Tuple[str, ...] = tuple(categorical_fields)
+        self.numeric_fields: Tuple[str, ...] = tuple(numeric_fields)
+        self.stale_days = stale_days
+        self.target_comparables = target_comparables
+        self.weights = weights
+        if not (self.required_fields or self.date_fields or self.categorical_fields or self.numeric_fields):
+            raise ValueError("Name at least one field to score")
+
+        self._roll = self._columns(roll)
+        self._categorical = {name: _CategoricalTable(self._roll[name]) for name in self.categorical_fields}
+        self._numeric = {name: _NumericTable(self._roll[name], bins) for name in self.numeric_fields}
+        latest = [dates[~np.isnat(dates)].max() for dates in (self._roll[name] for name in self.date_fields)
+                  if not np.isnat(dates).all()]
+        # Freshness is measured against the roll's newest date unless told otherwise
+        self.as_of: Optional[np.datetime64] = max(latest) if latest else None
+
+    def _columns(self, columns: Mapping[str, Sequence]) -> Dict[str, np.ndarray]:
+        names = set(self.required_fields) | set(self.date_fields) | set(self.categorical_fields) | set(self.numeric_fields)
+        missing = sorted(names - set(columns))
+        if missing:
+            raise ValueError(f"Missing roll columns: {', '.join(missing)}")
+        arrays = {}
+        for name in names:
+            values = columns[name]
+            if name in self.date_fields:
+                arrays[name] = np.asarray(values, dtype="datetime64[D]")
+            elif name in self.numeric_fields:
+                arrays[name] = np.asarray(np.where(_missing(np.asarray(values)), np.nan, values), dtype=np.float64)
+            else:
+                arrays[name] = np.asarray(values)
+        if len({len(array) for array in arrays.values()}) > 1:
+            raise ValueError("All roll columns must have the same length")
+        return arrays
+
+    def score(
+        self,
+        columns: Optional[Mapping[str, Sequence]] = None,
+        as_of: Optional[DateLike] = None,
+        comparable_counts: Optional[Sequence[int]] = None,
+    ) -> QualityScores:
+        """
+        Score records against this roll's tables.
+
+        Args:
+            columns: Records to score, with the roll's field names
+                (default: the roll itself)
+            as_of: Date freshness is measured from (default: newest date in the roll)
+            comparable_counts: Comparable sales available per record
+
+        Returns:
+            QualityScores with arrays aligned to the records
+        """
+        arrays = self._roll if columns is None else self._columns(columns)
+        size = len(next(iter(arrays.values())))
+        if comparable_counts is not None and len(comparable_counts) != size:
+            raise ValueError("comparable_counts must have one entry per record")
+
+        if self.required_fields:
+            present = sum((~_missing(arrays[name])).astype(np.float64) for name in self.required_fields)
+            completeness = present / len(self.required_fields)
+        else:
+            completeness = np.ones(size)
+        components = [(self.weights.completeness, completeness)]
+
+        freshness = None
+        if self.date_fields:
+            reference = np.datetime64(as_of, "D") if as_of is not None else self.as_of
+            freshness = np.zeros(size)
+            if reference is not None:
+                for name in self.date_fields:
+                    dates = arrays[name]
+                    age = (reference - dates).astype(np.float64)
+                    freshness += np.where(np.isnat(dates), 0.0, np.clip(1.0 - age / self.stale_days, 0.0, 1.0))
+                freshness /= len(self.date_fields)
+            components.append((self.weights.freshness, freshness))
+
+        comp_density = None
+        if comparable_counts is not None:
+            counts = np.asarray(comparable_counts, dtype=np.float64)
+            comp_density = np.clip(counts / self.target_comparables, 0.0, 1.0)
+            components.append((self.weights.comp_density, comp_density))
+
+        total = sum(weight for weight, _ in components)
+        quality = sum(weight * component for weight, component in components) / total
+
+        rarity_sum = np.zeros(size)
+        scored = np.zeros(size)
+        for tables in (self._categorical, self._numeric):
+            for name, table in tables.items():
+                values = arrays[name]
+                known = ~_missing(values)
+                rarity_sum += np.where(known, table(values), 0.0)
+                scored += known
+        with np.errstate(invalid="ignore"):
+            uniqueness = np.where(scored > 0, rarity_sum / scored, _DEFAULT_UNIQUENESS)
+
+        return QualityScores(
+            data_quality_score=np.round(quality, _SCORE_DECIMALS),
+            property_uniqueness=np.round(uniqueness, _SCORE_DECIMALS),
+            completeness=completeness,
+            freshness=freshness,
+            comp_density=comp_density,
+        )
@@ -0,0 +1,364 @@
+"""Mergeable quantile sketches for portfolio-level summaries.
+
+Percentiles of a decided portfolio used to need every result in memory
+and a sort. A QuantileSketch is a merging t-digest per group: each group's
+values are summarized as weighted centroids, sorted by mean. A centroid
+starting at quantile q0 absorbs its neighbours while its right edge q
+keeps k(q) - k(q0) <= 1 under the scale function
+
+    k(q) = compression / (2 pi) * asin(2q - 1)
+
+so centroids are small near the tails and larger around the median. A
+group holds about compression / 2 centroids on shuffled input and never
+more than about compression, however many values it has seen. Exact minimum,
+maximum and count are kept alongside.
+
+A centroid spans about 2 pi sqrt(q (1 - q)) / compression of rank, and
+the rank error of a quantile is bounded by that width: under 1.6% at the
+median and 0.7% at the 5th and 95th percentiles with the default
+compression of 200. No centroid ever holds more than
+sin(pi / compression) of its group's values. Small groups keep every
+value as its own centroid and are exact.
+
+All groups are compressed together, one centroid per group per step, so
+adding a chunk or merging a sketch from another worker or shard costs a
+sort of the chunk and the current centroids plus about compression / 2
+vectorized steps. Sketches pickle as plain arrays.
+
+    quantiles = PortfolioQuantiles()
+    for chunk in chunks:
+        quantiles.add_results(chunk)   # (property_id, jurisdiction_id, decision, confidence)
+    quantiles.merge(other_worker_quantiles)
+    quantiles.quantiles("expected_roi", jurisdiction_id="collin_county_tx")
+"""
+
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .confidence import ConfidenceResult
+from .decision import DecisionResult
+from .result_store import DecisionStore
+from .rounding import CENTS, THOUSANDTHS, half_up
+
+
+DEFAULT_COMPRESSION = 200
+_MIN_COMPRESSION = 20
+
+# Quantiles reported when none are asked for
+DEFAULT_QUANTILES: Tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+PORTFOLIO_METRICS: Tuple[str, ...] = (
+    "expected_annual_savings",
+    "expected_roi",
+    "assessment_ratio",
+    "confidence_band_pct",
+)
+
+# Quantum each metric is reported in, as on the result models
+_ROUNDING = {metric: half_up(CENTS) for metric in PORTFOLIO_METRICS}
+_ROUNDING["confidence_band_pct"] = half_up(THOUSANDTHS)
+
+_CHUNK_SIZE = 65536
+
+
+def _compress(groups: np.ndarray, means: np.ndarray, weights: np.ndarray, compression: float):
+    """Merge centroids of every group under the k1 scale function, sorted by (group, mean)."""
+    order = np.lexsort((means, groups))
+    groups, means, weights = groups[order], means[order], weights[order]
+    first = np.empty(len(groups), dtype=bool)
+    first[:1] = True
+    np.not_equal(groups[1:], groups[:-1], out=first[1:])
+    starts = np.flatnonzero(first)
+    lengths = np.diff(np.append(starts, len(groups)))
+
+    ends = starts + lengths
+
+    cumulative = np.cumsum(weights)
+    before = cumulative - weights
+    base = before[starts]
+    total = cumulative[ends - 1] - base
+    scale = compression / (2 * np.pi)
+
+    # Each active group opens a centroid at `position` and extends it over
+    # every input whose right quantile stays within one k unit of its start
+    new = np.zeros(len(groups), dtype=bool)
+    position = starts.copy()
+    active = np.arange(len(starts))
+    while len(active):
+        at = position[active]
+        new[at] = True
+        q_start = (before[at] - base[active]) / total[active]
+        k_limit = np.arcsin(np.clip(2 * q_start - 1, -1.0, 1.0)) + 1 / scale
+        q_limit = (np.sin(np.minimum(k_limit, np.pi / 2)) + 1) / 2
+        stop = np.searchsorted(cumulative, base[active] + q_limit * total[active], side="right")
+        # An input already over the limit stays a centroid of its own
+        position[active] = np.clip(stop, at + 1, ends[active])
+        active = active[position[active] < ends[active]]
+
+    cluster = np.cumsum(new) - 1
+    merged_weights = np.bincount(cluster, weights=weights)
+    merged_means = np.bincount(cluster, weights=weights * means) / merged_weights
+    return groups[new], merged_means, merged_weights
+
+
+class QuantileSketch:
+    """
+    Per-group t-digest over streamed values.
+
+    Args:
+        compression: Accuracy/size trade-off; a group keeps between about
+            compression / 2 and compression centroids
+
+    Raises:
+        ValueError: If compression is below 20
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        if compression < _MIN_COMPRESSION:
+            raise ValueError(f"compression must be at least {_MIN_COMPRESSION}")
+        self.compression = float(compression)
+        self._codes: Dict[str, int] = {}
+        self._count = np.zeros(0)
+        self._min = np.zeros(0)
+        self._max = np.zeros(0)
+        # Centroids of every group, sorted by (group, mean); _starts has one offset per group plus the end
+        self._groups = np.empty(0, dtype=np.int64)
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._starts = np.zeros(1, dtype=np.int64)
+
+    @property
+    def groups(self) -> Tuple[str, ...]:
+        """Group labels, in the order they were first seen."""
+        return tuple(self._codes)
+
+    @property
+    def centroid_count(self) -> int:
+        """Centroids held across all groups."""
+        return len(self._means)
+
+    def count(self, group: Optional[str] = None) -> int:
+        """Values added to a group, or to the whole sketch."""
+        if group is None:
+            return int(self._count.sum())
+        code = self._codes.get(group)
+        return 0 if code is None else int(self._count[code])
+
+    def _register(self, labels: Iterable[str]) -> np.ndarray:
+        codes = np.array([self._codes.setdefault(str(label), len(self._codes)) for label in labels], dtype=np.int64)
+        grow = len(self._codes) - len(self._count)
+        if grow:
+            self._count = np.append(self._count, np.zeros(grow))
+            self._min = np.append(self._min, np.full(grow, np.inf))
+            self._max = np.append(self._max, np.full(grow, -np.inf))
+        return codes
+
+    def add(self, groups: Sequence, values: Sequence[float], labels: Optional[Sequence[str]] = None) -> int:
+        """
+        Add a chunk of values.
+
+        NaN and infinite values (e.g. missing ROI) are skipped.
+
+        Args:
+            groups: Group label per value or, with `labels`, integer codes into it
+            values: Values to summarize
+            labels: Label of each group code
+
+        Returns:
+            Number of values added
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(groups) != len(values):
+            raise ValueError("groups and values must have the same length")
+        finite = np.isfinite(values)
+        values = values[finite]
+        if labels is None:
+            labels, groups = np.unique(np.asarray(groups)[finite].astype(str), return_inverse=True)
+        else:
+            groups = np.asarray(groups, dtype=np.int64)[finite]
+        if not len(values):
+            return 0
+        codes = self._register(labels)[groups.reshape(-1)]
+
+        self._count += np.bincount(codes, minlength=len(self._count))
+        np.minimum.at(self._min, codes, values)
+        np.maximum.at(self._max, codes, values)
+        self._absorb(codes, values, np.ones(len(values)))
+        return len(values)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Fold another sketch (e.g. from another worker or shard) into this one.
+
+        Returns:
+            This sketch
+        """
+        codes = self._register(other._codes)
+        self._count[codes] += other._count
+        self._min[codes] = np.minimum(self._min[codes], other._min)
+        self._max[codes] = np.maximum(self._max[codes], other._max)
+        if len(other._means):
+            self._absorb(codes[other._groups], other._means, other._weights)
+        return self
+
+    def _absorb(self, groups: np.ndarray, means: np.ndarray, weights: np.ndarray) -> None:
+        self._groups, self._means, self._weights = _compress(
+            np.concatenate([self._groups, groups]),
+            np.concatenate([self._means, means]),
+            np.concatenate([self._weights, weights]),
+            self.compression,
+        )
+        self._starts = np.searchsorted(self._groups, np.arange(len(self._codes) + 1))
+
+    def quantiles(self, qs: Sequence[float], group: Optional[str] = None) -> np.ndarray:
+        """
+        Estimated quantiles of one group, or of every value in the sketch.
+
+        Args:
+            qs: Quantiles in [0, 1]
+            group: Group label (default: all groups together)
+
+        Returns:
+            float64 estimates, NaN when the group has no values
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Quantiles must be between 0 and 1")
+        if group is None:
+            order = np.argsort(self._means, kind="stable")
+            means, weights = self._means[order], self._weights[order]
+            low, high = self._min.min(initial=np.inf), self._max.max(initial=-np.inf)
+        else:
+            code = self._codes.get(group)
+            if code is None:
+                return np.full(qs.shape, np.nan)
+            start, end = self._starts[code], self._starts[code + 1]
+            means, weights = self._means[start:end], self._weights[start:end]
+            low, high = self._min[code], self._max[code]
+        total = weights.sum()
+        if not total:
+            return np.full(qs.shape, np.nan)
+        # Each centroid sits at the middle of the rank range it covers; the ends are the exact extremes
+        centers = np.cumsum(weights) - weights / 2
+        return np.interp(qs * total, np.concatenate([[0.0], centers, [total]]),
+                         np.concatenate([[low], means, [high]]))
+
+
+class PortfolioQuantiles:
+    """
+    Quantile sketches of the portfolio metrics, by jurisdiction.
+
+    Tracks expected_annual_savings, expected_roi, assessment_ratio and
+    confidence_band_pct. Batch runners add each chunk as it is decided,
+    and merge their instances when workers or shards finish.
+
+    Args:
+        compression: Compression of each metric's QuantileSketch
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.sketches: Dict[str, QuantileSketch] = {metric: QuantileSketch(compression) for metric in PORTFOLIO_METRICS}
+
+    @property
+    def jurisdictions(self) -> List[str]:
+        """Jurisdictions with at least one value, sorted."""
+        return sorted(set().union(*(sketch.groups for sketch in self.sketches.values())))
+
+    def add_columns(self, jurisdiction_ids: Sequence, labels: Optional[Sequence[str]] = None, **columns) -> None:
+        """
+        Add metric columns (e.g. from a ScreeningResult) for one chunk.
+
+        Args:
+            jurisdiction_ids: Jurisdiction per row or, with `labels`, integer codes into it
+            labels: Jurisdiction of each code
+            **columns: Any of the portfolio metrics, one value per row
+
+        Raises:
+            ValueError: If a column is not a portfolio metric or is misaligned
+        """
+        unknown = sorted(set(columns) - set(PORTFOLIO_METRICS))
+        if unknown:
+            raise ValueError(f"Not portfolio metrics: {', '.join(unknown)}")
+        if labels is None:
+            labels, jurisdiction_ids = np.unique(np.asarray(jurisdiction_ids).astype(str), return_inverse=True)
+        for metric, values in columns.items():
+            self.sketches[metric].add(jurisdiction_ids, values, labels=labels)
+
+    def add_results(
+        self,
+        rows: Iterable[Tuple[str, str, DecisionResult, ConfidenceResult]],
+        chunk_size: int = _CHUNK_SIZE,
+    ) -> None:
+        """Add (property_id, jurisdiction_id, decision, confidence) rows, as written to a DecisionStore."""
+        columns: Dict[str, list] = {metric: [] for metric in PORTFOLIO_METRICS}
+        jurisdiction_ids: list = []
+        for _, jurisdiction_id, decision, confidence in rows:
+            jurisdiction_ids.append(jurisdiction_id)
+            columns["expected_annual_savings"].append(float(decision.expected_annual_savings))
+            columns["expected_roi"].append(np.nan if decision.expected_roi is None else float(decision.expected_roi))
+            columns["assessment_ratio"].append(float(decision.assessment_ratio))
+            columns["confidence_band_pct"].append(float(confidence.confidence_band_pct))
+            if len(jurisdiction_ids) == chunk_size:
+                self.add_columns(jurisdiction_ids, **columns)
+                jurisdiction_ids = []
+                columns = {metric: [] for metric in PORTFOLIO_METRICS}
+        if jurisdiction_ids:
+            self.add_columns(jurisdiction_ids, **columns)
+
+    def add_store(self, store: DecisionStore, chunk_size: int = 16 * _CHUNK_SIZE) -> None:
+        """Add every record of a DecisionStore, straight from its mapped columns."""
+        records = store.records
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
+            codes, inverse = np.unique(chunk["jurisdiction"], return_inverse=True)
+            self.add_columns(
+                inverse, labels=[store.string(int(code)) for code in codes],
+                **{metric: chunk[metric] for metric in PORTFOLIO_METRICS}
+            )
+
+    def merge(self, other: "PortfolioQuantiles") -> "PortfolioQuantiles":
+        """Fold another worker's or shard's quantiles into these; returns self."""
+        for metric, sketch in self.sketches.items():
+            sketch.merge(other.sketches[metric])
+        return self
+
+    def quantiles(
+        self,
+        metric: str,
+        jurisdiction_id: Optional[str] = None,
+        qs: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> Dict[float, Optional[Decimal]]:
+        """
+        Estimated quantiles of one metric.
+
+        Args:
+            metric: One of PORTFOLIO_METRICS
+            jurisdiction_id: Jurisdiction (default: the whole portfolio)
+            qs: Quantiles in [0, 1]
+
+        Returns:
+            quantile -> estimate rounded like the result field, None without values
+        """
+        if metric not in self.sketches:
+            raise ValueError(f"Not a portfolio metric: {metric}")
+        rounding = _ROUNDING[metric]
+        estimates = self.sketches[metric].quantiles(qs, jurisdiction_id)
+        return {
+            float(q): None if np.isnan(value) else rounding(Decimal(repr(float(value))))
+            for q, value in zip(qs, estimates)
+        }
+
+    def summary(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> Dict[Optional[str], Dict[str, Dict[float, Optional[Decimal]]]]:
+        """
+        Quantiles of every metric, by jurisdiction.
+
+        Returns:
+            jurisdiction_id -> metric -> quantile -> estimate, with the whole
+            portfolio under the key None
+        """
+        return {
+            jurisdiction_id: {metric: self.quantiles(metric, jurisdiction_id, qs) for metric in PORTFOLIO_METRICS}
+            for jurisdiction_id in [None] + self.jurisdictions
+        }
@@ -0,0 +1,360 @@
+"""Assessment ratio studies (COD, PRD, PRB) over streamed sales.
+
+JurisdictionPriors.cod_target bounds the FAIR band of make_appeal_decision.
+A RatioStudy measures it instead. Sales are added chunk by chunk as
+(jurisdiction, stratum, assessed value, sale price). Each ratio is
+assessed / sale price, and statistics are reported for every
+(jurisdiction, stratum) and for every jurisdiction as a whole:
+
+- median ratio;
+- COD: mean absolute deviation from the median ratio, over the median
+  (a fraction, like cod_target; IAAO reports it x100);
+- PRD: mean ratio over the sale-weighted mean ratio, sum(A) / sum(S);
+- PRB: IAAO's price-related bias, the slope of (ratio - median) / median
+  on log2 of 0.5 x sale price + 0.5 x assessed / median.
+
+By default every ratio is kept, and medians are exact, by np.partition
+(selection) over each group's ratios. That costs 16 bytes per sale. With
+`sketch_resolution`, sales are folded instead into a sparse histogram of
+log ratios per group, with bins `sketch_resolution` wide in relative
+terms, each carrying its count and the sum and sum of squares of log2
+sale price. Memory then grows with the number of occupied bins, not the
+number of sales. Medians and COD are accurate to about the resolution.
+PRB decomposes exactly per bin once the median is known, so it is exact
+up to the ratio's bin. Counts, means and PRD are exact in both modes.
+
+    study = RatioStudy()
+    for chunk in roll_chunks:
+        study.add(chunk["jurisdiction_id"], chunk["assessed_value"], chunk["sale_price"],
+                  strata=chunk["property_type"])
+    priors = study.update_priors(priors)
+"""
+
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from .decimal_fields import JsonDecimal
+from .jurisdiction import JurisdictionPriors
+from .rounding import THOUSANDTHS, half_up
+
+
+# Fewest sales for a jurisdiction's COD to replace its cod_target
+DEFAULT_MIN_SALES = 30
+
+# cod_target bounds accepted by JurisdictionPriors (gt=0, le=0.50)
+_MIN_COD_TARGET = THOUSANDTHS
+_MAX_COD_TARGET = Decimal('0.50')
+
+# Sketch bins are packed into one int64 key: group | bin. Ratios are
+# clipped to [1e-6, 1e6]; _BIN_BITS covers that range down to a
+# resolution of about 1e-5.
+_BIN_BITS = 22
+_BIN_OFFSET = 1 << (_BIN_BITS - 1)
+_RATIO_LIMITS = (1e-6, 1e6)
+
+_round_stat = half_up(Decimal('0.0001'))
+_round_target = half_up(THOUSANDTHS)
+
+
+def _to_decimal(value: float) -> Decimal:
+    return _round_stat(Decimal(repr(float(value))))
+
+
+class RatioStudyResult(BaseModel):
+    """Ratio statistics for one jurisdiction, or one stratum within it."""
+
+    jurisdiction_id: str = Field(..., description="Jurisdiction of the sales")
+    stratum: Optional[str] = Field(None, description="Stratum, or None for the whole jurisdiction")
+    sale_count: int = Field(..., ge=1, description="Sales in the study")
+    median_ratio: JsonDecimal = Field(..., description="Median assessment-to-sale ratio")
+    mean_ratio: JsonDecimal = Field(..., description="Mean ratio")
+    weighted_mean_ratio: JsonDecimal = Field(..., description="Total assessed over total sale price")
+    cod: JsonDecimal = Field(..., description="Coefficient of dispersion, as a fraction of the median")
+    prd: JsonDecimal = Field(..., description="Price-related differential")
+    prb: Optional[JsonDecimal] = Field(None, description="Price-related bias (None without price spread)")
+    exact: bool = Field(..., description="False when median and COD come from the sketch")
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class RatioStudy:
+    """
+    Streaming ratio-study accumulator.
+
+    Args:
+        sketch_resolution: Relative bin width of the approximate mode
+            (e.g. 0.001); None keeps every ratio for exact medians
+
+    Raises:
+        ValueError: If sketch_resolution is not in [1e-5, 0.1]
+    """
+
+    def __init__(self, sketch_resolution: Optional[float] = None):
+        if sketch_resolution is not None and not 1e-5 <= sketch_resolution <= 0.1:
+            raise ValueError("sketch_resolution must be between 1e-5 and 0.1")
+        self.sketch_resolution = sketch_resolution
+        self._step = None if sketch_resolution is None else float(np.log1p(sketch_resolution))
+        self.rejected = 0
+
+        self._groups: Dict[Tuple[str, str], int] = {}
+        # Exact per-group sums: count, assessed, sale price, ratio
+        self._sums = np.zeros((0, 4))
+        # Exact mode: chunks of (group, ratio, sale price)
+        self._chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        # Sketch mode: sorted keys and per-key count, sum of log2 price, sum of its square
+        self._keys = np.empty(0, dtype=np.int64)
+        self._bins = np.empty((0, 3))
+
+    @property
+    def exact(self) -> bool:
+        return self.sketch_resolution is None
+
+    @property
+    def sale_count(self) -> int:
+        """Sales accepted so far."""
+        return int(self._sums[:, 0].sum())
+
+    def _group_codes(self, jurisdiction_ids: np.ndarray, strata: Optional[np.ndarray]) -> np.ndarray:
+        jurisdictions, jurisdiction_codes = np.unique(jurisdiction_ids.astype(str), return_inverse=True)
+        if strata is None:
+            labels, stratum_codes = np.array([""]), np.zeros(len(jurisdiction_codes), dtype=np.int64)
+        else:
+            if strata.dtype.kind == "O":
+                strata = np.where(np.equal(strata, None), "", strata)
+            labels, stratum_codes = np.unique(strata.astype(str), return_inverse=True)
+        pairs, inverse = np.unique(jurisdiction_codes.reshape(-1) * len(labels) + stratum_codes.reshape(-1),
+                                   return_inverse=True)
+        lookup = np.array([
+            self._groups.setdefault((str(jurisdictions[pair // len(labels)]), str(labels[pair % len(labels)])),
+                                    len(self._groups))
+            for pair in pairs.tolist()
+        ], dtype=np.int64)
+        if len(self._groups) > len(self._sums):
+            self._sums = np.vstack([self._sums, np.zeros((len(self._groups) - len(self._sums), 4))])
+        return lookup[inverse.reshape(-1)]
+
+    def add(
+        self,
+        jurisdiction_ids: Sequence[str],
+        assessed_values: Sequence[float],
+        sale_prices: Sequence[float],
+        strata: Optional[Sequence[Optional[str]]] = None,
+    ) -> int:
+        """
+        Add a chunk of sales.
+
+        Sales with a non-positive or non-finite assessed value or price are
+        skipped and counted in `rejected`.
+
+        Args:
+            jurisdiction_ids: Jurisdiction of each sale
+            assessed_values: Assessed value at the time of sale
+            sale_prices: Sale price
+            strata: Stratum of each sale (e.g. property type), or None
+
+        Returns:
+            Number of sales accepted from the chunk
+        """
+        assessed = np.asarray(assessed_values, dtype=np.float64)
+        prices = np.asarray(sale_prices, dtype=np.float64)
+        if not len(jurisdiction_ids) == len(assessed) == len(prices):
+            raise ValueError("jurisdiction_ids, assessed_values and sale_prices must have the same length")
+        if strata is not None and len(strata) != len(assessed):
+            raise ValueError("strata must have one entry per sale")
+        valid = np.isfinite(assessed) & np.isfinite(prices) & (assessed > 0) & (prices > 0)
+        self.rejected += int((~valid).sum())
+        assessed, prices = assessed[valid], prices[valid]
+        codes = self._group_codes(
+            np.asarray(jurisdiction_ids)[valid], None if strata is None else np.asarray(strata)[valid]
+        )
+        ratios = assessed / prices
+
+        groups = len(self._sums)
+        for column, weights in enumerate((None, assessed, prices, ratios)):
+            self._sums[:, column] += np.bincount(codes, weights=weights, minlength=groups)
+
+        if self.exact:
+            self._chunks.append((codes, ratios, prices))
+        else:
+            bins = np.floor(np.log(np.clip(ratios, *_RATIO_LIMITS)) / self._step).astype(np.int64) + _BIN_OFFSET
+            log_prices = np.log2(prices)
+            keys = np.concatenate([self._keys, (codes << _BIN_BITS) | bins])
+            self._keys, slots = np.unique(keys, return_inverse=True)
+            merged = np.zeros((len(self._keys), 3))
+            for column, values in enumerate((np.ones(len(bins)), log_prices, log_prices * log_prices)):
+                merged[:, column] = np.bincount(
+                    slots.reshape(-1), weights=np.concatenate([self._bins[:, column], values]), minlength=len(self._keys)
+                )
+            self._bins = merged
+        return len(codes)
+
+    def _segments(self) -> Tuple[List[Tuple[str, Optional[str]]], np.ndarray, np.ndarray]:
+        """Result keys in report order, with their group ranges in rank order."""
+        keys = sorted(self._groups)
+        # Rank of each group: sorting by rank makes jurisdictions contiguous
+        rank = np.empty(len(keys), dtype=np.int64)
+        rank[[self._groups[key] for key in keys]] = np.arange(len(keys))
+        segments: List[Tuple[str, Optional[str]]] = []
+        starts, ends = [], []
+        position = 0
+        while position < len(keys):
+            jurisdiction_id = keys[position][0]
+            end = position
+            while end < len(keys) and keys[end][0] == jurisdiction_id:
+                end += 1
+            # The jurisdiction row covers all its sales; unstratified sales get no row of their own
+            segments.append((jurisdiction_id, None))
+            starts.append(position)
+            ends.append(end)
+            for offset, (_, stratum) in enumerate(keys[position:end]):
+                if stratum:
+                    segments.append((jurisdiction_id, stratum))
+                    starts.append(position + offset)
+                    ends.append(position + offset + 1)
+            position = end
+        return segments, rank, np.array([starts, ends], dtype=np.int64).reshape(2, -1)
+
+    def results(self) -> List[RatioStudyResult]:
+        """
+        Statistics per jurisdiction and per stratum, sorted by jurisdiction.
+
+        A jurisdiction's row (stratum None) covers all its sales and comes
+        before its strata's rows. Sales without a stratum count only in
+        the jurisdiction row.
+        """
+        segments, rank, (starts, ends) = self._segments()
+        if not segments:
+            return []
+        sums = np.zeros_like(self._sums)
+        sums[rank] = self._sums
+        cumulative = np.vstack([np.zeros(4), np.cumsum(sums, axis=0)])
+        totals = cumulative[ends] - cumulative[starts]
+
+        if self.exact:
+            stats = self._exact_stats(rank, starts, ends)
+        else:
+            stats = self._sketch_stats(rank, starts, ends)
+
+        results = []
+        for (jurisdiction_id, stratum), (count, assessed, prices, ratio_sum), (median, cod, prb) in zip(
+                segments, totals, stats):
+            mean = ratio_sum / count
+            weighted = assessed / prices
+            results.append(RatioStudyResult(
+                jurisdiction_id=jurisdiction_id,
+                stratum=stratum,
+                sale_count=int(count),
+                median_ratio=_to_decimal(median),
+                mean_ratio=_to_decimal(mean),
+                weighted_mean_ratio=_to_decimal(weighted),
+                cod=_to_decimal(cod),
+                prd=_to_decimal(mean / weighted),
+                prb=None if prb is None else _to_decimal(prb),
+                exact=self.exact,
+            ))
+        return results
+
+    def _exact_stats(self, rank, starts, ends) -> List[Tuple[float, float, Optional[float]]]:
+        codes, ratios, prices = (np.concatenate(column) for column in zip(*self._chunks))
+        ranks = rank[codes]
+        order = np.argsort(ranks, kind="stable")
+        ratios, prices = ratios[order], prices[order]
+        bounds = np.searchsorted(ranks[order], np.arange(len(rank) + 1))
+
+        stats = []
+        for start, end in zip(bounds[starts], bounds[ends]):
+            r, s = ratios[start:end], prices[start:end]
+            length = len(r)
+            middle = np.partition(r, [(length - 1) // 2, length // 2])
+            median = (middle[(length - 1) // 2] + middle[length // 2]) / 2
+            cod = np.abs(r - median).mean() / median
+            relative = (r - median) / median
+            x = np.log2(0.5 * s + 0.5 * r * s / median)
+            stats.append((median, cod, _slope(x, relative)))
+        return stats
+
+    def _sketch_stats(self, rank, starts, ends) -> List[Tuple[float, float, Optional[float]]]:
+        ranks = rank[self._keys >> _BIN_BITS]
+        order = np.argsort(ranks, kind="stable")
+        bins, values = (self._keys & ((1 << _BIN_BITS) - 1))[order], self._bins[order]
+        bounds = np.searchsorted(ranks[order], np.arange(len(rank) + 1))
+
+        stats = []
+        for start, end in zip(bounds[starts], bounds[ends]):
+            # Merge the bins of the segment's groups, in ratio order
+            merged, inverse = np.unique(bins[start:end], return_inverse=True)
+            n, log_sum, log_sq = (
+                np.bincount(inverse.reshape(-1), weights=column, minlength=len(merged)) for column in values[start:end].T
+            )
+            c = np.exp((merged - _BIN_OFFSET + 0.5) * self._step)
+            total = n.sum()
+            cumulative = np.cumsum(n)
+            low = c[np.searchsorted(cumulative, (total - 1) // 2 + 1)]
+            high = c[np.searchsorted(cumulative, total // 2 + 1)]
+            median = (low + high) / 2
+            cod = (n * np.abs(c - median)).sum() / total / median
+            # x = log2(price) + g with g fixed per bin, so its sums decompose
+            y = (c - median) / median
+            g = np.log2(0.5 + 0.5 * c / median)
+            sum_x = log_sum + n * g
+            sum_xx = log_sq + 2 * g * log_sum + n * g * g
+            stats.append((median, cod, _slope_from_sums(
+                total, sum_x.sum(), sum_xx.sum(), (n * y).sum(), (y * sum_x).sum()
+            )))
+        return stats
+
+    def cod_by_jurisdiction(self, min_sales: int = DEFAULT_MIN_SALES) -> Dict[str, Decimal]:
+        """Jurisdiction-wide COD of every jurisdiction with at least `min_sales` sales."""
+        return {
+            result.jurisdiction_id: result.cod
+            for result in self.results()
+            if result.stratum is None and result.sale_count >= min_sales
+        }
+
+    def update_priors(
+        self,
+        priors: Union[Mapping[str, JurisdictionPriors], Iterable[JurisdictionPriors]],
+        min_sales: int = DEFAULT_MIN_SALES,
+    ) -> Dict[str, JurisdictionPriors]:
+        """
+        Set cod_target from each jurisdiction's observed COD.
+
+        Jurisdictions with fewer than `min_sales` sales, or none at all,
+        keep their priors. The observed COD is rounded to thousandths and
+        kept within the bounds JurisdictionPriors accepts. Pass changed
+        priors to RedecisionTracker.update_priors to re-decide their properties.
+
+        Args:
+            priors: Current priors (a mapping's values are used)
+            min_sales: Fewest sales for the observed COD to be used
+
+        Returns:
+            jurisdiction_id -> priors, updated where the study has data
+        """
+        if isinstance(priors, Mapping):
+            priors = priors.values()
+        observed = self.cod_by_jurisdiction(min_sales)
+        updated = {}
+        for p in priors:
+            cod = observed.get(p.jurisdiction_id)
+            if cod is not None:
+                target = min(max(_round_target(cod), _MIN_COD_TARGET), _MAX_COD_TARGET)
+                if target != p.cod_target:
+                    p = p.model_copy(update={"cod_target": target})
+            updated[p.jurisdiction_id] = p
+        return updated
+
+
+def _slope(x: np.ndarray, y: np.ndarray) -> Optional[float]:
+    return _slope_from_sums(len(x), x.sum(), (x * x).sum(), y.sum(), (x * y).sum())
+
+
+def _slope_from_sums(n, sum_x, sum_xx, sum_y, sum_xy) -> Optional[float]:
+    """Least-squares slope of y on x from their sums; None without spread in x."""
+    sxx = sum_xx - sum_x * sum_x / n
+    if not sxx > 1e-12 * max(sum_xx, 1.0):
+        return None
+    return (sum_xy - sum_x * sum_y / n) / sxx
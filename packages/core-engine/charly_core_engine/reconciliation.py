@@ -0,0 +1,212 @@
+"""Reconciliation of income, sales and cost approach values."""
+
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from pydantic import BaseModel, ConfigDict, Field
+
+from .confidence import METHOD_BANDS, ConfidenceInput, ConfidenceResult, ValuationMethod, calculate_confidence_band
+from .decimal_fields import JsonDecimal
+from .decision import DecisionInput, DecisionResult, make_appeal_decision
+from .jurisdiction import JurisdictionPriors
+from .rounding import half_up, round_currency
+
+
+# Approach keys used by the combined valuation payload, in tie-break order
+APPROACH_METHODS: Mapping[str, ValuationMethod] = MappingProxyType({
+    "sales": ValuationMethod.SALES_COMPARISON,
+    "income": ValuationMethod.INCOME_APPROACH,
+    "cost": ValuationMethod.COST_APPROACH,
+})
+
+# Relative weight of each approach: the inverse of its base confidence band,
+# so a method trusted to ±10% counts twice as much as one trusted to ±20%
+RECONCILIATION_WEIGHTS: Mapping[str, Decimal] = MappingProxyType({
+    approach: 1 / METHOD_BANDS[method] for approach, method in APPROACH_METHODS.items()
+})
+
+_round_weight = half_up(Decimal('0.0001'))
+
+
+def _to_decimal(value: Any) -> Decimal:
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def approach_values(combined: Mapping[str, Any]) -> Dict[str, Decimal]:
+    """
+    Positive approach values from a combined valuation payload.
+
+    Reads `<approach>_value` (as returned by combine_all), falling back to
+    `combined[<approach>]["value"]`. Missing, zero or negative values are
+    left out: combine_all reports an unavailable approach as 0.0.
+    """
+    values = {}
+    for approach in APPROACH_METHODS:
+        raw = combined.get(f"{approach}_value")
+        if raw is None:
+            raw = (combined.get(approach) or {}).get("value")
+        if raw is None:
+            continue
+        value = _to_decimal(raw)
+        if value > 0:
+            values[approach] = value
+    return values
+
+
+class ReconciliationResult(BaseModel):
+    """Reconciled market value and the confidence input built from it."""
+
+    property_id: Optional[str] = Field(None, description="Property identifier, if present in the payload")
+    reconciled_value: JsonDecimal = Field(..., gt=0, description="Weighted market value across approaches")
+    primary_method: ValuationMethod = Field(..., description="Most reliable approach that contributed")
+    approach_values: Dict[str, JsonDecimal] = Field(..., description="Approach values that contributed")
+    weights: Dict[str, JsonDecimal] = Field(..., description="Normalized weight of each contributing approach")
+    confidence_input: ConfidenceInput = Field(..., description="Ready input for calculate_confidence_band")
+
+    model_config = ConfigDict(defer_build=True)
+
+    def decision_input(
+        self,
+        assessed_value: Any,
+        jurisdiction_priors: JurisdictionPriors,
+        tax_rate: Any,
+        confidence_result: Optional[ConfidenceResult] = None,
+        **decision_fields: Any
+    ) -> DecisionInput:
+        """
+        Build the DecisionInput for this property.
+
+        Args:
+            assessed_value: Current assessed value
+            jurisdiction_priors: Priors of the property's jurisdiction
+            tax_rate: Effective tax rate (decimal)
+            confidence_result: Band already computed from confidence_input;
+                calculated here when omitted
+            **decision_fields: Other DecisionInput fields (fees, thresholds, horizon)
+
+        Returns:
+            DecisionInput using the reconciled value as the market estimate,
+            with the ConfidenceResult attached as `confidence_result`
+        """
+        if confidence_result is None:
+            confidence_result = calculate_confidence_band(self.confidence_input)
+        return DecisionInput(
+            assessed_value=assessed_value,
+            estimated_market_value=self.reconciled_value,
+            confidence_result=confidence_result,
+            jurisdiction_priors=jurisdiction_priors,
+            tax_rate=tax_rate,
+            **decision_fields
+        )
+
+
+def reconcile(
+    combined: Mapping[str, Any],
+    weights: Mapping[str, Decimal] = RECONCILIATION_WEIGHTS,
+    **confidence_fields: Any
+) -> ReconciliationResult:
+    """
+    Reconcile one combined valuation into a single market value.
+
+    Contributing approaches are weighted by `weights`, renormalized over the
+    approaches that reported a positive value. The most heavily weighted of
+    them becomes the ConfidenceInput's valuation method, and every approach
+    value is passed as an other estimate so their spread widens the band.
+
+    Args:
+        combined: Payload from combine_all (or the combined valuation endpoint)
+        weights: Relative weight per approach key; defaults mirror METHOD_BANDS
+        **confidence_fields: Other ConfidenceInput fields (data quality, market
+            conditions, comparable sales, ...)
+
+    Returns:
+        ReconciliationResult with the reconciled value and ConfidenceInput
+
+    Raises:
+        ValueError: If no approach reported a positive value
+    """
+    values = approach_values(combined)
+    if not values:
+        raise ValueError("No approach reported a positive value to reconcile")
+
+    approach_weights = {approach: _to_decimal(weights[approach]) for approach in values}
+    total_weight = sum(approach_weights.values())
+    reconciled = sum(values[a] * w for a, w in approach_weights.items()) / total_weight
+    # max() keeps the first of equal weights, i.e. APPROACH_METHODS order
+    primary = max(approach_weights, key=approach_weights.get)
+
+    confidence_input = ConfidenceInput(
+        estimated_market_value=round_currency(reconciled),
+        valuation_method=APPROACH_METHODS[primary],
+        other_estimates=[(value, APPROACH_METHODS[a]) for a, value in values.items()],
+        **confidence_fields
+    )
+    return ReconciliationResult(
+        property_id=combined.get("property_id"),
+        reconciled_value=confidence_input.estimated_market_value,
+        primary_method=APPROACH_METHODS[primary],
+        approach_values=values,
+        weights={a: _round_weight(w / total_weight) for a, w in approach_weights.items()},
+        confidence_input=confidence_input,
+    )
+
+
+def reconcile_many(
+    rows: Iterable[Mapping[str, Any]],
+    weights: Mapping[str, Decimal] = RECONCILIATION_WEIGHTS,
+    confidence_fields: Optional[Sequence[Mapping[str, Any]]] = None,
+    **shared_confidence_fields: Any
+) -> List[ReconciliationResult]:
+    """
+    Reconcile a batch of combined valuations.
+
+    Args:
+        rows: combine_all payloads
+        weights: Relative weight per approach key
+        confidence_fields: Optional per-row ConfidenceInput fields, aligned with rows
+        **shared_confidence_fields: ConfidenceInput fields applied to every row
+
+    Returns:
+        One ReconciliationResult per row, in order
+    """
+    rows = list(rows)
+    if confidence_fields is not None and len(confidence_fields) != len(rows):
+        raise ValueError("confidence_fields must have one entry per row")
+
+    results = []
+    for i, row in enumerate(rows):
+        fields = dict(shared_confidence_fields)
+        if confidence_fields is not None:
+            fields.update(confidence_fields[i])
+        results.append(reconcile(row, weights, **fields))
+    return results
+
+
+def decide_reconciled(
+    results: Sequence[ReconciliationResult],
+    decision_rows: Sequence[Mapping[str, Any]]
+) -> List[Tuple[ReconciliationResult, DecisionResult, ConfidenceResult]]:
+    """
+    Carry reconciled valuations through confidence and the appeal decision.
+
+    Args:
+        results: Output of reconcile_many
+        decision_rows: Per-row keyword arguments for
+            ReconciliationResult.decision_input (assessed_value,
+            jurisdiction_priors, tax_rate and optional decision fields)
+
+    Returns:
+        (reconciliation, decision, confidence) triples, in order
+
+    Raises:
+        ValueError: If decision_rows is not aligned with results
+    """
+    if len(results) != len(decision_rows):
+        raise ValueError("decision_rows must have one entry per reconciliation result")
+    decided = []
+    for result, row in zip(results, decision_rows):
+        input_data = result.decision_input(**row)
+        decided.append((result, make_appeal_decision(input_data), input_data.confidence_result))
+    return decided
@@ -0,0 +1,178 @@
+"""Incremental re-decisioning when jurisdiction priors change."""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from pydantic import BaseModel, ConfigDict, Field
+
+from .decision import AppealDecision, DecisionInput, DecisionResult, make_appeal_decision
+from .jurisdiction import JurisdictionPriors
+
+
+# Prior fields make_appeal_decision reads for every property
+ALWAYS_USED_PRIOR_FIELDS: FrozenSet[str] = frozenset({
+    "appeal_success_rate",
+    "average_reduction_pct",
+    "cod_target",
+    "reassessment_risk_factor",
+})
+
+# Read only when the input carries no explicit appeal costs
+DEFAULT_COST_PRIOR_FIELDS: FrozenSet[str] = frozenset({
+    "typical_filing_fee",
+    "typical_attorney_cost",
+})
+
+
+def prior_dependencies(input_data: DecisionInput) -> FrozenSet[str]:
+    """Prior fields whose value can change the decision for this input."""
+    explicit_costs = (
+        input_data.estimated_filing_fee
+        + input_data.estimated_attorney_fee
+        + input_data.estimated_other_costs
+    )
+    if explicit_costs == 0:
+        return ALWAYS_USED_PRIOR_FIELDS | DEFAULT_COST_PRIOR_FIELDS
+    return ALWAYS_USED_PRIOR_FIELDS
+
+
+class DecisionChange(BaseModel):
+    """A property whose decision label changed after a re-run."""
+
+    property_id: str = Field(..., description="Property identifier")
+    previous_decision: AppealDecision = Field(..., description="Decision before the update")
+    decision: AppealDecision = Field(..., description="Decision after the update")
+    result: DecisionResult = Field(..., description="Full recomputed decision")
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class RedecisionReport(BaseModel):
+    """Outcome of applying updated priors to a tracked jurisdiction."""
+
+    jurisdiction_id: str = Field(..., description="Jurisdiction whose priors changed")
+    changed_fields: List[str] = Field(default_factory=list, description="Prior fields that differ from before")
+    recomputed: int = Field(0, ge=0, description="Properties re-run through make_appeal_decision")
+    skipped: int = Field(0, ge=0, description="Tracked properties unaffected by the changed fields")
+    changes: List[DecisionChange] = Field(default_factory=list, description="Properties whose decision label changed")
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class RedecisionTracker:
+    """
+    Track which decisions were computed from which jurisdiction priors.
+
+    Each tracked property keeps its DecisionInput (and with it the cached
+    ConfidenceResult) and the set of prior fields its decision depends on.
+    When a jurisdiction's priors are replaced, only properties that read a
+    changed field are re-decided, and label changes are reported.
+    """
+
+    def __init__(self):
+        self._inputs: Dict[str, DecisionInput] = {}
+        self._results: Dict[str, DecisionResult] = {}
+        self._dependencies: Dict[str, FrozenSet[str]] = {}
+        self._by_jurisdiction: Dict[str, Set[str]] = {}
+        self._priors: Dict[str, JurisdictionPriors] = {}
+
+    def __len__(self) -> int:
+        return len(self._inputs)
+
+    def __contains__(self, property_id: str) -> bool:
+        return property_id in self._inputs
+
+    def track(self, property_id: str, input_data: DecisionInput) -> DecisionResult:
+        """Decide a property and record its dependency on its jurisdiction."""
+        jurisdiction_id = input_data.jurisdiction_priors.jurisdiction_id
+        current = self._priors.get(jurisdiction_id)
+        if current is not None and current != input_data.jurisdiction_priors:
+            # Keep one priors version per jurisdiction; use update_priors to change it
+            input_data = input_data.model_copy(update={"jurisdiction_priors": current})
+
+        self.untrack(property_id)
+        result = make_appeal_decision(input_data)
+
+        self._inputs[property_id] = input_data
+        self._results[property_id] = result
+        self._dependencies[property_id] = prior_dependencies(input_data)
+        self._by_jurisdiction.setdefault(jurisdiction_id, set()).add(property_id)
+        self._priors.setdefault(jurisdiction_id, input_data.jurisdiction_priors)
+        return result
+
+    def track_many(self, rows: Iterable[Tuple[str, DecisionInput]]) -> Dict[str, DecisionResult]:
+        """Track several properties at once."""
+        return {property_id: self.track(property_id, input_data) for property_id, input_data in rows}
+
+    def untrack(self, property_id: str) -> None:
+        """Forget a property (no-op if it is not tracked)."""
+        input_data = self._inputs.pop(property_id, None)
+        if input_data is None:
+            return
+        del self._results[property_id]
+        del self._dependencies[property_id]
+        jurisdiction_id = input_data.jurisdiction_priors.jurisdiction_id
+        members = self._by_jurisdiction[jurisdiction_id]
+        members.discard(property_id)
+        if not members:
+            del self._by_jurisdiction[jurisdiction_id]
+            del self._priors[jurisdiction_id]
+
+    def result(self, property_id: str) -> Optional[DecisionResult]:
+        return self._results.get(property_id)
+
+    def decision_input(self, property_id: str) -> Optional[DecisionInput]:
+        """Current input of a tracked property, with its cached ConfidenceResult."""
+        return self._inputs.get(property_id)
+
+    def priors(self, jurisdiction_id: str) -> Optional[JurisdictionPriors]:
+        return self._priors.get(jurisdiction_id)
+
+    def dependents(self, jurisdiction_id: str) -> Set[str]:
+        """Property IDs whose decisions were computed with this jurisdiction's priors."""
+        return set(self._by_jurisdiction.get(jurisdiction_id, ()))
+
+    def update_priors(self, priors: JurisdictionPriors) -> RedecisionReport:
+        """
+        Replace a jurisdiction's priors and re-decide only affected properties.
+
+        Confidence results are reused from the tracked inputs; nothing upstream
+        of make_appeal_decision is recomputed.
+
+        Args:
+            priors: New priors for an already-tracked jurisdiction
+
+        Returns:
+            RedecisionReport listing changed fields and label changes
+        """
+        jurisdiction_id = priors.jurisdiction_id
+        report = RedecisionReport(jurisdiction_id=jurisdiction_id)
+        previous = self._priors.get(jurisdiction_id)
+        if previous is None:
+            return report
+
+        changed = frozenset(
+            name for name in JurisdictionPriors.model_fields
+            if getattr(previous, name) != getattr(priors, name)
+        )
+        report.changed_fields = sorted(changed)
+        self._priors[jurisdiction_id] = priors
+
+        for property_id in sorted(self._by_jurisdiction[jurisdiction_id]):
+            input_data = self._inputs[property_id].model_copy(update={"jurisdiction_priors": priors})
+            self._inputs[property_id] = input_data
+            if not changed & self._dependencies[property_id]:
+                report.skipped += 1
+                continue
+
+            old = self._results[property_id]
+            new = make_appeal_decision(input_data)
+            self._results[property_id] = new
+            report.recomputed += 1
+            if new.decision != old.decision:
+                report.changes.append(DecisionChange(
+                    property_id=property_id,
+                    previous_decision=old.decision,
+                    decision=new.decision,
+                    result=new,
+                ))
+
+        return report
@@ -0,0 +1,430 @@
+"""Memory-mapped binary store for batch decision and confidence results.
+
+A decided portfolio is written once as a fixed-width record file and then
+re-queried many times (by jurisdiction, decision label, ROI range) without
+re-parsing JSON. Layout, all little-endian:
+
+    header   64 bytes   magic, version, section counts and offsets
+    records  n x RECORD_DTYPE
+    codes    uint32[]   per-record rationale/risk/supporting text codes
+    strings  uint64[n_strings + 1] offsets, then one UTF-8 blob
+
+Property IDs, jurisdiction IDs and every rationale/risk phrase share a single
+deduplicated string table, so repeated risk factors cost four bytes each.
+"""
+
+import mmap
+import os
+import struct
+from decimal import Decimal
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .confidence import ConfidenceResult
+from .decision import AppealDecision, DecisionResult
+from .rounding import HALF_UP_CONTEXT
+
+
+MAGIC = b"CHRLYDS1"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sIIQQQQQQ")  # 64 bytes
+
+# Categorical codes. Order is part of the file format - append only.
+DECISION_CODES: Tuple[str, ...] = tuple(d.value for d in AppealDecision)
+CONFIDENCE_LEVEL_CODES: Tuple[str, ...] = ("HIGH", "MEDIUM", "LOW")
+GRADE_CODES: Tuple[str, ...] = ("A", "B", "C", "D")
+
+FLAG_WITHIN_BAND = 0x01
+FLAG_REASSESSMENT_WARNING = 0x02
+
+# Quantum each float column is restored to when rebuilding Decimal results.
+_CENT = Decimal('0.01')
+_MILLI = Decimal('0.001')
+
+DECISION_COLUMNS: Tuple[Tuple[str, Decimal], ...] = (
+    ("assessment_ratio", _CENT),
+    ("expected_annual_savings", _CENT),
+    ("expected_roi", _CENT),
+    ("breakeven_reduction_pct", _CENT),
+    ("success_probability", _CENT),
+    ("total_appeal_costs", _CENT),
+    ("net_savings_year_1", _CENT),
+    ("cumulative_net_savings", _CENT),
+)
+
+CONFIDENCE_COLUMNS: Tuple[Tuple[str, Decimal], ...] = (
+    ("central_estimate", _CENT),
+    ("confidence_band_pct", _MILLI),
+    ("lower_bound", _CENT),
+    ("upper_bound", _CENT),
+    ("confidence_score", _MILLI),
+    ("estimate_dispersion", _MILLI),
+    ("method_consistency", _MILLI),
+)
+
+RECORD_DTYPE = np.dtype([
+    ("property", "<u4"),
+    ("jurisdiction", "<u4"),
+    ("text_offset", "<u8"),
+    ("n_rationale", "u1"),
+    ("n_risk", "u1"),
+    ("n_supporting", "u1"),
+    ("n_confidence_risk", "u1"),
+    ("decision", "u1"),
+    ("confidence_level", "u1"),
+    ("reliability_grade", "u1"),
+    ("flags", "u1"),
+] + [(name, "<f8") for name, _ in DECISION_COLUMNS + CONFIDENCE_COLUMNS])
+
+_TEXT_LISTS = ("n_rationale", "n_risk", "n_supporting", "n_confidence_risk")
+
+
+def _to_float(value: Optional[Decimal]) -> float:
+    return float("nan") if value is None else float(value)
+
+
+def _to_decimal(value: float, quantum: Decimal) -> Optional[Decimal]:
+    if value != value:  # NaN encodes None
+        return None
+    return Decimal(repr(float(value))).quantize(quantum, context=HALF_UP_CONTEXT)
+
+
+def _align(handle: BinaryIO, boundary: int = 8) -> int:
+    position = handle.tell()
+    padding = -position % boundary
+    if padding:
+        handle.write(b"\0" * padding)
+    return position + padding
+
+
+class DecisionStoreWriter:
+    """
+    Stream (property, jurisdiction, decision, confidence) rows into a store file.
+
+    Records are buffered in chunks and flushed as they fill, so a portfolio
+    run can append results as they are produced without holding them all.
+    Only the string table and text codes are kept in memory until close().
+    Leaving a `with` block through an exception discards the partial file.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 65536):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.path = path
+        self._handle: BinaryIO = open(path, "wb")
+        self._handle.write(b"\0" * _HEADER.size)
+        self._chunk = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+        self._pending = 0
+        self._count = 0
+        self._codes: List[int] = []
+        self._strings: Dict[str, int] = {}
+
+    def _intern(self, text: str) -> int:
+        code = self._strings.get(text)
+        if code is None:
+            code = len(self._strings)
+            self._strings[text] = code
+        return code
+
+    def _intern_list(self, texts: List[str], field: str) -> int:
+        if len(texts) > 255:
+            raise ValueError(f"Too many entries for {field} (max 255)")
+        self._codes.extend(self._intern(text) for text in texts)
+        return len(texts)
+
+    def append(
+        self,
+        property_id: str,
+        jurisdiction_id: str,
+        decision: DecisionResult,
+        confidence: ConfidenceResult,
+    ) -> int:
+        """Append one decided property and return its record index."""
+        if self._handle.closed:
+            raise ValueError("Store writer is closed")
+
+        record = self._chunk[self._pending]
+        record["property"] = self._intern(property_id)
+        record["jurisdiction"] = self._intern(jurisdiction_id)
+        record["text_offset"] = len(self._codes)
+        record["n_rationale"] = self._intern_list(decision.primary_rationale, "primary_rationale")
+        record["n_risk"] = self._intern_list(decision.risk_factors, "risk_factors")
+        record["n_supporting"] = self._intern_list(decision.supporting_factors, "supporting_factors")
+        record["n_confidence_risk"] = self._intern_list(confidence.risk_factors, "confidence risk_factors")
+
+        record["decision"] = DECISION_CODES.index(decision.decision.value)
+        record["confidence_level"] = CONFIDENCE_LEVEL_CODES.index(decision.confidence_level)
+        record["reliability_grade"] = GRADE_CODES.index(confidence.reliability_grade)
+        record["flags"] = (
+            (FLAG_WITHIN_BAND if decision.within_confidence_band else 0)
+            | (FLAG_REASSESSMENT_WARNING if decision.reassessment_risk_warning else 0)
+        )
+
+        for name, _ in DECISION_COLUMNS:
+            record[name] = _to_float(getattr(decision, name))
+        for name, _ in CONFIDENCE_COLUMNS:
+            record[name] = _to_float(getattr(confidence, name))
+
+        self._pending += 1
+        if self._pending == len(self._chunk):
+            self._flush()
+
+        self._count += 1
+        return self._count - 1
+
+    def extend(self, rows: Iterable[Tuple[str, str, DecisionResult, ConfidenceResult]]) -> None:
+        """Append many rows."""
+        for row in rows:
+            self.append(*row)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _flush(self) -> None:
+        self._handle.write(self._chunk[:self._pending].tobytes())
+        self._pending = 0
+
+    def close(self) -> None:
+        """Write the code and string sections and finalize the header."""
+        if self._handle.closed:
+            return
+        self._flush()
+
+        codes_offset = _align(self._handle)
+        self._handle.write(np.asarray(self._codes, dtype="<u4").tobytes())
+
+        strings_offset = _align(self._handle)
+        encoded = [text.encode("utf-8") for text in self._strings]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+        self._handle.write(offsets.tobytes())
+        self._handle.write(b"".join(encoded))
+
+        self._handle.seek(0)
+        self._handle.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, 0,
+            self._count, _HEADER.size,
+            len(self._codes), codes_offset,
+            len(encoded), strings_offset,
+        ))
+        self._handle.close()
+
+    def discard(self) -> None:
+        """Close without finalizing and delete the partial file."""
+        if self._handle.closed:
+            return
+        self._handle.close()
+        os.remove(self.path)
+
+    def __enter__(self) -> "DecisionStoreWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if exc_info[0] is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+def write_decision_store(
+    path: str,
+    rows: Iterable[Tuple[str, str, DecisionResult, ConfidenceResult]],
+) -> int:
+    """
+    Write a complete store from (property_id, jurisdiction_id, decision, confidence) rows.
+
+    Returns:
+        Number of records written
+    """
+    with DecisionStoreWriter(path) as writer:
+        writer.extend(rows)
+        return len(writer)
+
+
+class DecisionStore:
+    """
+    Read-only, memory-mapped view over a decision store file.
+
+    `records` is a NumPy structured array backed directly by the mapping, so
+    column filters and aggregates run without deserializing any row:
+
+        with DecisionStore.open("portfolio.crs") as store:
+            mask = store.mask(decision="OVER", jurisdiction_id="collin_county_tx")
+            mask &= store.records["expected_roi"] > 200
+            total = store.records["expected_annual_savings"][mask].sum()
+    """
+
+    def __init__(self, buffer: mmap.mmap):
+        self._mmap = buffer
+        try:
+            self._map_sections(buffer)
+        except BaseException:
+            buffer.close()  # Nothing else holds the mapping of a rejected file
+            raise
+        self._lookup: Optional[Dict[str, int]] = None
+
+    def _map_sections(self, buffer: mmap.mmap) -> None:
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Truncated decision store: file is shorter than its header")
+        (magic, version, _reserved, n_records, records_offset, n_codes,
+         codes_offset, n_strings, strings_offset) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a CHARLY decision store")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported decision store version: {version}")
+        sections = [
+            (records_offset, n_records * RECORD_DTYPE.itemsize),
+            (codes_offset, n_codes * 4),
+            (strings_offset, (n_strings + 1) * 8),
+        ]
+        if any(offset + size > len(buffer) for offset, size in sections):
+            raise ValueError("Truncated decision store: sections extend past the end of the file")
+
+        self.records = np.frombuffer(buffer, dtype=RECORD_DTYPE, count=n_records, offset=records_offset)
+        self.codes = np.frombuffer(buffer, dtype="<u4", count=n_codes, offset=codes_offset)
+        self._string_offsets = np.frombuffer(buffer, dtype="<u8", count=n_strings + 1, offset=strings_offset)
+        self._blob_offset = strings_offset + (n_strings + 1) * 8
+
+    @classmethod
+    def open(cls, path: str) -> "DecisionStore":
+        """
+        Memory-map a store file read-only.
+
+        Raises:
+            ValueError: If the file is not a decision store of this version,
+                or is truncated
+        """
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size < _HEADER.size:
+                raise ValueError("Truncated decision store: file is shorter than its header")
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def close(self) -> None:
+        """Release the mapping. Views taken from `records` must not outlive it."""
+        self.records = self.codes = self._string_offsets = None
+        self._mmap.close()
+
+    def __enter__(self) -> "DecisionStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # String table
+
+    def string(self, code: int) -> str:
+        """Decode one entry of the string table."""
+        start = self._blob_offset + int(self._string_offsets[code])
+        end = self._blob_offset + int(self._string_offsets[code + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def code_of(self, text: str) -> Optional[int]:
+        """String-table code for `text`, or None if it never occurs in the store."""
+        if self._lookup is None:
+            self._lookup = {self.string(i): i for i in range(len(self._string_offsets) - 1)}
+        return self._lookup.get(text)
+
+    def property_id(self, index: int) -> str:
+        return self.string(int(self.records["property"][index]))
+
+    def jurisdiction_id(self, index: int) -> str:
+        return self.string(int(self.records["jurisdiction"][index]))
+
+    # Queries
+
+    def mask(
+        self,
+        decision: Optional[str] = None,
+        jurisdiction_id: Optional[str] = None,
+        confidence_level: Optional[str] = None,
+        reliability_grades: Optional[Iterable[str]] = None,
+        min_roi: Optional[float] = None,
+        max_roi: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Boolean mask over records matching every given criterion.
+
+        ROI bounds are inclusive; records without an ROI never match a bound.
+        """
+        records = self.records
+        result = np.ones(len(records), dtype=bool)
+
+        if decision is not None:
+            result &= records["decision"] == DECISION_CODES.index(AppealDecision(decision).value)
+        if confidence_level is not None:
+            result &= records["confidence_level"] == CONFIDENCE_LEVEL_CODES.index(confidence_level)
+        if reliability_grades is not None:
+            codes = [GRADE_CODES.index(grade) for grade in reliability_grades]
+            result &= np.isin(records["reliability_grade"], codes)
+        if jurisdiction_id is not None:
+            code = self.code_of(jurisdiction_id)
+            if code is None:
+                result[:] = False
+            else:
+                result &= records["jurisdiction"] == code
+        if min_roi is not None:
+            result &= records["expected_roi"] >= min_roi
+        if max_roi is not None:
+            result &= records["expected_roi"] <= max_roi
+
+        return result
+
+    def risk_factor_mask(self, risk_factor: str) -> np.ndarray:
+        """Boolean mask of records whose decision risk factors include `risk_factor`."""
+        result = np.zeros(len(self.records), dtype=bool)
+        code = self.code_of(risk_factor)
+        if code is None:
+            return result
+
+        records = self.records
+        risk_start = records["text_offset"] + records["n_rationale"]
+        risk_end = risk_start + records["n_risk"]
+        hits = np.flatnonzero(self.codes == code)
+        # Map each hit back to its owning record, then keep hits inside the risk slice
+        owners = np.searchsorted(records["text_offset"], hits, side="right") - 1
+        inside = (hits >= risk_start[owners]) & (hits < risk_end[owners])
+        result[owners[inside]] = True
+        return result
+
+    # Row materialization
+
+    def _texts(self, start: int, count: int) -> List[str]:
+        return [self.string(int(code)) for code in self.codes[start:start + count]]
+
+    def get(self, index: int) -> Tuple[DecisionResult, ConfidenceResult]:
+        """Rebuild the Decimal-valued result models for one record."""
+        record = self.records[index]
+        start = int(record["text_offset"])
+        counts = [int(record[name]) for name in _TEXT_LISTS]
+        texts = []
+        for count in counts:
+            texts.append(self._texts(start, count))
+            start += count
+        rationale, risk, supporting, confidence_risk = texts
+
+        confidence = ConfidenceResult(
+            reliability_grade=GRADE_CODES[record["reliability_grade"]],
+            risk_factors=confidence_risk,
+            **{name: _to_decimal(record[name], quantum) for name, quantum in CONFIDENCE_COLUMNS}
+        )
+        decision = DecisionResult(
+            decision=AppealDecision(DECISION_CODES[record["decision"]]),
+            confidence_level=CONFIDENCE_LEVEL_CODES[record["confidence_level"]],
+            primary_rationale=rationale,
+            risk_factors=risk,
+            supporting_factors=supporting,
+            within_confidence_band=bool(record["flags"] & FLAG_WITHIN_BAND),
+            reassessment_risk_warning=bool(record["flags"] & FLAG_REASSESSMENT_WARNING),
+            **{name: _to_decimal(record[name], quantum) for name, quantum in DECISION_COLUMNS}
+        )
+        return decision, confidence
+
+    def __iter__(self) -> Iterator[Tuple[str, str, DecisionResult, ConfidenceResult]]:
+        for index in range(len(self.records)):
+            yield (self.property_id(index), self.jurisdiction_id(index)) + self.get(index)
@@ -0,0 +1,238 @@
+"""Robust dispersion statistics over large, ragged estimate sets.
+
+calculate_confidence_band measures dispersion as the mean and population
+variance of at most a dozen Decimal estimates, so one stray comparable or
+AVM run can widen a band on its own. This module handles hundreds of
+estimates per property, for many properties at once, given as ragged
+arrays: row i's estimates are `values[offsets[i]:offsets[i + 1]]`.
+
+For each row, values outside Tukey's fences (`iqr_multiplier` x IQR beyond
+the quartiles) are rejected. The median, trimmed mean and median absolute
+deviation (MAD) are then taken over the kept values. Order statistics come
+from np.partition, i.e. O(n) selection rather than a sort. Rows are grouped
+by length so each group is one 2-D partition call.
+
+`robust_confidence_bands` turns the MAD into the coefficient of variation
+consumed by confidence_band_from_dispersion: 1.4826 x MAD / median, which
+equals the standard CV for normally distributed estimates.
+"""
+
+from decimal import Decimal
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from .confidence import ConfidenceInput, ConfidenceResult, confidence_band_from_dispersion
+
+
+# Scales the MAD to a standard deviation for normally distributed values
+MAD_NORMAL_SCALE = 1.4826
+
+# Share of kept values cut from each end for the trimmed mean
+DEFAULT_TRIM = 0.10
+
+# Tukey fence width, in interquartile ranges beyond Q1 and Q3
+DEFAULT_IQR_MULTIPLIER = 1.5
+
+
+class RobustDispersion:
+    """
+    Per-row robust statistics (NaN for rows without estimates).
+
+    Attributes:
+        count: Estimates per row
+        kept: Estimates per row inside the fences
+        q1, q3: Quartiles of all the row's estimates (linear interpolation)
+        median, trimmed_mean, mad: Statistics of the kept estimates
+        outliers: Per-element mask of rejected estimates, aligned with values
+    """
+
+    def __init__(self, count: np.ndarray, outliers: np.ndarray):
+        size = len(count)
+        self.count = count
+        self.outliers = outliers
+        self.kept = np.zeros(size, dtype=np.int64)
+        self.q1 = np.full(size, np.nan)
+        self.q3 = np.full(size, np.nan)
+        self.median = np.full(size, np.nan)
+        self.trimmed_mean = np.full(size, np.nan)
+        self.mad = np.full(size, np.nan)
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    @property
+    def iqr(self) -> np.ndarray:
+        """Interquartile range of each row."""
+        return self.q3 - self.q1
+
+    @property
+    def cv(self) -> np.ndarray:
+        """Robust coefficient of variation, MAD_NORMAL_SCALE x MAD / median (NaN below 2 kept values)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cv = MAD_NORMAL_SCALE * self.mad / self.median
+        cv[(self.kept < 2) | ~(self.median > 0)] = np.nan
+        return cv
+
+
+def _check_ragged(offsets, values) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.asarray(offsets, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    if (offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(values)
+            or np.any(np.diff(offsets) < 0)):
+        raise ValueError("offsets must run from 0 to len(values) in n + 1 steps")
+    if not np.isfinite(values).all():
+        raise ValueError("Estimates must be finite")
+    return offsets, values
+
+
+def _by_length(offsets: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """(rows, element index matrix) for each non-zero row length."""
+    counts = np.diff(offsets)
+    for length in np.unique(counts[counts > 0]).tolist():
+        rows = np.flatnonzero(counts == length)
+        yield rows, offsets[rows][:, None] + np.arange(length)
+
+
+def _quantile_ranks(length: int, q: float) -> Tuple[int, int, float]:
+    position = q * (length - 1)
+    low = int(np.floor(position))
+    return low, min(low + 1, length - 1), position - low
+
+
+def _interpolate(partitioned: np.ndarray, ranks: Tuple[int, int, float]) -> np.ndarray:
+    low, high, fraction = ranks
+    return partitioned[:, low] + (partitioned[:, high] - partitioned[:, low]) * fraction
+
+
+def _median(partitioned: np.ndarray) -> np.ndarray:
+    length = partitioned.shape[1]
+    return (partitioned[:, (length - 1) // 2] + partitioned[:, length // 2]) / 2
+
+
+def robust_dispersion(
+    offsets: Sequence[int],
+    values: Sequence[float],
+    trim: float = DEFAULT_TRIM,
+    iqr_multiplier: float = DEFAULT_IQR_MULTIPLIER,
+) -> RobustDispersion:
+    """
+    Fence outliers and compute robust statistics for every row.
+
+    Args:
+        offsets: Row offsets into values (length n + 1)
+        values: Concatenated estimates
+        trim: Share of kept values cut from each end for the trimmed mean
+        iqr_multiplier: Tukey fence width in IQRs; inf keeps every value
+
+    Returns:
+        RobustDispersion with per-row statistics and the outlier mask
+
+    Raises:
+        ValueError: If offsets are malformed, values are not finite or
+            trim is outside [0, 0.5)
+    """
+    if not 0 <= trim < 0.5:
+        raise ValueError("trim must be in [0, 0.5)")
+    offsets, values = _check_ragged(offsets, values)
+    result = RobustDispersion(np.diff(offsets), np.zeros(len(values), dtype=bool))
+
+    # Quartiles of every estimate set fix the fences
+    for rows, elements in _by_length(offsets):
+        length = elements.shape[1]
+        row_values = values[elements]
+        lower, upper = _quantile_ranks(length, 0.25), _quantile_ranks(length, 0.75)
+        partitioned = np.partition(row_values, sorted({*lower[:2], *upper[:2]}), axis=1)
+        q1, q3 = _interpolate(partitioned, lower), _interpolate(partitioned, upper)
+        result.q1[rows], result.q3[rows] = q1, q3
+        if np.isfinite(iqr_multiplier):
+            slack = iqr_multiplier * (q3 - q1)[:, None]
+            result.outliers[elements] = (row_values < q1[:, None] - slack) | (row_values > q3[:, None] + slack)
+
+    # Location and scale of what is left
+    kept_values = values[~result.outliers]
+    result.kept = np.bincount(
+        np.repeat(np.arange(len(result)), result.count), weights=~result.outliers, minlength=len(result)
+    ).astype(np.int64)
+    kept_offsets = np.concatenate([[0], np.cumsum(result.kept)])
+    for rows, elements in _by_length(kept_offsets):
+        length = elements.shape[1]
+        cut = int(trim * length)
+        middle = {(length - 1) // 2, length // 2}
+        partitioned = np.partition(kept_values[elements], sorted(middle | {cut, length - cut - 1}), axis=1)
+        median = _median(partitioned)
+        result.median[rows] = median
+        # Everything between the kth positions cut and length - cut - 1 is the trimmed middle
+        result.trimmed_mean[rows] = partitioned[:, cut:length - cut].mean(axis=1)
+        deviations = np.abs(partitioned - median[:, None])
+        result.mad[rows] = _median(np.partition(deviations, sorted(middle), axis=1))
+    return result
+
+
+def robust_confidence_bands(
+    inputs: Sequence[ConfidenceInput],
+    estimate_offsets: Sequence[int],
+    estimate_values: Sequence[float],
+    trim: float = DEFAULT_TRIM,
+    iqr_multiplier: float = DEFAULT_IQR_MULTIPLIER,
+) -> List[ConfidenceResult]:
+    """
+    Confidence bands whose dispersion term comes from robust statistics.
+
+    Row i's estimate set is its primary estimated_market_value plus
+    `estimate_values[estimate_offsets[i]:estimate_offsets[i + 1]]`, with no
+    limit on size. `comparable_sales` and `other_estimates` on the inputs are
+    not read; put those values in the arrays instead. The kept estimates
+    other than the primary count as comparable sales for the
+    limited-comparables risk factor.
+
+    Args:
+        inputs: One ConfidenceInput per property
+        estimate_offsets: Row offsets into estimate_values (length n + 1)
+        estimate_values: Concatenated AVM and comparable estimates
+        trim: Share cut from each end for the trimmed mean
+        iqr_multiplier: Tukey fence width in IQRs
+
+    Returns:
+        One ConfidenceResult per input, in order
+    """
+    offsets, values = _check_ragged(estimate_offsets, estimate_values)
+    if len(offsets) != len(inputs) + 1:
+        raise ValueError("estimate_offsets must have one entry per input plus one")
+    primary = np.array([float(input_data.estimated_market_value) for input_data in inputs])
+    # Each row's primary estimate goes first in its segment
+    combined = np.insert(values, offsets[:-1], primary)
+    combined_offsets = offsets + np.arange(len(offsets))
+    stats = robust_dispersion(combined_offsets, combined, trim, iqr_multiplier)
+
+    cv = stats.cv
+    comparable_count = stats.kept - ~stats.outliers[combined_offsets[:-1]]
+    return [
+        confidence_band_from_dispersion(
+            input_data,
+            None if np.isnan(cv[i]) else Decimal(repr(float(cv[i]))),
+            int(comparable_count[i]),
+        )
+        for i, input_data in enumerate(inputs)
+    ]
+
+
+def robust_confidence_band(
+    input_data: ConfidenceInput,
+    estimates: Sequence[float],
+    trim: float = DEFAULT_TRIM,
+    iqr_multiplier: float = DEFAULT_IQR_MULTIPLIER,
+) -> ConfidenceResult:
+    """
+    Robust confidence band for one property (see robust_confidence_bands).
+
+    Args:
+        input_data: Confidence calculation inputs
+        estimates: AVM and comparable estimates besides the primary estimate
+        trim: Share cut from each end for the trimmed mean
+        iqr_multiplier: Tukey fence width in IQRs
+
+    Returns:
+        ConfidenceResult with bounds and quality metrics
+    """
+    return robust_confidence_bands([input_data], [0, len(estimates)], estimates, trim, iqr_multiplier)[0]
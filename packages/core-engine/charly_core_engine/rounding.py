@@ -0,0 +1,33 @@
+"""Decimal rounding shared by the engine and finance calculators."""
+
+from decimal import Context, Decimal, ROUND_HALF_UP
+from typing import Callable
+
+
+# Quantization exponents used by calculator results
+CENTS = Decimal('0.01')
+THOUSANDTHS = Decimal('0.001')
+BASIS_POINTS = Decimal('0.0001')
+
+# One context reused for every quantize. Passing `rounding=` instead makes
+# decimal copy the thread's current context on each call. Precision, traps
+# and exponent limits are those of the default context the engines run in.
+HALF_UP_CONTEXT = Context(prec=28, rounding=ROUND_HALF_UP)
+
+
+def half_up(exponent: Decimal) -> Callable[[Decimal], Decimal]:
+    """
+    Build a rounding function for a fixed exponent.
+
+    Args:
+        exponent: Quantization exponent, e.g. Decimal('0.01') for cents
+
+    Returns:
+        Function rounding a Decimal to `exponent` with ROUND_HALF_UP
+    """
+    def quantize(value: Decimal) -> Decimal:
+        return value.quantize(exponent, context=HALF_UP_CONTEXT)
+    return quantize
+
+
+round_currency = half_up(CENTS)
@@ -0,0 +1,361 @@
+"""Float64 screening of the confidence + decision pipeline.
+
+County-wide first passes only need the decision label for most parcels.
+`screen_decisions` evaluates calculate_confidence_band and
+make_appeal_decision over whole columns in float64, then flags every row
+whose outcome could flip under float error or the engine's Decimal
+rounding: the assessment ratio near 0.90 or 1 + cod_target, the assessed
+value near a confidence bound, or the ROI near `min_roi_threshold`. Only
+flagged rows are re-run through the exact Decimal engines.
+
+For unflagged rows the decision label, band membership and ROI-threshold
+outcome equal the exact engine's; the numeric metrics are float
+approximations. Flagged rows carry the exact DecisionResult, unless the
+exact engines reject the row's inputs: those keep their float outcome and
+are marked unverified.
+"""
+
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+from pydantic import ValidationError
+
+from .confidence import (
+    MARKET_ADJUSTMENTS, MAX_BAND, METHOD_BANDS, MIN_BAND,
+    ConfidenceInput, ValuationMethod, calculate_confidence_band
+)
+from .decision import (
+    UNDER_RATIO_THRESHOLD, AppealDecision, DecisionInput, DecisionResult, make_appeal_decision
+)
+from .jurisdiction import JurisdictionPriors
+from .result_store import DECISION_CODES
+
+
+# Relative tolerance for threshold proximity. float64 carries ~16
+# significant digits; this leaves ample room for accumulated error.
+SCREENING_EPSILON = 1e-9
+
+# Absolute slack for values the exact engine quantizes before comparing:
+# bounds are rounded to cents, ROI to hundredths of a percent.
+_BOUND_SLACK = 0.01
+_ROI_SLACK = 0.005
+
+_METHODS = list(ValuationMethod)
+_MARKET_CONDITIONS = list(MARKET_ADJUSTMENTS)
+
+ColumnLike = Union[float, int, str, Sequence]
+
+_UNDER = DECISION_CODES.index(AppealDecision.UNDER.value)
+_FAIR = DECISION_CODES.index(AppealDecision.FAIR.value)
+_OVER = DECISION_CODES.index(AppealDecision.OVER.value)
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(repr(float(value)))
+
+
+def _as_labels(values) -> np.ndarray:
+    """String labels from a scalar or sequence, unwrapping enum members."""
+    if isinstance(values, np.ndarray):
+        return values.astype(str)
+    if isinstance(values, str):
+        return np.asarray(getattr(values, "value", values))
+    return np.asarray([getattr(value, "value", value) for value in values], dtype=str)
+
+
+def _default(model, name: str):
+    return model.model_fields[name].default
+
+
+class ScreeningBatch:
+    """
+    Column-oriented inputs for `screen_decisions`.
+
+    Each argument is a column with one value per property, or a scalar
+    applied to every row. Defaults mirror ConfidenceInput and DecisionInput.
+    Comparable sales are ragged: the sales of row i are
+    `comparable_prices[comparable_offsets[i]:comparable_offsets[i + 1]]`.
+    Other (non-comparable) estimates are not supported in batches.
+
+    Args:
+        assessed_value: Current assessed values
+        estimated_market_value: Primary market value estimates
+        valuation_method: ValuationMethod values per row
+        tax_rate: Effective tax rates (decimal)
+        jurisdiction_id: Jurisdiction of each row, a key of `priors`
+        priors: JurisdictionPriors for every jurisdiction referenced
+        comparable_offsets: Row offsets into `comparable_prices` (length n + 1)
+        comparable_prices: Concatenated comparable sale prices
+    """
+
+    def __init__(
+        self,
+        assessed_value: ColumnLike,
+        estimated_market_value: ColumnLike,
+        valuation_method: ColumnLike,
+        tax_rate: ColumnLike,
+        jurisdiction_id: ColumnLike,
+        priors: Union[Mapping[str, JurisdictionPriors], Iterable[JurisdictionPriors]],
+        comparable_offsets: Optional[Sequence[int]] = None,
+        comparable_prices: Optional[Sequence[float]] = None,
+        data_quality_score: ColumnLike = _default(ConfidenceInput, "data_quality_score"),
+        market_conditions: ColumnLike = _default(ConfidenceInput, "market_conditions"),
+        property_uniqueness: ColumnLike = _default(ConfidenceInput, "property_uniqueness"),
+        days_since_valuation: ColumnLike = _default(ConfidenceInput, "days_since_valuation"),
+        estimated_filing_fee: ColumnLike = _default(DecisionInput, "estimated_filing_fee"),
+        estimated_attorney_fee: ColumnLike = _default(DecisionInput, "estimated_attorney_fee"),
+        estimated_other_costs: ColumnLike = _default(DecisionInput, "estimated_other_costs"),
+        min_roi_threshold: ColumnLike = _default(DecisionInput, "min_roi_threshold"),
+        min_savings_threshold: ColumnLike = _default(DecisionInput, "min_savings_threshold"),
+        appeal_horizon_years: ColumnLike = _default(DecisionInput, "appeal_horizon_years"),
+    ):
+        self.assessed_value = np.atleast_1d(np.asarray(assessed_value, dtype=np.float64))
+        size = len(self.assessed_value)
+
+        def column(values, dtype=np.float64) -> np.ndarray:
+            array = np.asarray(values, dtype=dtype)
+            if array.ndim == 0:
+                return np.full(size, array, dtype=array.dtype)
+            if len(array) != size:
+                raise ValueError("All screening columns must have the same length")
+            return array
+
+        def codes(values, labels: Sequence[str], name: str) -> np.ndarray:
+            names, inverse = np.unique(column(_as_labels(values), dtype=str), return_inverse=True)
+            lookup = np.empty(len(names), dtype=np.int64)
+            for i, label in enumerate(names):
+                key = label.lower() if name == "market_conditions" else label
+                if key not in labels:
+                    raise ValueError(f"Unknown {name}: {label!r}")
+                lookup[i] = labels.index(key)
+            return lookup[inverse.reshape(-1)]
+
+        self.estimated_market_value = column(estimated_market_value)
+        self.tax_rate = column(tax_rate)
+        self.data_quality_score = column(data_quality_score)
+        self.property_uniqueness = column(property_uniqueness)
+        self.days_since_valuation = column(days_since_valuation, dtype=np.int64)
+        self.estimated_filing_fee = column(estimated_filing_fee)
+        self.estimated_attorney_fee = column(estimated_attorney_fee)
+        self.estimated_other_costs = column(estimated_other_costs)
+        self.min_roi_threshold = column(min_roi_threshold)
+        self.min_savings_threshold = column(min_savings_threshold)
+        self.appeal_horizon_years = column(appeal_horizon_years, dtype=np.int64)
+
+        self.valuation_method = codes(valuation_method, [m.value for m in _METHODS], "valuation_method")
+        self.market_conditions = codes(market_conditions, _MARKET_CONDITIONS, "market_conditions")
+
+        if isinstance(priors, Mapping):
+            priors = priors.values()
+        self.priors: List[JurisdictionPriors] = list(priors)
+        jurisdiction_ids = [p.jurisdiction_id for p in self.priors]
+        self.jurisdiction = codes(jurisdiction_id, jurisdiction_ids, "jurisdiction_id")
+
+        if comparable_offsets is None:
+            self.comparable_offsets = np.zeros(size + 1, dtype=np.int64)
+            self.comparable_prices = np.empty(0, dtype=np.float64)
+        else:
+            self.comparable_offsets = np.asarray(comparable_offsets, dtype=np.int64)
+            self.comparable_prices = np.asarray(comparable_prices, dtype=np.float64)
+            if (len(self.comparable_offsets) != size + 1 or self.comparable_offsets[0] != 0
+                    or self.comparable_offsets[-1] != len(self.comparable_prices)
+                    or np.any(np.diff(self.comparable_offsets) < 0)):
+                raise ValueError("comparable_offsets must run from 0 to len(comparable_prices) in n + 1 steps")
+
+    def __len__(self) -> int:
+        return len(self.assessed_value)
+
+    def confidence_input(self, row: int) -> ConfidenceInput:
+        """Exact-engine ConfidenceInput for one row."""
+        start, end = self.comparable_offsets[row], self.comparable_offsets[row + 1]
+        return ConfidenceInput(
+            estimated_market_value=_to_decimal(self.estimated_market_value[row]),
+            valuation_method=_METHODS[self.valuation_method[row]],
+            comparable_sales=[_to_decimal(price) for price in self.comparable_prices[start:end]],
+            data_quality_score=_to_decimal(self.data_quality_score[row]),
+            market_conditions=_MARKET_CONDITIONS[self.market_conditions[row]],
+            property_uniqueness=_to_decimal(self.property_uniqueness[row]),
+            days_since_valuation=int(self.days_since_valuation[row]),
+        )
+
+    def decision_input(self, row: int, confidence_result) -> DecisionInput:
+        """Exact-engine DecisionInput for one row."""
+        return DecisionInput(
+            assessed_value=_to_decimal(self.assessed_value[row]),
+            estimated_market_value=_to_decimal(self.estimated_market_value[row]),
+            confidence_result=confidence_result,
+            jurisdiction_priors=self.priors[self.jurisdiction[row]],
+            tax_rate=_to_decimal(self.tax_rate[row]),
+            estimated_filing_fee=_to_decimal(self.estimated_filing_fee[row]),
+            estimated_attorney_fee=_to_decimal(self.estimated_attorney_fee[row]),
+            estimated_other_costs=_to_decimal(self.estimated_other_costs[row]),
+            min_roi_threshold=_to_decimal(self.min_roi_threshold[row]),
+            min_savings_threshold=_to_decimal(self.min_savings_threshold[row]),
+            appeal_horizon_years=int(self.appeal_horizon_years[row]),
+        )
+
+
+class ScreeningResult:
+    """
+    Per-row screening outcome.
+
+    Attributes:
+        decision: Decision codes (indexes into DECISION_CODES)
+        assessment_ratio, lower_bound, upper_bound, expected_annual_savings,
+        expected_roi: Metric columns (ROI is NaN where there are no costs)
+        within_confidence_band, meets_roi_threshold: Boolean outcome columns
+        flagged: Rows near a threshold, re-evaluated exactly when verified
+        unverified: Flagged rows the exact engines rejected; their outcome
+            stays the float approximation
+        exact: Exact DecisionResult by row for every re-evaluated row
+        errors: Validation message by row for every unverified row
+    """
+
+    def __init__(self, size: int):
+        self.decision = np.zeros(size, dtype=np.uint8)
+        self.assessment_ratio = np.zeros(size)
+        self.lower_bound = np.zeros(size)
+        self.upper_bound = np.zeros(size)
+        self.expected_annual_savings = np.zeros(size)
+        self.expected_roi = np.full(size, np.nan)
+        self.within_confidence_band = np.zeros(size, dtype=bool)
+        self.meets_roi_threshold = np.zeros(size, dtype=bool)
+        self.flagged = np.zeros(size, dtype=bool)
+        self.unverified = np.zeros(size, dtype=bool)
+        self.exact: Dict[int, DecisionResult] = {}
+        self.errors: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.decision)
+
+    @property
+    def decisions(self) -> np.ndarray:
+        """Decision labels ("OVER"/"FAIR"/"UNDER") per row."""
+        return np.array(DECISION_CODES)[self.decision]
+
+    def store_exact(self, row: int, result: DecisionResult, lower_bound: Decimal, upper_bound: Decimal,
+                    min_roi_threshold: Decimal) -> None:
+        """Overwrite a row with an exact engine result."""
+        self.exact[row] = result
+        self.decision[row] = DECISION_CODES.index(result.decision.value)
+        self.assessment_ratio[row] = float(result.assessment_ratio)
+        self.lower_bound[row] = float(lower_bound)
+        self.upper_bound[row] = float(upper_bound)
+        self.expected_annual_savings[row] = float(result.expected_annual_savings)
+        self.expected_roi[row] = np.nan if result.expected_roi is None else float(result.expected_roi)
+        self.within_confidence_band[row] = result.within_confidence_band
+        self.meets_roi_threshold[row] = bool(result.expected_roi and result.expected_roi > min_roi_threshold)
+
+
+def _coefficient_of_variation(batch: ScreeningBatch) -> np.ndarray:
+    """Population CV over each row's primary estimate and comparable sales (NaN if alone)."""
+    offsets = batch.comparable_offsets
+    counts = np.diff(offsets)
+    # Interleave each row's primary estimate ahead of its sales
+    values = np.insert(batch.comparable_prices, offsets[:-1], batch.estimated_market_value)
+    starts = offsets[:-1] + np.arange(len(batch))
+    sizes = counts + 1
+
+    mean = np.add.reduceat(values, starts) / sizes
+    squared = (values - np.repeat(mean, sizes)) ** 2
+    variance = np.add.reduceat(squared, starts) / sizes
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cv = np.sqrt(variance) / mean
+    cv[(counts == 0) | (mean <= 0)] = np.nan
+    return cv
+
+
+def _near(values: np.ndarray, targets, slack: float, tolerance: float) -> np.ndarray:
+    scale = np.maximum(np.abs(values), np.abs(targets))
+    return np.abs(values - targets) <= slack + tolerance * scale
+
+
+def screen_decisions(
+    batch: ScreeningBatch,
+    tolerance: float = SCREENING_EPSILON,
+    verify: bool = True,
+) -> ScreeningResult:
+    """
+    Screen a batch in float64 and re-decide rows near a decision boundary.
+
+    Args:
+        batch: Column inputs
+        tolerance: Relative distance to a threshold that flags a row
+        verify: Re-run flagged rows through the exact Decimal engines; a row
+            whose inputs fail their validation is marked unverified
+            instead of failing the batch
+
+    Returns:
+        ScreeningResult with labels, metrics and the flagged mask
+    """
+    if len(batch) == 0:
+        return ScreeningResult(0)
+    result = ScreeningResult(len(batch))
+    market_value = batch.estimated_market_value
+    assessed = batch.assessed_value
+
+    # calculate_confidence_band
+    band = np.array([float(METHOD_BANDS[m]) for m in _METHODS])[batch.valuation_method]
+    band = band + (1.0 - batch.data_quality_score) * 0.15
+    band += np.array([float(MARKET_ADJUSTMENTS[c]) for c in _MARKET_CONDITIONS])[batch.market_conditions]
+    band += batch.property_uniqueness * 0.10
+    band += np.minimum(batch.days_since_valuation / 365.0 * 0.01, 0.15)
+    cv = _coefficient_of_variation(batch)
+    band += np.where(np.isnan(cv), 0.0, cv * 0.5)
+    band = np.clip(band, float(MIN_BAND), float(MAX_BAND))
+    lower = market_value - market_value * band
+    upper = market_value + market_value * band
+
+    # make_appeal_decision
+    priors = batch.priors
+    cod_target = np.array([float(p.cod_target) for p in priors])[batch.jurisdiction]
+    reduction = np.array([float(p.average_reduction_pct) for p in priors])[batch.jurisdiction]
+    default_costs = np.array([float(p.typical_filing_fee + p.typical_attorney_cost) for p in priors])[batch.jurisdiction]
+
+    ratio = assessed / market_value
+    within = (np.round(lower, 2) <= assessed) & (assessed <= np.round(upper, 2))
+    reduced = np.maximum(assessed * (1.0 - reduction), market_value)
+    savings = (assessed - reduced) * batch.tax_rate
+    costs = batch.estimated_filing_fee + batch.estimated_attorney_fee + batch.estimated_other_costs
+    costs = np.where(costs == 0, default_costs, costs)
+    horizon = batch.appeal_horizon_years
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(costs > 0, (savings * horizon - costs) / costs * 100, np.nan)
+
+    fair_limit = 1.0 + cod_target
+    under = float(UNDER_RATIO_THRESHOLD)
+    result.decision[:] = np.where(
+        ratio < under, _UNDER, np.where((ratio <= fair_limit) & within, _FAIR, _OVER)
+    )
+    result.assessment_ratio[:] = ratio
+    result.lower_bound[:] = lower
+    result.upper_bound[:] = upper
+    result.expected_annual_savings[:] = savings
+    result.expected_roi[:] = roi
+    result.within_confidence_band[:] = within
+    result.meets_roi_threshold[:] = roi > batch.min_roi_threshold
+
+    result.flagged[:] = (
+        _near(ratio, under, 0.0, tolerance)
+        | _near(ratio, fair_limit, 0.0, tolerance)
+        | _near(assessed, lower, _BOUND_SLACK, tolerance)
+        | _near(assessed, upper, _BOUND_SLACK, tolerance)
+        | (~np.isnan(roi) & _near(roi, batch.min_roi_threshold, _ROI_SLACK, tolerance))
+    )
+
+    if verify:
+        for row in np.flatnonzero(result.flagged):
+            row = int(row)
+            try:
+                confidence = calculate_confidence_band(batch.confidence_input(row))
+                decision_input = batch.decision_input(row, confidence)
+                exact = make_appeal_decision(decision_input)
+            except (ValidationError, ValueError) as e:
+                result.unverified[row] = True
+                result.errors[row] = str(e)
+                continue
+            result.store_exact(
+                row, exact, confidence.lower_bound, confidence.upper_bound, decision_input.min_roi_threshold,
+            )
+    return result
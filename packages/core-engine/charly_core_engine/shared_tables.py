@@ -0,0 +1,348 @@
+"""Jurisdiction priors and tax-rate schedules in shared memory.
+
+Process pools that decide portfolios otherwise pickle every
+JurisdictionPriors (and rate table) into each worker. Here the parent
+publishes both tables once into a `multiprocessing.shared_memory` segment
+as numpy structured arrays; workers attach by name and read the rows in
+place.
+
+    tables = SharedJurisdictionTables.create(priors, {"collin_county_tx": {2024: Decimal('0.0215')}})
+    pool = ProcessPoolExecutor(initializer=init_worker, initargs=(tables.handle,))
+    # in a worker:
+    priors = attached_tables()["collin_county_tx"]
+
+Decimal fields are stored as an int64 coefficient plus an int8 exponent,
+so values (including their exponent, e.g. 0.450 vs 0.45) round-trip
+exactly.
+"""
+
+import sys
+from dataclasses import dataclass
+from decimal import Decimal
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Type, Union, get_args
+
+import numpy as np
+from pydantic import BaseModel
+
+from .jurisdiction import JurisdictionPriors
+
+
+_INT64_MIN = np.iinfo(np.int64).min  # Stored for None in optional integer fields
+_ALIGNMENT = 8
+
+# Python 3.13+ can attach without registering with the resource tracker.
+# Earlier, pool workers share the creator's tracker, where the segment is
+# already registered, so attaching adds no second owner.
+_ATTACH_OPTIONS: Dict[str, Any] = {"track": False} if sys.version_info >= (3, 13) else {}
+
+
+def _field_kinds(model: Type[BaseModel] = JurisdictionPriors) -> Dict[str, str]:
+    """Storage kind per model field: str, decimal, int, optional_int or bool."""
+    kinds = {}
+    for name, info in model.model_fields.items():
+        annotation = info.annotation
+        optional = type(None) in get_args(annotation)
+        if optional:
+            annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+        if annotation is str and not optional:
+            kinds[name] = "str"
+        elif annotation is Decimal and not optional:
+            kinds[name] = "decimal"
+        elif annotation is bool and not optional:
+            kinds[name] = "bool"
+        elif annotation is int:
+            kinds[name] = "optional_int" if optional else "int"
+        else:
+            raise TypeError(f"{model.__name__}.{name} has no shared-memory representation")
+    return kinds
+
+
+_FIELD_KINDS = _field_kinds()
+PRIOR_FIELDS: Tuple[str, ...] = tuple(_FIELD_KINDS)
+
+
+def _encode_decimal(value: Decimal) -> Tuple[int, int]:
+    exponent = value.as_tuple().exponent
+    if not isinstance(exponent, int):
+        raise ValueError(f"Cannot share non-finite Decimal {value}")
+    coefficient = int(value.scaleb(-exponent))
+    if not (_INT64_MIN <= coefficient <= np.iinfo(np.int64).max and -128 <= exponent <= 127):
+        raise ValueError(f"Decimal {value} is out of range for shared storage")
+    return coefficient, exponent
+
+
+def _decode_decimal(coefficient, exponent) -> Decimal:
+    return Decimal(int(coefficient)).scaleb(int(exponent))
+
+
+def _priors_dtype(widths: Mapping[str, int]) -> np.dtype:
+    fields = []
+    for name, kind in _FIELD_KINDS.items():
+        if kind == "str":
+            fields.append((name, f"S{widths[name]}"))
+        elif kind == "decimal":
+            fields += [(name, np.int64), (f"{name}_exp", np.int8)]
+        elif kind == "bool":
+            fields.append((name, np.bool_))
+        else:
+            fields.append((name, np.int64))
+    return np.dtype(fields)
+
+
+def _rates_dtype(id_width: int) -> np.dtype:
+    return np.dtype([
+        ("jurisdiction_id", f"S{id_width}"),
+        ("tax_year", np.int32),
+        ("tax_rate", np.int64),
+        ("tax_rate_exp", np.int8),
+    ])
+
+
+def _aligned(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+@dataclass(frozen=True)
+class SharedTablesHandle:
+    """Picklable description of a published segment; pass it to workers."""
+
+    name: str
+    priors_count: int
+    rates_count: int
+    string_widths: Tuple[Tuple[str, int], ...]
+
+    @property
+    def priors_dtype(self) -> np.dtype:
+        return _priors_dtype(dict(self.string_widths))
+
+    @property
+    def rates_dtype(self) -> np.dtype:
+        return _rates_dtype(dict(self.string_widths)["jurisdiction_id"])
+
+    @property
+    def rates_offset(self) -> int:
+        return _aligned(self.priors_count * self.priors_dtype.itemsize)
+
+    @property
+    def size(self) -> int:
+        return max(1, self.rates_offset + self.rates_count * self.rates_dtype.itemsize)
+
+
+def _write_tables(buffer, handle: SharedTablesHandle, records, rate_rows) -> None:
+    # Views are local so the segment can be closed once this returns
+    table = np.ndarray(handle.priors_count, dtype=handle.priors_dtype, buffer=buffer)
+    for row, p in zip(table, records):
+        for name, kind in _FIELD_KINDS.items():
+            value = getattr(p, name)
+            if kind == "str":
+                row[name] = value.encode()
+            elif kind == "decimal":
+                row[name], row[f"{name}_exp"] = _encode_decimal(value)
+            elif kind == "optional_int":
+                row[name] = _INT64_MIN if value is None else value
+            else:
+                row[name] = value
+    rates = np.ndarray(handle.rates_count, dtype=handle.rates_dtype, buffer=buffer, offset=handle.rates_offset)
+    for row, (jurisdiction_id, year, rate) in zip(rates, rate_rows):
+        row["jurisdiction_id"], row["tax_year"] = jurisdiction_id, year
+        row["tax_rate"], row["tax_rate_exp"] = _encode_decimal(rate)
+
+
+class SharedJurisdictionTables(Mapping):
+    """
+    Read-only jurisdiction lookups backed by a shared-memory segment.
+
+    Behaves as a Mapping of jurisdiction_id -> JurisdictionPriors (so it can
+    stand in for a priors dict, e.g. in ScreeningBatch). Each worker builds a
+    JurisdictionPriors at most once per jurisdiction; `value()` reads a
+    single field without building one.
+
+    Use `create` in the parent and `attach` in workers; the creator must
+    `unlink` the segment when all workers are done.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, handle: SharedTablesHandle, owner: bool):
+        self._shm = shm
+        self.handle = handle
+        self.owner = owner
+        self._priors = np.ndarray(handle.priors_count, dtype=handle.priors_dtype, buffer=shm.buf)
+        self._rates = np.ndarray(handle.rates_count, dtype=handle.rates_dtype, buffer=shm.buf,
+                                 offset=handle.rates_offset)
+        self._priors.flags.writeable = False
+        self._rates.flags.writeable = False
+        self._ids = self._priors["jurisdiction_id"]
+        self._rate_ids = self._rates["jurisdiction_id"]
+        self._materialized: Dict[str, JurisdictionPriors] = {}
+
+    @classmethod
+    def create(
+        cls,
+        priors: Union[Mapping[str, JurisdictionPriors], Iterable[JurisdictionPriors]],
+        tax_rates: Optional[Mapping[str, Mapping[int, Decimal]]] = None,
+    ) -> "SharedJurisdictionTables":
+        """
+        Publish priors and tax-rate schedules into a new shared-memory segment.
+
+        Args:
+            priors: JurisdictionPriors to publish (a mapping's values are used)
+            tax_rates: Per jurisdiction, effective tax rate by tax year
+
+        Returns:
+            Owning SharedJurisdictionTables; pass `.handle` to workers
+        """
+        if isinstance(priors, Mapping):
+            priors = priors.values()
+        records = sorted(priors, key=lambda p: p.jurisdiction_id.encode())
+        ids = [p.jurisdiction_id.encode() for p in records]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate jurisdiction_id in priors")
+        rate_rows = sorted(
+            (jurisdiction_id.encode(), int(year), Decimal(str(rate)))
+            for jurisdiction_id, schedule in (tax_rates or {}).items()
+            for year, rate in schedule.items()
+        )
+
+        widths = {name: 1 for name, kind in _FIELD_KINDS.items() if kind == "str"}
+        for p in records:
+            for name in widths:
+                widths[name] = max(widths[name], len(getattr(p, name).encode()))
+        widths["jurisdiction_id"] = max([widths["jurisdiction_id"]] + [len(row[0]) for row in rate_rows])
+        handle = SharedTablesHandle("", len(records), len(rate_rows), tuple(sorted(widths.items())))
+
+        shm = shared_memory.SharedMemory(create=True, size=handle.size)
+        handle = SharedTablesHandle(shm.name, handle.priors_count, handle.rates_count, handle.string_widths)
+        try:
+            _write_tables(shm.buf, handle, records, rate_rows)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, handle, owner=True)
+
+    @classmethod
+    def attach(cls, handle: SharedTablesHandle) -> "SharedJurisdictionTables":
+        """Map an existing segment read-only, without copying it."""
+        shm = shared_memory.SharedMemory(name=handle.name, **_ATTACH_OPTIONS)
+        return cls(shm, handle, owner=False)
+
+    def _row(self, jurisdiction_id: str) -> Optional[int]:
+        key = jurisdiction_id.encode()
+        index = int(np.searchsorted(self._ids, key))
+        if index < len(self._ids) and self._ids[index] == key:
+            return index
+        return None
+
+    def __getitem__(self, jurisdiction_id: str) -> JurisdictionPriors:
+        priors = self._materialized.get(jurisdiction_id)
+        if priors is None:
+            index = self._row(jurisdiction_id)
+            if index is None:
+                raise KeyError(jurisdiction_id)
+            row = self._priors[index]
+            # Rows were validated as JurisdictionPriors before publishing
+            priors = JurisdictionPriors.model_construct(
+                **{name: self._decode(row, name) for name in PRIOR_FIELDS}
+            )
+            self._materialized[jurisdiction_id] = priors
+        return priors
+
+    def __iter__(self) -> Iterator[str]:
+        return (jurisdiction_id.decode() for jurisdiction_id in self._ids)
+
+    def __len__(self) -> int:
+        return len(self._priors)
+
+    def __contains__(self, jurisdiction_id: object) -> bool:
+        return isinstance(jurisdiction_id, str) and self._row(jurisdiction_id) is not None
+
+    @staticmethod
+    def _decode(row, name: str) -> Any:
+        kind = _FIELD_KINDS[name]
+        if kind == "str":
+            return row[name].decode()
+        if kind == "decimal":
+            return _decode_decimal(row[name], row[f"{name}_exp"])
+        if kind == "bool":
+            return bool(row[name])
+        value = int(row[name])
+        return None if kind == "optional_int" and value == _INT64_MIN else value
+
+    def value(self, jurisdiction_id: str, field: str) -> Any:
+        """
+        One JurisdictionPriors field, read straight from shared memory.
+
+        Raises:
+            KeyError: Unknown jurisdiction or field
+        """
+        if field not in _FIELD_KINDS:
+            raise KeyError(field)
+        index = self._row(jurisdiction_id)
+        if index is None:
+            raise KeyError(jurisdiction_id)
+        return self._decode(self._priors[index], field)
+
+    def tax_rate(self, jurisdiction_id: str, tax_year: int) -> Decimal:
+        """
+        Effective tax rate for a tax year.
+
+        Schedules are step functions: the latest rate published for a year
+        at or before `tax_year` applies.
+
+        Raises:
+            KeyError: No rate for the jurisdiction on or before `tax_year`
+        """
+        key = jurisdiction_id.encode()
+        start = int(np.searchsorted(self._rate_ids, key, side="left"))
+        end = int(np.searchsorted(self._rate_ids, key, side="right"))
+        position = start + int(np.searchsorted(self._rates["tax_year"][start:end], tax_year, side="right")) - 1
+        if position < start:
+            raise KeyError(f"No tax rate for {jurisdiction_id} on or before {tax_year}")
+        return _decode_decimal(self._rates["tax_rate"][position], self._rates["tax_rate_exp"][position])
+
+    def tax_years(self, jurisdiction_id: str) -> List[int]:
+        """Years with a published rate for the jurisdiction, ascending."""
+        key = jurisdiction_id.encode()
+        start = int(np.searchsorted(self._rate_ids, key, side="left"))
+        end = int(np.searchsorted(self._rate_ids, key, side="right"))
+        return [int(year) for year in self._rates["tax_year"][start:end]]
+
+    @property
+    def nbytes(self) -> int:
+        return self.handle.size
+
+    def close(self) -> None:
+        """Drop this process's mapping (the segment stays until unlinked)."""
+        self._materialized.clear()
+        self._ids = self._rate_ids = self._priors = self._rates = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Destroy the segment; creator only, after workers are done."""
+        if not self.owner:
+            raise RuntimeError("Only the creating process may unlink shared tables")
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedJurisdictionTables":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+_attached: Optional[SharedJurisdictionTables] = None
+
+
+def init_worker(handle: SharedTablesHandle) -> None:
+    """Pool initializer: attach the published tables in this worker."""
+    global _attached
+    _attached = SharedJurisdictionTables.attach(handle)
+
+
+def attached_tables() -> SharedJurisdictionTables:
+    """Tables attached by init_worker in the current process."""
+    if _attached is None:
+        raise RuntimeError("No shared jurisdiction tables attached; use init_worker as the pool initializer")
+    return _attached
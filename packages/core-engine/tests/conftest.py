@@ -0,0 +1,86 @@
+"""Shared test fixtures."""
+
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+
+from charly_core_engine.confidence import calculate_confidence_band, ConfidenceInput, ValuationMethod
+from charly_core_engine.decision import DecisionInput
+from charly_core_engine.jurisdiction import JurisdictionPriors
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def modules_loaded_by():
+    """
+    Names in sys.modules after running a statement in a fresh interpreter.
+
+    Which modules an import pulls in is deterministic, unlike how long it
+    takes, so lazy-import guarantees can be asserted without timing budgets
+    (benchmarks/bench_import.py reports those).
+    """
+    def run(statement: str) -> frozenset:
+        script = f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True,
+        )
+        return frozenset(completed.stdout.split())
+    return run
+
+
+@pytest.fixture
+def priors():
+    """Build Collin County priors; keyword arguments override fields."""
+    def create(**overrides) -> JurisdictionPriors:
+        values = dict(
+            jurisdiction_id="collin_county_tx",
+            jurisdiction_name="Collin County, TX",
+            state="TX",
+            appeal_success_rate=Decimal('0.45'),
+            average_reduction_pct=Decimal('0.18'),
+            typical_filing_fee=Decimal('450'),
+            typical_attorney_cost=Decimal('2800'),
+            cod_target=Decimal('0.15'),
+        )
+        values.update(overrides)
+        return JurisdictionPriors(**values)
+    return create
+
+
+@pytest.fixture
+def decision_input(priors):
+    """
+    Build a DecisionInput for a $1M sales-comparison valuation.
+
+    `confidence` holds extra ConfidenceInput fields (three tight comparable
+    sales by default), `jurisdiction_priors` defaults to the priors fixture,
+    and other keyword arguments override DecisionInput fields.
+    """
+    def create(
+        assessed: str,
+        jurisdiction_priors: Optional[JurisdictionPriors] = None,
+        confidence: Optional[Dict[str, Any]] = None,
+        **overrides
+    ) -> DecisionInput:
+        if confidence is None:
+            confidence = {"comparable_sales": [Decimal('990000'), Decimal('1000000'), Decimal('1010000')]}
+        confidence_result = calculate_confidence_band(ConfidenceInput(
+            estimated_market_value=Decimal('1000000'),
+            valuation_method=ValuationMethod.SALES_COMPARISON,
+            **confidence
+        ))
+        return DecisionInput(
+            assessed_value=Decimal(assessed),
+            estimated_market_value=Decimal('1000000'),
+            confidence_result=confidence_result,
+            jurisdiction_priors=jurisdiction_priors or priors(),
+            tax_rate=Decimal('0.025'),
+            **overrides
+        )
+    return create
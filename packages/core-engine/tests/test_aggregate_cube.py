@@ -0,0 +1,158 @@
+"""Tests for the incrementally maintained decision cube."""
+
+import io
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from charly_core_engine.aggregate_cube import CUBE_MEASURES, DecisionCube
+from charly_core_engine.decision import make_appeal_decision
+from charly_core_engine.jurisdiction import JurisdictionPriors
+from charly_core_engine.redecision import RedecisionTracker
+from charly_core_engine.result_store import DecisionStore, write_decision_store
+
+
+@pytest.fixture
+def inputs(decision_input):
+    travis = JurisdictionPriors.get_default_priors("TX")
+    return {
+        "FAIR-1": decision_input("1120000"),
+        "OVER-1": decision_input("1400000"),
+        "OVER-2": decision_input("1300000", confidence={}),
+        "UNDER-1": decision_input("800000"),
+        "OTHER-1": decision_input("1250000", travis, confidence={"data_quality_score": Decimal('0.4')}),
+    }
+
+
+def rows_of(inputs):
+    return [
+        (property_id, input_data.jurisdiction_priors.jurisdiction_id, make_appeal_decision(input_data),
+         input_data.confidence_result)
+        for property_id, input_data in inputs.items()
+    ]
+
+
+def expected_totals(rows, **filters):
+    """Brute-force sums over the matching rows."""
+    totals = dict.fromkeys(CUBE_MEASURES, Decimal('0.00'))
+    totals["count"] = 0
+    for _, jurisdiction_id, decision, confidence in rows:
+        labels = {
+            "jurisdiction_id": jurisdiction_id,
+            "decision": decision.decision.value,
+            "confidence_level": decision.confidence_level,
+            "reliability_grade": confidence.reliability_grade,
+        }
+        if all(labels[name] == value for name, value in filters.items()):
+            totals["count"] += 1
+            for measure in CUBE_MEASURES[1:]:
+                totals[measure] += getattr(decision, measure)
+    return totals
+
+
+class TestDecisionCube:
+    """Test cube queries against brute-force sums."""
+
+    def test_totals_match_rows(self, inputs):
+        rows = rows_of(inputs)
+        cube = DecisionCube.from_rows(rows)
+
+        assert len(cube) == 5
+        assert "OVER-1" in cube
+        assert cube.jurisdictions == ("collin_county_tx", "default_tx")
+        assert cube.totals() == expected_totals(rows)
+        assert cube.totals(jurisdiction_id="collin_county_tx", decision="OVER") == \
+            expected_totals(rows, jurisdiction_id="collin_county_tx", decision="OVER")
+        grade = rows[0][3].reliability_grade
+        assert cube.totals(reliability_grade=grade, confidence_level=rows[0][2].confidence_level) == \
+            expected_totals(rows, reliability_grade=grade, confidence_level=rows[0][2].confidence_level)
+        assert cube.total("count", decision=["OVER", "UNDER"]) == 4
+        assert cube.total("expected_annual_savings", jurisdiction_id="nowhere_tx") == Decimal('0.00')
+
+    def test_breakdown(self, inputs):
+        rows = rows_of(inputs)
+        cube = DecisionCube.from_rows(rows)
+        assert cube.breakdown("decision") == {"OVER": 3, "FAIR": 1, "UNDER": 1}
+        assert cube.breakdown("decision", "count", decision=["OVER", "FAIR"]) == {"OVER": 3, "FAIR": 1}
+        savings = cube.breakdown("jurisdiction_id", "expected_annual_savings", decision="OVER")
+        assert savings == {
+            jurisdiction_id: expected_totals(rows, jurisdiction_id=jurisdiction_id, decision="OVER")[
+                "expected_annual_savings"]
+            for jurisdiction_id in ("collin_county_tx", "default_tx")
+        }
+
+    def test_redecide_subtracts_old_contribution(self, inputs, priors):
+        tracker = RedecisionTracker()
+        tracker.track_many(inputs.items())
+        cube = DecisionCube.from_rows(rows_of(inputs))
+
+        # A tighter FAIR band turns FAIR-1 into OVER and changes its savings
+        report = tracker.update_priors(priors(cod_target=Decimal('0.05')))
+        assert [change.property_id for change in report.changes] == ["FAIR-1"]
+        cube.refresh(tracker, tracker.dependents("collin_county_tx"))
+        current = [(property_id, input_data.jurisdiction_priors.jurisdiction_id, tracker.result(property_id),
+                    input_data.confidence_result)
+                   for property_id, input_data in ((p, tracker.decision_input(p)) for p in inputs)]
+        assert cube.totals() == expected_totals(current)
+        assert cube.total("count", decision="FAIR") == 0
+
+        tracker.untrack("OVER-2")
+        cube.refresh(tracker, ["OVER-2"])
+        assert "OVER-2" not in cube
+        assert cube.totals() == expected_totals([row for row in current if row[0] != "OVER-2"])
+        cube.remove("OVER-2")
+        cube.remove("NEVER-SEEN")
+        assert len(cube) == 4
+
+    def test_from_store_matches_rows(self, inputs, tmp_path):
+        rows = rows_of(inputs)
+        path = str(tmp_path / "portfolio.crs")
+        # A property decided twice keeps its last record
+        write_decision_store(path, rows + [rows[0][:1] + rows[1][1:]])
+        with DecisionStore.open(path) as store:
+            cube = DecisionCube.from_store(store)
+        expected = DecisionCube.from_rows(rows + [rows[0][:1] + rows[1][1:]])
+        assert len(cube) == 5
+        assert cube.totals() == expected.totals()
+        assert cube.breakdown("decision") == expected.breakdown("decision")
+        # Incremental updates keep working on a bulk-built cube
+        cube.upsert(*rows[0])
+        assert cube.totals() == expected_totals(rows)
+
+    def test_save_and_load(self, inputs, tmp_path):
+        rows = rows_of(inputs)
+        cube = DecisionCube(capacity=1)
+        for row in rows:
+            cube.upsert(*row)
+        path = str(tmp_path / "portfolio.cube")
+        cube.save(path)
+        loaded = DecisionCube.load(path)
+        assert loaded.totals() == cube.totals()
+        assert loaded.jurisdictions == cube.jurisdictions
+        loaded.upsert(rows[1][0], *rows[0][1:])
+        cube.upsert(rows[1][0], *rows[0][1:])
+        assert loaded.breakdown("decision") == cube.breakdown("decision")
+
+        buffer = io.BytesIO()
+        DecisionCube().save(buffer)
+        buffer.seek(0)
+        assert len(DecisionCube.load(buffer)) == 0
+
+    def test_rejects_other_versions(self, tmp_path):
+        path = str(tmp_path / "old.cube")
+        with open(path, "wb") as handle:
+            np.savez(handle, format_version=np.array(99))
+        with pytest.raises(ValueError):
+            DecisionCube.load(path)
+
+    def test_validation(self, inputs):
+        cube = DecisionCube.from_rows(rows_of(inputs))
+        with pytest.raises(ValueError):
+            cube.totals(property_type="office")
+        with pytest.raises(ValueError):
+            cube.total("assessed_value")
+        with pytest.raises(ValueError):
+            cube.breakdown("property_type")
+        with pytest.raises(ValueError):
+            cube.breakdown("decision", "assessed_value")
@@ -0,0 +1,256 @@
+"""Tests for column-wise validation against the pydantic models."""
+
+import random
+from decimal import Decimal
+from typing import Optional
+
+import numpy as np
+import pytest
+from pydantic import BaseModel, Field, ValidationError
+
+from charly_core_engine.column_validation import (
+    ErrorRule, validate_confidence_columns, validate_decision_columns, validate_model_columns
+)
+from charly_core_engine.confidence import ConfidenceInput, ValuationMethod, calculate_confidence_band
+from charly_core_engine.decision import DecisionInput
+from charly_core_engine.jurisdiction import JurisdictionPriors
+
+
+NUMBERS = [5, 0, -1, 0.05, 0.1, 0.10000000000000002, 0.5, 1, 3.0, 3.5, 11, 1095, 1096, 10**6,
+           "2.5", " 7 ", "3.0", "1e3", "0.11", "abc", "NaN", "inf", float("nan"), None]
+METHODS = ["sales_comparison", "cost_approach", ValuationMethod.INCOME_APPROACH, "bogus", None]
+
+
+def pydantic_errors(model, **fields):
+    """(type, loc, msg) of each error constructing `model`; None marks an absent field."""
+    try:
+        model(**{name: value for name, value in fields.items() if value is not None})
+    except ValidationError as e:
+        return [(error["type"], error["loc"], error["msg"]) for error in e.errors()]
+    return []
+
+
+def report_errors(report, row):
+    return [(error["type"], error["loc"], error["msg"]) for error in report.errors(row)]
+
+
+def random_confidence_rows(size: int, seed: int = 3):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(size):
+        rows.append({
+            "estimated_market_value": rng.choice(NUMBERS),
+            "valuation_method": rng.choice(METHODS),
+            "data_quality_score": rng.choice(NUMBERS),
+            "market_conditions": rng.choice(["stable", "Volatile", "bad", None]),
+            "property_uniqueness": rng.choice(NUMBERS),
+            "days_since_valuation": rng.choice(NUMBERS),
+            "comparable_sales": [rng.choice([1, 2.5, "x", float("nan")]) for _ in range(rng.choice([0, 1, 2]))],
+            "other_estimates": [
+                (rng.choice([5, 5, 5, -1, "q"]), rng.choice(["cost_approach"] * 5 + ["zz"]))
+                for _ in range(rng.choice([0, 0, 1, 3, 11]))
+            ],
+        })
+    return rows
+
+
+def ragged(lists):
+    offsets = np.concatenate([[0], np.cumsum([len(items) for items in lists])])
+    return offsets, [item for items in lists for item in items]
+
+
+class TestMatchesModels:
+    """Test that column checks report what per-row models report."""
+
+    def test_confidence_columns(self):
+        rows = random_confidence_rows(1500)
+        scalar = [name for name in rows[0] if name not in ("comparable_sales", "other_estimates")]
+        comparable_offsets, prices = ragged([row["comparable_sales"] for row in rows])
+        estimate_offsets, estimates = ragged([row["other_estimates"] for row in rows])
+
+        report = validate_confidence_columns(
+            {name: [row[name] for row in rows] for name in scalar},
+            comparable_offsets, np.array(prices, dtype=object),
+            estimate_offsets, np.array([value for value, _ in estimates], dtype=object),
+            [method for _, method in estimates],
+        )
+
+        for i, row in enumerate(rows):
+            expected = pydantic_errors(ConfidenceInput, **row)
+            got = report_errors(report, i)
+            # Set ordering in the market conditions message varies between runs
+            assert [e[:2] for e in got] == [e[:2] for e in expected]
+            assert [e[2] for e in got if e[1] != ("market_conditions",)] == \
+                [e[2] for e in expected if e[1] != ("market_conditions",)]
+            assert report.valid[i] == (expected == [])
+        assert 0 < report.valid.sum() < len(rows)
+
+    def test_decision_columns(self):
+        rng = random.Random(5)
+        confidence = calculate_confidence_band(
+            ConfidenceInput(estimated_market_value=100, valuation_method="cost_approach")
+        )
+        priors = JurisdictionPriors.get_default_priors("TX")
+        names = ["assessed_value", "estimated_market_value", "tax_rate", "estimated_filing_fee",
+                 "min_roi_threshold", "appeal_horizon_years"]
+        rows = [{name: rng.choice(NUMBERS) for name in names} for _ in range(1500)]
+
+        report = validate_decision_columns({name: [row[name] for row in rows] for name in names})
+
+        for i, row in enumerate(rows):
+            expected = pydantic_errors(
+                DecisionInput, confidence_result=confidence, jurisdiction_priors=priors, **row
+            )
+            assert report_errors(report, i) == expected
+        assert report.valid.any()
+
+    @pytest.mark.parametrize("value", ["abc", "1.2.3", ""])
+    def test_unparsable_strings(self, value):
+        report = validate_confidence_columns({
+            "estimated_market_value": [value], "valuation_method": "cost_approach",
+        })
+        expected = pydantic_errors(ConfidenceInput, estimated_market_value=value, valuation_method="cost_approach")
+        assert expected == [("decimal_parsing", ("estimated_market_value",), "Input should be a valid decimal")]
+        assert report_errors(report, 0) == expected
+
+
+class TestColumnValidation:
+    """Test the vectorized paths and the report."""
+
+    def test_numeric_columns(self):
+        report = validate_decision_columns({
+            "assessed_value": np.array([500_000.0, -1.0, 400_000.0, np.nan]),
+            "estimated_market_value": 450_000,
+            "tax_rate": np.array([0.02, 0.02, 0.12, 0.02]),
+            "appeal_horizon_years": np.array([3, 3, 0, 11]),
+        })
+
+        assert report.valid.tolist() == [True, False, False, False]
+        assert report.valid_rows.tolist() == [0]
+        assert report.invalid_rows.tolist() == [1, 2, 3]
+        assert report.errors(0) == []
+        assert report.errors(2) == [
+            {"type": "value_error", "loc": ("tax_rate",), "msg": "Value error, Tax rate seems unreasonably high (>10%)"},
+            {"type": "greater_than_equal", "loc": ("appeal_horizon_years",), "msg": "Input should be greater than or equal to 1"},
+        ]
+        assert [(row, rule.type) for row, rule in report.iter_errors()] == [
+            (1, "greater_than"), (2, "value_error"), (2, "greater_than_equal"),
+            (3, "finite_number"), (3, "less_than_equal"),
+        ]
+        assert report.summary()[ErrorRule(("assessed_value",), "greater_than", "Input should be greater than 0")] == 1
+
+    def test_string_columns(self):
+        report = validate_confidence_columns({
+            "estimated_market_value": np.array(["450000", "4.5e5", "-3"]),
+            "valuation_method": np.array(["cost_approach", "cost_approach", "guess"]),
+            "market_conditions": np.array(["stable", "VOLATILE", "stable"]),
+            "days_since_valuation": np.array(["30", "99999999999999999999", "1_100"]),
+        })
+
+        assert report.valid.tolist() == [True, False, False]
+        assert [e["type"] for e in report.errors(1)] == ["less_than_equal"]
+        assert [e["type"] for e in report.errors(2)] == ["greater_than", "enum", "less_than_equal"]
+
+    def test_rows_fail_independently_and_only_once_per_field(self):
+        report = validate_confidence_columns({
+            "estimated_market_value": [1.0, "abc", None, np.inf],
+            "valuation_method": "sales_comparison",
+            "data_quality_score": [None, 0.5, [0.5], 2],
+        })
+
+        assert report.valid.tolist() == [True, False, False, False]
+        assert report_errors(report, 1) == [("decimal_parsing", ("estimated_market_value",), "Input should be a valid decimal")]
+        assert report_errors(report, 2) == [
+            ("missing", ("estimated_market_value",), "Field required"),
+            ("decimal_parsing", ("data_quality_score",), "Input should be a valid decimal"),
+        ]
+        assert [e["type"] for e in report.errors(3)] == ["finite_number", "less_than_equal"]
+
+    def test_ragged_columns(self):
+        offsets = [0, 2, 2, 14]
+        report = validate_confidence_columns(
+            {"estimated_market_value": [1.0, 2.0, 3.0], "valuation_method": "cost_approach"},
+            comparable_offsets=[0, 1, 1, 1], comparable_prices=[np.nan],
+            other_estimate_offsets=offsets,
+            other_estimate_values=[5.0, -1.0] + [5.0] * 12,
+            other_estimate_methods=["cost_approach", "cost_approach"] + ["sales_comparison"] * 11 + ["zz"],
+        )
+
+        assert report_errors(report, 0) == [
+            ("finite_number", ("comparable_sales", 0), "Input should be a finite number"),
+            ("value_error", ("other_estimates",), "Value error, All estimates must be positive"),
+        ]
+        assert report.valid[1]
+        # An unparsed element keeps the list validator from running
+        assert [e["loc"] for e in report.errors(2)] == [("other_estimates", 11, 1)]
+
+    def test_too_many_estimates(self):
+        report = validate_confidence_columns(
+            {"estimated_market_value": 1.0, "valuation_method": "cost_approach"},
+            other_estimate_offsets=[0, 11], other_estimate_values=[-1.0] * 11,
+            other_estimate_methods=[ValuationMethod.COST_APPROACH] * 11,
+        )
+        assert report_errors(report, 0) == [("value_error", ("other_estimates",), "Value error, Too many other estimates (max 10)")]
+
+    def test_large_batch(self):
+        size = 200_000
+        rng = np.random.default_rng(7)
+        tax_rate = rng.uniform(0.0, 0.12, size)
+
+        report = validate_decision_columns({
+            "assessed_value": rng.uniform(1, 1e6, size),
+            "estimated_market_value": rng.uniform(1, 1e6, size),
+            "tax_rate": tax_rate,
+        })
+
+        assert np.array_equal(report.valid, tax_rate <= 0.10)
+        assert len(report.rules) == 1
+
+    def test_empty_batch(self):
+        report = validate_decision_columns({"assessed_value": [], "estimated_market_value": [], "tax_rate": []})
+        assert len(report) == 0
+        assert report.summary() == {}
+
+
+class TestModelColumns:
+    """Test the generic numeric checks on another model."""
+
+    def test_flags_and_nested_models_are_skipped(self):
+        class Filing(BaseModel):
+            fee: Decimal = Field(..., gt=0)
+            years: int = Field(1, ge=1, le=10)
+            notarized: bool = True
+            priors: Optional[JurisdictionPriors] = None
+            discount: Optional[Decimal] = Field(None, ge=0)
+
+        checks = {"fee": ((lambda v: v > 1000, "Fee too high"),)}
+        report = validate_model_columns(
+            Filing, {"fee": [50, 5000, 50], "years": [1, 2, 11], "notarized": "ignored", "discount": [None, 1, -1]},
+            checks,
+        )
+
+        assert report.valid.tolist() == [True, False, False]
+        assert report.errors(1) == [{"type": "value_error", "loc": ("fee",), "msg": "Value error, Fee too high"}]
+        assert [e["loc"] for e in report.errors(2)] == [("years",), ("discount",)]
+
+
+class TestStructuralErrors:
+    """Test problems with the columns themselves, which raise."""
+
+    def test_missing_required_column(self):
+        with pytest.raises(ValueError, match="tax_rate"):
+            validate_decision_columns({"assessed_value": [1.0], "estimated_market_value": [1.0]})
+        with pytest.raises(ValueError, match="valuation_method"):
+            validate_confidence_columns({"estimated_market_value": [1.0]})
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError, match="same length"):
+            validate_decision_columns({"assessed_value": [1.0, 2.0], "estimated_market_value": [1.0], "tax_rate": 0.02})
+
+    def test_bad_offsets(self):
+        columns = {"estimated_market_value": [1.0], "valuation_method": "cost_approach"}
+        with pytest.raises(ValueError, match="comparable_offsets"):
+            validate_confidence_columns(columns, comparable_offsets=[0, 3], comparable_prices=[1.0])
+        with pytest.raises(ValueError, match="other_estimate_methods"):
+            validate_confidence_columns(columns, other_estimate_offsets=[0, 1], other_estimate_values=[1.0],
+                                        other_estimate_methods=[])
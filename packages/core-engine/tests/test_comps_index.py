@@ -0,0 +1,125 @@
+"""Tests for the comparable-sales candidate index."""
+
+import pytest
+from decimal import Decimal
+
+import numpy as np
+
+from charly_core_engine.comps_index import ComparableSalesIndex, _project
+from charly_core_engine.confidence import (
+    calculate_confidence_band, ConfidenceInput, ValuationMethod
+)
+
+
+@pytest.fixture(scope="module")
+def sales():
+    rng = np.random.default_rng(5)
+    n = 20000
+    return dict(
+        latitude=32.7 + rng.uniform(-0.3, 0.3, n),
+        longitude=-96.8 + rng.uniform(-0.3, 0.3, n),
+        building_area=rng.uniform(2000, 40000, n),
+        property_type=rng.choice(["office", "retail", "industrial"], n),
+        sale_date=np.datetime64("2022-01-01") + rng.integers(0, 900, n).astype("timedelta64[D]"),
+        price=np.round(rng.uniform(200000, 5000000, n), 2),
+    )
+
+
+@pytest.fixture(scope="module")
+def index(sales):
+    return ComparableSalesIndex(cell_km=2.0, **sales)
+
+
+def brute_force(sales, latitude, longitude, property_type, k, building_area=None, size_tolerance=0.25,
+                as_of=None, max_age_days=None, max_distance_km=None):
+    """Reference implementation: score every sale."""
+    reference = (sales["latitude"].min() + sales["latitude"].max()) / 2
+    x, y = _project(sales["latitude"], sales["longitude"], reference)
+    qx, qy = _project(np.float64(latitude), np.float64(longitude), reference)
+    distance = np.hypot(x - qx, y - qy)
+    ok = sales["property_type"] == property_type
+    if building_area is not None:
+        ok &= np.abs(sales["building_area"] - building_area) <= size_tolerance * building_area
+    if as_of is not None:
+        as_of = np.datetime64(as_of, "D")
+        ok &= sales["sale_date"] <= as_of
+        if max_age_days is not None:
+            ok &= sales["sale_date"] >= as_of - np.timedelta64(max_age_days, "D")
+    if max_distance_km is not None:
+        ok &= distance <= max_distance_km
+    rows = np.flatnonzero(ok)
+    return rows[np.argsort(distance[rows], kind="stable")[:k]]
+
+
+class TestComparableSalesIndex:
+    """Test k-nearest queries against a brute-force scan."""
+
+    @pytest.mark.parametrize("query", [
+        dict(latitude=32.7, longitude=-96.8, property_type="office", k=6),
+        dict(latitude=32.55, longitude=-96.95, property_type="retail", k=10, building_area=15000),
+        dict(latitude=32.9, longitude=-96.6, property_type="industrial", k=5,
+             as_of="2023-06-30", max_age_days=180),
+        dict(latitude=32.7, longitude=-96.8, property_type="office", k=50, max_distance_km=1.5),
+        # Subject outside the populated area forces a wide ring walk
+        dict(latitude=33.2, longitude=-97.3, property_type="office", k=3),
+    ])
+    def test_matches_brute_force(self, index, sales, query):
+        assert index.nearest(**query).tolist() == brute_force(sales, **query).tolist()
+
+    def test_comparable_sales_feed_confidence_input(self, index, sales):
+        comps = index.comparable_sales(32.7, -96.8, "office", k=4)
+        rows = index.nearest(32.7, -96.8, "office", k=4)
+        assert comps == [Decimal(str(sales["price"][row])).quantize(Decimal('0.01')) for row in rows]
+        assert all(isinstance(price, Decimal) for price in comps)
+
+        result = calculate_confidence_band(ConfidenceInput(
+            estimated_market_value=Decimal('2500000'),
+            valuation_method=ValuationMethod.SALES_COMPARISON,
+            comparable_sales=comps,
+        ))
+        assert result.estimate_dispersion is not None
+
+    def test_north_and_east_distances_agree(self):
+        # Sales 1.0 km due north and 1.2 km due east of the subject
+        latitude, longitude = 32.78, -96.80
+        north = latitude + 1.0 / 110.574
+        east = longitude + 1.2 / (111.320 * np.cos(np.radians(latitude)))
+        index = ComparableSalesIndex(
+            [north, latitude], [longitude, east], [10000, 10000], ["office", "office"],
+            ["2023-01-01", "2023-01-01"], [1e6, 2e6], cell_km=0.5,
+        )
+        assert index.nearest(latitude, longitude, "office", k=1).tolist() == [0]
+        assert index.nearest(latitude, longitude, "office", k=2).tolist() == [0, 1]
+        # The north sale is inside 1.1 km, the east one is not
+        assert index.nearest(latitude, longitude, "office", k=2, max_distance_km=1.1).tolist() == [0]
+
+    def test_sale_dates(self, index, sales):
+        rows = index.nearest(32.7, -96.8, "retail", k=5)
+        assert index.sale_dates(rows).tolist() == sales["sale_date"][rows].tolist()
+
+    def test_unknown_type_returns_nothing(self, index):
+        assert len(index.nearest(32.7, -96.8, "hotel")) == 0
+        assert index.comparable_sales(32.7, -96.8, "hotel") == []
+
+    def test_no_qualifying_sales(self, index):
+        assert len(index.nearest(32.7, -96.8, "office", as_of="2000-01-01")) == 0
+
+    def test_len(self, index, sales):
+        assert len(index) == len(sales["price"])
+
+
+class TestComparableSalesIndexValidation:
+    """Test argument validation."""
+
+    def test_rejects_tiny_cells(self, sales):
+        with pytest.raises(ValueError, match="cell_km"):
+            ComparableSalesIndex(cell_km=0.001, **sales)
+
+    def test_rejects_ragged_columns(self, sales):
+        ragged = dict(sales, price=sales["price"][:-1])
+        with pytest.raises(ValueError, match="same length"):
+            ComparableSalesIndex(**ragged)
+
+    def test_rejects_nonpositive_k(self, index):
+        with pytest.raises(ValueError, match="k must be positive"):
+            index.nearest(32.7, -96.8, "office", k=0)
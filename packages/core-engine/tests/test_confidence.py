@@ -3,6 +3,7 @@
 import pytest
 from decimal import Decimal
 from hypothesis import given, strategies as st
+from pydantic import ValidationError
 
 from charly_core_engine.confidence import (
     calculate_confidence_band, ConfidenceInput, ConfidenceResult, 
@@ -56,6 +57,16 @@ class TestConfidenceInput:
                 valuation_method=ValuationMethod.SALES_COMPARISON
             )
             
+    def test_unparsable_market_value_rejected(self):
+        """Test non-numeric strings and booleans fail validation instead of raising."""
+        for value in ["abc", True]:
+            with pytest.raises(ValidationError) as exc_info:
+                ConfidenceInput(
+                    estimated_market_value=value,
+                    valuation_method=ValuationMethod.INCOME_APPROACH
+                )
+            assert exc_info.value.errors()[0]["type"] == "decimal_parsing"
+            
     def test_data_quality_score_bounds(self):
         """Test data quality score validation."""
         # Valid scores
@@ -0,0 +1,76 @@
+"""Tests for incremental confidence accumulation."""
+
+import random
+import pytest
+from decimal import Decimal
+
+from charly_core_engine.confidence import (
+    calculate_confidence_band, ConfidenceInput, ValuationMethod
+)
+from charly_core_engine.confidence_accumulator import ConfidenceAccumulator
+
+
+def create_input(**overrides) -> ConfidenceInput:
+    values = dict(
+        estimated_market_value=Decimal('1000000'),
+        valuation_method=ValuationMethod.SALES_COMPARISON,
+        data_quality_score=Decimal('0.85'),
+    )
+    values.update(overrides)
+    return ConfidenceInput(**values)
+
+
+class TestConfidenceAccumulator:
+    """Test running statistics against calculate_confidence_band."""
+
+    def test_no_comparables_matches_engine(self):
+        input_data = create_input()
+        accumulator = ConfidenceAccumulator(input_data)
+        assert accumulator.count == 1
+        assert accumulator.coefficient_of_variation() is None
+        assert accumulator.result() == calculate_confidence_band(input_data)
+
+    def test_seeded_input_matches_engine(self):
+        input_data = create_input(
+            comparable_sales=[Decimal('950000'), Decimal('1040000')],
+            other_estimates=[(Decimal('1100000'), ValuationMethod.COST_APPROACH)],
+        )
+        accumulator = ConfidenceAccumulator(input_data)
+        assert accumulator.count == 4
+        assert accumulator.comparable_count == 2
+        assert accumulator.result() == calculate_confidence_band(input_data)
+
+    def test_streamed_sales_match_full_recompute(self):
+        rng = random.Random(11)
+        base = create_input(other_estimates=[(Decimal('990000'), ValuationMethod.INCOME_APPROACH)])
+        accumulator = ConfidenceAccumulator(base)
+        sales = []
+        for _ in range(300):
+            sale = Decimal(rng.randint(70000000, 130000000)) / 100
+            sales.append(sale)
+            accumulator.add_sale(sale)
+            if len(sales) % 25 == 0 or len(sales) < 4:
+                expected = calculate_confidence_band(base.model_copy(update={"comparable_sales": list(sales)}))
+                assert accumulator.result() == expected
+
+    def test_statistics(self):
+        accumulator = ConfidenceAccumulator(create_input(estimated_market_value=Decimal('100')))
+        accumulator.add_sales([Decimal('200'), 300])
+        assert accumulator.mean == Decimal('200')
+        assert accumulator.variance.quantize(Decimal('0.0001')) == Decimal('6666.6667')
+        assert accumulator.comparable_count == 2
+
+    def test_identical_estimates_have_zero_dispersion(self):
+        accumulator = ConfidenceAccumulator(create_input())
+        accumulator.add_sales([Decimal('1000000')] * 5)
+        assert accumulator.coefficient_of_variation() == 0
+        assert accumulator.result().estimate_dispersion == Decimal('0.000')
+
+    def test_nonpositive_mean_has_no_dispersion(self):
+        accumulator = ConfidenceAccumulator(create_input(estimated_market_value=Decimal('10')))
+        accumulator.add_sale(Decimal('-50'))
+        assert accumulator.coefficient_of_variation() is None
+        expected = calculate_confidence_band(
+            create_input(estimated_market_value=Decimal('10'), comparable_sales=[Decimal('-50')])
+        )
+        assert accumulator.result() == expected
@@ -0,0 +1,223 @@
+"""Tests for secondary indexes over decision results."""
+
+import random
+import pytest
+from decimal import Decimal
+
+from charly_core_engine import decision_index
+from charly_core_engine.confidence import ConfidenceResult
+from charly_core_engine.decision import DecisionResult, AppealDecision
+from charly_core_engine.decision_index import DecisionIndex
+from charly_core_engine.result_store import write_decision_store, DecisionStore
+
+
+BASE_CONFIDENCE = ConfidenceResult(
+    central_estimate=Decimal('1000000.00'),
+    confidence_band_pct=Decimal('0.100'),
+    lower_bound=Decimal('900000.00'),
+    upper_bound=Decimal('1100000.00'),
+    confidence_score=Decimal('0.889'),
+    reliability_grade="A",
+    method_consistency=Decimal('1.000'),
+)
+
+BASE_DECISION = DecisionResult(
+    decision=AppealDecision.OVER,
+    confidence_level="HIGH",
+    assessment_ratio=Decimal('1.20'),
+    expected_annual_savings=Decimal('5000.00'),
+    expected_roi=Decimal('400.00'),
+    breakeven_reduction_pct=Decimal('0.01'),
+    primary_rationale=[],
+    risk_factors=[],
+    supporting_factors=[],
+    within_confidence_band=False,
+    success_probability=Decimal('0.50'),
+    total_appeal_costs=Decimal('3000.00'),
+    net_savings_year_1=Decimal('2000.00'),
+    cumulative_net_savings=Decimal('12000.00'),
+)
+
+JURISDICTIONS = ["collin_county_tx", "travis_county_tx", "harris_county_tx"]
+
+
+def random_row(rng: random.Random, property_id: str):
+    decision = BASE_DECISION.model_copy(update={
+        "decision": rng.choice(list(AppealDecision)),
+        "confidence_level": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+        "assessment_ratio": Decimal(rng.randint(70, 150)) / 100,
+        "expected_annual_savings": Decimal(rng.randint(0, 20000)),
+        "expected_roi": None if rng.random() < 0.1 else Decimal(rng.randint(-100, 800)),
+    })
+    confidence = BASE_CONFIDENCE.model_copy(update={"reliability_grade": rng.choice("ABCD")})
+    return property_id, rng.choice(JURISDICTIONS), decision, confidence
+
+
+def brute_force(rows, decision=None, grades=None, jurisdiction=None, roi=None, savings=None):
+    """Reference implementation: scan every row."""
+    hits = []
+    for i, (property_id, jurisdiction_id, d, c) in enumerate(rows):
+        if decision is not None and d.decision.value != decision:
+            continue
+        if grades is not None and c.reliability_grade not in grades:
+            continue
+        if jurisdiction is not None and jurisdiction_id != jurisdiction:
+            continue
+        if roi is not None and (d.expected_roi is None or not roi[0] <= d.expected_roi):
+            continue
+        if savings is not None and not savings[0] <= d.expected_annual_savings <= savings[1]:
+            continue
+        hits.append(i)
+    return hits
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(42)
+    return [random_row(rng, f"PROP-{i}") for i in range(3000)]
+
+
+class TestDecisionIndexQueries:
+    """Test conjunctive queries against a brute-force scan."""
+
+    @pytest.mark.parametrize("query,reference", [
+        (dict(decision="OVER"), dict(decision="OVER")),
+        (dict(reliability_grade=("A", "B")), dict(grades="AB")),
+        (dict(jurisdiction_id="collin_county_tx"), dict(jurisdiction="collin_county_tx")),
+        (dict(expected_roi=(200, None)), dict(roi=(200, None))),
+        (
+            dict(decision="OVER", jurisdiction_id="collin_county_tx", reliability_grade=["A", "B"], expected_roi=(200, None)),
+            dict(decision="OVER", jurisdiction="collin_county_tx", grades="AB", roi=(200, None)),
+        ),
+        (
+            dict(decision="FAIR", expected_annual_savings=(1000, 5000)),
+            dict(decision="FAIR", savings=(1000, 5000)),
+        ),
+    ])
+    def test_matches_brute_force(self, rows, query, reference):
+        index = DecisionIndex.from_results(rows)
+        assert index.query(**query).tolist() == brute_force(rows, **reference)
+
+    def test_no_predicates_returns_all_rows(self, rows):
+        index = DecisionIndex.from_results(rows)
+        assert index.query().tolist() == list(range(len(rows)))
+        assert len(index) == len(rows)
+
+    def test_confidence_level_and_ratio(self, rows):
+        index = DecisionIndex.from_results(rows)
+        result = index.query(confidence_level="LOW", assessment_ratio=(None, Decimal('0.9')))
+        expected = [
+            i for i, (_, _, d, _) in enumerate(rows)
+            if d.confidence_level == "LOW" and d.assessment_ratio <= Decimal('0.9')
+        ]
+        assert result.tolist() == expected
+
+    def test_unknown_jurisdiction_matches_nothing(self, rows):
+        index = DecisionIndex.from_results(rows)
+        assert len(index.query(jurisdiction_id="nowhere", decision="OVER")) == 0
+
+    def test_property_id_lookup(self, rows):
+        index = DecisionIndex.from_results(rows)
+        assert "PROP-7" in index
+        assert index.row_of("PROP-7") == 7
+        assert index.row_of("missing") is None
+        assert index.property_id(7) == "PROP-7"
+        assert index.property_ids([1, 2]) == ["PROP-1", "PROP-2"]
+
+
+class TestDecisionIndexUpdates:
+    """Test incremental maintenance when rows are re-decided."""
+
+    def test_upsert_redecided_rows(self, rows):
+        index = DecisionIndex.from_results(rows)
+        rng = random.Random(7)
+        for _ in range(200):
+            i = rng.randrange(len(rows))
+            rows[i] = random_row(rng, rows[i][0])
+            index.upsert(*rows[i])
+
+        query = dict(decision="OVER", reliability_grade="A", expected_roi=(100, None))
+        reference = dict(decision="OVER", grades="A", roi=(100, None))
+        assert index.query(**query).tolist() == brute_force(rows, **reference)
+        # Range-driven plans see pending updates too
+        assert index.query(expected_roi=(790, None)).tolist() == brute_force(rows, roi=(790, None))
+
+    def test_pending_updates_merge_past_threshold(self, rows, monkeypatch):
+        monkeypatch.setattr(decision_index, "_MIN_PENDING", 10)
+        index = DecisionIndex.from_results(rows)
+        rng = random.Random(3)
+        for i in range(100):
+            rows[i] = random_row(rng, rows[i][0])
+            index.upsert(*rows[i])
+        assert all(len(column.pending) <= 100 for column in index._sorted.values())
+        assert index.query(expected_roi=(0, 300)).tolist() == [
+            i for i, (_, _, d, _) in enumerate(rows)
+            if d.expected_roi is not None and 0 <= d.expected_roi <= 300
+        ]
+
+    def test_jurisdiction_postings_follow_moves(self, rows, monkeypatch):
+        monkeypatch.setattr(decision_index, "_MIN_PENDING", 50)
+        index = DecisionIndex.from_results(rows)
+        rng = random.Random(11)
+        for step in range(120):
+            i = rng.randrange(len(rows))
+            jurisdiction_id = "dallas_county_tx" if step % 2 else rng.choice(JURISDICTIONS)
+            rows[i] = (rows[i][0], jurisdiction_id) + rows[i][2:]
+            index.upsert(*rows[i])
+
+        # Pending moves were merged once past the threshold, then rebuilt in full
+        assert len(index._jurisdiction.pending) <= 50
+        for jurisdictions in (["dallas_county_tx"], ["collin_county_tx", "dallas_county_tx"], JURISDICTIONS):
+            expected = [i for i, row in enumerate(rows) if row[1] in jurisdictions]
+            assert index.query(jurisdiction_id=jurisdictions).tolist() == expected
+        index.rebuild()
+        assert not index._jurisdiction.pending
+        assert sum(len(postings) for postings in index._jurisdiction.postings.values()) == len(rows)
+        assert index.query(jurisdiction_id="dallas_county_tx").tolist() == [
+            i for i, row in enumerate(rows) if row[1] == "dallas_county_tx"
+        ]
+
+    def test_appends_grow_capacity(self, rows):
+        index = DecisionIndex(capacity=1)
+        for row in rows[:200]:
+            index.upsert(*row)
+        assert len(index) == 200
+        assert index.query(decision="UNDER").tolist() == brute_force(rows[:200], decision="UNDER")
+        assert index.query(expected_roi=(500, None)).tolist() == brute_force(rows[:200], roi=(500, None))
+        assert index.query(jurisdiction_id="harris_county_tx").tolist() == \
+            brute_force(rows[:200], jurisdiction="harris_county_tx")
+
+    def test_same_label_upsert_is_noop(self, rows):
+        index = DecisionIndex.from_results(rows[:10])
+        before = index.query(decision=rows[0][2].decision.value).tolist()
+        index.upsert(*rows[0])
+        assert index.query(decision=rows[0][2].decision.value).tolist() == before
+
+
+class TestDecisionIndexFromStore:
+    """Test bulk loading from a mapped result store."""
+
+    def test_from_store_matches_from_results(self, rows, tmp_path):
+        path = str(tmp_path / "portfolio.crs")
+        write_decision_store(path, rows)
+        with DecisionStore.open(path) as store:
+            index = DecisionIndex.from_store(store)
+
+        expected = DecisionIndex.from_results(rows)
+        query = dict(decision="OVER", jurisdiction_id="travis_county_tx", expected_roi=(200, None))
+        assert index.query(**query).tolist() == expected.query(**query).tolist()
+        assert index.property_id(5) == "PROP-5"
+
+        # Updates work on bulk-loaded indexes as well
+        redecided = rows[0][:2] + (rows[0][2].model_copy(update={"decision": AppealDecision.UNDER}), rows[0][3])
+        index.upsert(*redecided)
+        assert 0 in index.query(decision="UNDER").tolist()
+        assert 0 not in index.query(decision="OVER").tolist()
+
+    def test_from_empty_store(self, tmp_path):
+        path = str(tmp_path / "empty.crs")
+        write_decision_store(path, [])
+        with DecisionStore.open(path) as store:
+            index = DecisionIndex.from_store(store)
+        assert len(index) == 0
+        assert len(index.query(decision="OVER")) == 0
@@ -0,0 +1,44 @@
+"""Import-cost checks: which modules a cold import loads."""
+
+import pytest
+
+import charly_core_engine
+
+# Column and store modules that pull in numpy; single-property use must not load them
+BATCH_MODULES = frozenset({
+    "numpy",
+    "charly_core_engine.result_store",
+    "charly_core_engine.screening",
+    "charly_core_engine.shared_tables",
+    "charly_core_engine.column_validation",
+})
+
+
+class TestImportCost:
+    """Keep cold-start imports lazy."""
+
+    def test_bare_import_is_lazy(self, modules_loaded_by):
+        loaded = modules_loaded_by("import charly_core_engine")
+        assert "charly_core_engine" in loaded
+        assert not {"pydantic", "charly_core_engine.decision"} & loaded
+        assert not BATCH_MODULES & loaded
+
+    def test_engine_exports_skip_batch_modules(self, modules_loaded_by):
+        loaded = modules_loaded_by(
+            "from charly_core_engine import make_appeal_decision, calculate_confidence_band"
+        )
+        assert {"charly_core_engine.decision", "charly_core_engine.confidence"} <= loaded
+        assert not BATCH_MODULES & loaded
+
+
+class TestLazyExports:
+    """Test module-level __getattr__ exports."""
+
+    def test_all_exports_resolve(self):
+        for name in charly_core_engine.__all__:
+            assert getattr(charly_core_engine, name) is not None
+        assert set(charly_core_engine.__all__) <= set(dir(charly_core_engine))
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError, match="not_a_thing"):
+            charly_core_engine.not_a_thing
@@ -0,0 +1,127 @@
+"""Tests for streaming market conditions classification."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from charly_core_engine.confidence import ConfidenceInput, ValuationMethod
+from charly_core_engine.market_conditions import MarketConditionsClassifier
+
+
+START = np.datetime64("2023-01-01")
+TRENDS = {"rising": 0.15, "falling": -0.15, "flat": 0.0, "choppy": 0.0}
+
+
+def simulate(sales_per_submarket=3000, days=540, seed=2):
+    """Sales with an annual trend per submarket; 'choppy' gets monthly shocks."""
+    rng = np.random.default_rng(seed)
+    submarkets, dates, prices = [], [], []
+    for name, trend in TRENDS.items():
+        day = rng.integers(0, days, sales_per_submarket)
+        month = day // 30
+        shocks = rng.normal(0, 0.12, days // 30 + 1) if name == "choppy" else np.zeros(days // 30 + 1)
+        log_price = 13 + np.log1p(trend) * day / 365.25 + shocks[month] + rng.normal(0, 0.2, len(day))
+        submarkets += [name] * len(day)
+        dates.append(START + day)
+        prices.append(np.exp(log_price))
+    dates, prices = np.concatenate(dates), np.concatenate(prices)
+    order = np.argsort(dates, kind="stable")
+    return np.array(submarkets)[order].tolist(), dates[order], prices[order]
+
+
+class TestMarketConditionsClassifier:
+    """Test classification and the rolling state."""
+
+    def test_classifies_submarkets(self):
+        classifier = MarketConditionsClassifier()
+        classifier.add_sales(*simulate())
+
+        report = classifier.classify()
+
+        assert {name: report.condition(name) for name in TRENDS} == {
+            "rising": "improving", "falling": "declining", "flat": "stable", "choppy": "volatile",
+        }
+        assert report.annual_trend[report.submarkets.index("rising")] == pytest.approx(0.15, abs=0.05)
+        assert report.volatility[report.submarkets.index("flat")] < 0.01
+        assert report.as_of == np.datetime64("2024-06")
+        assert report.sales.sum() < 4 * 3000  # Only the last 12 months count
+
+    def test_daily_updates_match_full_recompute(self):
+        submarkets, dates, prices = simulate(sales_per_submarket=800)
+        streamed = MarketConditionsClassifier()
+        bounds = np.searchsorted(dates, START + np.arange(0, 547, 7))
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            streamed.add_sales(submarkets[start:end], dates[start:end], prices[start:end])
+
+        recent = dates >= np.datetime64("2023-07-01")
+        full = MarketConditionsClassifier()
+        full.add_sales(np.array(submarkets)[recent].tolist(), dates[recent], prices[recent])
+
+        a, b = streamed.classify(), full.classify()
+        order = [b.submarkets.index(name) for name in a.submarkets]
+        assert a.conditions.tolist() == b.conditions[order].tolist()
+        assert np.allclose(a.annual_trend, b.annual_trend[order])
+        assert np.allclose(a.volatility, b.volatility[order])
+
+    def test_window_and_late_sales(self):
+        classifier = MarketConditionsClassifier(window_months=6, min_months=3, min_sales=3)
+        assert classifier.as_of is None
+        assert classifier.add_sales(["a"], ["2024-06-10"], [100.0]) == 1
+        # Late sale inside the window lands; one from before the window is dropped
+        assert classifier.add_sales(["a", "a"], ["2024-02-01", "2023-12-31"], [100.0, 100.0]) == 1
+        assert classifier.add_sales(["a"], ["2024-04-01"], [100.0]) == 1
+        assert classifier.classify().condition("a") == "stable"
+
+        classifier.advance("2024-09-15")
+        classifier.advance("2024-01-01")  # Never moves back
+        assert classifier.as_of == np.datetime64("2024-09")
+        report = classifier.classify()
+        assert report.condition("a") is None and report.sales.tolist() == [2]
+
+    def test_thin_submarkets_are_undetermined(self):
+        classifier = MarketConditionsClassifier()
+        assert len(classifier.classify()) == 0
+        classifier.add_sales(["a", "b"], ["2024-01-05", "2024-01-06"], [100.0, 200.0])
+        classifier.add_sales([], [], [])
+
+        report = classifier.classify()
+
+        assert len(classifier) == len(report) == 2
+        assert report.conditions.tolist() == [None, None]
+        assert np.isnan(report.annual_trend).all()
+        assert report.conditions_for(["a", "zz"]) == ["stable", "stable"]
+        assert report.conditions_for(["a"], default=None) == [None]
+
+    def test_apply_sets_market_conditions(self):
+        classifier = MarketConditionsClassifier()
+        classifier.add_sales(*simulate(sales_per_submarket=2000))
+        report = classifier.classify()
+        inputs = [
+            ConfidenceInput(estimated_market_value=Decimal('500000'), valuation_method=ValuationMethod.COST_APPROACH,
+                            market_conditions=condition)
+            for condition in ["stable", "stable", "improving"]
+        ]
+
+        applied = report.apply(inputs, ["falling", "unknown", "rising"])
+
+        assert [input_data.market_conditions for input_data in applied] == ["declining", "stable", "improving"]
+        assert applied[1] is inputs[1] and applied[2] is inputs[2]
+        with pytest.raises(ValueError, match="same length"):
+            report.apply(inputs, ["falling"])
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="min_months"):
+            MarketConditionsClassifier(window_months=2, min_months=3)
+        with pytest.raises(ValueError, match="min_months"):
+            MarketConditionsClassifier(min_months=2)
+        classifier = MarketConditionsClassifier()
+        with pytest.raises(ValueError, match="same length"):
+            classifier.add_sales(["a"], ["2024-01-01", "2024-01-02"], [1.0])
+        with pytest.raises(ValueError, match="positive"):
+            classifier.add_sales(["a"], ["2024-01-01"], [0.0])
+        with pytest.raises(ValueError, match="missing"):
+            classifier.add_sales(["a", "a"], ["2024-01-01", "NaT"], [1.0, 2.0])
+        with pytest.raises(ValueError, match="missing"):
+            classifier.add_sales(["a"], [None], [1.0])
+        assert classifier.as_of is None
@@ -0,0 +1,122 @@
+"""Tests for market indexes and comparable-sale time adjustment."""
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from charly_core_engine.confidence import ConfidenceInput, ValuationMethod, calculate_confidence_band
+from charly_core_engine.market_index import NO_MARKET, MarketIndexStore
+
+
+@pytest.fixture
+def store():
+    return MarketIndexStore.from_series({
+        "collin_county_tx": {"2023-01": 100.0, "2023-02": 103.1, "2023-04": 109.0},
+        ("collin_county_tx", "office"): {"2023-01": 200.0, "2024-01": 180.0},
+        "dallas_county_tx": {"2022-06": 50.0},
+    })
+
+
+def reference_level(series, day):
+    """Level on `day` by walking the monthly series."""
+    months = sorted((np.datetime64(month, "M"), level) for month, level in series.items())
+    day = np.datetime64(day, "D")
+    month = day.astype("datetime64[M]")
+    if month < months[0][0]:
+        return months[0][1]
+    if month >= months[-1][0]:
+        return months[-1][1]
+    # Interpolate monthly levels over gaps, then within the month by day
+    numbers = [m.astype(np.int64) for m, _ in months]
+    at = lambda m: np.interp(m.astype(np.int64), numbers, [level for _, level in months])
+    start = month.astype("datetime64[D]")
+    length = ((month + 1).astype("datetime64[D]") - start).astype(int)
+    return at(month) + (at(month + 1) - at(month)) * (day - start).astype(int) / length
+
+
+class TestMarketIndexStore:
+    """Test index lookups and price adjustment."""
+
+    def test_levels_match_reference(self, store):
+        series = {"2023-01": 100.0, "2023-02": 103.1, "2023-04": 109.0}
+        days = np.datetime64("2022-11-20") + np.arange(0, 240, 3)
+        code = store.market_code("collin_county_tx")
+
+        levels = store.levels(code, days)
+
+        assert levels == pytest.approx([reference_level(series, day) for day in days], rel=1e-12)
+        # Gap month is interpolated, month starts are exact
+        assert store.levels(code, ["2023-03-01", "2023-02-01"]).tolist() == pytest.approx([106.05, 103.1])
+
+    def test_market_resolution(self, store):
+        assert len(store) == 3
+        assert store.markets[store.market_code("collin_county_tx", "office")] == ("collin_county_tx", "office")
+        # Submarkets without their own series fall back to the jurisdiction
+        assert store.market_code("collin_county_tx", "retail") == store.market_code("collin_county_tx")
+        assert store.market_code("harris_county_tx") == NO_MARKET
+        assert store.market_codes(
+            ["collin_county_tx", "collin_county_tx", "harris_county_tx"], ["office", None, "office"]
+        ).tolist() == [store.market_code("collin_county_tx", "office"), store.market_code("collin_county_tx"), NO_MARKET]
+        assert store.market_codes([]).tolist() == []
+
+    def test_adjust_prices(self, store):
+        codes = store.market_codes(["collin_county_tx", "collin_county_tx", "harris_county_tx", "dallas_county_tx"],
+                                   [None, "office", None, None])
+        sale_dates = np.array(["2023-01-01", "2023-01-01", "2020-01-01", "2021-01-01"], dtype="datetime64[D]")
+
+        adjusted = store.adjust_prices([1000.0] * 4, sale_dates, np.datetime64("2024-01-01"), codes)
+
+        # Unindexed markets and single-month series leave prices unchanged
+        assert adjusted.tolist() == pytest.approx([1090.0, 900.0, 1000.0, 1000.0])
+        factors = store.adjustment_factors(codes[:2], "2024-01-01", sale_dates[:2])
+        assert factors * adjusted[:2] == pytest.approx([1000.0, 1000.0])
+
+    def test_ragged_valuation_dates(self, store):
+        counts = np.array([2, 1])
+        valuation = np.repeat(np.array(["2023-02-01", "2023-04-01"], dtype="datetime64[D]"), counts)
+        adjusted = store.adjust_prices([100.0, 100.0, 100.0], "2023-01-01", valuation,
+                                       store.market_code("collin_county_tx"))
+        assert adjusted.tolist() == pytest.approx([103.1, 103.1, 109.0])
+
+    def test_comparable_sales_reduce_dispersion(self, store):
+        # Comps that only differ by market drift become identical
+        prices = [Decimal('2000000'), Decimal('1900000'), Decimal('1800000')]
+        sale_dates = [date(2023, 1, 1), "2023-07-01", np.datetime64("2024-01-01")]
+        comps = store.adjust_comparable_sales(prices, sale_dates, "2024-01-01", "collin_county_tx", "office")
+        assert comps == [Decimal('1800000.00')] * 3
+
+        def dispersion(comparable_sales):
+            return calculate_confidence_band(ConfidenceInput(
+                estimated_market_value=Decimal('1800000'),
+                valuation_method=ValuationMethod.SALES_COMPARISON,
+                comparable_sales=comparable_sales,
+            )).estimate_dispersion
+
+        assert dispersion(comps) < dispersion(prices)
+        assert store.adjust_comparable_sales([], [], "2024-01-01", "collin_county_tx") == []
+
+
+class TestMarketIndexStoreValidation:
+    """Test construction and argument errors."""
+
+    def test_rejects_bad_levels(self):
+        with pytest.raises(ValueError, match="positive"):
+            MarketIndexStore(["a"], None, ["2023-01"], [0.0])
+        with pytest.raises(ValueError, match="positive"):
+            MarketIndexStore(["a"], None, ["2023-01"], [np.nan])
+
+    def test_rejects_duplicate_months(self):
+        with pytest.raises(ValueError, match="Duplicate"):
+            MarketIndexStore(["a", "a", "b"], ["x", "x", "x"], ["2023-01", "2023-01", "2023-01"], [1.0, 2.0, 3.0])
+
+    def test_rejects_ragged_or_empty_columns(self, store):
+        with pytest.raises(ValueError, match="same length"):
+            MarketIndexStore(["a", "b"], None, ["2023-01"], [1.0])
+        with pytest.raises(ValueError, match="at least one"):
+            MarketIndexStore([], None, [], [])
+        with pytest.raises(ValueError, match="same length"):
+            store.market_codes(["a"], [])
+        with pytest.raises(ValueError, match="same length"):
+            store.adjust_comparable_sales([Decimal('1')], [], "2024-01-01", "a")
@@ -0,0 +1,129 @@
+"""Tests for data quality and uniqueness scoring of roll records."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from charly_core_engine.column_validation import validate_confidence_columns
+from charly_core_engine.quality_scoring import QualityScorer, QualityWeights
+
+
+def create_roll():
+    return {
+        "property_type": np.array(["office", "office", "office", "retail", "retail", "hotel", ""]),
+        "building_sqft": [10_000, 12_000, None, 11_000, 9_000, 250_000, 10_500],
+        "year_built": np.array([1990.0, 2001.0, 1985.0, np.nan, 1999.0, 1920.0, 2010.0]),
+        "last_inspection": np.array(["2024-01-01", "2023-01-01", "NaT", "2022-01-01", "2024-01-01", "2021-01-01",
+                                     "2024-01-01"], dtype="datetime64[D]"),
+    }
+
+
+@pytest.fixture
+def scorer():
+    return QualityScorer(
+        create_roll(),
+        required_fields=["property_type", "building_sqft", "year_built"],
+        date_fields=["last_inspection"],
+        categorical_fields=["property_type"],
+        numeric_fields=["building_sqft"],
+        stale_days=730,
+        bins=4,
+    )
+
+
+class TestQualityScorer:
+    """Test the quality components and their combination."""
+
+    def test_components(self, scorer):
+        scores = scorer.score(comparable_counts=[6, 3, 0, 12, 6, 1, 6])
+
+        assert len(scores) == 7
+        assert scores.completeness.tolist() == pytest.approx([1, 1, 2 / 3, 2 / 3, 1, 1, 2 / 3])
+        assert scorer.as_of == np.datetime64("2024-01-01")
+        assert scores.freshness.tolist() == pytest.approx([1, 1 - 365 / 730, 0, 0, 1, 0, 1])
+        assert scores.comp_density.tolist() == pytest.approx([1, 0.5, 0, 1, 1, 1 / 6, 1])
+        expected = 0.5 * scores.completeness + 0.3 * scores.freshness + 0.2 * scores.comp_density
+        assert scores.data_quality_score.tolist() == pytest.approx(np.round(expected, 3).tolist())
+
+    def test_missing_components_drop_out(self):
+        roll = create_roll()
+        scores = QualityScorer(roll, required_fields=["year_built"], weights=QualityWeights(completeness=2)).score()
+
+        assert scores.freshness is None and scores.comp_density is None
+        assert scores.data_quality_score.tolist() == [1, 1, 1, 0, 1, 1, 1]
+        # No rarity attributes: uniqueness falls back to the model default
+        assert scores.property_uniqueness.tolist() == [0.5] * 7
+        assert QualityScorer(roll, required_fields=["last_inspection"]).score().completeness[2] == 0
+
+    def test_explicit_as_of_and_empty_dates(self, scorer):
+        scores = scorer.score(as_of="2025-01-01")
+        assert scores.freshness[0] == pytest.approx(1 - 366 / 730)
+
+        undated = QualityScorer({"d": np.array(["NaT"], dtype="datetime64[D]")}, date_fields=["d"])
+        assert undated.as_of is None
+        assert undated.score().data_quality_score.tolist() == [0.625]  # Completeness 1 (nothing required), freshness 0
+
+    def test_uniqueness(self, scorer):
+        scores = scorer.score()
+        uniqueness = scores.property_uniqueness
+
+        # Common type and size score lowest; the lone large hotel highest
+        assert uniqueness[0] == min(uniqueness)
+        assert uniqueness[5] == max(uniqueness)
+        # A record with only one known attribute averages over just that one
+        assert uniqueness[2] == 0.0  # Most common type, size missing
+
+    def test_scoring_new_records(self, scorer):
+        scores = scorer.score({
+            "property_type": ["office", "casino", None],
+            "building_sqft": [10_000.0, -5.0, 0.0],
+            "year_built": [2000, 2000, 2000],
+            "last_inspection": ["2024-01-01", "2024-01-01", None],
+        })
+
+        # Unseen categories score 1; sizes out of range share the roll's tail bin
+        assert scores.property_uniqueness.tolist() == [0.0, 0.875, 0.75]
+        assert scores.completeness.tolist() == pytest.approx([1, 1, 2 / 3])
+
+    def test_numeric_edges(self):
+        # Linear bins when values are not all positive; constant columns share one bin
+        scorer = QualityScorer({"a": [-1.0, 0.0, 1.0, 1.0], "b": [5, 5, 5, 5]}, numeric_fields=["a", "b"], bins=2)
+        scores = scorer.score({"a": [1.0, 50.0], "b": [5, 6]})
+        assert scores.property_uniqueness.tolist() == [0.0, 1.0]
+        empty = QualityScorer({"a": [None]}, numeric_fields=["a"], categorical_fields=[])
+        assert empty.score({"a": [3.0]}).property_uniqueness.tolist() == [1.0]
+
+    def test_scores_feed_batch_confidence(self, scorer):
+        scores = scorer.score(comparable_counts=[6] * 7)
+        columns = {"estimated_market_value": Decimal('1000000'), "valuation_method": "sales_comparison",
+                   **scores.as_columns()}
+        assert validate_confidence_columns(columns).valid.all()
+
+    def test_large_roll(self):
+        rng = np.random.default_rng(1)
+        size = 200_000
+        roll = {"type": rng.choice(["a", "b", "c"], size, p=[0.7, 0.29, 0.01]), "area": rng.lognormal(9, 1, size)}
+        scores = QualityScorer(roll, categorical_fields=["type"], numeric_fields=["area"]).score()
+        assert scores.property_uniqueness[roll["type"] == "c"].mean() > scores.property_uniqueness[roll["type"] == "a"].mean()
+
+
+class TestQualityScorerValidation:
+    """Test configuration and column errors."""
+
+    def test_invalid_settings(self):
+        roll = create_roll()
+        with pytest.raises(ValueError, match="at least one field"):
+            QualityScorer(roll)
+        with pytest.raises(ValueError, match="positive"):
+            QualityScorer(roll, required_fields=["year_built"], stale_days=0)
+        with pytest.raises(ValueError, match="weights"):
+            QualityScorer(roll, required_fields=["year_built"], weights=QualityWeights(freshness=-1))
+
+    def test_column_errors(self, scorer):
+        with pytest.raises(ValueError, match="Missing roll columns: year_built"):
+            QualityScorer({"building_sqft": [1]}, required_fields=["building_sqft", "year_built"])
+        with pytest.raises(ValueError, match="same length"):
+            QualityScorer({"a": [1, 2], "b": [1]}, required_fields=["a", "b"])
+        with pytest.raises(ValueError, match="one entry per record"):
+            scorer.score(comparable_counts=[1])
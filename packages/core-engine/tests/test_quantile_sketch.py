@@ -0,0 +1,184 @@
+"""Tests for mergeable quantile sketches."""
+
+import pickle
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from charly_core_engine.confidence import calculate_confidence_band, ConfidenceInput, ValuationMethod
+from charly_core_engine.decision import make_appeal_decision, DecisionInput
+from charly_core_engine.jurisdiction import JurisdictionPriors
+from charly_core_engine.quantile_sketch import PortfolioQuantiles, QuantileSketch
+from charly_core_engine.result_store import DecisionStore, write_decision_store
+
+
+QS = np.array([0.001, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 0.999])
+
+
+def rank_errors(sketch, values, group=None):
+    ordered = np.sort(values)
+    ranks = np.searchsorted(ordered, sketch.quantiles(QS, group)) / len(ordered)
+    return np.abs(ranks - QS)
+
+
+def rank_bound(compression=200):
+    return 2 * np.pi * np.sqrt(QS * (1 - QS)) / compression
+
+
+class TestQuantileSketch:
+    """Test accuracy, size and merging of the per-group digest."""
+
+    def test_bounded_rank_error_and_size(self):
+        rng = np.random.default_rng(0)
+        groups = rng.choice(["dallas_tx", "harris_tx", "travis_tx"], 300_000)
+        values = np.exp(rng.normal(8, 1.5, len(groups)))
+        sketch = QuantileSketch()
+        for start in range(0, len(values), 20_000):
+            assert sketch.add(groups[start:start + 20_000], values[start:start + 20_000]) == 20_000
+
+        assert sketch.count() == len(values)
+        assert set(sketch.groups) == {"dallas_tx", "harris_tx", "travis_tx"}
+        # About compression / 2 centroids per group, however many values
+        assert sketch.centroid_count <= 3 * 150
+        for group in sketch.groups:
+            assert np.all(rank_errors(sketch, values[groups == group], group) <= rank_bound())
+        assert np.all(rank_errors(sketch, values) <= rank_bound())
+
+    def test_centroid_weight_bound_on_sorted_stream(self):
+        values = np.arange(1_000_000, dtype=float)
+        sketch = QuantileSketch()
+        for start in range(0, len(values), 65536):
+            sketch.add(["a"] * len(values[start:start + 65536]), values[start:start + 65536])
+
+        # No centroid holds more than sin(pi / compression) of the group
+        assert sketch._weights.max() <= len(values) * np.sin(np.pi / sketch.compression)
+        assert sketch.centroid_count <= sketch.compression
+        assert np.all(rank_errors(sketch, values) <= rank_bound())
+
+    def test_small_groups_are_exact(self):
+        values = np.random.default_rng(1).normal(size=31)
+        sketch = QuantileSketch()
+        sketch.add(["a"] * 31, values)
+        assert sketch.quantiles([0.5], "a")[0] == pytest.approx(np.median(values))
+        assert sketch.quantiles([0, 1], "a").tolist() == [values.min(), values.max()]
+
+    def test_merge_matches_single_stream(self):
+        rng = np.random.default_rng(2)
+        values = rng.gamma(2.0, 1000.0, 200_000)
+        groups = np.where(values > 1500, "high", "low")
+        whole, workers = QuantileSketch(), [QuantileSketch() for _ in range(4)]
+        whole.add(groups, values)
+        for worker, part in zip(workers, np.array_split(np.arange(len(values)), 4)):
+            worker.add(groups[part], values[part])
+        # Workers travel between processes by pickle
+        merged = pickle.loads(pickle.dumps(workers[0]))
+        for worker in workers[1:]:
+            assert merged.merge(pickle.loads(pickle.dumps(worker))) is merged
+
+        assert merged.count("high") == whole.count("high")
+        for group in ("high", "low"):
+            assert np.all(rank_errors(merged, values[groups == group], group) <= rank_bound())
+            assert merged.quantiles([0, 1], group).tolist() == whole.quantiles([0, 1], group).tolist()
+
+    def test_coded_groups_and_missing_values(self):
+        sketch = QuantileSketch()
+        assert sketch.add([0, 1, 1, 0], [1.0, np.nan, 3.0, np.inf], labels=["a", "b"]) == 2
+        assert sketch.count("a") == 1 and sketch.count("b") == 1
+        assert sketch.add([0], [np.nan], labels=["c"]) == 0
+        assert sketch.count("c") == 0
+        assert np.isnan(sketch.quantiles([0.5], "c")).all()
+        assert np.isnan(QuantileSketch().quantiles([0.5])).all()
+        assert QuantileSketch().merge(QuantileSketch()).centroid_count == 0
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(compression=10)
+        sketch = QuantileSketch()
+        with pytest.raises(ValueError):
+            sketch.add(["a"], [1.0, 2.0])
+        sketch.add(["a"], [1.0])
+        with pytest.raises(ValueError):
+            sketch.quantiles([1.5], "a")
+
+
+def decide(assessed, market, jurisdiction, **confidence_kwargs):
+    confidence = calculate_confidence_band(ConfidenceInput(
+        estimated_market_value=Decimal(market),
+        valuation_method=ValuationMethod.SALES_COMPARISON,
+        **confidence_kwargs
+    ))
+    decision = make_appeal_decision(DecisionInput(
+        assessed_value=Decimal(assessed),
+        estimated_market_value=Decimal(market),
+        confidence_result=confidence,
+        jurisdiction_priors=jurisdiction,
+        tax_rate=Decimal('0.025')
+    ))
+    return decision, confidence
+
+
+@pytest.fixture
+def portfolio():
+    collin = JurisdictionPriors(
+        jurisdiction_id="collin_county_tx", jurisdiction_name="Collin County, TX", state="TX"
+    )
+    travis = JurisdictionPriors.get_default_priors("TX")
+    rows = []
+    for i, (assessed, jurisdiction) in enumerate([
+        ("1300000", collin), ("1100000", collin), ("1500000", collin),
+        ("700000", travis), ("1250000", travis),
+    ]):
+        decision, confidence = decide(assessed, "1000000", jurisdiction)
+        rows.append((f"PROP-{i}", jurisdiction.jurisdiction_id, decision, confidence))
+    return rows
+
+
+class TestPortfolioQuantiles:
+    """Test the portfolio metric summaries."""
+
+    def test_from_results(self, portfolio):
+        quantiles = PortfolioQuantiles()
+        quantiles.add_results(portfolio, chunk_size=2)
+
+        assert quantiles.jurisdictions == ["collin_county_tx", "default_tx"]
+        collin = [decision for _, jurisdiction, decision, _ in portfolio if jurisdiction == "collin_county_tx"]
+        median = quantiles.quantiles("assessment_ratio", "collin_county_tx", qs=[0.5])
+        assert median == {0.5: sorted(d.assessment_ratio for d in collin)[1]}
+        savings = quantiles.quantiles("expected_annual_savings", qs=[0, 1])
+        assert savings[1.0] == max(d.expected_annual_savings for _, _, d, _ in portfolio)
+        assert quantiles.quantiles("expected_roi", "nowhere_tx", qs=[0.5]) == {0.5: None}
+        band = quantiles.quantiles("confidence_band_pct", "default_tx", qs=[0])[0.0]
+        assert band == min(c.confidence_band_pct for _, j, _, c in portfolio if j == "default_tx")
+        assert band.as_tuple().exponent == -3
+
+        summary = quantiles.summary(qs=[0.5])
+        assert list(summary) == [None, "collin_county_tx", "default_tx"]
+        assert summary["collin_county_tx"]["assessment_ratio"] == median
+
+    def test_from_store_matches_results(self, portfolio, tmp_path):
+        path = str(tmp_path / "portfolio.crs")
+        write_decision_store(path, portfolio)
+        from_results, from_store = PortfolioQuantiles(), PortfolioQuantiles()
+        from_results.add_results(portfolio)
+        with DecisionStore.open(path) as store:
+            from_store.add_store(store, chunk_size=3)
+        assert from_store.summary() == from_results.summary()
+
+    def test_merge_workers(self, portfolio):
+        whole, first, second = PortfolioQuantiles(), PortfolioQuantiles(), PortfolioQuantiles()
+        whole.add_results(portfolio)
+        first.add_results(portfolio[:2])
+        second.add_results(portfolio[2:])
+        assert first.merge(second) is first
+        assert first.summary() == whole.summary()
+
+    def test_add_columns(self):
+        quantiles = PortfolioQuantiles()
+        quantiles.add_columns(["a", "a", "b"], expected_roi=[150.0, np.nan, 300.0], assessment_ratio=[1.2, 1.3, 0.9])
+        assert quantiles.quantiles("expected_roi", "a", qs=[0.5]) == {0.5: Decimal("150.00")}
+        assert quantiles.sketches["assessment_ratio"].count() == 3
+        with pytest.raises(ValueError):
+            quantiles.add_columns(["a"], net_savings_year_1=[1.0])
+        with pytest.raises(ValueError):
+            quantiles.quantiles("net_savings_year_1")
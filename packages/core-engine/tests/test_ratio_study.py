@@ -0,0 +1,194 @@
+"""Tests for the streaming assessment ratio study."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from charly_core_engine.jurisdiction import JurisdictionPriors
+from charly_core_engine.ratio_study import RatioStudy
+
+
+def reference_stats(assessed, prices):
+    """Textbook IAAO statistics, sorting for the median."""
+    ratios = assessed / prices
+    median = float(np.median(ratios))
+    cod = np.mean(np.abs(ratios - median)) / median
+    prd = ratios.mean() / (assessed.sum() / prices.sum())
+    x = np.log2(0.5 * prices + 0.5 * assessed / median)
+    prb = np.polyfit(x, (ratios - median) / median, 1)[0]
+    return median, cod, prd, prb
+
+
+def create_sales(size=4000, seed=3):
+    rng = np.random.default_rng(seed)
+    jurisdictions = rng.choice(["dallas_tx", "harris_tx"], size)
+    strata = rng.choice(["office", "retail"], size)
+    prices = np.exp(rng.normal(13.0, 0.8, size))
+    # Regressive: cheaper properties assessed relatively higher
+    assessed = prices * np.exp(rng.normal(-0.05, 0.1, size)) * (prices / 4e5) ** -0.03
+    return jurisdictions, strata, assessed, prices
+
+
+def add_in_chunks(study, jurisdictions, strata, assessed, prices, chunk=700):
+    for start in range(0, len(prices), chunk):
+        end = start + chunk
+        study.add(jurisdictions[start:end], assessed[start:end], prices[start:end], strata=strata[start:end])
+
+
+class TestExactStudy:
+    """Exact mode matches a sort-based reference."""
+
+    def test_matches_reference(self):
+        jurisdictions, strata, assessed, prices = create_sales()
+        study = RatioStudy()
+        add_in_chunks(study, jurisdictions, strata, assessed, prices)
+        results = study.results()
+
+        assert [(r.jurisdiction_id, r.stratum) for r in results] == [
+            ("dallas_tx", None), ("dallas_tx", "office"), ("dallas_tx", "retail"),
+            ("harris_tx", None), ("harris_tx", "office"), ("harris_tx", "retail"),
+        ]
+        assert study.sale_count == len(prices)
+        for result in results:
+            mask = jurisdictions == result.jurisdiction_id
+            if result.stratum is not None:
+                mask &= strata == result.stratum
+            median, cod, prd, prb = reference_stats(assessed[mask], prices[mask])
+            assert result.exact
+            assert result.sale_count == mask.sum()
+            assert float(result.median_ratio) == pytest.approx(median, abs=5e-5)
+            assert float(result.cod) == pytest.approx(cod, abs=5e-5)
+            assert float(result.prd) == pytest.approx(prd, abs=5e-5)
+            assert float(result.prb) == pytest.approx(prb, abs=5e-5)
+            assert result.prb < 0 and result.prd > 1
+
+    def test_even_count_median_and_rounding(self):
+        study = RatioStudy()
+        assert study.add(["a"] * 4, [90, 100, 110, 130], [100] * 4) == 4
+        result, = study.results()
+        # Ratios 0.9, 1.0, 1.1, 1.3: median 1.05, mean |r - m| = 0.125
+        assert result.median_ratio == Decimal("1.0500")
+        assert result.cod == Decimal("0.1190")
+        assert result.mean_ratio == Decimal("1.0750")
+        assert result.weighted_mean_ratio == Decimal("1.0750")
+        assert result.prd == Decimal("1.0000")
+        assert result.prb == Decimal("1.4191")
+        assert result.stratum is None
+
+    def test_identical_sales(self):
+        study = RatioStudy()
+        study.add(["a"] * 3, [100] * 3, [100] * 3)
+        result, = study.results()
+        assert result.cod == Decimal("0")
+        # No value spread to regress on
+        assert result.prb is None
+
+    def test_rejects_invalid_sales(self):
+        study = RatioStudy()
+        accepted = study.add(["a", "a", "a", "b", "a"], [100, 0, np.nan, 100, 120], [100, 100, 100, -5, 100])
+        assert accepted == 2
+        assert study.rejected == 3
+        # "b" had no valid sales, so it has no row
+        assert [r.jurisdiction_id for r in study.results()] == ["a"]
+
+    def test_unstratified_sales_count_in_jurisdiction_only(self):
+        study = RatioStudy()
+        study.add(["a"] * 3, [100, 110, 90], [100] * 3, strata=["office", None, "office"])
+        jurisdiction, office = study.results()
+        assert (jurisdiction.stratum, jurisdiction.sale_count) == (None, 3)
+        assert (office.stratum, office.sale_count) == ("office", 2)
+
+    def test_empty(self):
+        study = RatioStudy()
+        assert study.add([], [], []) == 0
+        assert study.results() == []
+        assert study.sale_count == 0
+
+
+class TestSketchStudy:
+    """Sketch mode tracks the exact study within its resolution."""
+
+    @pytest.mark.parametrize("resolution", [0.001, 0.01])
+    def test_close_to_exact(self, resolution):
+        jurisdictions, strata, assessed, prices = create_sales()
+        exact, sketch = RatioStudy(), RatioStudy(sketch_resolution=resolution)
+        for study in (exact, sketch):
+            add_in_chunks(study, jurisdictions, strata, assessed, prices)
+
+        for expected, result in zip(exact.results(), sketch.results()):
+            assert not result.exact
+            assert (result.jurisdiction_id, result.stratum, result.sale_count) == \
+                (expected.jurisdiction_id, expected.stratum, expected.sale_count)
+            assert result.prd == expected.prd
+            assert result.mean_ratio == expected.mean_ratio
+            assert float(result.median_ratio) == pytest.approx(float(expected.median_ratio), rel=resolution)
+            assert float(result.cod) == pytest.approx(float(expected.cod), abs=2 * resolution)
+            assert float(result.prb) == pytest.approx(float(expected.prb), abs=2 * resolution)
+
+    def test_memory_bounded_by_bins(self):
+        study = RatioStudy(sketch_resolution=0.01)
+        rng = np.random.default_rng(0)
+        for _ in range(5):
+            prices = rng.uniform(1e5, 1e6, 10_000)
+            study.add(np.full(10_000, "a"), prices * rng.uniform(0.9, 1.1, 10_000), prices)
+        # Ratios span 0.9-1.1: about 20 one-percent bins
+        assert len(study._keys) <= 25
+        assert study.results()[0].sale_count == 50_000
+
+    def test_invalid_resolution(self):
+        with pytest.raises(ValueError):
+            RatioStudy(sketch_resolution=0.5)
+        with pytest.raises(ValueError):
+            RatioStudy(sketch_resolution=0)
+
+
+class TestValidation:
+    """Test chunk validation."""
+
+    def test_misaligned_columns(self):
+        study = RatioStudy()
+        with pytest.raises(ValueError):
+            study.add(["a"], [100, 110], [100, 100])
+        with pytest.raises(ValueError):
+            study.add(["a", "a"], [100, 110], [100, 100], strata=["office"])
+
+
+class TestPriorUpdates:
+    """Observed COD feeds JurisdictionPriors.cod_target."""
+
+    def create_study(self):
+        study = RatioStudy()
+        rng = np.random.default_rng(1)
+        prices = rng.uniform(1e5, 1e6, 200)
+        # Uniform ratios on [0.85, 1.15]: COD about 0.075
+        study.add(np.full(200, "dallas_tx"), prices * rng.uniform(0.85, 1.15, 200), prices)
+        study.add(np.full(10, "harris_tx"), prices[:10] * 1.5, prices[:10])
+        return study
+
+    def test_updates_jurisdictions_with_enough_sales(self):
+        study = self.create_study()
+        priors = {
+            jurisdiction_id: JurisdictionPriors.get_default_priors().model_copy(
+                update={"jurisdiction_id": jurisdiction_id})
+            for jurisdiction_id in ("dallas_tx", "harris_tx", "travis_tx")
+        }
+        updated = study.update_priors(priors)
+
+        observed = study.cod_by_jurisdiction()
+        assert set(observed) == {"dallas_tx"}
+        assert updated["dallas_tx"].cod_target == observed["dallas_tx"].quantize(Decimal("0.001"))
+        assert Decimal("0.06") < updated["dallas_tx"].cod_target < Decimal("0.09")
+        # Too few sales, or none: unchanged
+        assert updated["harris_tx"] is priors["harris_tx"]
+        assert updated["travis_tx"] is priors["travis_tx"]
+
+        assert study.update_priors(priors.values(), min_sales=5)["harris_tx"].cod_target == Decimal("0.001")
+
+    def test_clamps_to_priors_bounds(self):
+        study = RatioStudy()
+        study.add(["a"] * 4, [50, 100, 300, 900], [100] * 4)
+        priors = JurisdictionPriors.get_default_priors().model_copy(update={"jurisdiction_id": "a"})
+        updated = study.update_priors([priors], min_sales=1)["a"]
+        assert updated.cod_target == Decimal("0.50")
+        JurisdictionPriors.model_validate(updated.model_dump())
@@ -0,0 +1,123 @@
+"""Tests for reconciling combined approach valuations."""
+
+import pytest
+from decimal import Decimal
+
+from charly_core_engine.confidence import METHOD_BANDS, ValuationMethod, calculate_confidence_band
+from charly_core_engine.decision import AppealDecision, make_appeal_decision
+from charly_core_engine.reconciliation import (
+    RECONCILIATION_WEIGHTS, approach_values, decide_reconciled, reconcile, reconcile_many
+)
+
+
+def combined(income=1000000.0, sales=1100000.0, cost=900000.0, **extra):
+    row = {
+        "income": {"approach": "income", "value": income},
+        "sales": {"approach": "sales", "value": sales},
+        "cost": {"approach": "cost", "value": cost},
+        "income_value": income,
+        "sales_value": sales,
+        "cost_value": cost,
+    }
+    row.update(extra)
+    return row
+
+
+def test_weights_mirror_method_bands():
+    assert RECONCILIATION_WEIGHTS["sales"] / RECONCILIATION_WEIGHTS["cost"] == (
+        METHOD_BANDS[ValuationMethod.COST_APPROACH] / METHOD_BANDS[ValuationMethod.SALES_COMPARISON]
+    )
+    assert RECONCILIATION_WEIGHTS["sales"] > RECONCILIATION_WEIGHTS["income"] > RECONCILIATION_WEIGHTS["cost"]
+
+
+def test_reconcile_weights_by_reliability():
+    result = reconcile(combined(), data_quality_score=Decimal('0.9'))
+
+    # Weights 1/0.15 : 1/0.10 : 1/0.20 = 4 : 6 : 3
+    expected = (Decimal('1000000') * 4 + Decimal('1100000') * 6 + Decimal('900000') * 3) / 13
+    assert result.reconciled_value == expected.quantize(Decimal('0.01'))
+    assert result.weights == {"sales": Decimal('0.4615'), "income": Decimal('0.3077'), "cost": Decimal('0.2308')}
+    assert result.primary_method == ValuationMethod.SALES_COMPARISON
+
+    confidence_input = result.confidence_input
+    assert confidence_input.estimated_market_value == result.reconciled_value
+    assert confidence_input.valuation_method == ValuationMethod.SALES_COMPARISON
+    assert confidence_input.data_quality_score == Decimal('0.9')
+    assert sorted(m.value for _, m in confidence_input.other_estimates) == [
+        "cost_approach", "income_approach", "sales_comparison"
+    ]
+    calculate_confidence_band(confidence_input)
+
+
+def test_missing_approaches_are_renormalized():
+    result = reconcile(combined(sales=0.0))
+
+    assert set(result.approach_values) == {"income", "cost"}
+    assert sum(result.weights.values()) == Decimal('1.0000')
+    assert result.primary_method == ValuationMethod.INCOME_APPROACH
+    assert Decimal('900000') < result.reconciled_value < Decimal('1000000')
+
+
+def test_nested_values_are_read_when_flat_keys_are_absent():
+    row = {"property_id": "P-1", "income": {"value": "500000"}, "cost": {"value": 400000}}
+
+    assert approach_values(row) == {"income": Decimal('500000'), "cost": Decimal('400000')}
+    assert reconcile(row).property_id == "P-1"
+
+
+def test_custom_weights():
+    result = reconcile(combined(), weights={"sales": 1, "income": 1, "cost": 0})
+
+    assert result.reconciled_value == Decimal('1050000.00')
+    assert result.weights["cost"] == Decimal('0')
+
+
+def test_no_positive_values_raises():
+    with pytest.raises(ValueError, match="No approach"):
+        reconcile(combined(income=0.0, sales=0.0, cost=0.0))
+
+
+def test_reconcile_many_applies_shared_and_row_fields():
+    rows = [combined(property_id="A"), combined(property_id="B", cost=0.0)]
+
+    results = reconcile_many(rows, confidence_fields=[{}, {"market_conditions": "volatile"}],
+                             data_quality_score=Decimal('0.7'))
+
+    assert [r.property_id for r in results] == ["A", "B"]
+    assert results[0].confidence_input.market_conditions == "stable"
+    assert results[1].confidence_input.market_conditions == "volatile"
+    assert {r.confidence_input.data_quality_score for r in results} == {Decimal('0.7')}
+
+    with pytest.raises(ValueError):
+        reconcile_many(rows, confidence_fields=[{}])
+
+
+def test_decide_reconciled_matches_manual_pipeline(priors):
+    collin = priors()
+    results = reconcile_many([combined(), combined(income=800000.0, sales=820000.0, cost=790000.0)])
+    decision_rows = [
+        {"assessed_value": Decimal('1400000'), "jurisdiction_priors": collin, "tax_rate": Decimal('0.025')},
+        {"assessed_value": Decimal('810000'), "jurisdiction_priors": collin, "tax_rate": Decimal('0.025')},
+    ]
+
+    decided = decide_reconciled(results, decision_rows)
+
+    assert [decision.decision for _, decision, _ in decided] == [AppealDecision.OVER, AppealDecision.FAIR]
+    manual = make_appeal_decision(results[0].decision_input(**decision_rows[0]))
+    assert decided[0][1] == manual
+    assert decided[0][2] == calculate_confidence_band(results[0].confidence_input)
+
+    with pytest.raises(ValueError, match="one entry per reconciliation result"):
+        decide_reconciled(results, decision_rows[:1])
+
+
+def test_decision_input_reuses_confidence_result(priors):
+    result = reconcile(combined())
+    confidence = calculate_confidence_band(result.confidence_input)
+
+    input_data = result.decision_input(
+        Decimal('1400000'), priors(), Decimal('0.025'), confidence_result=confidence
+    )
+
+    assert input_data.confidence_result is confidence
+    assert input_data.estimated_market_value == result.reconciled_value
@@ -0,0 +1,104 @@
+"""Tests for incremental re-decisioning on jurisdiction prior changes."""
+
+import pytest
+from decimal import Decimal
+
+from charly_core_engine.decision import make_appeal_decision, AppealDecision
+from charly_core_engine.jurisdiction import JurisdictionPriors
+from charly_core_engine.redecision import (
+    RedecisionTracker, prior_dependencies, ALWAYS_USED_PRIOR_FIELDS, DEFAULT_COST_PRIOR_FIELDS
+)
+
+
+@pytest.fixture
+def tracker(decision_input):
+    tracker = RedecisionTracker()
+    tracker.track_many([
+        ("FAIR-1", decision_input("1120000")),
+        ("FAIR-2", decision_input("1130000", estimated_attorney_fee=Decimal('1500'))),
+        ("OVER-1", decision_input("1400000")),
+        ("UNDER-1", decision_input("800000")),
+    ])
+    tracker.track("OTHER-1", decision_input("1050000", JurisdictionPriors.get_default_priors("TX")))
+    return tracker
+
+
+class TestPriorDependencies:
+    """Test which prior fields a decision depends on."""
+
+    def test_default_costs_add_fee_fields(self, decision_input):
+        input_data = decision_input("1100000")
+        assert prior_dependencies(input_data) == ALWAYS_USED_PRIOR_FIELDS | DEFAULT_COST_PRIOR_FIELDS
+
+    def test_explicit_costs_ignore_fee_fields(self, decision_input):
+        input_data = decision_input("1100000", estimated_filing_fee=Decimal('100'))
+        assert prior_dependencies(input_data) == ALWAYS_USED_PRIOR_FIELDS
+
+
+class TestRedecisionTracker:
+    """Test targeted re-decisioning."""
+
+    def test_tracks_dependents_per_jurisdiction(self, tracker):
+        assert len(tracker) == 5
+        assert "OVER-1" in tracker
+        assert tracker.dependents("collin_county_tx") == {"FAIR-1", "FAIR-2", "OVER-1", "UNDER-1"}
+        assert tracker.dependents("default_tx") == {"OTHER-1"}
+        assert tracker.result("FAIR-1").decision == AppealDecision.FAIR
+
+    def test_cod_change_emits_label_diff(self, tracker, priors):
+        report = tracker.update_priors(priors(cod_target=Decimal('0.05')))
+
+        assert report.changed_fields == ["cod_target"]
+        assert report.recomputed == 4
+        assert report.skipped == 0
+        assert {(c.property_id, c.previous_decision, c.decision) for c in report.changes} == {
+            ("FAIR-1", AppealDecision.FAIR, AppealDecision.OVER),
+            ("FAIR-2", AppealDecision.FAIR, AppealDecision.OVER),
+        }
+        assert tracker.result("FAIR-1").decision == AppealDecision.OVER
+        # Other jurisdictions are untouched
+        assert tracker.result("OTHER-1").decision == AppealDecision.FAIR
+
+    def test_fee_change_only_recomputes_default_cost_properties(self, tracker, priors, decision_input):
+        new_priors = priors(typical_attorney_cost=Decimal('9000'))
+        report = tracker.update_priors(new_priors)
+
+        assert report.changed_fields == ["typical_attorney_cost"]
+        assert report.recomputed == 3
+        assert report.skipped == 1  # FAIR-2 has explicit costs
+
+        # Incremental results match a full rerun with the new priors
+        expected = make_appeal_decision(decision_input("1400000", new_priors))
+        assert tracker.result("OVER-1") == expected
+        assert tracker.priors("collin_county_tx") == new_priors
+
+    def test_irrelevant_change_recomputes_nothing(self, tracker, priors):
+        report = tracker.update_priors(priors(jurisdiction_name="Collin CAD"))
+        assert report.changed_fields == ["jurisdiction_name"]
+        assert report.recomputed == 0
+        assert report.skipped == 4
+        assert report.changes == []
+
+    def test_unknown_jurisdiction_is_noop(self, tracker, priors):
+        report = tracker.update_priors(priors(jurisdiction_id="nowhere"))
+        assert report.recomputed == 0
+        assert report.changed_fields == []
+
+    def test_track_uses_current_priors_version(self, tracker, priors, decision_input):
+        stale = priors(cod_target=Decimal('0.30'))
+        tracker.track("LATE-1", decision_input("1120000", stale))
+        assert tracker.priors("collin_county_tx").cod_target == Decimal('0.15')
+        assert tracker.result("LATE-1").decision == AppealDecision.FAIR
+
+    def test_untrack(self, tracker):
+        tracker.untrack("OTHER-1")
+        tracker.untrack("OTHER-1")
+        assert "OTHER-1" not in tracker
+        assert tracker.dependents("default_tx") == set()
+        assert tracker.priors("default_tx") is None
+        assert tracker.result("OTHER-1") is None
+
+    def test_retrack_moves_jurisdiction(self, tracker, decision_input):
+        tracker.track("FAIR-1", decision_input("1120000", JurisdictionPriors.get_default_priors("TX")))
+        assert "FAIR-1" not in tracker.dependents("collin_county_tx")
+        assert "FAIR-1" in tracker.dependents("default_tx")
@@ -0,0 +1,235 @@
+"""Tests for the memory-mapped decision result store."""
+
+import mmap
+import os
+import pytest
+from decimal import Decimal
+
+import numpy as np
+
+from charly_core_engine.confidence import (
+    calculate_confidence_band, ConfidenceInput, ValuationMethod
+)
+from charly_core_engine.decision import make_appeal_decision, DecisionInput, AppealDecision
+from charly_core_engine.jurisdiction import JurisdictionPriors
+from charly_core_engine.result_store import (
+    DecisionStore, DecisionStoreWriter, MAGIC, write_decision_store, RECORD_DTYPE
+)
+
+
+def decide(assessed: str, market: str, jurisdiction: JurisdictionPriors, **confidence_kwargs):
+    """Run confidence + decision for one property."""
+    confidence = calculate_confidence_band(ConfidenceInput(
+        estimated_market_value=Decimal(market),
+        valuation_method=confidence_kwargs.pop("valuation_method", ValuationMethod.SALES_COMPARISON),
+        **confidence_kwargs
+    ))
+    decision = make_appeal_decision(DecisionInput(
+        assessed_value=Decimal(assessed),
+        estimated_market_value=Decimal(market),
+        confidence_result=confidence,
+        jurisdiction_priors=jurisdiction,
+        tax_rate=Decimal('0.025')
+    ))
+    return decision, confidence
+
+
+@pytest.fixture
+def portfolio():
+    collin = JurisdictionPriors(
+        jurisdiction_id="collin_county_tx", jurisdiction_name="Collin County, TX", state="TX"
+    )
+    travis = JurisdictionPriors.get_default_priors("TX")
+    rows = []
+    for i, (assessed, market, jurisdiction, kwargs) in enumerate([
+        ("1300000", "1000000", collin, {"comparable_sales": [Decimal('980000'), Decimal('1010000'), Decimal('995000')]}),
+        ("1020000", "1000000", collin, {}),
+        ("700000", "1000000", travis, {"data_quality_score": Decimal('0.4'), "market_conditions": "volatile"}),
+        ("1500000", "1000000", travis, {"valuation_method": ValuationMethod.TAX_ASSESSOR}),
+    ]):
+        decision, confidence = decide(assessed, market, jurisdiction, **kwargs)
+        rows.append((f"PROP-{i}", jurisdiction.jurisdiction_id, decision, confidence))
+    return rows
+
+
+@pytest.fixture
+def store_path(tmp_path, portfolio):
+    path = str(tmp_path / "portfolio.crs")
+    assert write_decision_store(path, portfolio) == len(portfolio)
+    return path
+
+
+class TestDecisionStoreRoundTrip:
+    """Test writing and re-reading stores."""
+
+    def test_round_trip_is_exact(self, store_path, portfolio):
+        """Rebuilt Decimal results equal the originals field for field."""
+        with DecisionStore.open(store_path) as store:
+            assert len(store) == len(portfolio)
+            for original, restored in zip(portfolio, store):
+                assert restored[0] == original[0]
+                assert restored[1] == original[1]
+                assert restored[2] == original[2]
+                assert restored[3] == original[3]
+
+    def test_none_values_survive(self, store_path, portfolio):
+        """Optional Decimal fields encode None as NaN."""
+        with DecisionStore.open(store_path) as store:
+            no_dispersion = [i for i, row in enumerate(portfolio) if row[3].estimate_dispersion is None]
+            assert no_dispersion
+            assert np.isnan(store.records["estimate_dispersion"][no_dispersion]).all()
+            assert store.get(no_dispersion[0])[1].estimate_dispersion is None
+
+    def test_records_are_fixed_width_mmap_view(self, store_path):
+        """Records are a read-only structured view over the mapped file."""
+        with DecisionStore.open(store_path) as store:
+            assert store.records.dtype == RECORD_DTYPE
+            assert not store.records.flags.writeable
+
+    def test_small_chunks_flush_incrementally(self, tmp_path, portfolio):
+        """Writer output does not depend on the chunk size."""
+        path = str(tmp_path / "chunked.crs")
+        with DecisionStoreWriter(path, chunk_size=1) as writer:
+            for row in portfolio:
+                writer.append(*row)
+            assert len(writer) == len(portfolio)
+        writer.close()  # Closing twice is harmless
+
+        with DecisionStore.open(path) as store:
+            assert [row[0] for row in store] == [row[0] for row in portfolio]
+
+    def test_empty_store(self, tmp_path):
+        """A store with no rows opens cleanly."""
+        path = str(tmp_path / "empty.crs")
+        assert write_decision_store(path, []) == 0
+        with DecisionStore.open(path) as store:
+            assert len(store) == 0
+            assert store.code_of("anything") is None
+            assert not store.mask(decision="OVER").any()
+
+
+class TestDecisionStoreQueries:
+    """Test column filters over the mapped records."""
+
+    def test_filter_by_decision_and_jurisdiction(self, store_path, portfolio):
+        with DecisionStore.open(store_path) as store:
+            mask = store.mask(decision="OVER", jurisdiction_id="collin_county_tx")
+            expected = [
+                row[2].decision == AppealDecision.OVER and row[1] == "collin_county_tx"
+                for row in portfolio
+            ]
+            assert mask.tolist() == expected
+            assert store.property_id(int(np.flatnonzero(mask)[0])) == "PROP-0"
+            assert store.jurisdiction_id(0) == "collin_county_tx"
+
+    def test_filter_by_roi_range(self, store_path, portfolio):
+        with DecisionStore.open(store_path) as store:
+            mask = store.mask(min_roi=100, max_roi=10000)
+            expected = [
+                row[2].expected_roi is not None and 100 <= row[2].expected_roi <= 10000
+                for row in portfolio
+            ]
+            assert mask.tolist() == expected
+
+    def test_filter_by_confidence_and_grade(self, store_path, portfolio):
+        with DecisionStore.open(store_path) as store:
+            level = portfolio[0][2].confidence_level
+            grade = portfolio[0][3].reliability_grade
+            mask = store.mask(confidence_level=level, reliability_grades=[grade])
+            assert mask[0]
+            assert mask.tolist() == [
+                row[2].confidence_level == level and row[3].reliability_grade == grade
+                for row in portfolio
+            ]
+
+    def test_unknown_jurisdiction_matches_nothing(self, store_path):
+        with DecisionStore.open(store_path) as store:
+            assert not store.mask(jurisdiction_id="nowhere").any()
+
+    def test_aggregate_without_deserializing(self, store_path, portfolio):
+        with DecisionStore.open(store_path) as store:
+            over = store.mask(decision="OVER")
+            total = store.records["expected_annual_savings"][over].sum()
+        expected = sum(row[2].expected_annual_savings for row in portfolio if row[2].decision == AppealDecision.OVER)
+        assert Decimal(repr(float(total))).quantize(Decimal('0.01')) == expected
+
+    def test_risk_factor_mask(self, store_path, portfolio):
+        with DecisionStore.open(store_path) as store:
+            risk = "High risk of assessment increase upon review"
+            assert store.risk_factor_mask(risk).tolist() == [risk in row[2].risk_factors for row in portfolio]
+            assert not store.risk_factor_mask("not a risk factor").any()
+            # Phrases used only as rationale never match the risk slice
+            rationale = portfolio[2][2].primary_rationale[1]
+            assert not store.risk_factor_mask(rationale).any()
+
+
+class TestDecisionStoreErrors:
+    """Test error handling."""
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "junk.crs"
+        path.write_bytes(b"\0" * 128)
+        with pytest.raises(ValueError, match="Not a CHARLY decision store"):
+            DecisionStore.open(str(path))
+
+    def test_rejects_unknown_version(self, store_path):
+        with open(store_path, "r+b") as handle:
+            handle.seek(8)
+            handle.write((99).to_bytes(4, "little"))
+        with pytest.raises(ValueError, match="Unsupported decision store version"):
+            DecisionStore.open(store_path)
+
+    @pytest.mark.parametrize("size", [0, 12])
+    def test_rejects_file_shorter_than_header(self, tmp_path, size):
+        path = tmp_path / "short.crs"
+        path.write_bytes((MAGIC + bytes(8))[:size])
+        with pytest.raises(ValueError, match="Truncated decision store"):
+            DecisionStore.open(str(path))
+
+    def test_rejects_truncated_sections(self, store_path):
+        with open(store_path, "r+b") as handle:
+            handle.truncate(72)  # Header plus part of the first record
+        with pytest.raises(ValueError, match="Truncated decision store"):
+            DecisionStore.open(store_path)
+
+    @pytest.mark.parametrize("size, message", [(128, "Not a CHARLY"), (16, "Truncated")])
+    def test_rejected_file_releases_mapping(self, size, message):
+        buffer = mmap.mmap(-1, size)
+        with pytest.raises(ValueError, match=message):
+            DecisionStore(buffer)
+        assert buffer.closed
+
+    def test_writer_rejects_bad_chunk_size(self, tmp_path):
+        with pytest.raises(ValueError, match="chunk_size"):
+            DecisionStoreWriter(str(tmp_path / "x.crs"), chunk_size=0)
+
+    def test_writer_rejects_append_after_close(self, tmp_path, portfolio):
+        writer = DecisionStoreWriter(str(tmp_path / "x.crs"))
+        writer.close()
+        with pytest.raises(ValueError, match="closed"):
+            writer.append(*portfolio[0])
+
+    def test_writer_discards_partial_file_on_error(self, tmp_path, portfolio):
+        path = tmp_path / "x.crs"
+
+        def rows():
+            yield from portfolio
+            raise RuntimeError("decision run failed")
+
+        with pytest.raises(RuntimeError):
+            write_decision_store(str(path), rows())
+        assert not path.exists()
+
+        writer = DecisionStoreWriter(str(path))
+        writer.discard()
+        writer.discard()
+        assert not path.exists()
+        with pytest.raises(ValueError, match="closed"):
+            writer.append(*portfolio[0])
+
+    def test_writer_rejects_oversized_lists(self, tmp_path, portfolio):
+        property_id, jurisdiction_id, decision, confidence = portfolio[0]
+        decision = decision.model_copy(update={"risk_factors": ["risk"] * 256})
+        with DecisionStoreWriter(str(tmp_path / "x.crs")) as writer:
+            with pytest.raises(ValueError, match="max 255"):
+                writer.append(property_id, jurisdiction_id, decision, confidence)
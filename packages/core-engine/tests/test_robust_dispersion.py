@@ -0,0 +1,146 @@
+"""Tests for robust dispersion over ragged estimate arrays."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from charly_core_engine.confidence import (
+    ConfidenceInput, ValuationMethod, confidence_band_from_dispersion
+)
+from charly_core_engine.robust_dispersion import (
+    MAD_NORMAL_SCALE, robust_confidence_band, robust_confidence_bands, robust_dispersion
+)
+
+
+def create_input(**overrides) -> ConfidenceInput:
+    values = dict(
+        estimated_market_value=Decimal('1000000'),
+        valuation_method=ValuationMethod.SALES_COMPARISON,
+        data_quality_score=Decimal('0.85'),
+    )
+    values.update(overrides)
+    return ConfidenceInput(**values)
+
+
+def ragged(rows):
+    offsets = np.concatenate([[0], np.cumsum([len(row) for row in rows])])
+    return offsets, np.concatenate([np.asarray(row, dtype=float) for row in rows] + [np.empty(0)])
+
+
+def reference(row, trim=0.10, iqr_multiplier=1.5):
+    """Sort-based statistics for one row."""
+    row = np.asarray(row, dtype=float)
+    q1, q3 = np.quantile(row, [0.25, 0.75])
+    slack = iqr_multiplier * (q3 - q1)
+    kept = np.sort(row[(row >= q1 - slack) & (row <= q3 + slack)])
+    cut = int(trim * len(kept))
+    median = np.median(kept)
+    return {
+        "q1": q1, "q3": q3, "kept": len(kept), "median": median,
+        "trimmed_mean": kept[cut:len(kept) - cut].mean(),
+        "mad": np.median(np.abs(kept - median)),
+    }
+
+
+class TestRobustDispersion:
+    """Test the per-row statistics against sorting."""
+
+    def test_matches_sorted_reference(self):
+        rng = np.random.default_rng(11)
+        rows = [
+            rng.lognormal(13, 0.2, rng.integers(1, 60)) * rng.choice([1, 1, 1, 5], rng.integers(1, 2))
+            for _ in range(400)
+        ]
+        rows[7] = np.array([500_000.0] * 9 + [9_000_000.0])  # Zero IQR
+        offsets, values = ragged(rows)
+
+        stats = robust_dispersion(offsets, values)
+
+        assert len(stats) == len(rows)
+        for i, row in enumerate(rows):
+            expected = reference(row)
+            assert stats.kept[i] == expected["kept"]
+            for name in ("q1", "q3", "median", "trimmed_mean", "mad"):
+                assert getattr(stats, name)[i] == pytest.approx(expected[name], rel=1e-12)
+
+    def test_rejects_outliers(self):
+        offsets, values = ragged([[100.0, 101.0, 102.0, 103.0, 104.0, 1000.0], [5.0, 6.0]])
+
+        stats = robust_dispersion(offsets, values)
+
+        assert stats.outliers.tolist() == [False] * 5 + [True, False, False]
+        assert stats.count.tolist() == [6, 2]
+        assert stats.kept.tolist() == [5, 2]
+        assert stats.median.tolist() == [102.0, 5.5]
+        assert stats.iqr[0] == pytest.approx(103.75 - 101.25)
+        assert stats.cv[0] == pytest.approx(MAD_NORMAL_SCALE * 1.0 / 102.0)
+
+    def test_infinite_multiplier_keeps_everything(self):
+        offsets, values = ragged([[100.0, 101.0, 102.0, 103.0, 104.0, 1000.0]])
+
+        stats = robust_dispersion(offsets, values, trim=0.2, iqr_multiplier=np.inf)
+
+        assert not stats.outliers.any()
+        assert stats.kept[0] == 6
+        assert stats.median[0] == 102.5
+        assert stats.trimmed_mean[0] == pytest.approx(102.5)
+
+    def test_empty_and_degenerate_rows(self):
+        offsets, values = ragged([[], [250_000.0], [-3.0, -1.0], [0.0, 0.0, 4.0]])
+
+        stats = robust_dispersion(offsets, values)
+
+        assert np.isnan(stats.median[0]) and np.isnan(stats.mad[0])
+        assert stats.kept.tolist() == [0, 1, 2, 3]
+        # Too few kept values, or a non-positive median, give no CV
+        assert np.isnan(stats.cv).all()
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="trim"):
+            robust_dispersion([0, 1], [1.0], trim=0.5)
+        with pytest.raises(ValueError, match="offsets"):
+            robust_dispersion([0, 3], [1.0, 2.0])
+        with pytest.raises(ValueError, match="offsets"):
+            robust_dispersion([0, 2, 1, 2], [1.0, 2.0])
+        with pytest.raises(ValueError, match="offsets"):
+            robust_dispersion([], [])
+        with pytest.raises(ValueError, match="finite"):
+            robust_dispersion([0, 2], [1.0, np.nan])
+
+
+class TestRobustConfidenceBands:
+    """Test the confidence mode built on robust dispersion."""
+
+    def test_matches_band_from_dispersion(self):
+        rng = np.random.default_rng(5)
+        inputs = [create_input(), create_input(estimated_market_value=Decimal('420000'))]
+        estimates = [rng.normal(1_000_000, 40_000, 500), np.array([400_000.0, 9e9])]
+        offsets, values = ragged(estimates)
+
+        results = robust_confidence_bands(inputs, offsets, values)
+
+        for input_data, row, result in zip(inputs, estimates, results):
+            combined = reference(np.concatenate([[float(input_data.estimated_market_value)], row]))
+            cv = MAD_NORMAL_SCALE * combined["mad"] / combined["median"]
+            expected = confidence_band_from_dispersion(input_data, Decimal(repr(float(cv))), combined["kept"] - 1)
+            assert result == expected
+        # Hundreds of estimates are fine, and the stray 9e9 does not widen the band
+        assert results[1].confidence_score > Decimal('0.5')
+
+    def test_comparable_count_excludes_primary(self):
+        # The primary is itself an outlier here, so all three kept estimates count
+        result = robust_confidence_band(create_input(estimated_market_value=Decimal('5000')),
+                                        [100.0, 101.0, 102.0])
+        assert "Limited comparable sales data" not in result.risk_factors
+
+        result = robust_confidence_band(create_input(), [1_000_000.0, 1_010_000.0])
+        assert "Limited comparable sales data" in result.risk_factors
+
+    def test_no_estimates(self):
+        input_data = create_input()
+        assert robust_confidence_band(input_data, []) == confidence_band_from_dispersion(input_data, None, 0)
+
+    def test_offsets_must_match_inputs(self):
+        with pytest.raises(ValueError, match="one entry per input"):
+            robust_confidence_bands([create_input()], [0, 1, 2], [1.0, 2.0])
@@ -0,0 +1,27 @@
+"""Tests for the shared Decimal rounding helpers."""
+
+from decimal import Decimal, ROUND_HALF_UP, localcontext
+from hypothesis import given, strategies as st
+
+from charly_core_engine.rounding import BASIS_POINTS, CENTS, THOUSANDTHS, half_up, round_currency
+
+
+class TestHalfUp:
+    """Test cached-context quantizers."""
+
+    def test_ties_round_away_from_zero(self):
+        assert round_currency(Decimal('2.345')) == Decimal('2.35')
+        assert round_currency(Decimal('-2.345')) == Decimal('-2.35')
+        assert str(half_up(THOUSANDTHS)(Decimal('0.1'))) == "0.100"
+        assert str(half_up(BASIS_POINTS)(Decimal('0.071428571'))) == "0.0714"
+        assert str(half_up(BASIS_POINTS)(Decimal('0.00005'))) == "0.0001"
+
+    def test_ignores_caller_rounding_mode(self):
+        with localcontext() as ctx:
+            ctx.rounding = "ROUND_DOWN"
+            assert round_currency(Decimal('1.005')) == Decimal('1.01')
+
+    @given(st.decimals(min_value=-10**12, max_value=10**12, allow_nan=False, allow_infinity=False, places=6))
+    def test_matches_per_call_rounding(self, value):
+        expected = value.quantize(CENTS, rounding=ROUND_HALF_UP)
+        assert str(round_currency(value)) == str(expected)
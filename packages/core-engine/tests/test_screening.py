@@ -0,0 +1,142 @@
+"""Tests for float64 screening with exact re-evaluation of boundary rows."""
+
+import numpy as np
+import pytest
+from decimal import Decimal
+
+from charly_core_engine.confidence import ValuationMethod, calculate_confidence_band
+from charly_core_engine.decision import make_appeal_decision
+from charly_core_engine.jurisdiction import JurisdictionPriors
+from charly_core_engine.screening import ScreeningBatch, screen_decisions
+
+
+PRIORS = [
+    JurisdictionPriors.get_default_priors("TX"),
+    JurisdictionPriors(
+        jurisdiction_id="collin_county_tx",
+        jurisdiction_name="Collin County, TX",
+        state="TX",
+        cod_target=Decimal('0.15'),
+        average_reduction_pct=Decimal('0.18'),
+    ),
+]
+
+
+def create_batch(size: int = 1500, seed: int = 11) -> ScreeningBatch:
+    rng = np.random.default_rng(seed)
+    market_value = np.round(rng.uniform(100_000, 3_000_000, size), -3)
+    ratio = rng.uniform(0.7, 1.5, size)
+    # Push a slice of rows exactly onto the ratio thresholds
+    ratio[:100] = 0.90
+    ratio[100:200] = 1.10
+    comparable_counts = rng.integers(0, 5, size)
+    offsets = np.concatenate([[0], np.cumsum(comparable_counts)])
+    prices = np.round(np.repeat(market_value, comparable_counts) * rng.uniform(0.85, 1.15, offsets[-1]), -2)
+    methods = np.array([m.value for m in ValuationMethod])[rng.integers(0, 5, size)]
+    return ScreeningBatch(
+        assessed_value=np.round(market_value * ratio, 2),
+        estimated_market_value=market_value,
+        valuation_method=methods,
+        tax_rate=np.round(rng.uniform(0.01, 0.03, size), 4),
+        jurisdiction_id=np.array(["default_tx", "collin_county_tx"])[rng.integers(0, 2, size)],
+        priors=PRIORS,
+        comparable_offsets=offsets,
+        comparable_prices=prices,
+        data_quality_score=np.round(rng.uniform(0.4, 1.0, size), 2),
+        market_conditions=np.array(["stable", "improving", "declining", "Volatile"])[rng.integers(0, 4, size)],
+        property_uniqueness=np.round(rng.uniform(0, 1, size), 2),
+        days_since_valuation=rng.integers(0, 800, size),
+        estimated_attorney_fee=np.where(rng.random(size) < 0.5, 0, 1500),
+        min_roi_threshold=np.round(rng.uniform(50, 400, size), 2),
+    )
+
+
+def exact_decision(batch: ScreeningBatch, row: int):
+    confidence = calculate_confidence_band(batch.confidence_input(row))
+    return make_appeal_decision(batch.decision_input(row, confidence)), confidence
+
+
+class TestScreenDecisions:
+    """Test screening against the exact Decimal engine."""
+
+    def test_outcomes_match_exact_engine(self):
+        batch = create_batch()
+        result = screen_decisions(batch)
+
+        assert len(result) == len(batch)
+        assert 100 <= result.flagged.sum() < len(batch) // 2
+        assert set(result.exact) == set(np.flatnonzero(result.flagged).tolist())
+        for row in range(len(batch)):
+            expected, confidence = exact_decision(batch, row)
+            assert result.decisions[row] == expected.decision.value
+            assert result.within_confidence_band[row] == expected.within_confidence_band
+            meets = bool(expected.expected_roi and expected.expected_roi > batch.decision_input(row, confidence).min_roi_threshold)
+            assert result.meets_roi_threshold[row] == meets
+            assert result.assessment_ratio[row] == pytest.approx(float(expected.assessment_ratio), abs=0.006)
+            assert result.lower_bound[row] == pytest.approx(float(confidence.lower_bound), abs=0.01)
+            if row in result.exact:
+                assert result.exact[row] == expected
+
+    def test_threshold_rows_are_flagged(self):
+        batch = create_batch(size=300)
+        result = screen_decisions(batch, verify=False)
+        assert result.flagged[:100].all()
+        assert result.exact == {}
+        assert not result.unverified.any()
+
+    def test_scalar_columns_broadcast(self):
+        batch = ScreeningBatch(
+            assessed_value=[1_400_000, 850_000],
+            estimated_market_value=1_000_000,
+            valuation_method=ValuationMethod.SALES_COMPARISON,
+            tax_rate=Decimal('0.025'),
+            jurisdiction_id="default_tx",
+            priors={"default_tx": PRIORS[0]},
+        )
+        result = screen_decisions(batch)
+        assert result.decisions.tolist() == ["OVER", "UNDER"]
+        assert np.isnan(result.expected_roi).sum() == 0
+        assert batch.confidence_input(0).comparable_sales == []
+
+    def test_invalid_flagged_row_is_unverified(self):
+        # Row 1 sits on the 0.90 threshold with a tax rate the exact engine rejects
+        batch = ScreeningBatch(
+            assessed_value=[900_000, 900_000, 1_400_000],
+            estimated_market_value=1_000_000,
+            valuation_method=ValuationMethod.SALES_COMPARISON,
+            tax_rate=[0.025, 0.25, 0.25],
+            jurisdiction_id="default_tx",
+            priors=PRIORS,
+        )
+        result = screen_decisions(batch)
+
+        assert result.flagged.tolist() == [True, True, False]
+        assert result.unverified.tolist() == [False, True, False]
+        assert set(result.exact) == {0}
+        assert "Tax rate" in result.errors[1]
+        assert result.decisions.tolist() == ["FAIR", "FAIR", "OVER"]
+        # The float outcome is kept
+        assert result.expected_annual_savings[1] == pytest.approx((900_000 - 1_000_000) * 0.25)
+
+    def test_empty_batch(self):
+        batch = ScreeningBatch([], [], [], [], [], PRIORS)
+        assert len(screen_decisions(batch)) == 0
+
+
+class TestScreeningBatchValidation:
+    """Test column validation."""
+
+    def test_unknown_labels(self):
+        with pytest.raises(ValueError, match="valuation_method"):
+            ScreeningBatch([1.0], [1.0], ["guess"], 0.02, "default_tx", PRIORS)
+        with pytest.raises(ValueError, match="jurisdiction_id"):
+            ScreeningBatch([1.0], [1.0], "cost_approach", 0.02, "nowhere", PRIORS)
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError, match="same length"):
+            ScreeningBatch([1.0, 2.0], [1.0], "cost_approach", 0.02, "default_tx", PRIORS)
+
+    def test_bad_offsets(self):
+        with pytest.raises(ValueError, match="comparable_offsets"):
+            ScreeningBatch([1.0], [1.0], "cost_approach", 0.02, "default_tx", PRIORS,
+                           comparable_offsets=[0, 3], comparable_prices=[1.0])
@@ -0,0 +1,156 @@
+"""Tests for shared-memory jurisdiction tables."""
+
+import pickle
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import List
+
+from pydantic import BaseModel
+
+from charly_core_engine import shared_tables
+from charly_core_engine.jurisdiction import JurisdictionPriors
+from charly_core_engine.shared_tables import (
+    PRIOR_FIELDS, SharedJurisdictionTables, _encode_decimal, _field_kinds, attached_tables, init_worker
+)
+
+
+@pytest.fixture
+def jurisdictions(priors):
+    return [
+        priors(appeal_success_rate=Decimal('0.450'), last_revaluation_year=2021),
+        JurisdictionPriors.get_default_priors("CA"),
+        JurisdictionPriors(jurisdiction_id="doña_ana_nm", jurisdiction_name="Doña Ana County, NM", state="NM"),
+    ]
+
+
+TAX_RATES = {
+    "collin_county_tx": {2022: Decimal('0.0231'), 2024: Decimal('0.0215')},
+    "default_ca": {2024: Decimal('0.011')},
+}
+
+
+@pytest.fixture
+def tables(jurisdictions):
+    with SharedJurisdictionTables.create(jurisdictions, TAX_RATES) as tables:
+        yield tables
+
+
+def _worker_lookup(jurisdiction_id):
+    tables = attached_tables()
+    priors = tables[jurisdiction_id]
+    return priors, tables.tax_rate(jurisdiction_id, 2024)
+
+
+def test_priors_round_trip_exactly(tables, jurisdictions):
+    for original in jurisdictions:
+        shared = tables[original.jurisdiction_id]
+        assert shared == original
+        assert str(shared.appeal_success_rate) == str(original.appeal_success_rate)
+    assert tables["default_ca"].last_revaluation_year is None
+    assert tables["collin_county_tx"].last_revaluation_year == 2021
+
+
+def test_mapping_interface(tables):
+    assert len(tables) == 3
+    assert sorted(tables) == ["collin_county_tx", "default_ca", "doña_ana_nm"]
+    assert "default_ca" in tables
+    assert "harris_county_tx" not in tables
+    assert tables.get("harris_county_tx") is None
+    assert tables["collin_county_tx"] is tables["collin_county_tx"]  # Built once per process
+    with pytest.raises(KeyError):
+        tables["harris_county_tx"]
+
+
+def test_single_field_reads(tables):
+    assert tables.value("collin_county_tx", "cod_target") == Decimal('0.15')
+    assert tables.value("doña_ana_nm", "jurisdiction_name") == "Doña Ana County, NM"
+    assert tables.value("default_ca", "uses_market_value") is True
+    assert set(PRIOR_FIELDS) == set(JurisdictionPriors.model_fields)
+    with pytest.raises(KeyError):
+        tables.value("collin_county_tx", "no_such_field")
+
+
+def test_tax_rate_schedule_steps(tables):
+    assert tables.tax_years("collin_county_tx") == [2022, 2024]
+    assert tables.tax_rate("collin_county_tx", 2022) == Decimal('0.0231')
+    assert tables.tax_rate("collin_county_tx", 2023) == Decimal('0.0231')
+    assert tables.tax_rate("collin_county_tx", 2030) == Decimal('0.0215')
+    assert tables.tax_rate("default_ca", 2024) == Decimal('0.011')
+    with pytest.raises(KeyError):
+        tables.tax_rate("collin_county_tx", 2021)
+    with pytest.raises(KeyError):
+        tables.tax_rate("doña_ana_nm", 2024)
+
+
+def test_attached_view_is_read_only_and_shares_memory(tables):
+    attached = SharedJurisdictionTables.attach(pickle.loads(pickle.dumps(tables.handle)))
+    try:
+        assert attached["collin_county_tx"] == tables["collin_county_tx"]
+        assert not attached._priors.flags.writeable
+        with pytest.raises(ValueError):
+            attached._priors["cod_target"][0] = 1
+        with pytest.raises(RuntimeError):
+            attached.unlink()
+    finally:
+        attached.close()
+
+
+def test_workers_attach_without_pickling_priors(tables):
+    with ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(tables.handle,)) as pool:
+        results = list(pool.map(_worker_lookup, ["collin_county_tx", "default_ca"]))
+
+    assert results[0] == (tables["collin_county_tx"], Decimal('0.0215'))
+    assert results[1] == (tables["default_ca"], Decimal('0.011'))
+
+
+def test_duplicate_ids_are_rejected(jurisdictions):
+    with pytest.raises(ValueError, match="Duplicate"):
+        SharedJurisdictionTables.create(jurisdictions + jurisdictions[:1])
+
+
+def test_priors_mapping_is_accepted(jurisdictions):
+    priors = {p.jurisdiction_id: p for p in jurisdictions}
+    with SharedJurisdictionTables.create(priors) as tables:
+        assert sorted(tables) == sorted(priors)
+        assert tables.tax_years("collin_county_tx") == []
+        assert tables.nbytes == tables.handle.size
+
+
+def test_unencodable_rate_releases_segment(jurisdictions):
+    with pytest.raises(ValueError, match="out of range"):
+        SharedJurisdictionTables.create(jurisdictions, {"default_ca": {2024: Decimal('1E+200')}})
+
+
+def test_decimal_encoding_limits():
+    assert _encode_decimal(Decimal('0.450')) == (450, -3)
+    with pytest.raises(ValueError, match="non-finite"):
+        _encode_decimal(Decimal('NaN'))
+    with pytest.raises(ValueError, match="out of range"):
+        _encode_decimal(Decimal(2) ** 70)
+
+
+def test_unsupported_field_types_are_rejected():
+    class Unsupported(BaseModel):
+        tags: List[str]
+
+    with pytest.raises(TypeError, match="Unsupported.tags"):
+        _field_kinds(Unsupported)
+
+
+def test_unknown_jurisdiction_value(tables):
+    with pytest.raises(KeyError):
+        tables.value("harris_county_tx", "cod_target")
+
+
+def test_init_worker_in_process(tables, monkeypatch):
+    monkeypatch.setattr(shared_tables, "_attached", None)
+    with pytest.raises(RuntimeError, match="init_worker"):
+        attached_tables()
+    init_worker(tables.handle)
+    attached = attached_tables()
+    try:
+        assert attached["default_ca"] == tables["default_ca"]
+        assert not attached.owner
+    finally:
+        attached.close()
@@ -0,0 +1,63 @@
+"""
+Cold-start import cost of charly_finance, from `python -X importtime`.
+
+Run from the package root:
+
+    python -m benchmarks.bench_import [--repeat R]
+
+Each case runs in R fresh interpreters; the import work spent in
+charly_finance's own modules (self time, excluding pydantic and
+charly_core_engine) is reported as the best of those runs next to its
+budget. Exits non-zero when a case is over budget.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict
+
+PACKAGE = "charly_finance"
+
+# (statement, budget in microseconds of the package's own import work).
+# Lazy exports load through importlib, which -X importtime does not report,
+# so the calculator case imports the submodules they resolve to directly.
+CASES = [
+    ("import charly_finance", 10_000),
+    ("import charly_finance.noi, charly_finance.cap_rate, charly_finance.tax_savings", 30_000),
+]
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    """Self time (us) per module imported by `statement` in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(self_us)
+    return timings
+
+
+def own_cost_us(statement: str) -> int:
+    return sum(us for name, us in import_times(statement).items() if name.split(".")[0] == PACKAGE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    over_budget = False
+    for statement, budget_us in CASES:
+        best_us = min(own_cost_us(statement) for _ in range(args.repeat))
+        status = "ok" if best_us <= budget_us else "OVER BUDGET"
+        over_budget |= best_us > budget_us
+        print(f"{statement:80s} {best_us:7d} us / {budget_us:7d} us  {status}")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Construction and serialization cost of the finance pydantic models.
+
+Run from the package root:
+
+    python -m benchmarks.bench_models [--number N] [--repeat R]
+
+Inputs are validated from plain dicts of strings and floats (as they arrive
+from the API); results are serialized with model_dump_json and
+model_dump(mode="json"). Reports the best per-call time over R rounds of N
+calls.
+"""
+
+import argparse
+import timeit
+
+from charly_finance.cap_rate import CapRateInput, calculate_cap_rate
+from charly_finance.noi import NOIInput, NOIResult, calculate_noi
+from charly_finance.tax_savings import TaxSavingsInput, calculate_tax_savings
+
+NOI = {
+    "gross_rental_income": "250000",
+    "vacancy_rate": 0.07,
+    "other_income": 12000,
+    "property_taxes": "31000.50",
+    "insurance": 8200.0,
+    "maintenance": "15000",
+    "management_fees": 12500,
+}
+
+CAP_RATE = {"net_operating_income": "180000", "target_cap_rate": 0.075}
+
+TAX_SAVINGS = {
+    "current_assessed_value": "1250000",
+    "proposed_assessed_value": 1000000.0,
+    "tax_rate": "25.5",
+    "filing_fee": 450,
+    "attorney_fee": "2800",
+    "years_of_savings": 3,
+}
+
+
+def best_per_call_us(func, number: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    noi = calculate_noi(NOIInput(**NOI))
+    cap_rate = calculate_cap_rate(CapRateInput(**CAP_RATE))
+    savings = calculate_tax_savings(TaxSavingsInput(**TAX_SAVINGS))
+
+    cases = [
+        ("NOIInput(**dict)", lambda: NOIInput(**NOI)),
+        ("CapRateInput(**dict)", lambda: CapRateInput(**CAP_RATE)),
+        ("TaxSavingsInput(**dict)", lambda: TaxSavingsInput(**TAX_SAVINGS)),
+        ("NOIResult.model_dump_json", noi.model_dump_json),
+        ("CapRateResult.model_dump_json", cap_rate.model_dump_json),
+        ("TaxSavingsResult.model_dump_json", savings.model_dump_json),
+        ("TaxSavingsResult.model_dump(json)", lambda: savings.model_dump(mode="json")),
+        ("NOIResult.model_validate", lambda: NOIResult.model_validate(noi.model_dump())),
+    ]
+    for name, func in cases:
+        print(f"{name:34s} {best_per_call_us(func, args.number, args.repeat):8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
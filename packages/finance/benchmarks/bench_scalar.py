@@ -0,0 +1,63 @@
+"""
+Scalar throughput of the finance calculators.
+
+Run from the package root:
+
+    python -m benchmarks.bench_scalar [--number N] [--repeat R]
+
+Prints the best per-call time over R rounds of N calls for calculate_noi,
+calculate_cap_rate (both modes) and calculate_tax_savings.
+"""
+
+import argparse
+import timeit
+from decimal import Decimal
+
+from charly_finance.cap_rate import CapRateInput, calculate_cap_rate
+from charly_finance.noi import NOIInput, calculate_noi
+from charly_finance.tax_savings import TaxSavingsInput, calculate_tax_savings
+
+
+def build_cases():
+    noi_input = NOIInput(
+        gross_rental_income=Decimal('1200000'),
+        vacancy_rate=Decimal('0.07'),
+        other_income=Decimal('35000'),
+        property_taxes=Decimal('145000'),
+        insurance=Decimal('28000'),
+        maintenance=Decimal('62000'),
+        utilities=Decimal('41000'),
+        management_fees=Decimal('48000'),
+        other_expenses=Decimal('12500'),
+    )
+    cap_rate_input = CapRateInput(net_operating_income=Decimal('750000'), property_value=Decimal('10500000'))
+    implied_value_input = CapRateInput(net_operating_income=Decimal('750000'), target_cap_rate=Decimal('0.0675'))
+    tax_savings_input = TaxSavingsInput(
+        current_assessed_value=Decimal('12000000'),
+        proposed_assessed_value=Decimal('10500000'),
+        tax_rate=Decimal('24.5'),
+        filing_fee=Decimal('500'),
+        attorney_fee=Decimal('7500'),
+        years_of_savings=3,
+    )
+    return [
+        ("calculate_noi", lambda: calculate_noi(noi_input)),
+        ("calculate_cap_rate (rate)", lambda: calculate_cap_rate(cap_rate_input)),
+        ("calculate_cap_rate (value)", lambda: calculate_cap_rate(implied_value_input)),
+        ("calculate_tax_savings", lambda: calculate_tax_savings(tax_savings_input)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, func in build_cases():
+        per_call = min(timeit.repeat(func, number=args.number, repeat=args.repeat)) / args.number
+        print(f"{name:28s} {per_call * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,35 @@
 """CHARLY Finance - Property tax appeal financial calculations."""
 
-from .noi import calculate_noi, NOIInput, NOIResult
-from .cap_rate import calculate_cap_rate, CapRateInput, CapRateResult
-from .tax_savings import calculate_tax_savings, TaxSavingsInput, TaxSavingsResult
-
-__all__ = [
-    "calculate_noi", "NOIInput", "NOIResult",
-    "calculate_cap_rate", "CapRateInput", "CapRateResult", 
-    "calculate_tax_savings", "TaxSavingsInput", "TaxSavingsResult"
-]
\ No newline at end of file
+from importlib import import_module
+
+# Public name -> defining submodule, imported on first attribute access.
+_EXPORTS = {
+    "calculate_noi": ".noi",
+    "NOIInput": ".noi",
+    "NOIResult": ".noi",
+    "calculate_cap_rate": ".cap_rate",
+    "CapRateInput": ".cap_rate",
+    "CapRateResult": ".cap_rate",
+    "calculate_tax_savings": ".tax_savings",
+    "TaxSavingsInput": ".tax_savings",
+    "TaxSavingsResult": ".tax_savings",
+    "ColumnValidationReport": ".column_validation",
+    "validate_noi_columns": ".column_validation",
+    "validate_cap_rate_columns": ".column_validation",
+    "validate_tax_savings_columns": ".column_validation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,30 +1,49 @@
 """Cap rate calculations for commercial property valuation."""
 
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Optional
-from pydantic import BaseModel, Field, validator
+from decimal import Decimal
+from typing import Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from charly_core_engine.decimal_fields import CoercedDecimal, JsonDecimal
+from charly_core_engine.rounding import BASIS_POINTS, half_up, round_currency
+
+
+# Quality label by cap rate band, lowest first. Each entry is
+# (limit, inclusive, label); rates above the last limit are "VERY_HIGH".
+CAP_RATE_QUALITY_BANDS: Tuple[Tuple[Decimal, bool, str], ...] = (
+    (Decimal('0.02'), False, "VERY_LOW"),   # < 2%
+    (Decimal('0.04'), False, "LOW"),        # 2-4%
+    (Decimal('0.12'), True, "REASONABLE"),  # 4-12%
+    (Decimal('0.20'), True, "HIGH"),        # 12-20%
+)
+
+_round_percentage = half_up(BASIS_POINTS)  # 4 decimal places for percentages
+
+
+def _cap_rate_quality(cap_rate: Decimal) -> str:
+    for limit, inclusive, label in CAP_RATE_QUALITY_BANDS:
+        if cap_rate < limit or (inclusive and cap_rate == limit):
+            return label
+    return "VERY_HIGH"
 
 
 class CapRateInput(BaseModel):
     """Input data for cap rate calculation."""
     
-    net_operating_income: Decimal = Field(..., description="Annual NOI")
-    property_value: Optional[Decimal] = Field(None, ge=0, description="Property value (if calculating cap rate)")
-    target_cap_rate: Optional[Decimal] = Field(None, gt=0, le=1, description="Target cap rate (if calculating value)")
+    net_operating_income: CoercedDecimal = Field(..., description="Annual NOI")
+    property_value: Optional[CoercedDecimal] = Field(None, ge=0, description="Property value (if calculating cap rate)")
+    target_cap_rate: Optional[CoercedDecimal] = Field(None, gt=0, le=1, description="Target cap rate (if calculating value)")
     
-    @validator("target_cap_rate")
+    model_config = ConfigDict(defer_build=True)
+
+    @field_validator("target_cap_rate")
+    @classmethod
     def validate_cap_rate(cls, v):
         if v is not None and (v <= 0 or v > 0.5):  # 0% to 50% reasonable range
             raise ValueError("Cap rate must be between 0% and 50%")
         return v
-        
-    @validator("*", pre=True)
-    def convert_to_decimal(cls, v):
-        if isinstance(v, (int, float, str)):
-            return Decimal(str(v))
-        return v
-    
-    @validator("net_operating_income")
+
+    @field_validator("net_operating_income")
+    @classmethod
     def validate_noi(cls, v):
         # Allow negative NOI for analysis but warn about it in results
         return v
@@ -33,18 +52,15 @@ class CapRateInput(BaseModel):
 class CapRateResult(BaseModel):
     """Result of cap rate calculation."""
     
-    cap_rate: Optional[Decimal] = Field(None, description="Calculated cap rate")
-    implied_value: Optional[Decimal] = Field(None, description="Value implied by NOI and target cap rate")
-    noi_used: Decimal = Field(..., description="NOI used in calculation")
+    cap_rate: Optional[JsonDecimal] = Field(None, description="Calculated cap rate")
+    implied_value: Optional[JsonDecimal] = Field(None, description="Value implied by NOI and target cap rate")
+    noi_used: JsonDecimal = Field(..., description="NOI used in calculation")
     
     # Analysis flags
     negative_noi_warning: bool = Field(False, description="True if NOI was negative")
     cap_rate_quality: str = Field(..., description="Assessment of cap rate reasonableness")
     
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
+    model_config = ConfigDict(defer_build=True)
 
 
 def calculate_cap_rate(input_data: CapRateInput) -> CapRateResult:
@@ -71,12 +87,6 @@ def calculate_cap_rate(input_data: CapRateInput) -> CapRateResult:
     
     negative_noi_warning = input_data.net_operating_income < 0
     
-    def round_currency(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    
-    def round_percentage(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)  # 4 decimal places for percentages
-    
     # Calculate cap rate from property value
     if input_data.property_value is not None:
         if input_data.property_value == 0:
@@ -87,19 +97,11 @@ def calculate_cap_rate(input_data: CapRateInput) -> CapRateResult:
         # Assess cap rate quality
         if negative_noi_warning:
             quality = "NEGATIVE_NOI"
-        elif cap_rate < Decimal('0.02'):  # < 2%
-            quality = "VERY_LOW"
-        elif cap_rate < Decimal('0.04'):  # 2-4%
-            quality = "LOW" 
-        elif cap_rate <= Decimal('0.12'):  # 4-12%
-            quality = "REASONABLE"
-        elif cap_rate <= Decimal('0.20'):  # 12-20%
-            quality = "HIGH"
-        else:  # > 20%
-            quality = "VERY_HIGH"
+        else:
+            quality = _cap_rate_quality(cap_rate)
             
         return CapRateResult(
-            cap_rate=round_percentage(cap_rate),
+            cap_rate=_round_percentage(cap_rate),
             implied_value=None,
             noi_used=round_currency(input_data.net_operating_income),
             negative_noi_warning=negative_noi_warning,
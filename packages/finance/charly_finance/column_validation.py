@@ -0,0 +1,95 @@
+"""Column-wise validation of batch finance inputs.
+
+Validating a roll by building NOIInput, CapRateInput or TaxSavingsInput per
+row stops at the first bad row and pays for an exception on every
+failure. `validate_noi_columns`, `validate_cap_rate_columns` and
+`validate_tax_savings_columns` check the same constraints over whole
+numpy columns in one pass: a mask of valid rows plus a compact error
+table of (row, rule) pairs, each rule carrying pydantic's error type,
+location and message.
+
+The checks are core-engine's validate_model_columns: bounds, defaults and
+required fields are read from the model fields, and the models' field
+validators are mirrored in FIELD_CHECKS. Each field of a row reports at
+most its first failure, as in pydantic. None marks a value the row did not
+supply: the field default applies, or a `missing` error if the field is
+required.
+"""
+
+from typing import Mapping, Tuple
+
+from charly_core_engine.column_validation import (
+    Check, ColumnLike, ColumnValidationReport, ErrorRule, validate_model_columns
+)
+
+from .cap_rate import CapRateInput
+from .noi import NOIInput
+from .tax_savings import TaxSavingsInput
+
+
+# Mirrors of the models' field validators: model -> field -> (bad-value predicate, message)
+FIELD_CHECKS: Mapping[type, Mapping[str, Tuple[Check, ...]]] = {
+    NOIInput: {
+        "vacancy_rate": ((lambda v: v > 0.5, "Vacancy rate cannot exceed 50%"),),
+    },
+    CapRateInput: {
+        "target_cap_rate": ((lambda v: (v <= 0) | (v > 0.5), "Cap rate must be between 0% and 50%"),),
+    },
+    TaxSavingsInput: {
+        # tax_rate_per_thousand is declared after tax_rate, so the model's
+        # validator always sees its default (True) and the per-$1000 message
+        "tax_rate": ((lambda v: v > 200, "Tax rate per $1000 seems too high (>$200)"),),
+    },
+}
+
+
+def validate_noi_columns(columns: Mapping[str, ColumnLike]) -> ColumnValidationReport:
+    """
+    Validate NOIInput fields column-wise.
+
+    Args:
+        columns: NOIInput fields by name, one value per row or a scalar for
+            every row; absent optional fields take their defaults
+
+    Returns:
+        ColumnValidationReport with the valid-row mask and error table
+
+    Raises:
+        ValueError: If columns are misaligned or a required column is absent
+    """
+    return validate_model_columns(NOIInput, columns, FIELD_CHECKS[NOIInput])
+
+
+def validate_cap_rate_columns(columns: Mapping[str, ColumnLike]) -> ColumnValidationReport:
+    """
+    Validate CapRateInput fields column-wise.
+
+    Only field constraints are checked; providing exactly one of
+    property_value and target_cap_rate is enforced by calculate_cap_rate.
+
+    Args:
+        columns: CapRateInput fields by name, one value per row or a scalar
+
+    Returns:
+        ColumnValidationReport with the valid-row mask and error table
+
+    Raises:
+        ValueError: If columns are misaligned or a required column is absent
+    """
+    return validate_model_columns(CapRateInput, columns, FIELD_CHECKS[CapRateInput])
+
+
+def validate_tax_savings_columns(columns: Mapping[str, ColumnLike]) -> ColumnValidationReport:
+    """
+    Validate the numeric TaxSavingsInput fields column-wise.
+
+    Args:
+        columns: TaxSavingsInput fields by name, one value per row or a scalar
+
+    Returns:
+        ColumnValidationReport with the valid-row mask and error table
+
+    Raises:
+        ValueError: If columns are misaligned or a required column is absent
+    """
+    return validate_model_columns(TaxSavingsInput, columns, FIELD_CHECKS[TaxSavingsInput])
@@ -1,53 +1,49 @@
 """Net Operating Income calculations for commercial properties."""
 
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from typing import Dict, List, Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from charly_core_engine.decimal_fields import CoercedDecimal, JsonDecimal
+from charly_core_engine.rounding import round_currency
 
 
 class NOIInput(BaseModel):
     """Input data for NOI calculation."""
     
-    gross_rental_income: Decimal = Field(..., ge=0, description="Annual gross rental income")
-    vacancy_rate: Decimal = Field(0.05, ge=0, le=1, description="Vacancy rate as decimal (default 5%)")
-    other_income: Decimal = Field(0, ge=0, description="Other income (parking, laundry, etc)")
+    gross_rental_income: CoercedDecimal = Field(..., ge=0, description="Annual gross rental income")
+    vacancy_rate: CoercedDecimal = Field(Decimal('0.05'), ge=0, le=1, description="Vacancy rate as decimal (default 5%)")
+    other_income: CoercedDecimal = Field(Decimal('0'), ge=0, description="Other income (parking, laundry, etc)")
     
     # Operating expenses
-    property_taxes: Decimal = Field(0, ge=0, description="Annual property taxes")
-    insurance: Decimal = Field(0, ge=0, description="Annual insurance costs")
-    maintenance: Decimal = Field(0, ge=0, description="Annual maintenance costs")
-    utilities: Decimal = Field(0, ge=0, description="Annual utility costs")
-    management_fees: Decimal = Field(0, ge=0, description="Annual management fees")
-    other_expenses: Decimal = Field(0, ge=0, description="Other operating expenses")
+    property_taxes: CoercedDecimal = Field(Decimal('0'), ge=0, description="Annual property taxes")
+    insurance: CoercedDecimal = Field(Decimal('0'), ge=0, description="Annual insurance costs")
+    maintenance: CoercedDecimal = Field(Decimal('0'), ge=0, description="Annual maintenance costs")
+    utilities: CoercedDecimal = Field(Decimal('0'), ge=0, description="Annual utility costs")
+    management_fees: CoercedDecimal = Field(Decimal('0'), ge=0, description="Annual management fees")
+    other_expenses: CoercedDecimal = Field(Decimal('0'), ge=0, description="Other operating expenses")
     
-    @validator("vacancy_rate")
+    model_config = ConfigDict(defer_build=True)
+
+    @field_validator("vacancy_rate")
+    @classmethod
     def validate_vacancy_rate(cls, v):
         if v > 0.5:  # 50% vacancy seems unrealistic for analysis
             raise ValueError("Vacancy rate cannot exceed 50%")
         return v
-    
-    @validator("*", pre=True)
-    def convert_to_decimal(cls, v):
-        if isinstance(v, (int, float, str)):
-            return Decimal(str(v))
-        return v
 
 
 class NOIResult(BaseModel):
     """Result of NOI calculation."""
     
-    effective_gross_income: Decimal = Field(..., description="Gross income minus vacancy")
-    total_operating_expenses: Decimal = Field(..., description="Sum of all operating expenses")
-    net_operating_income: Decimal = Field(..., description="EGI minus operating expenses")
+    effective_gross_income: JsonDecimal = Field(..., description="Gross income minus vacancy")
+    total_operating_expenses: JsonDecimal = Field(..., description="Sum of all operating expenses")
+    net_operating_income: JsonDecimal = Field(..., description="EGI minus operating expenses")
     
     # Breakdown for transparency
-    vacancy_loss: Decimal = Field(..., description="Income lost to vacancy")
-    expense_breakdown: Dict[str, Decimal] = Field(..., description="Detailed expense breakdown")
+    vacancy_loss: JsonDecimal = Field(..., description="Income lost to vacancy")
+    expense_breakdown: Dict[str, JsonDecimal] = Field(..., description="Detailed expense breakdown")
     
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
+    model_config = ConfigDict(defer_build=True)
 
 
 def calculate_noi(input_data: NOIInput) -> NOIResult:
@@ -92,10 +88,6 @@ def calculate_noi(input_data: NOIInput) -> NOIResult:
     if net_operating_income < -effective_gross_income:
         raise ValueError("Operating expenses exceed 200% of effective gross income - please verify inputs")
     
-    # Round to nearest cent
-    def round_currency(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    
     return NOIResult(
         effective_gross_income=round_currency(effective_gross_income),
         total_operating_expenses=round_currency(total_operating_expenses),
@@ -1,68 +1,70 @@
 """Property tax savings calculations for appeals."""
 
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from typing import Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+from charly_core_engine.decimal_fields import CoercedDecimal, JsonDecimal
+from charly_core_engine.rounding import CENTS, half_up, round_currency
+
+
+_PER_THOUSAND = Decimal('1000')
+
+_round_percentage = half_up(CENTS)
 
 
 class TaxSavingsInput(BaseModel):
     """Input data for tax savings calculation."""
     
-    current_assessed_value: Decimal = Field(..., gt=0, description="Current assessed value")
-    proposed_assessed_value: Decimal = Field(..., gt=0, description="Proposed/target assessed value")
-    tax_rate: Decimal = Field(..., gt=0, description="Tax rate per $1000 or mill rate")
+    current_assessed_value: CoercedDecimal = Field(..., gt=0, description="Current assessed value")
+    proposed_assessed_value: CoercedDecimal = Field(..., gt=0, description="Proposed/target assessed value")
+    tax_rate: CoercedDecimal = Field(..., gt=0, description="Tax rate per $1000 or mill rate")
     tax_rate_per_thousand: bool = Field(True, description="True if tax rate is per $1000, False if mill rate")
     
     # Appeal costs and timeline
-    filing_fee: Decimal = Field(0, ge=0, description="Appeal filing fee")
-    attorney_fee: Decimal = Field(0, ge=0, description="Attorney/consultant fee")
-    other_costs: Decimal = Field(0, ge=0, description="Other appeal-related costs")
+    filing_fee: CoercedDecimal = Field(Decimal('0'), ge=0, description="Appeal filing fee")
+    attorney_fee: CoercedDecimal = Field(Decimal('0'), ge=0, description="Attorney/consultant fee")
+    other_costs: CoercedDecimal = Field(Decimal('0'), ge=0, description="Other appeal-related costs")
     years_of_savings: int = Field(1, ge=1, le=10, description="Years to calculate savings for")
     
-    @validator("proposed_assessed_value")
-    def validate_proposed_value(cls, v, values):
+    model_config = ConfigDict(defer_build=True)
+
+    @field_validator("proposed_assessed_value")
+    @classmethod
+    def validate_proposed_value(cls, v):
         # Allow increases for "Under" scenarios but flag them
         return v
     
-    @validator("tax_rate")
-    def validate_tax_rate(cls, v, values):
-        rate_type = values.get("tax_rate_per_thousand", True)
+    @field_validator("tax_rate")
+    @classmethod
+    def validate_tax_rate(cls, v, info: ValidationInfo):
+        rate_type = info.data.get("tax_rate_per_thousand", True)
         if rate_type and v > 200:  # $200 per $1000 seems unrealistic
             raise ValueError("Tax rate per $1000 seems too high (>$200)")
         elif not rate_type and v > 200:  # 200 mills = 20% also unrealistic
             raise ValueError("Mill rate seems too high (>200 mills)")
         return v
-        
-    @validator("*", pre=True)  
-    def convert_to_decimal(cls, v):
-        if isinstance(v, (int, float, str)):
-            return Decimal(str(v))
-        return v
 
 
 class TaxSavingsResult(BaseModel):
     """Result of tax savings calculation."""
     
-    annual_tax_current: Decimal = Field(..., description="Current annual tax")
-    annual_tax_proposed: Decimal = Field(..., description="Proposed annual tax")
-    annual_savings: Decimal = Field(..., description="Annual tax savings")
+    annual_tax_current: JsonDecimal = Field(..., description="Current annual tax")
+    annual_tax_proposed: JsonDecimal = Field(..., description="Proposed annual tax")
+    annual_savings: JsonDecimal = Field(..., description="Annual tax savings")
     
-    total_appeal_costs: Decimal = Field(..., description="Total costs to appeal")
-    net_first_year_savings: Decimal = Field(..., description="First year savings minus costs")
-    cumulative_savings: Decimal = Field(..., description="Total savings over specified years")
+    total_appeal_costs: JsonDecimal = Field(..., description="Total costs to appeal")
+    net_first_year_savings: JsonDecimal = Field(..., description="First year savings minus costs")
+    cumulative_savings: JsonDecimal = Field(..., description="Total savings over specified years")
     
     # Analysis metrics
-    payback_period_years: Optional[Decimal] = Field(None, description="Years to recoup appeal costs")
-    roi_percentage: Optional[Decimal] = Field(None, description="ROI as percentage") 
+    payback_period_years: Optional[JsonDecimal] = Field(None, description="Years to recoup appeal costs")
+    roi_percentage: Optional[JsonDecimal] = Field(None, description="ROI as percentage") 
     
     # Flags for decision making
     value_increase_warning: bool = Field(False, description="True if proposed value is higher")
     negative_savings_warning: bool = Field(False, description="True if appeal would increase taxes")
     
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
+    model_config = ConfigDict(defer_build=True)
 
 
 def calculate_tax_savings(input_data: TaxSavingsInput) -> TaxSavingsResult:
@@ -75,18 +77,12 @@ def calculate_tax_savings(input_data: TaxSavingsInput) -> TaxSavingsResult:
     Returns:
         TaxSavingsResult with calculated savings and metrics
     """
-    def round_currency(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    
-    def round_percentage(value: Decimal) -> Decimal:
-        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    
     # Calculate effective tax rate (convert to decimal)
     if input_data.tax_rate_per_thousand:
-        effective_rate = input_data.tax_rate / Decimal('1000')
+        effective_rate = input_data.tax_rate / _PER_THOUSAND
     else:
         # Mill rate: 1 mill = $1 per $1000 of value
-        effective_rate = input_data.tax_rate / Decimal('1000')
+        effective_rate = input_data.tax_rate / _PER_THOUSAND
     
     # Calculate annual taxes
     annual_tax_current = input_data.current_assessed_value * effective_rate
@@ -119,7 +115,7 @@ def calculate_tax_savings(input_data: TaxSavingsInput) -> TaxSavingsResult:
         # ROI = (Total Benefit - Total Cost) / Total Cost
         total_benefit = annual_savings * input_data.years_of_savings
         roi = ((total_benefit - total_appeal_costs) / total_appeal_costs) * 100
-        roi_percentage = round_percentage(roi)
+        roi_percentage = _round_percentage(roi)
     
     return TaxSavingsResult(
         annual_tax_current=round_currency(annual_tax_current),
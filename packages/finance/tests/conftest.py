@@ -0,0 +1,28 @@
+"""Shared test fixtures."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def modules_loaded_by():
+    """
+    Names in sys.modules after running a statement in a fresh interpreter.
+
+    Which modules an import pulls in is deterministic, unlike how long it
+    takes, so lazy-import guarantees can be asserted without timing budgets
+    (benchmarks/bench_import.py reports those).
+    """
+    def run(statement: str) -> frozenset:
+        script = f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True,
+        )
+        return frozenset(completed.stdout.split())
+    return run
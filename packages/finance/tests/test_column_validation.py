@@ -0,0 +1,141 @@
+"""Tests for column-wise validation of finance inputs."""
+
+import random
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from charly_finance.cap_rate import CapRateInput
+from charly_finance.column_validation import (
+    FIELD_CHECKS, ErrorRule, validate_cap_rate_columns, validate_noi_columns, validate_tax_savings_columns
+)
+from charly_finance.noi import NOIInput
+from charly_finance.tax_savings import TaxSavingsInput
+
+
+NUMBERS = [100_000, 0, -1, 0.05, 0.5, 0.50000000000000001, 0.51, 1, 1.5, 3.0, 3.5, 11, 200, 201,
+           "2.5", " 7 ", "3.0", "1e3", "abc", "NaN", float("nan"), None]
+
+
+def pydantic_errors(model, **fields):
+    """(type, loc, msg) of each error constructing `model`; None marks an absent field."""
+    try:
+        model(**{name: value for name, value in fields.items() if value is not None})
+    except ValidationError as e:
+        return [(error["type"], error["loc"], error["msg"]) for error in e.errors()]
+    return []
+
+
+@pytest.mark.parametrize("model, validate, names", [
+    (NOIInput, validate_noi_columns, ["gross_rental_income", "vacancy_rate", "other_income", "insurance"]),
+    (CapRateInput, validate_cap_rate_columns, ["net_operating_income", "property_value", "target_cap_rate"]),
+    (TaxSavingsInput, validate_tax_savings_columns,
+     ["current_assessed_value", "proposed_assessed_value", "tax_rate", "filing_fee", "years_of_savings"]),
+])
+def test_matches_models(model, validate, names):
+    rng = random.Random(17)
+    rows = [{name: rng.choice(NUMBERS) for name in names} for _ in range(1500)]
+    for row in rows[::3]:  # Keep required fields present often enough to see later errors
+        row[names[0]] = 1000
+
+    report = validate({name: [row[name] for row in rows] for name in names})
+
+    for i, row in enumerate(rows):
+        expected = pydantic_errors(model, **row)
+        assert [(e["type"], e["loc"], e["msg"]) for e in report.errors(i)] == expected
+    assert 0 < report.valid.sum() < len(rows)
+
+
+# Smallest valid rows, so a probed field's own errors are the only ones
+VALID_ROWS = {
+    NOIInput: {"gross_rental_income": 120_000},
+    CapRateInput: {"net_operating_income": 50_000},
+    TaxSavingsInput: {"current_assessed_value": 1_000_000, "proposed_assessed_value": 900_000, "tax_rate": 25},
+}
+VALIDATORS = {NOIInput: validate_noi_columns, CapRateInput: validate_cap_rate_columns,
+              TaxSavingsInput: validate_tax_savings_columns}
+PROBES = [-1, 0, 1e-9, 0.05, 0.4999999, 0.5, 0.5000001, 0.51, 1, 25, 199.99, 200, 200.01, 1e6]
+
+
+@pytest.mark.parametrize("model, name", [
+    (model, name) for model, fields in FIELD_CHECKS.items() for name in fields
+], ids=lambda value: getattr(value, "__name__", value))
+def test_field_checks_mirror_model_validators(model, name):
+    """Every FIELD_CHECKS rule fails exactly the values the model's own validator rejects."""
+    report = VALIDATORS[model]({**VALID_ROWS[model], name: PROBES})
+
+    rejected = 0
+    for i, value in enumerate(PROBES):
+        expected = pydantic_errors(model, **{**VALID_ROWS[model], name: value})
+        assert [(e["type"], e["loc"], e["msg"]) for e in report.errors(i)] == expected
+        rejected += any(error[0] == "value_error" for error in expected)
+    assert 0 < rejected < len(PROBES)
+
+
+class TestColumnValidation:
+    """Test the vectorized paths and the report."""
+
+    def test_noi_columns(self):
+        report = validate_noi_columns({
+            "gross_rental_income": np.array([120_000.0, 90_000.0, -5.0]),
+            "vacancy_rate": np.array([0.05, 0.6, 0.05]),
+            "insurance": 4_000,
+        })
+
+        assert report.valid.tolist() == [True, False, False]
+        assert report.valid_rows.tolist() == [0]
+        assert report.invalid_rows.tolist() == [1, 2]
+        assert report.errors(1) == [
+            {"type": "value_error", "loc": ("vacancy_rate",), "msg": "Value error, Vacancy rate cannot exceed 50%"},
+        ]
+        assert [(row, rule.type) for row, rule in report.iter_errors()] == [(1, "value_error"), (2, "greater_than_equal")]
+        assert report.summary()[ErrorRule(("vacancy_rate",), "value_error", "Value error, Vacancy rate cannot exceed 50%")] == 1
+
+    def test_optional_columns(self):
+        report = validate_cap_rate_columns({
+            "net_operating_income": [50_000, -10_000, 50_000],
+            "property_value": [None, 500_000, None],
+            "target_cap_rate": [0.08, None, 0.75],
+        })
+
+        assert report.valid.tolist() == [True, True, False]
+        assert report.errors(2)[0]["msg"] == "Value error, Cap rate must be between 0% and 50%"
+
+    def test_string_columns(self):
+        report = validate_tax_savings_columns({
+            "current_assessed_value": np.array(["1000000", "1e6", "1e6"]),
+            "proposed_assessed_value": 800_000,
+            "tax_rate": np.array(["25.5", "250", "25"]),
+            "years_of_savings": np.array(["3", "3", "99999999999999999999"]),
+        })
+
+        assert report.valid.tolist() == [True, False, False]
+        assert report.errors(1)[0]["msg"] == "Value error, Tax rate per $1000 seems too high (>$200)"
+        assert [e["type"] for e in report.errors(2)] == ["less_than_equal"]
+
+    def test_missing_values(self):
+        report = validate_noi_columns({"gross_rental_income": [None, 1.0], "vacancy_rate": None})
+
+        assert report.errors(0) == [{"type": "missing", "loc": ("gross_rental_income",), "msg": "Field required"}]
+        assert report.valid[1]
+
+    def test_large_batch(self):
+        size = 200_000
+        vacancy = np.random.default_rng(3).uniform(0, 0.7, size)
+
+        report = validate_noi_columns({"gross_rental_income": 100_000.0, "vacancy_rate": vacancy})
+
+        assert np.array_equal(report.valid, vacancy <= 0.5)
+        assert len(report.rules) == 1
+
+    def test_empty_batch(self):
+        report = validate_cap_rate_columns({"net_operating_income": []})
+        assert len(report) == 0
+        assert report.summary() == {}
+
+    def test_structural_errors(self):
+        with pytest.raises(ValueError, match="net_operating_income"):
+            validate_cap_rate_columns({"property_value": [1.0]})
+        with pytest.raises(ValueError, match="same length"):
+            validate_noi_columns({"gross_rental_income": [1.0, 2.0], "vacancy_rate": [0.1]})
@@ -0,0 +1,34 @@
+"""Import-cost checks: which modules a cold import loads."""
+
+import pytest
+
+import charly_finance
+
+
+class TestImportCost:
+    """Keep cold-start imports lazy."""
+
+    def test_bare_import_is_lazy(self, modules_loaded_by):
+        loaded = modules_loaded_by("import charly_finance")
+        assert "charly_finance" in loaded
+        assert not {"pydantic", "numpy", "charly_finance.noi"} & loaded
+
+    def test_calculators_skip_column_validation(self, modules_loaded_by):
+        loaded = modules_loaded_by(
+            "from charly_finance import calculate_noi, calculate_cap_rate, calculate_tax_savings"
+        )
+        assert {"charly_finance.noi", "charly_finance.cap_rate", "charly_finance.tax_savings"} <= loaded
+        assert not {"numpy", "charly_finance.column_validation"} & loaded
+
+
+class TestLazyExports:
+    """Test module-level __getattr__ exports."""
+
+    def test_all_exports_resolve(self):
+        for name in charly_finance.__all__:
+            assert getattr(charly_finance, name) is not None
+        assert set(charly_finance.__all__) <= set(dir(charly_finance))
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError, match="not_a_thing"):
+            charly_finance.not_a_thing
@@ -0,0 +1,185 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from charly_core_engine.confidence import ConfidenceInput, calculate_confidence_band
+from charly_core_engine.decision import DecisionInput, make_appeal_decision
+from fastapi_backend.main import app
+from fastapi_backend.routers import decisions
+from fastapi_backend.routers.decisions import get_decision_executor, iter_line_chunks, stream_decisions
+
+PRIORS = {
+    "jurisdiction_id": "collin_county_tx",
+    "jurisdiction_name": "Collin County, TX",
+    "state": "TX",
+    "appeal_success_rate": "0.45",
+    "average_reduction_pct": "0.18",
+    "typical_filing_fee": "450",
+    "typical_attorney_cost": "2800",
+    "cod_target": "0.15",
+}
+
+
+def make_row(i: int) -> dict:
+    market_value = 500000 + 1000 * i
+    return {
+        "property_id": f"P-{i:05d}",
+        "confidence": {
+            "estimated_market_value": market_value,
+            "valuation_method": "sales_comparison",
+            "comparable_sales": [market_value * 0.97, market_value * 1.02, market_value * 1.05],
+        },
+        "decision": {
+            "assessed_value": market_value * (0.8 + (i % 7) * 0.1),
+            "jurisdiction_priors": PRIORS,
+            "tax_rate": "0.025",
+        },
+    }
+
+
+def ndjson(rows) -> bytes:
+    return b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+
+@pytest.fixture
+def client():
+    executor = ThreadPoolExecutor(max_workers=2)
+    app.dependency_overrides[get_decision_executor] = lambda: executor
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    executor.shutdown()
+
+
+def post_batch(client, body: bytes):
+    response = client.post(
+        "/api/v1/decisions/batch", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_matches_engine(client):
+    rows = [make_row(i) for i in range(1200)]
+    results = post_batch(client, ndjson(rows))
+
+    assert sorted(r["line"] for r in results) == list(range(1, 1201))
+    by_line = {r["line"]: r for r in results}
+    for i in (0, 3, 599, 1199):
+        row = rows[i]
+        confidence = calculate_confidence_band(ConfidenceInput(**row["confidence"]))
+        decision = make_appeal_decision(DecisionInput(
+            **row["decision"],
+            estimated_market_value=row["confidence"]["estimated_market_value"],
+            confidence_result=confidence,
+        ))
+        result = by_line[i + 1]
+        assert result["property_id"] == row["property_id"]
+        assert result["decision"] == json.loads(decision.model_dump_json())
+        assert result["confidence"] == json.loads(confidence.model_dump_json())
+
+
+def test_bad_lines_report_errors(client):
+    good = json.dumps(make_row(1)).encode()
+    bad_value = make_row(2)
+    bad_value["decision"]["tax_rate"] = "0.5"
+    body = b"\n".join([
+        good, b"", b"{not json", b"[1, 2]", json.dumps({"confidence": {}}).encode(), json.dumps(bad_value).encode(), good
+    ])  # Last line has no trailing newline
+    results = {r["line"]: r for r in post_batch(client, body)}
+
+    assert set(results) == {1, 3, 4, 5, 6, 7}
+    assert "decision" in results[1] and "decision" in results[7]
+    assert results[3]["error"].startswith("Invalid JSON")
+    assert results[4]["error"] == "Each line must be a JSON object"
+    assert results[5]["error"] == "property_id must be a string"
+    assert results[6]["property_id"] == "P-00002"
+    assert "Tax rate" in results[6]["error"]
+
+
+def test_failing_row_does_not_abort_stream(client):
+    unparsable = make_row(2)
+    unparsable["confidence"]["estimated_market_value"] = "abc"
+    overflowing = make_row(3)
+    overflowing["confidence"]["estimated_market_value"] = "1e999999"
+    rows = [make_row(1), unparsable, make_row(4), overflowing, make_row(5)]
+    results = {r["line"]: r for r in post_batch(client, ndjson(rows))}
+
+    assert set(results) == {1, 2, 3, 4, 5}
+    assert all("decision" in results[line] for line in (1, 3, 5))
+    assert results[2]["property_id"] == "P-00002"
+    assert "valid decimal" in results[2]["error"]
+    assert results[4]["error"].startswith("Calculation failed")
+
+
+def test_wrong_content_type(client):
+    response = client.post("/api/v1/decisions/batch", json=make_row(1))
+    assert response.status_code == 415
+    assert response.json()["code"] == "unsupported_media_type"
+
+
+def test_intake_is_bounded_by_window():
+    """The body is only read as far as the in-flight window allows."""
+    pulled = []
+
+    async def body():
+        for i in range(100):
+            pulled.append(i)
+            yield json.dumps(make_row(i)).encode() + b"\n"
+
+    async def first_output():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            stream = stream_decisions(body(), executor, chunk_lines=2, max_in_flight=3)
+            chunk = await stream.__anext__()
+            await stream.aclose()
+            return chunk
+
+    chunk = asyncio.run(first_output())
+    assert chunk.count(b"\n") == 2
+    # 3 chunks of 2 lines in flight, plus the line that starts the 4th chunk
+    assert len(pulled) <= 3 * 2 + 2
+
+
+def test_long_lines_are_capped():
+    async def body():
+        yield b'{"a": 1}\n' + b"x" * 30
+        yield b"y" * 30
+        yield b'\n{"b": 2}\n' + b"z" * 5
+        yield b"\n" + b"w" * 41
+
+    async def chunks():
+        return [chunk async for chunk in iter_line_chunks(body(), chunk_lines=2, max_line_bytes=40)]
+
+    assert asyncio.run(chunks()) == [(1, [b'{"a": 1}', None]), (3, [b'{"b": 2}', b"zzzzz"]), (5, [None])]
+
+
+def test_long_line_gets_error_row(client):
+    good = json.dumps(make_row(1)).encode()
+    padded = make_row(2)
+    padded["padding"] = "x" * decisions.BATCH_MAX_LINE_BYTES
+    body = b"\n".join([good, json.dumps(padded).encode(), good])
+
+    response = client.post(
+        "/api/v1/decisions/batch", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    results = {r["line"]: r for r in map(json.loads, response.text.splitlines())}
+
+    assert results[2]["error"] == "Line exceeds the maximum line length"
+    assert "decision" in results[1] and "decision" in results[3]
+
+
+def test_default_executor_is_process_pool(monkeypatch):
+    monkeypatch.setattr(decisions, "_executor", None)
+    monkeypatch.setattr(decisions, "_batcher", None)
+    executor = get_decision_executor()
+    assert executor is get_decision_executor()
+    with TestClient(app) as client:
+        results = post_batch(client, ndjson(make_row(i) for i in range(5)))
+    assert len(results) == 5
+    # App shutdown closes the pool
+    assert decisions._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(len, [])
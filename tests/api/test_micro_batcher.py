@@ -0,0 +1,245 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from charly_core_engine.confidence import ConfidenceInput, calculate_confidence_band
+from charly_core_engine.decision import DecisionInput, make_appeal_decision
+from fastapi_backend.main import app
+from fastapi_backend.routers.decisions import get_micro_batcher
+from fastapi_backend.services import micro_batcher
+from fastapi_backend.services.micro_batcher import DecisionMicroBatcher
+
+PRIORS = {
+    "jurisdiction_id": "collin_county_tx",
+    "jurisdiction_name": "Collin County, TX",
+    "state": "TX",
+    "appeal_success_rate": "0.45",
+    "average_reduction_pct": "0.18",
+    "typical_filing_fee": "450",
+    "typical_attorney_cost": "2800",
+    "cod_target": "0.15",
+}
+
+
+def make_row(i: int) -> dict:
+    market_value = 500000 + 1000 * i
+    return {
+        "property_id": f"P-{i:05d}",
+        "confidence": {"estimated_market_value": market_value, "valuation_method": "sales_comparison"},
+        "decision": {"assessed_value": market_value * (0.8 + (i % 7) * 0.1), "jurisdiction_priors": PRIORS,
+                     "tax_rate": "0.025"},
+    }
+
+
+def expected(row):
+    confidence = calculate_confidence_band(ConfidenceInput(**row["confidence"]))
+    return confidence, make_appeal_decision(DecisionInput(
+        **row["decision"], estimated_market_value=row["confidence"]["estimated_market_value"],
+        confidence_result=confidence,
+    ))
+
+
+@pytest.fixture
+def slow_batches(monkeypatch):
+    """Make every batch take at least 20 ms so concurrent rows pile up."""
+    decide_rows = micro_batcher.decide_rows
+
+    def slow(rows):
+        time.sleep(0.02)
+        return decide_rows(rows)
+
+    monkeypatch.setattr(micro_batcher, "decide_rows", slow)
+
+
+def run_concurrently(batcher, rows):
+    async def main():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            batcher.executor = executor
+            return await asyncio.gather(*(batcher.submit(row) for row in rows), return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_lone_row_goes_out_when_the_window_closes():
+    batcher = DecisionMicroBatcher(max_wait_ms=5)
+
+    [(confidence, decision)] = run_concurrently(batcher, [make_row(1)])
+
+    assert (confidence, decision) == expected(make_row(1))
+    assert batcher.metrics.batch_sizes == {1: 1}
+    assert batcher.metrics.max_queue_wait_seconds > 0.004
+
+
+def test_zero_window_dispatches_immediately(slow_batches):
+    batcher = DecisionMicroBatcher(max_wait_ms=0, max_batch_size=16, max_in_flight=1)
+
+    results = run_concurrently(batcher, [make_row(i) for i in range(20)])
+
+    assert all(isinstance(result, tuple) for result in results)
+    # The first row went out alone; the rest queued behind it
+    assert batcher.metrics.batch_sizes == {1: 1, 16: 1, 3: 1}
+
+
+def test_rows_arriving_within_the_window_share_a_batch():
+    rows = [make_row(i) for i in range(5)]
+    batcher = DecisionMicroBatcher(max_wait_ms=500)
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            batcher.executor = executor
+            futures = []
+            for row in rows:  # One row per event loop iteration
+                futures.append(asyncio.ensure_future(batcher.submit(row)))
+                await asyncio.sleep(0)
+            return await asyncio.gather(*futures)
+
+    results = asyncio.run(main())
+
+    assert results == [expected(row) for row in rows]
+    assert batcher.metrics.batch_sizes == {5: 1}
+
+
+def test_burst_is_batched_and_each_caller_gets_its_own_result(slow_batches):
+    rows = [make_row(i) for i in range(50)]
+    batcher = DecisionMicroBatcher(max_batch_size=16, max_in_flight=1)
+
+    results = run_concurrently(batcher, rows)
+
+    for row, result in zip(rows, results):
+        assert result == expected(row)
+    metrics = batcher.metrics
+    assert metrics.items == 50
+    # The first batch filled up at once; the rest queued behind it
+    assert metrics.batch_sizes == {16: 3, 2: 1}
+    assert metrics.mean_queue_wait_ms > 0
+    assert metrics.as_dict()["max_batch_size"] == 16
+
+
+def test_in_flight_batches_never_exceed_the_limit(monkeypatch):
+    decide_rows = micro_batcher.decide_rows
+    running, peak = [0], [0]
+
+    def counted(rows):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        running[0] -= 1
+        return decide_rows(rows)
+
+    monkeypatch.setattr(micro_batcher, "decide_rows", counted)
+    batcher = DecisionMicroBatcher(max_batch_size=4, max_in_flight=2)
+
+    results = run_concurrently(batcher, [make_row(i) for i in range(20)])
+
+    assert all(isinstance(result, tuple) for result in results)
+    # Every batch fills up before its window closes
+    assert batcher.metrics.batch_sizes == {4: 5}
+    assert peak[0] == 2
+    assert batcher.stats()["in_flight"] == 0 and batcher.queued == 0
+
+
+def test_invalid_row_fails_only_its_caller():
+    bad = make_row(2)
+    bad["decision"]["tax_rate"] = "0.5"
+
+    results = run_concurrently(DecisionMicroBatcher(), [make_row(1), bad, make_row(3)])
+
+    assert results[0] == expected(make_row(1))
+    assert isinstance(results[1], ValueError) and "Tax rate" in str(results[1])
+    assert results[2] == expected(make_row(3))
+
+
+def test_unparsable_row_fails_only_its_caller():
+    bad = make_row(2)
+    bad["confidence"]["estimated_market_value"] = "abc"
+    rows = [make_row(0), make_row(1), bad, make_row(3), make_row(4)]
+    batcher = DecisionMicroBatcher()
+
+    results = run_concurrently(batcher, rows)
+
+    assert batcher.metrics.batch_sizes == {5: 1}
+    assert isinstance(results[2], ValueError) and "valid decimal" in str(results[2])
+    for i in (0, 1, 3, 4):
+        assert results[i] == expected(rows[i])
+
+
+def test_failed_batch_is_retried_row_by_row(monkeypatch):
+    decide_rows = micro_batcher.decide_rows
+
+    def fragile(rows):
+        if any(row.get("explode") for row in rows):
+            raise RuntimeError("worker crashed")
+        return decide_rows(rows)
+
+    monkeypatch.setattr(micro_batcher, "decide_rows", fragile)
+    rows = [make_row(1), {**make_row(2), "explode": True}, make_row(3)]
+
+    results = run_concurrently(DecisionMicroBatcher(), rows)
+
+    assert results[0] == expected(rows[0])
+    assert isinstance(results[1], RuntimeError)
+    assert results[2] == expected(rows[2])
+
+
+def test_settings_are_validated():
+    with pytest.raises(ValueError):
+        DecisionMicroBatcher(max_batch_size=0)
+    with pytest.raises(ValueError):
+        DecisionMicroBatcher(max_in_flight=0)
+    with pytest.raises(ValueError):
+        DecisionMicroBatcher(max_wait_ms=-1)
+
+
+@pytest.fixture
+def client():
+    executor = ThreadPoolExecutor(max_workers=2)
+    batcher = DecisionMicroBatcher(executor)
+    app.dependency_overrides[get_micro_batcher] = lambda: batcher
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    executor.shutdown()
+
+
+def test_single_decision_endpoint(client):
+    row = make_row(4)
+
+    response = client.post("/api/v1/decisions", json=row)
+
+    assert response.status_code == 200
+    body = response.json()
+    confidence, decision = expected(row)
+    assert body["property_id"] == "P-00004"
+    assert body["decision"] == decision.model_dump(mode="json")
+    assert body["confidence"] == confidence.model_dump(mode="json")
+
+
+def test_single_decision_endpoint_errors(client):
+    bad = make_row(1)
+    bad["confidence"]["estimated_market_value"] = -5
+
+    invalid = client.post("/api/v1/decisions", json=bad)
+    bad["confidence"]["estimated_market_value"] = "abc"
+    unparsable = client.post("/api/v1/decisions", json=bad)
+    not_object = client.post("/api/v1/decisions", json=[1, 2])
+    not_json = client.post("/api/v1/decisions", content=b"{nope", headers={"content-type": "application/json"})
+
+    assert invalid.status_code == 422
+    assert invalid.json()["code"] == "invalid_decision_input"
+    assert unparsable.status_code == 422
+    assert not_object.status_code == 400
+    assert not_json.status_code == 400
+
+
+def test_stats_endpoint(client):
+    client.post("/api/v1/decisions", json=make_row(5))
+
+    response = client.get("/api/v1/decisions/stats")
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["batches"] == 1 and stats["items"] == 1
+    assert stats["batch_sizes"] == {"1": 1}
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+    assert stats["mean_queue_wait_ms"] >= 0
@@ -0,0 +1,135 @@
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from charly_core_engine.confidence import ConfidenceInput, ValuationMethod, calculate_confidence_band
+from charly_core_engine.decision import AppealDecision, DecisionInput, make_appeal_decision
+from charly_finance.cap_rate import CapRateInput, calculate_cap_rate
+from charly_finance.noi import NOIInput, calculate_noi
+from charly_finance.tax_savings import TaxSavingsInput, calculate_tax_savings
+from fastapi_backend.services.property_pipeline import PROPERTY_STAGES, PropertyPipeline, Stage, fingerprint
+
+PRIORS = {
+    "jurisdiction_id": "collin_county_tx",
+    "jurisdiction_name": "Collin County, TX",
+    "state": "TX",
+    "appeal_success_rate": "0.45",
+    "average_reduction_pct": "0.18",
+    "typical_filing_fee": "450",
+    "typical_attorney_cost": "2800",
+    "cod_target": "0.15",
+}
+
+
+def make_inputs(assessed="2000000", tax_rate="0.025", **sections):
+    inputs = {
+        "noi": {"gross_rental_income": "150000", "vacancy_rate": "0.05", "property_taxes": "20000", "insurance": "5000"},
+        "cap_rate": {"target_cap_rate": "0.08"},
+        "confidence": {"comparable_sales": ["1450000", "1500000", "1550000"]},
+        "decision": {"assessed_value": assessed, "jurisdiction_priors": PRIORS, "tax_rate": tax_rate,
+                     "estimated_filing_fee": "450", "estimated_attorney_fee": "2800"},
+    }
+    inputs.update(sections)
+    return inputs
+
+
+def test_matches_manual_chain():
+    run = PropertyPipeline().run(make_inputs())
+
+    noi = calculate_noi(NOIInput(**make_inputs()["noi"]))
+    cap = calculate_cap_rate(CapRateInput(net_operating_income=noi.net_operating_income, target_cap_rate="0.08"))
+    confidence = calculate_confidence_band(ConfidenceInput(
+        estimated_market_value=cap.implied_value, valuation_method=ValuationMethod.INCOME_APPROACH,
+        comparable_sales=[Decimal("1450000"), Decimal("1500000"), Decimal("1550000")],
+    ))
+    decision = make_appeal_decision(DecisionInput(
+        assessed_value="2000000", estimated_market_value=confidence.central_estimate, confidence_result=confidence,
+        jurisdiction_priors=PRIORS, tax_rate="0.025", estimated_filing_fee="450", estimated_attorney_fee="2800",
+    ))
+
+    assert run.results["noi"] == noi
+    assert run.results["cap_rate"] == cap
+    assert run.results["confidence"] == confidence
+    assert run.results["decision"] == decision
+    assert decision.decision == AppealDecision.OVER
+    assert run.results["tax_savings"] == calculate_tax_savings(TaxSavingsInput(
+        current_assessed_value="2000000", proposed_assessed_value=confidence.central_estimate, tax_rate="25",
+        filing_fee="450", attorney_fee="2800", years_of_savings=3,
+    ))
+    assert set(run.timings) == {stage.name for stage in PROPERTY_STAGES}
+    assert run.cached == []
+
+
+def test_tax_rate_edit_reruns_only_downstream_stages():
+    pipeline = PropertyPipeline()
+    first = pipeline.run(make_inputs())
+
+    edited = pipeline.run(make_inputs(tax_rate="0.03"))
+
+    assert edited.cached == ["noi", "cap_rate", "confidence"]
+    assert edited.executed == ["decision", "tax_savings"]
+    assert edited.results["noi"] is first.results["noi"]
+    assert edited.results["tax_savings"].annual_tax_current == Decimal("60000.00")
+
+    assert pipeline.run(make_inputs()).cached == [stage.name for stage in PROPERTY_STAGES]
+    stats = pipeline.stats()
+    assert stats["noi"].runs == 3 and stats["noi"].hits == 2
+    assert stats["tax_savings"].hits == 1
+
+
+def test_upstream_edit_invalidates_everything_below():
+    pipeline = PropertyPipeline()
+    pipeline.run(make_inputs())
+
+    edited = make_inputs()
+    edited["noi"] = dict(edited["noi"], insurance="6000")
+
+    assert pipeline.run(edited).cached == []
+
+
+def test_tax_savings_section_overrides_defaults():
+    run = PropertyPipeline().run(make_inputs(tax_savings={"years_of_savings": 5}))
+    assert run.results["tax_savings"].cumulative_savings == (
+        run.results["tax_savings"].annual_savings * 5 - run.results["tax_savings"].total_appeal_costs
+    )
+
+
+def test_not_over_assessed_means_no_savings():
+    run = PropertyPipeline().run(make_inputs(assessed="1475000"))
+
+    assert run.results["decision"].decision != AppealDecision.OVER
+    assert run.results["tax_savings"].annual_savings == Decimal("0.00")
+
+
+def test_run_many_shares_cache_and_collects_errors():
+    pipeline = PropertyPipeline()
+    rows = [make_inputs(tax_rate=rate) for rate in ("0.02", "0.025", "0.03")]
+    rows.append(make_inputs(cap_rate={"property_value": "1500000"}))  # No implied value to feed confidence
+
+    runs = pipeline.run_many(rows, return_exceptions=True)
+
+    assert [run.cached for run in runs[1:3]] == [["noi", "cap_rate", "confidence"]] * 2
+    assert isinstance(runs[3], ValueError)
+    with pytest.raises(ValueError):
+        pipeline.run_many(rows)
+    with pytest.raises(ValidationError):
+        pipeline.run(make_inputs(tax_rate="-1"))
+
+
+def test_cache_is_bounded():
+    pipeline = PropertyPipeline(cache_size=5)
+    pipeline.run(make_inputs())
+    pipeline.run(make_inputs(tax_rate="0.03"))
+
+    assert pipeline.run(make_inputs()).cached == ["noi", "cap_rate", "confidence"]
+
+
+def test_stage_order_is_validated():
+    with pytest.raises(ValueError, match="depends on"):
+        PropertyPipeline([Stage("b", (), ("a",), lambda s, u: None), Stage("a", (), (), lambda s, u: None)])
+
+
+def test_fingerprint_is_stable_across_equal_values():
+    assert fingerprint({"a": Decimal("1.0"), "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": Decimal("1.0")})
+    assert fingerprint({"a": Decimal("1.0")}) != fingerprint({"a": Decimal("1.1")})
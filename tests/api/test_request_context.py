@@ -0,0 +1,119 @@
+import importlib
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fastapi_backend.services.request_context import COMPS, PROPERTY_RECORD, RequestContext
+
+
+def test_fetch_memoizes_per_key():
+    context = RequestContext()
+    calls = []
+
+    def load(key):
+        calls.append(key)
+        return {"id": key}
+
+    assert context.fetch(PROPERTY_RECORD, "A", lambda: load("A")) == {"id": "A"}
+    assert context.fetch(PROPERTY_RECORD, "A", lambda: load("A")) is context.fetch(PROPERTY_RECORD, "A", lambda: load("A"))
+    context.fetch(PROPERTY_RECORD, "B", lambda: load("B"))
+    context.fetch(COMPS, "A", lambda: load("comps-A"))
+
+    assert calls == ["A", "B", "comps-A"]
+    assert context.stats() == {PROPERTY_RECORD: {"loads": 2, "hits": 2}, COMPS: {"loads": 1, "hits": 0}}
+    assert context.avoided_fetches == 2
+
+
+def test_concurrent_callers_share_one_load():
+    context = RequestContext()
+    calls = []
+    release = threading.Event()
+
+    def slow_load():
+        calls.append(1)
+        release.wait(5)
+        return "record"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(context.fetch, PROPERTY_RECORD, "A", slow_load) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        assert [f.result() for f in futures] == ["record"] * 4
+    assert calls == [1]
+    assert context.avoided_fetches == 3
+
+
+def test_failed_load_is_remembered():
+    context = RequestContext()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise LookupError("no such property")
+
+    for _ in range(2):
+        with pytest.raises(LookupError):
+            context.fetch(PROPERTY_RECORD, "X", failing)
+    assert calls == [1]
+
+
+@pytest.fixture
+def combiner(monkeypatch):
+    """valuation_combiner wired to in-memory approach services sharing lookups."""
+    loads = []
+
+    def property_record(prop_id, context):
+        return context.fetch(PROPERTY_RECORD, prop_id, lambda: loads.append(("record", prop_id)) or {"sqft": 10000})
+
+    def comps(prop_id, context):
+        return context.fetch(COMPS, prop_id, lambda: loads.append(("comps", prop_id)) or [2_000_000, 2_200_000])
+
+    def income(prop_id, context):
+        return {"value": property_record(prop_id, context)["sqft"] * 205}
+
+    def sales(prop_id, context):
+        prices = comps(prop_id, context)
+        property_record(prop_id, context)
+        return {"value": sum(prices) / len(prices)}
+
+    def cost(prop_id, context):
+        property_record(prop_id, context)
+        comps(prop_id, context)
+        return {"value": "1950000"}
+
+    for name, func, attr in (
+        ("income_service", income, "get_income_valuation"),
+        ("sales_service", sales, "get_sales_valuation"),
+        ("cost_service", cost, "get_cost_valuation"),
+    ):
+        module = types.ModuleType(f"fastapi_backend.services.{name}")
+        setattr(module, attr, func)
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.delitem(sys.modules, "fastapi_backend.services.valuation_combiner", raising=False)
+    module = importlib.import_module("fastapi_backend.services.valuation_combiner")
+    yield module, loads
+    sys.modules.pop("fastapi_backend.services.valuation_combiner", None)
+
+
+def test_combine_all_loads_shared_lookups_once(combiner):
+    module, loads = combiner
+    context = RequestContext()
+    combined = module.combine_all("OBZ-2023-001", context=context)
+
+    assert combined["income_value"] == 2_050_000.0
+    assert combined["sales_value"] == 2_100_000.0
+    assert combined["cost_value"] == 1_950_000.0
+    assert loads == [("record", "OBZ-2023-001"), ("comps", "OBZ-2023-001")]
+    assert context.stats() == {PROPERTY_RECORD: {"loads": 1, "hits": 2}, COMPS: {"loads": 1, "hits": 1}}
+    assert context.avoided_fetches == 3
+
+
+def test_each_request_gets_a_fresh_context(combiner):
+    module, loads = combiner
+    module.combine_all("OBZ-2023-001")
+    module.combine_all("OBZ-2023-001")
+    assert len(loads) == 4
@@ -0,0 +1,102 @@
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fastapi_backend.main import app
+from fastapi_backend.schemas.combined_validator import validate_combined
+from fastapi_backend.services import standins
+from fastapi_backend.services.request_context import PROPERTY_RECORD, RequestContext
+from tools.load_combined import LoadReport, percentile
+
+
+@pytest.fixture
+def install_standins():
+    installed = []
+
+    def install(**options):
+        installed.append(standins.install(standins.StandinConfig(**options)))
+        return installed[-1]
+
+    yield install
+    standins.uninstall()
+
+
+def test_combined_endpoint_returns_schema_valid_body(install_standins):
+    install_standins()
+    client = TestClient(app)
+
+    first = client.get("/api/valuation/OBZ-2023-001/combined")
+    second = client.get("/api/valuation/OBZ-2023-001/combined")
+
+    assert first.status_code == 200
+    body = first.json()
+    validate_combined(body)
+    assert body["property_id"] == "OBZ-2023-001"
+    assert body["income_value"] == body["income"]["value"]
+    assert second.json() == body
+
+
+def test_standins_share_lookups_within_a_request(install_standins):
+    fakes = install_standins()
+    from fastapi_backend.services.valuation_combiner import combine_all
+
+    context = RequestContext()
+    combine_all("ABC-2023-002", context=context)
+
+    assert context.stats()[PROPERTY_RECORD] == {"loads": 1, "hits": 2}
+    assert fakes.loads == 3  # Property record, comps, cost table
+
+
+def test_failing_property_returns_bad_gateway(install_standins):
+    install_standins(failing_ids=frozenset({"BAD-1"}))
+    client = TestClient(app)
+
+    response = client.get("/api/valuation/BAD-1/combined")
+
+    assert response.status_code == 502
+    assert response.headers["content-type"].startswith("application/problem+json")
+    assert response.json()["code"] == "approach_service_failed"
+    assert client.get("/api/valuation/OK-1/combined").status_code == 200
+
+
+def test_failure_rate_is_reproducible(install_standins):
+    def statuses():
+        install_standins(failure_rate=0.3, seed=7)
+        client = TestClient(app)
+        return [client.get(f"/api/valuation/P-{i}/combined").status_code for i in range(20)]
+
+    first = statuses()
+    assert set(first) == {200, 502}
+    assert statuses() == first
+
+
+def test_missing_services_return_not_implemented(monkeypatch):
+    standins.uninstall()
+    monkeypatch.setitem(sys.modules, "fastapi_backend.services.income_service", None)
+
+    response = TestClient(app).get("/api/valuation/OBZ-2023-001/combined")
+
+    assert response.status_code == 501
+    assert response.json()["code"] == "approach_services_unavailable"
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_report_check_lists_missed_targets():
+    report = LoadReport(requests=100, errors=5, duration_s=2.0, throughput_rps=40.0,
+                        p50_ms=120.0, p95_ms=650.0, p99_ms=900.0, max_ms=1000.0, status_counts={})
+
+    missed = report.check()
+
+    assert len(missed) == 3
+    assert any(m.startswith("P95") for m in missed)
+    assert any(m.startswith("throughput") for m in missed)
+    assert any(m.startswith("error rate") for m in missed)
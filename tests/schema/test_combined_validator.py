@@ -0,0 +1,90 @@
+import copy
+import json
+
+import pytest
+from hypothesis import given, strategies as st
+from jsonschema import Draft202012Validator, ValidationError
+
+from fastapi_backend.schemas.combined_validator import (
+    SCHEMA_PATH, CompiledValidator, get_combined_validator, validate_combined, validate_combined_many,
+)
+
+SCHEMA = json.load(open(SCHEMA_PATH))
+REFERENCE = Draft202012Validator(SCHEMA)
+
+VALID = {
+    "property_id": "OBZ-2023-001",
+    "income_value": 2050000.0,
+    "sales_value": 2100000,
+    "cost_value": 1950000.0,
+    "income": {"value": 2050000.0, "cap_rate": 0.065},
+    "sales": {"value": 2100000},
+    "cost": {},
+    "extra": "allowed",
+}
+
+json_values = st.recursive(
+    st.none() | st.booleans() | st.integers() | st.floats(allow_nan=False) | st.text(max_size=5),
+    lambda children: st.lists(children, max_size=3) | st.dictionaries(st.text(max_size=5), children, max_size=3),
+    max_leaves=5,
+)
+
+
+def test_cached_and_valid():
+    assert get_combined_validator() is get_combined_validator()
+    validate_combined(VALID)
+    assert get_combined_validator().errors(VALID) == []
+
+
+@pytest.mark.parametrize("field, value", [
+    ("property_id", 7),
+    ("income_value", "2050000"),
+    ("sales_value", True),
+    ("cost", []),
+])
+def test_type_errors(field, value):
+    instance = dict(VALID, **{field: value})
+    with pytest.raises(ValidationError):
+        validate_combined(instance)
+    assert get_combined_validator().errors(instance)[0].startswith(field + ":")
+
+
+def test_missing_required():
+    instance = {k: v for k, v in VALID.items() if k != "cost"}
+    assert get_combined_validator().errors(instance) == ["<root>: 'cost' is a required property"]
+
+
+@given(st.fixed_dictionaries({}, optional={key: json_values for key in SCHEMA["properties"]}) | json_values)
+def test_matches_jsonschema(instance):
+    assert get_combined_validator().is_valid(instance) == REFERENCE.is_valid(instance)
+
+
+def test_validate_many():
+    bad = copy.deepcopy(VALID)
+    bad["sales"] = None
+    errors = validate_combined_many([VALID, bad, VALID, "nope"])
+    assert set(errors) == {1, 3}
+    assert errors[1] == ["sales: None is not of type 'object'"]
+
+
+def test_compiled_subset_and_fallback():
+    compiled = CompiledValidator({
+        "type": ["integer", "null"],
+    })
+    assert compiled.is_valid(3) and compiled.is_valid(3.0) and compiled.is_valid(None)
+    assert not compiled.is_valid(3.5) and not compiled.is_valid(False)
+
+    closed = CompiledValidator({"type": "array", "items": {"type": "object", "additionalProperties": False,
+                                                           "properties": {"a": {"type": "string"}}}})
+    assert closed.is_valid([{"a": "x"}, {}])
+    assert not closed.is_valid([{"a": "x", "b": 1}])
+
+    # Keywords outside the compiled subset fall back to jsonschema
+    fallback = CompiledValidator({"type": "string", "minLength": 2})
+    assert fallback.is_valid("ab") and not fallback.is_valid("a")
+    assert not CompiledValidator({"items": {"pattern": "^a"}}).is_valid(["b"])
+    assert not CompiledValidator({"properties": {"x": {"minimum": 2}}}).is_valid({"x": 1})
+    assert not CompiledValidator({"additionalProperties": {"type": "string"}}).is_valid({"x": 1})
+    assert CompiledValidator({"properties": {"x": True}}).is_valid({"x": 1})
+    assert CompiledValidator({"required": ["x"]}).is_valid("not an object")
+
@@ -0,0 +1,55 @@
+"""
+Cost of validating a combined valuation payload: CompiledValidator against
+jsonschema's Draft202012Validator on the same schema.
+
+Run from the repository root:
+
+    python -m tools.bench_combined_validator [--number N] [--repeat R]
+
+Reports the best per-call time over R rounds of N calls for each validator
+and the speedup of the compiled one.
+"""
+
+import argparse
+import json
+import timeit
+
+from jsonschema import Draft202012Validator
+
+from fastapi_backend.schemas.combined_validator import SCHEMA_PATH, get_combined_validator
+
+PAYLOAD = {
+    "property_id": "OBZ-2023-001",
+    "income_value": 2050000.0,
+    "sales_value": 2100000,
+    "cost_value": 1950000.0,
+    "income": {"value": 2050000.0, "cap_rate": 0.065},
+    "sales": {"value": 2100000},
+    "cost": {},
+    "extra": "allowed",
+}
+
+
+def best_per_call_us(func, number: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(SCHEMA_PATH) as handle:
+        reference = Draft202012Validator(json.load(handle))
+    compiled = get_combined_validator()
+
+    compiled_us = best_per_call_us(lambda: compiled.validate(PAYLOAD), args.number, args.repeat)
+    reference_us = best_per_call_us(lambda: reference.validate(PAYLOAD), args.number, args.repeat)
+    print(f"{'CompiledValidator.validate':34s} {compiled_us:8.2f} us/call")
+    print(f"{'Draft202012Validator.validate':34s} {reference_us:8.2f} us/call")
+    print(f"{'speedup':34s} {reference_us / compiled_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Load harness for GET /api/valuation/{id}/combined.
+
+Drives the endpoint from a pool of worker threads, each holding one
+keep-alive `requests.Session`, and reports throughput and latency
+percentiles against the read targets in SYSTEM_NFRS.md.
+
+Against a running backend:
+
+    python -m tools.load_combined --base-url http://localhost:8000 --duration 30
+
+Offline, against the app served in-process with stand-in approach
+services (requires uvicorn):
+
+    python -m tools.load_combined --serve-standins --latency-ms 15 --failure-rate 0.01
+
+Exits non-zero when a target is missed.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# SYSTEM_NFRS.md: reads P50/P95 <= 150/500 ms, sustain 50 RPS burst; alert on >2% errors
+NFR_TARGETS = {
+    "p50_ms": 150.0,
+    "p95_ms": 500.0,
+    "min_rps": 50.0,
+    "max_error_rate": 0.02,
+}
+
+DEFAULT_IDS = ("OBZ-2023-001", "ABC-2023-002")
+
+
+@dataclass
+class LoadReport:
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    status_counts: Dict[str, int]
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def check(self, targets: Dict[str, float] = NFR_TARGETS) -> List[str]:
+        """Missed targets as readable messages (empty when all are met)."""
+        failures = []
+        if self.p50_ms > targets["p50_ms"]:
+            failures.append(f"P50 {self.p50_ms:.1f} ms > {targets['p50_ms']:.0f} ms")
+        if self.p95_ms > targets["p95_ms"]:
+            failures.append(f"P95 {self.p95_ms:.1f} ms > {targets['p95_ms']:.0f} ms")
+        if self.throughput_rps < targets["min_rps"]:
+            failures.append(f"throughput {self.throughput_rps:.1f} RPS < {targets['min_rps']:.0f} RPS")
+        if self.error_rate > targets["max_error_rate"]:
+            failures.append(f"error rate {self.error_rate:.2%} > {targets['max_error_rate']:.0%}")
+        return failures
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def pooled_session() -> requests.Session:
+    """Session reusing one keep-alive connection per host, without retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def run_load(
+    base_url: str,
+    property_ids: Sequence[str],
+    concurrency: int = 16,
+    duration_s: float = 10.0,
+    max_requests: Optional[int] = None,
+    warmup_s: float = 1.0,
+    timeout_s: float = 30.0,
+) -> LoadReport:
+    """
+    Hit the combined endpoint from `concurrency` threads until the duration
+    (or request budget) runs out. Warmup requests are not recorded.
+    """
+    base_url = base_url.rstrip("/")
+    lock = threading.Lock()
+    samples: List[Tuple[float, int]] = []
+    issued = [0]
+    start = time.perf_counter()
+    record_from = start + warmup_s
+    stop_at = record_from + duration_s
+
+    def worker(offset: int) -> None:
+        session = pooled_session()
+        i = offset
+        try:
+            while time.perf_counter() < stop_at:
+                if max_requests is not None:
+                    with lock:
+                        if issued[0] >= max_requests:
+                            return
+                        issued[0] += 1
+                prop_id = property_ids[i % len(property_ids)]
+                i += concurrency
+                sent = time.perf_counter()
+                try:
+                    status = session.get(f"{base_url}/api/valuation/{prop_id}/combined", timeout=timeout_s).status_code
+                except requests.RequestException:
+                    status = 0
+                done = time.perf_counter()
+                if sent >= record_from or max_requests is not None:
+                    with lock:
+                        samples.append((done - sent, status))
+        finally:
+            session.close()
+
+    if max_requests is not None:
+        record_from = start  # A fixed request budget is measured in full
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - max(record_from, start)
+
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    status_counts: Dict[str, int] = {}
+    for _, status in samples:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+    errors = sum(count for status, count in status_counts.items() if not status.startswith("2"))
+    return LoadReport(
+        requests=len(samples),
+        errors=errors,
+        duration_s=elapsed,
+        throughput_rps=len(samples) / elapsed if elapsed > 0 else 0.0,
+        p50_ms=percentile(latencies, 50),
+        p95_ms=percentile(latencies, 95),
+        p99_ms=percentile(latencies, 99),
+        max_ms=latencies[-1] if latencies else 0.0,
+        status_counts=status_counts,
+    )
+
+
+def serve_standins(latency_ms: float, jitter_ms: float, failure_rate: float, seed: int = 0):
+    """Start the app with stand-in services on a free local port; returns (base_url, server)."""
+    import uvicorn  # Only needed for in-process serving
+
+    from fastapi_backend.main import app
+    from fastapi_backend.services import standins
+
+    standins.install(standins.StandinConfig(
+        fetch_latency_ms=latency_ms, jitter_ms=jitter_ms, failure_rate=failure_rate, seed=seed,
+    ))
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("In-process server did not start")
+        time.sleep(0.02)
+    return f"http://127.0.0.1:{port}", server
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test /api/valuation/{id}/combined")
+    parser.add_argument("--base-url", default=os.getenv("BACKEND_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--ids", default=",".join(DEFAULT_IDS), help="Comma-separated property IDs")
+    parser.add_argument("--synthetic-ids", type=int, default=0, help="Add N generated property IDs")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to record after warmup")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests instead")
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--serve-standins", action="store_true", help="Serve the app in-process with stand-ins")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Stand-in latency per upstream load")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    ids = [i for i in args.ids.split(",") if i]
+    ids += [f"SYN-{n:06d}" for n in range(args.synthetic_ids)]
+    base_url, server = args.base_url, None
+    if args.serve_standins:
+        base_url, server = serve_standins(args.latency_ms, args.jitter_ms, args.failure_rate)
+
+    try:
+        report = run_load(base_url, ids, args.concurrency, args.duration, args.requests, args.warmup)
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    failures = report.check()
+    print(f"requests={report.requests} errors={report.errors} ({report.error_rate:.2%}) "
+          f"duration={report.duration_s:.1f}s throughput={report.throughput_rps:.1f} RPS")
+    print(f"latency ms: p50={report.p50_ms:.1f} p95={report.p95_ms:.1f} "
+          f"p99={report.p99_ms:.1f} max={report.max_ms:.1f}")
+    print(f"status: {report.status_counts}")
+    print("NFR targets: " + ("met" if not failures else "MISSED - " + "; ".join(failures)))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({**asdict(report), "error_rate": report.error_rate, "missed": failures}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())